@@ -1,6 +1,6 @@
-
 from PySide2 import QtCore
 from ApplicationMode import ApplicationMode
+import threading
 
 
 class AppInfo(object):
@@ -9,10 +9,46 @@ class AppInfo(object):
 
         self.appName : str = None
         self.company : str = None
-        self.initialized : bool = False
-        self.applicationQuitting : bool = False
         self.mode : ApplicationMode = None
 
+        # Waiters are notified when the application is initialized or quitting instead of polling the state:
+        self.stateCondition = threading.Condition()
+        self._initialized = False
+        self._applicationQuitting = False
+
     @property
     def settings(self) -> QtCore.QSettings:
-        return QtCore.QSettings(self.company, self.appName)
\ No newline at end of file
+        return QtCore.QSettings(self.company, self.appName)
+
+    @property
+    def initialized(self) -> bool:
+        return self._initialized
+
+    @initialized.setter
+    def initialized(self, initialized: bool):
+        with self.stateCondition:
+            self._initialized = initialized
+            self.stateCondition.notify_all()
+
+    @property
+    def applicationQuitting(self) -> bool:
+        return self._applicationQuitting
+
+    @applicationQuitting.setter
+    def applicationQuitting(self, applicationQuitting: bool):
+        with self.stateCondition:
+            self._applicationQuitting = applicationQuitting
+            self.stateCondition.notify_all()
+
+    def waitForInitialization(self, timeout: float = None) -> bool:
+        """Blocks until the application is initialized or quitting. Returns True if the application is initialized.
+        """
+        with self.stateCondition:
+            self.stateCondition.wait_for(lambda: self._initialized or self._applicationQuitting, timeout)
+            return self._initialized
+
+    def waitForQuit(self, timeout: float = None) -> bool:
+        """Blocks until the application is quitting or the timeout expired. Returns True if the application is quitting.
+        """
+        with self.stateCondition:
+            return self.stateCondition.wait_for(lambda: self._applicationQuitting, timeout)
@@ -1,7 +1,6 @@
 from MetadataManagerCore import config
 from plugin.PluginManager import PluginManager
 from ApplicationMode import ApplicationMode
-from updater.Updater import Updater
 from MetadataManagerCore.host.HostProcessController import HostProcessController
 from MetadataManagerCore.file.FileHandlerManager import FileHandlerManager
 from MetadataManagerCore.service.WatchDogService import WatchDogService
@@ -9,48 +8,37 @@ from MetadataManagerCore.service.ServiceManager import ServiceManager
 from MetadataManagerCore.filtering.DocumentFilterManager import DocumentFilterManager
 from PySide2.QtCore import QThreadPool
 from PySide2 import QtCore
-from PySide2.QtWidgets import QApplication
 import asset_manager
 from qt_extensions import qt_util
 from MetadataManagerCore.mongodb_manager import MongoDBManager
-from time import sleep
 from datetime import datetime
 import logging
 from enum import Enum
-from LoaderWindow import LoaderWindow
 from AppInfo import AppInfo
-from MainWindowManager import MainWindowManager
 import os
 import sys
 from MetadataManagerCore.third_party_integrations.deadline.deadline_service import DeadlineService, DeadlineServiceInfo
 from MetadataManagerCore.actions.ActionManager import ActionManager
 from MetadataManagerCore.environment.EnvironmentManager import EnvironmentManager
 from ServiceRegistry import ServiceRegistry
-
-# Do not remove the resources_qrc import. It loads the custom resources/icons for Qt.
-import resources_qrc
 from MetadataManagerCore.task_processor.TaskProcessor import TaskProcessor
 from MetadataManagerCore.task_processor.ActionTaskPicker import ActionTaskPicker
 import time
 from ConsoleApp import ConsoleApp
 from MetadataManagerCore.file.PrintFileHandler import PrintFileHandler
+from file_cache.FileExistenceCache import FileExistenceCache
+from database import mongodb_util
+from startup_profiler import PROFILER, phase
 
 # Keep the following imports to ensure plugins have access to the modules.
 import MetadataManagerCore.communication.messaging
 
-# Visual Scripting imports:
-from VisualScriptingExtensions.ExtendedVisualScripting import ExtendedVisualScripting
-from VisualScriptingExtensions.CodeGenerator import CodeGenerator
-import VisualScriptingExtensions.mongodb_nodes
-import VisualScriptingExtensions.document_action_nodes
-import VisualScriptingExtensions.action_nodes
-import VisualScriptingExtensions.versioning_nodes
-import VisualScriptingExtensions.third_party_extensions.deadline_nodes
-import VisualScriptingExtensions.third_party_extensions.photoshop_nodes
-import VisualScriptingExtensions.environment_nodes
+# GUI and platform specific modules (QtWidgets, main window, updater, Photoshop nodes) and the visual scripting modules
+# are imported where they are needed to keep the console mode free of the node graph UI and short to start.
 
 class Bootstrapper(object):
-    def __init__(self, mode : ApplicationMode, taskFilePath: str, launcherFilename: str, loggerLevel: str = None):
+    def __init__(self, mode : ApplicationMode, taskFilePath: str, launcherFilename: str, loggerLevel: str = None,
+                 taskQueueName: str = None, taskQueueBackend: str = 'directory', idleTimeout: float = None, readyTimeout: float = None):
         super().__init__()
         self.mode = mode
         self.taskFilePath = taskFilePath
@@ -79,18 +67,38 @@ class Bootstrapper(object):
 
         self.restartRequested = False
         self.updater = None
+        self.app = None
 
-        dbInitTimeout = None
+        # The ready timeout limits the database connection and the initialization. The database connection of the GUI is retried until quitting by default.
+        dbInitTimeout = readyTimeout
         if self.mode == ApplicationMode.GUI:
+            from PySide2.QtWidgets import QApplication
+            from LoaderWindow import LoaderWindow
+            # Do not remove the resources_qrc import. It loads the custom resources/icons for Qt.
+            import resources_qrc
+
             self.app = QApplication([])
             self.app.setAttribute(QtCore.Qt.AA_EnableHighDpiScaling)
             self.loaderWindow = LoaderWindow(self.app, self.appInfo, self.logger, self)
         elif self.mode == ApplicationMode.Console:
-            dbInitTimeout = 60.0
-            self.consoleApp = ConsoleApp(self.appInfo, self.serviceRegistry, taskFilePath=self.taskFilePath, initTimeout = 240.0)
+            if readyTimeout == None:
+                dbInitTimeout = 60.0
+
+            taskQueue = self.createTaskQueue(taskQueueBackend, taskQueueName) if taskQueueName else None
+            self.consoleApp = ConsoleApp(self.appInfo, self.serviceRegistry, taskFilePath=self.taskFilePath, 
+                                         initTimeout = readyTimeout if readyTimeout != None else 240.0,
+                                         taskQueue=taskQueue, idleTimeout=idleTimeout)
         
         QThreadPool.globalInstance().start(qt_util.LambdaTask(self.initDataBaseManager, dbInitTimeout))
 
+    def createTaskQueue(self, backend: str, name: str):
+        if backend == 'rabbitmq':
+            from task_queue.RabbitMQTaskQueue import RabbitMQTaskQueue
+            return RabbitMQTaskQueue(config.RABBIT_MQ_HOST, name, username=config.RABBIT_MQ_USERNAME, password=config.RABBIT_MQ_PASSWORD)
+
+        from task_queue.DirectoryTaskQueue import DirectoryTaskQueue
+        return DirectoryTaskQueue(name)
+
     def requestRestart(self):
         self.restartRequested = True
         self.mainWindowManager.close()
@@ -161,39 +169,62 @@ class Bootstrapper(object):
         self.logger = logging.getLogger(__name__)
 
     def initDataBaseManager(self, timeout=None):
-        connected = False
-        self.dbManager = MongoDBManager(self.mongodbHost, self.dbName)
-
-        tStart = time.time()
-        while not connected and (timeout == None or time.time() - tStart < timeout) and not self.appInfo.applicationQuitting:
-            self.logger.info("Connecting to database...")
-
-            try:
-                self.dbManager.connect()
-                self.logger.info("Connected.")
-                connected = True
-            except Exception as e:
-                if self.appInfo.applicationQuitting:
-                    return
-
-                print(f"Error: {str(e)}")
-                sleep(2)
-                self.logger.info("Failed to connect. Retrying...")
-                sleep(1)
-                continue
+        with phase('initDataBaseManager'):
+            connected = self.connectToDataBase(timeout)
 
         if not connected:
-            qt_util.runInMainThread(self.onDBManagerConnectionTimeout)
+            if not self.appInfo.applicationQuitting:
+                self.logger.error(f'Failed to connect to the database within {timeout}s.')
+                self.onDBManagerConnectionTimeout()
             return
         
-        self.onDBManagerConnected()
+        try:
+            self.onDBManagerConnected()
+        except Exception as e:
+            self.logger.error(f'Initialization failed: {str(e)}')
+            # Wakes up the console app instead of letting it wait for the ready timeout:
+            if self.mode == ApplicationMode.Console:
+                self.appInfo.applicationQuitting = True
+            else:
+                raise
+
+    def connectToDataBase(self, timeout=None) -> bool:
+        # Bounds each connection attempt of the retries:
+        self.dbManager = MongoDBManager(mongodb_util.withServerSelectionTimeout(self.mongodbHost), self.dbName)
+        self.logger.info("Connecting to database...")
+
+        # Retries are aborted as soon as the application quits:
+        connected = mongodb_util.connectWithRetry(self.dbManager, timeout, waitFunction=self.appInfo.waitForQuit)
+        if connected:
+            self.logger.info("Connected.")
+
+        return connected
 
     def onDBManagerConnectionTimeout(self):
+        if self.mode == ApplicationMode.Console:
+            self.appInfo.applicationQuitting = True
+        else:
+            qt_util.runInMainThread(self.quitAfterConnectionTimeout)
+
+    def quitAfterConnectionTimeout(self):
         if self.app:
             self.shutdown()
             self.app.quit()
 
+    def getAppDataDirectory(self):
+        appDataDir = QtCore.QStandardPaths.writableLocation(QtCore.QStandardPaths.GenericDataLocation)
+        return os.path.join(appDataDir, self.appInfo.company or '', self.appInfo.appName or 'MetadataManager')
+
     def initServices(self):
+        from VisualScriptingExtensions.ExtendedVisualScripting import ExtendedVisualScripting
+        from VisualScriptingExtensions.CodeGenerator import CodeGenerator
+        import VisualScriptingExtensions.mongodb_nodes
+        import VisualScriptingExtensions.document_action_nodes
+        import VisualScriptingExtensions.action_nodes
+        import VisualScriptingExtensions.versioning_nodes
+        import VisualScriptingExtensions.third_party_extensions.deadline_nodes
+        import VisualScriptingExtensions.environment_nodes
+
         self.serviceRegistry.deadlineService = DeadlineService(None)
         self.serviceRegistry.services.append(self.serviceRegistry.deadlineService)
 
@@ -226,35 +257,61 @@ class Bootstrapper(object):
         self.serviceRegistry.services.append(self.serviceManager)
         self.serviceManager.registerServiceClass(WatchDogService)
 
+        self.serviceRegistry.fileExistenceCache = FileExistenceCache()
+        self.serviceRegistry.services.append(self.serviceRegistry.fileExistenceCache)
+
+        if self.mode == ApplicationMode.GUI:
+            from file_cache.ThumbnailCache import ThumbnailCache
+            self.serviceRegistry.thumbnailCache = ThumbnailCache(os.path.join(self.getAppDataDirectory(), 'thumbnails'))
+            self.serviceRegistry.services.append(self.serviceRegistry.thumbnailCache)
+
         self.fileHandlerManager = FileHandlerManager()
         self.serviceRegistry.fileHandlerManager = self.fileHandlerManager
         self.serviceRegistry.services.append(self.fileHandlerManager)
 
         pluginFolder = os.path.join(os.path.dirname(os.path.realpath(__file__)), "plugins")
         privatePluginFolder = os.path.join(os.path.dirname(os.path.realpath(__file__)), "private", "plugins")
-        self.serviceRegistry.pluginManager = PluginManager([pluginFolder, privatePluginFolder], self.serviceRegistry, self.appInfo)
+        self.serviceRegistry.pluginManager = PluginManager([pluginFolder, privatePluginFolder], self.serviceRegistry, self.appInfo,
+                                                           manifestFilename=os.path.join(self.getAppDataDirectory(), 'plugin_manifest.json'))
         self.serviceRegistry.services.append(self.serviceRegistry.pluginManager)
 
-        visualScriptingSaveDataFolder = os.path.join(os.path.dirname(os.path.realpath(__file__)), "VisualScripting_SaveData")
-        visualScriptingPrivateSaveDataFolder = os.path.join(os.path.dirname(os.path.realpath(__file__)), "private", "VisualScripting_SaveData")
-        self.serviceRegistry.visualScripting = ExtendedVisualScripting([visualScriptingSaveDataFolder, visualScriptingPrivateSaveDataFolder], self.serviceRegistry.actionManager, 
-                                                                       self.serviceRegistry.documentFilterManager,
-                                                                       self.serviceRegistry.codeGenerator)
-        self.serviceRegistry.services.append(self.serviceRegistry.visualScripting)
+        with phase('visual scripting registration'):
+            # The Photoshop nodes depend on COM and are only available on Windows:
+            if sys.platform == 'win32':
+                import VisualScriptingExtensions.third_party_extensions.photoshop_nodes
+
+            visualScriptingSaveDataFolder = os.path.join(os.path.dirname(os.path.realpath(__file__)), "VisualScripting_SaveData")
+            visualScriptingPrivateSaveDataFolder = os.path.join(os.path.dirname(os.path.realpath(__file__)), "private", "VisualScripting_SaveData")
+            self.serviceRegistry.visualScripting = ExtendedVisualScripting([visualScriptingSaveDataFolder, visualScriptingPrivateSaveDataFolder], self.serviceRegistry.actionManager, 
+                                                                           self.serviceRegistry.documentFilterManager,
+                                                                           self.serviceRegistry.codeGenerator)
+            self.serviceRegistry.services.append(self.serviceRegistry.visualScripting)
 
     def onDBManagerConnected(self):
         self.initHostProcessController()
 
-        self.initServices()
-        self.load()
+        with phase('initServices'):
+            self.initServices()
+
+        with phase('load'):
+            self.load()
+
         self.appInfo.initialized = True
 
         if self.mode == ApplicationMode.GUI:
             qt_util.runInMainThread(self.loaderWindow.hide)
             qt_util.runInMainThread(self.setupMainWindowManager)
             qt_util.runInMainThread(self.setupUpdater)
+        else:
+            self.finishStartupProfile()
+
+    def finishStartupProfile(self):
+        if PROFILER.enabled:
+            PROFILER.disable()
+            print(PROFILER.report())
     
     def setupUpdater(self):
+        from updater.Updater import Updater
         self.updater = Updater(self.launcherFilename, self, self.mainWindowManager.window) if self.launcherFilename else None
 
     def initHostProcessController(self):
@@ -269,27 +326,30 @@ class Bootstrapper(object):
             qt_util.runInMainThread(self.mainWindowManager.close)
 
     def setupMainWindowManager(self):
-        self.mainWindowManager = MainWindowManager(self.app, self.appInfo, self.serviceRegistry, self)
-        self.serviceRegistry.mainWindowManager = self.mainWindowManager
+        with phase('setupMainWindowManager'):
+            from MainWindowManager import MainWindowManager
+            self.mainWindowManager = MainWindowManager(self.app, self.appInfo, self.serviceRegistry, self)
+            self.serviceRegistry.mainWindowManager = self.mainWindowManager
         
         settings = QtCore.QSettings(self.appInfo.company, self.appInfo.appName)
-        self.serviceRegistry.pluginManager.load(settings, self.dbManager)
-        self.mainWindowManager.pluginManagerViewer.loadPluginsFolders()
-        self.serviceRegistry.visualScripting.load(settings, self.dbManager)
+        with phase('plugin load'):
+            self.serviceRegistry.pluginManager.load(settings, self.dbManager)
+            self.mainWindowManager.pluginManagerViewer.loadPluginsFolders()
+
+        with phase('visual scripting load'):
+            self.serviceRegistry.visualScripting.load(settings, self.dbManager)
 
         self.mainWindowManager.show()
+        self.finishStartupProfile()
 
     def load(self, settings = None):
         if settings == None:
             settings = QtCore.QSettings(self.appInfo.company, self.appInfo.appName)
         
         for service in self.serviceRegistry.services:
-            # Skip PluginManager if in GUI mode. It will be loaded after the main window manager is initialized.
+            # Skip PluginManager and the visual scripting if in GUI mode. They are loaded after the main window manager is initialized.
             if self.mode == ApplicationMode.GUI:
-                if isinstance(service, PluginManager):
-                    continue
-
-                if isinstance(service, ExtendedVisualScripting):
+                if service is self.serviceRegistry.pluginManager or service is self.serviceRegistry.visualScripting:
                     continue
 
             try:
@@ -299,7 +359,8 @@ class Bootstrapper(object):
                 hasLoadFunc = False
 
             if hasLoadFunc:
-                service.load(settings, self.dbManager)
+                with phase(f'load {type(service).__name__}'):
+                    service.load(settings, self.dbManager)
 
     def save(self, settings = None):
         if self.appInfo.mode == ApplicationMode.Console:
@@ -1,10 +1,39 @@
 from ServiceRegistry import ServiceRegistry
 from AppInfo import AppInfo
+from task_queue.TaskQueue import TaskQueue, TaskQueueEntry
+import threading
+import traceback
 import time
 import logging
 
+class TaskThreadFilter(logging.Filter):
+    """Only passes the records logged by the thread of a task.
+    """
+    def __init__(self, threadId: int) -> None:
+        super().__init__()
+
+        self.threadId = threadId
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.thread == self.threadId
+
+class TaskErrorCounter(logging.Handler):
+    """Counts the errors logged by the thread of a task.
+    """
+    def __init__(self, threadId: int) -> None:
+        super().__init__(level=logging.ERROR)
+
+        self.addFilter(TaskThreadFilter(threadId))
+        self.errorCount = 0
+
+    def emit(self, record: logging.LogRecord):
+        self.errorCount += 1
+
 class ConsoleApp(object):
-    def __init__(self, appInfo: AppInfo, serviceRegistry: ServiceRegistry, taskFilePath=None, initTimeout = 10.0):
+    # The task queue is kept alive (e.g. leases renewed, heartbeats serviced) at this interval while a task is processed:
+    keepAliveIntervalInSeconds = 10.0
+
+    def __init__(self, appInfo: AppInfo, serviceRegistry: ServiceRegistry, taskFilePath=None, initTimeout = 10.0, taskQueue: TaskQueue = None, idleTimeout: float = None):
         super().__init__()
 
         self.logger = logging.getLogger(__name__)
@@ -12,18 +41,21 @@ class ConsoleApp(object):
         self.serviceRegistry = serviceRegistry
         self.taskFilePath = taskFilePath
         self.initTimeout = initTimeout
+        # Worker mode: the tasks of the queue are processed until the application quits or the queue is idle for idleTimeout seconds.
+        self.taskQueue = taskQueue
+        self.idleTimeout = idleTimeout
 
     def exec(self):
-        tStart = time.time()
         # Wait for initialization completion:
-        while not self.appInfo.initialized and not self.appInfo.applicationQuitting:
-            if self.initTimeout and (time.time() - tStart > self.initTimeout):
-                self.logger.error('Timeout.')
-                self.appInfo.applicationQuitting = True
-                return 1
+        if not self.appInfo.waitForInitialization(self.initTimeout) and not self.appInfo.applicationQuitting:
+            self.logger.error('Timeout.')
+            self.appInfo.applicationQuitting = True
+            return 1
 
         if self.appInfo.initialized:
-            if self.taskFilePath:
+            if self.taskQueue:
+                return self.processTaskQueue()
+            elif self.taskFilePath:
                 self.serviceRegistry.taskProcessor.processTaskFromJsonFile(self.taskFilePath)
             else:
                 self.logger.warn("Please provide a task when starting in console mode.")
@@ -34,3 +66,85 @@ class ConsoleApp(object):
 
 
         return 0
+
+    def processTaskQueue(self):
+        self.logger.info(f'Waiting for tasks of {self.taskQueue}...')
+        processedCount = 0
+        failedCount = 0
+        lastTaskTime = time.time()
+
+        try:
+            while not self.appInfo.applicationQuitting:
+                entry = self.taskQueue.get(timeout=1.0)
+                if entry == None:
+                    if self.idleTimeout and time.time() - lastTaskTime > self.idleTimeout:
+                        self.logger.info(f'No tasks within {self.idleTimeout}s.')
+                        break
+
+                    continue
+
+                succeeded = self.processQueuedTaskInThread(entry)
+                self.taskQueue.complete(entry, succeeded)
+
+                processedCount += 1
+                failedCount += 0 if succeeded else 1
+                lastTaskTime = time.time()
+        except KeyboardInterrupt:
+            self.logger.info('Interrupted.')
+        finally:
+            self.taskQueue.close()
+
+        self.logger.info(f'Processed {processedCount} tasks, {failedCount} failed.')
+
+        return 0
+
+    def processQueuedTaskInThread(self, entry: TaskQueueEntry) -> bool:
+        """Processes the task on a worker thread. The task queue is only used by this thread, which keeps it alive until the task finished.
+        """
+        result = [False]
+        taskThread = threading.Thread(target=lambda: result.__setitem__(0, self.processQueuedTask(entry)), name=f'Task {entry.name}', daemon=True)
+        taskThread.start()
+        while True:
+            taskThread.join(self.keepAliveIntervalInSeconds)
+            if not taskThread.is_alive():
+                break
+
+            self.taskQueue.keepAlive(entry)
+
+        return result[0]
+
+    def processQueuedTask(self, entry: TaskQueueEntry) -> bool:
+        """Processes the task with its own log file. Errors of the task are logged and don't stop the worker.
+        The task processor logs some failures instead of raising, so errors logged by the task thread also fail the task.
+        """
+        rootLogger = logging.getLogger()
+        logHandler = logging.FileHandler(self.taskQueue.getLogFilename(entry))
+        if len(rootLogger.handlers) > 0:
+            logHandler.setFormatter(rootLogger.handlers[0].formatter)
+
+        # Other tasks and the worker itself don't log into the file of this task:
+        logHandler.addFilter(TaskThreadFilter(threading.get_ident()))
+
+        errorCounter = TaskErrorCounter(threading.get_ident())
+        rootLogger.addHandler(logHandler)
+        rootLogger.addHandler(errorCounter)
+        tStart = time.time()
+        try:
+            self.logger.info(f'Processing task {entry.name}...')
+            if self.serviceRegistry.taskProcessor.processTaskFromJsonFile(entry.taskFilePath) == False:
+                self.logger.error(f'Task {entry.name} failed.')
+                return False
+
+            if errorCounter.errorCount > 0:
+                self.logger.error(f'Task {entry.name} failed: {errorCounter.errorCount} errors were logged.')
+                return False
+
+            self.logger.info(f'Finished task {entry.name} in {time.time() - tStart:.2f}s.')
+            return True
+        except Exception as e:
+            self.logger.error(f'Task {entry.name} failed: {str(e)}\n{traceback.format_exc()}')
+            return False
+        finally:
+            rootLogger.removeHandler(errorCounter)
+            rootLogger.removeHandler(logHandler)
+            logHandler.close()
@@ -0,0 +1,180 @@
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Callable, Iterable, List
+from enum import Enum
+import threading
+import logging
+import time
+import os
+
+logger = logging.getLogger(__name__)
+
+class DocumentActionExecutionMode(Enum):
+    # Documents are processed one after another (default for all actions):
+    Serial = 0
+    # The action is thread-safe and documents are processed on a thread pool:
+    Threaded = 1
+
+def getExecutionMode(action) -> DocumentActionExecutionMode:
+    """Document actions declare how they can be executed with an optional executionMode property.
+    """
+    return getattr(action, 'executionMode', DocumentActionExecutionMode.Serial)
+
+def getExecutionWidth(action) -> int:
+    """Document actions can limit the number of parallel workers with an optional executionWidth property.
+    """
+    width = getattr(action, 'executionWidth', None)
+    return max(1, int(width)) if width else (os.cpu_count() or 1)
+
+class DocumentActionError(object):
+    def __init__(self, documentId, message: str) -> None:
+        super().__init__()
+
+        self.documentId = documentId
+        self.message = message
+
+    def __str__(self) -> str:
+        return f'{self.documentId}: {self.message}'
+
+class DocumentActionExecutionResult(object):
+    def __init__(self) -> None:
+        super().__init__()
+
+        self.processedCount = 0
+        self.errors: List[DocumentActionError] = []
+        self.durationInSeconds = 0.0
+        self.cancelled = False
+
+    @property
+    def throughput(self) -> float:
+        """Processed documents per second.
+        """
+        return self.processedCount / self.durationInSeconds if self.durationInSeconds > 0.0 else 0.0
+
+    def __str__(self) -> str:
+        status = 'Cancelled' if self.cancelled else 'Finished'
+        return f'{status}: {self.processedCount} documents in {self.durationInSeconds:.1f}s ({self.throughput:.1f}/s), {len(self.errors)} errors'
+
+class DocumentActionExecutionEngine(object):
+    """Executes a document action on a stream of documents, serially or fanned out across a thread pool depending on the
+    execution mode of the action. Errors are collected per document instead of aborting the execution.
+    Cancellation is cooperative: no new documents are started after cancel() but running executions are finished.
+    Actions can prepare and clean up run state with optional beginDocumentExecution() and onDocumentExecutionFinished() methods,
+    both are called by execute() on the calling thread.
+    """
+    # Minimum time between progress callbacks:
+    progressIntervalInSeconds = 0.1
+
+    def __init__(self) -> None:
+        super().__init__()
+
+        self.cancelEvent = threading.Event()
+        self.lock = threading.Lock()
+        self.result: DocumentActionExecutionResult = None
+        self.progressCallback: Callable[[DocumentActionExecutionResult], None] = None
+        self.lastProgressTime = 0.0
+        self.startTime = 0.0
+
+    def cancel(self):
+        self.cancelEvent.set()
+
+    @property
+    def isCancelled(self) -> bool:
+        return self.cancelEvent.is_set()
+
+    def execute(self, action, documents: Iterable[dict], actionArgs=(), progressCallback: Callable[[DocumentActionExecutionResult], None] = None) -> DocumentActionExecutionResult:
+        self.cancelEvent.clear()
+        self.result = DocumentActionExecutionResult()
+        self.progressCallback = progressCallback
+        self.startTime = time.time()
+
+        mode = getExecutionMode(action)
+        try:
+            beginDocumentExecution = getattr(action, 'beginDocumentExecution', None)
+            if beginDocumentExecution:
+                beginDocumentExecution()
+
+            try:
+                self.executeInMode(mode, action, documents, actionArgs)
+            finally:
+                onDocumentExecutionFinished = getattr(action, 'onDocumentExecutionFinished', None)
+                if onDocumentExecutionFinished:
+                    onDocumentExecutionFinished()
+        except Exception as e:
+            logger.error(f'Execution of {action.displayName} failed: {str(e)}')
+            self.result.errors.append(DocumentActionError(None, str(e)))
+
+        self.result.cancelled = self.isCancelled
+        self.reportProgress(force=True)
+
+        return self.result
+
+    def executeInMode(self, mode: DocumentActionExecutionMode, action, documents: Iterable[dict], actionArgs):
+        if mode == DocumentActionExecutionMode.Threaded:
+            with ThreadPoolExecutor(max_workers=getExecutionWidth(action), thread_name_prefix='DocumentAction') as executor:
+                self.executeOnPool(executor, lambda document: executor.submit(action.execute, document, *actionArgs), action, documents)
+        else:
+            self.executeSerially(action, documents, actionArgs)
+
+    def executeSerially(self, action, documents: Iterable[dict], actionArgs):
+        for document in documents:
+            if self.isCancelled:
+                break
+
+            try:
+                action.execute(document, *actionArgs)
+            except Exception as e:
+                self.onDocumentFailed(action, document, e)
+
+            self.onDocumentProcessed()
+
+    def executeOnPool(self, executor, submit, action, documents: Iterable[dict]):
+        # Limits the number of queued documents to keep the memory bounded for big document streams:
+        maxPendingCount = getExecutionWidth(action) * 2
+        pendingFutures = dict()
+
+        def processFinishedFutures(futures):
+            for future in futures:
+                document = pendingFutures.pop(future)
+                exception = future.exception()
+                if exception:
+                    self.onDocumentFailed(action, document, exception)
+
+                self.onDocumentProcessed()
+
+        for document in documents:
+            if self.isCancelled:
+                break
+
+            pendingFutures[submit(document)] = document
+
+            if len(pendingFutures) >= maxPendingCount:
+                done, _ = wait(pendingFutures.keys(), return_when=FIRST_COMPLETED)
+                processFinishedFutures(done)
+
+        if self.isCancelled:
+            for future in list(pendingFutures.keys()):
+                if future.cancel():
+                    pendingFutures.pop(future)
+
+        done, _ = wait(pendingFutures.keys())
+        processFinishedFutures(done)
+
+    def onDocumentFailed(self, action, document: dict, exception: Exception):
+        documentId = document.get('_id')
+        logger.error(f'Execution of {action.displayName} on document {documentId} failed: {str(exception)}')
+        with self.lock:
+            self.result.errors.append(DocumentActionError(documentId, str(exception)))
+
+    def onDocumentProcessed(self):
+        with self.lock:
+            self.result.processedCount += 1
+
+        self.reportProgress()
+
+    def reportProgress(self, force=False):
+        now = time.time()
+        self.result.durationInSeconds = now - self.startTime
+
+        if self.progressCallback and (force or now - self.lastProgressTime >= self.progressIntervalInSeconds):
+            self.lastProgressTime = now
+            self.progressCallback(self.result)
@@ -180,7 +180,7 @@ class MainWindowManager(QtCore.QObject):
         self.collectionViewer.connectCollectionSelectionUpdateHandler(self.updateTableModelHeader)
         self.collectionViewer.headerUpdatedEvent.subscribe(self.updateTableModelHeader)
 
-        self.previewViewer = PreviewViewer(self.window)
+        self.previewViewer = PreviewViewer(self.window, self.serviceRegistry.fileExistenceCache, self.serviceRegistry.thumbnailCache)
         self.environmentManagerViewer = EnvironmentManagerViewer(self.window, self.serviceRegistry.environmentManager, 
                                                                  self.serviceRegistry.dbManager)
         self.inspector = Inspector(self.window, self.serviceRegistry.dbManager, self.collectionViewer)
@@ -191,7 +191,7 @@ class MainWindowManager(QtCore.QObject):
 
         self.documentSearchFilterViewer = DocumentSearchFilterViewer(self.appInfo, self.window, self.dbManager, 
                                                                      self.serviceRegistry.documentFilterManager, 
-                                                                     self.tableModel, self.collectionViewer)
+                                                                     self.tableModel, self.collectionViewer, self.serviceRegistry.fileExistenceCache)
         self.window.documentSearchFilterFrame.layout().addWidget(self.documentSearchFilterViewer.widget)
 
         self.serviceManagerViewer = ServiceManagerViewer(self.window, self.serviceRegistry)
@@ -288,6 +288,14 @@ class MainWindowManager(QtCore.QObject):
         for rowIdx in self.window.tableView.selectionModel().selectedRows():
             yield self.tableModel.getUID(rowIdx.row())
 
+    @property
+    def isPartialSelectAll(self) -> bool:
+        """True if all loaded rows are selected but the table has more (not yet fetched) rows. 
+        Selections only ever cover loaded rows, the remaining rows are not part of "Selected Items".
+        """
+        loadedCount = self.tableModel.rowCount(QtCore.QModelIndex())
+        return loadedCount > 0 and not self.tableModel.isFullyFetched and len(self.window.tableView.selectionModel().selectedRows()) == loadedCount
+
     def getFilteredDocuments(self):
         return self.documentSearchFilterViewer.getFilteredDocuments()
 
@@ -301,12 +309,14 @@ class MainWindowManager(QtCore.QObject):
             item = self.dbManager.findOneInCollections(uid, self.collectionViewer.getSelectedCollectionNames())
             if item != None:
                 self.previewViewer.showPreview(item.get(Keys.preview))
-                self.showItem(uid)
+                self.showItem(uid, item)
 
         self.window.selectedItemCountLabel.setText(f'Selected Count: {selectedCount}')
 
-    def showItem(self, uid: str):
-        itemDict = self.dbManager.findOneInCollections(uid, self.collectionViewer.getSelectedCollectionNames())
+    def showItem(self, uid: str, itemDict: dict = None):
+        # The document can be passed if it was already retrieved:
+        if itemDict == None:
+            itemDict = self.dbManager.findOneInCollections(uid, self.collectionViewer.getSelectedCollectionNames())
 
         if not itemDict:
             self.inspector.showDictionary({})
@@ -455,7 +465,8 @@ class MainWindowManager(QtCore.QObject):
         self.window.removeEventFilter(self)
         self.appInfo.applicationQuitting = True
         logger.info("Quitting application...")
-        
+
+        self.documentSearchFilterViewer.shutdown()
         self.bootstrapper.shutdown()
         self.app.quit()
 
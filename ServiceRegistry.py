@@ -8,9 +8,16 @@ from MetadataManagerCore.mongodb_manager import MongoDBManager
 from MetadataManagerCore.third_party_integrations.deadline.deadline_service import DeadlineService
 from MetadataManagerCore.actions.ActionManager import ActionManager
 from MetadataManagerCore.environment.EnvironmentManager import EnvironmentManager
-from VisualScriptingExtensions.CodeGenerator import CodeGenerator
-from VisualScriptingExtensions.ExtendedVisualScripting import ExtendedVisualScripting
 from MetadataManagerCore.task_processor.TaskProcessor import TaskProcessor
+from file_cache.FileExistenceCache import FileExistenceCache
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    # Only available in GUI mode:
+    from file_cache.ThumbnailCache import ThumbnailCache
+    # Imported by the bootstrapper when the services are initialized:
+    from VisualScriptingExtensions.CodeGenerator import CodeGenerator
+    from VisualScriptingExtensions.ExtendedVisualScripting import ExtendedVisualScripting
 
 class ServiceRegistry(object):
     def __init__(self):
@@ -22,13 +29,15 @@ class ServiceRegistry(object):
         self.dbManager : MongoDBManager = None
         self.actionManager : ActionManager = None
         self.environmentManager : EnvironmentManager = None
-        self.codeGenerator : CodeGenerator = None
+        self.codeGenerator : 'CodeGenerator' = None
         self.deadlineService : DeadlineService= None
-        self.visualScripting : ExtendedVisualScripting = None
+        self.visualScripting : 'ExtendedVisualScripting' = None
         self.taskProcessor : TaskProcessor = None
         self.documentFilterManager : DocumentFilterManager = None
         self.serviceManager : ServiceManager = None
         self.fileHandlerManager : FileHandlerManager = None
         self.hostProcessController : HostProcessController = None
+        self.fileExistenceCache : FileExistenceCache = None
+        self.thumbnailCache : 'ThumbnailCache' = None
         self.mainWindowManager = None
         self.pluginManager: PluginManager = None
\ No newline at end of file
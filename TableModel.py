@@ -1,6 +1,12 @@
 from MetadataManagerCore.Event import Event
 from PySide2 import QtCore, QtWidgets
+from PySide2.QtCore import QThreadPool
+from qt_extensions import qt_util
 import operator
+import itertools
+import logging
+
+logger = logging.getLogger(__name__)
 
 class TableModel(QtCore.QAbstractTableModel):
     def __init__(self, parent, entries, header, displayedKeys, *args):
@@ -10,6 +16,20 @@ class TableModel(QtCore.QAbstractTableModel):
         self.displayedKeys = displayedKeys
         self.cellColorFunction = None
 
+        # Iterator of not yet fetched entries. None if all entries are fetched.
+        self.entrySource = None
+        self.fetchBatchSize = 2000
+        # Batches are pulled from the entry source on the thread pool so slow queries don't block the GUI thread:
+        self.fetchInProgress = False
+        # Incremented whenever the entries are replaced. Results of fetches for older entry sources are dropped.
+        self.entrySourceGeneration = 0
+        # Called with the error message if the entry source failed, e.g. because the database cursor expired:
+        self.onFetchFailed = Event()
+
+        # Optional function(key: str, order: QtCore.Qt.SortOrder) -> bool that sorts the entries on the database side
+        # and replaces the entry source. Returns False if the sort could not be performed by the database.
+        self.sortFunction = None
+
         self.onSort = Event()
 
     def getUID(self, rowIdx):
@@ -19,7 +39,7 @@ class TableModel(QtCore.QAbstractTableModel):
         return len(self.entries)
 
     def columnCount(self, parent):
-        return len(self.entries[0]) - 1 if len(self.entries) > 0 else 0 
+        return len(self.entries[0]) - 1 if len(self.entries) > 0 else len(self.header)
 
     def data(self, index, role):
         if not index.isValid():
@@ -38,24 +58,121 @@ class TableModel(QtCore.QAbstractTableModel):
         return None
 
     def sort(self, col, order):
-        # Sort table by given column number col
+        if self.sortFunction and col >= 0 and col < len(self.displayedKeys):
+            if self.sortFunction(self.displayedKeys[col], order):
+                self.onSort()
+                return
+
+        self.sortInMemory(col, order)
+
+    def sortInMemory(self, col, order):
+        # Sort table by given column number col. All entries must be fetched for an in-memory sort, 
+        # so the remaining entries are fetched and sorted on the thread pool:
+        if self.fetchInProgress:
+            return
+
+        self.fetchInProgress = True
+        QThreadPool.globalInstance().start(qt_util.LambdaTask(self.sortInBackground, list(self.entries), self.entrySource, col, order, self.entrySourceGeneration))
+
+    def sortInBackground(self, entries, entrySource, col, order, generation):
+        errorMessage = None
+        if entrySource != None:
+            try:
+                entries.extend(entrySource)
+            except Exception as e:
+                errorMessage = str(e)
+
+        try:
+            entries.sort(key=operator.itemgetter(col + 1), reverse=order == QtCore.Qt.DescendingOrder)
+        except Exception as e:
+            errorMessage = str(e)
+
+        qt_util.runInMainThread(self.onSortedInBackground, entries, generation, errorMessage)
+
+    def onSortedInBackground(self, entries, generation, errorMessage):
+        if generation != self.entrySourceGeneration:
+            return
+
+        self.fetchInProgress = False
+        if errorMessage:
+            self.reportFetchError(errorMessage)
+            return
+
         self.emit(QtCore.SIGNAL("layoutAboutToBeChanged()"))
-        self.entries = sorted(self.entries, key=operator.itemgetter(col + 1))
-        if order == QtCore.Qt.DescendingOrder:
-            self.entries.reverse()
+        self.entries = entries
+        self.entrySource = None
         self.emit(QtCore.SIGNAL("layoutChanged()"))
 
         self.onSort()
 
+    def reportFetchError(self, errorMessage: str):
+        logger.error(f'Failed to fetch table entries. Reason: {errorMessage}')
+        self.onFetchFailed(errorMessage)
+
     def addEntry(self, entry):
-        self.emit(QtCore.SIGNAL("layoutAboutToBeChanged()"))
-        self.entries.append(entry)
-        self.emit(QtCore.SIGNAL("layoutChanged()"))
+        self.addEntries([entry])
 
     def addEntries(self, entries):
-        self.emit(QtCore.SIGNAL("layoutAboutToBeChanged()"))
+        if len(entries) == 0:
+            return
+
+        self.beginInsertRows(QtCore.QModelIndex(), len(self.entries), len(self.entries) + len(entries) - 1)
         self.entries.extend(entries)
-        self.emit(QtCore.SIGNAL("layoutChanged()"))
+        self.endInsertRows()
+
+    """
+    Replaces all entries with the given initial entries. Further entries are pulled lazily from entrySource
+    in batches of fetchBatchSize as the view scrolls (see canFetchMore/fetchMore).
+    """
+    def setEntrySource(self, entrySource, initialEntries = None):
+        self.beginResetModel()
+        self.resetEntrySource()
+        self.entries = list(initialEntries) if initialEntries else []
+        self.entrySource = iter(entrySource) if entrySource != None else None
+        self.endResetModel()
+
+    def resetEntrySource(self):
+        self.entrySource = None
+        self.fetchInProgress = False
+        self.entrySourceGeneration += 1
+
+    @property
+    def isFullyFetched(self) -> bool:
+        return self.entrySource == None
+
+    def canFetchMore(self, parent):
+        return not parent.isValid() and self.entrySource != None and not self.fetchInProgress
+
+    def fetchMore(self, parent):
+        if parent.isValid() or self.entrySource == None or self.fetchInProgress:
+            return
+
+        self.fetchInProgress = True
+        QThreadPool.globalInstance().start(qt_util.LambdaTask(self.fetchBatch, self.entrySource, self.entrySourceGeneration))
+
+    def fetchBatch(self, entrySource, generation):
+        errorMessage = None
+        try:
+            batch = list(itertools.islice(entrySource, self.fetchBatchSize))
+        except Exception as e:
+            errorMessage = str(e)
+            batch = []
+
+        qt_util.runInMainThread(self.onBatchFetched, batch, generation, errorMessage)
+
+    def onBatchFetched(self, batch, generation, errorMessage):
+        if generation != self.entrySourceGeneration:
+            return
+
+        self.fetchInProgress = False
+        if errorMessage or len(batch) < self.fetchBatchSize:
+            self.entrySource = None
+
+        self.addEntries(batch)
+
+        # The remaining entries can't be fetched anymore, e.g. because the cursor expired. The user has to search again.
+        if errorMessage:
+            self.reportFetchError(errorMessage)
 
     """
     The heaeder won't be updated if the current header is equal to the new given header (order and value comparison).
@@ -63,18 +180,20 @@ class TableModel(QtCore.QAbstractTableModel):
     """
     def updateHeader(self, header, displayedKeys):
         if self.header != header:
-            self.emit(QtCore.SIGNAL("layoutAboutToBeChanged()"))
+            self.beginResetModel()
             self.displayedKeys = displayedKeys
             self.entries = []
+            self.resetEntrySource()
             self.header = header
-            self.emit(QtCore.SIGNAL("layoutChanged()"))
+            self.endResetModel()
 
     def clear(self):
-        if len(self.entries) > 0:
-            self.emit(QtCore.SIGNAL("layoutAboutToBeChanged()"))
+        if len(self.entries) > 0 or self.entrySource != None:
+            self.beginResetModel()
             self.entries = []
-            self.emit(QtCore.SIGNAL("layoutChanged()"))
+            self.resetEntrySource()
+            self.endResetModel()
 
     def update(self):
         self.emit(QtCore.SIGNAL("layoutAboutToBeChanged()"))
-        self.emit(QtCore.SIGNAL("layoutChanged()"))
\ No newline at end of file
+        self.emit(QtCore.SIGNAL("layoutChanged()"))
@@ -4,9 +4,8 @@ from VisualScriptingExtensions.document_action_nodes import DocumentActionNode
 from VisualScriptingExtensions.action_nodes import ActionNode
 from MetadataManagerCore.actions.DocumentAction import DocumentAction
 from MetadataManagerCore.actions.Action import Action
+from VisualScriptingExtensions import GraphModuleCache
 import os
-import sys
-import importlib
 from MetadataManagerCore.actions.ActionManager import ActionManager
 from MetadataManagerCore.filtering.DocumentFilterManager import DocumentFilterManager
 from MetadataManagerCore.filtering.DocumentFilter import DocumentFilter
@@ -22,6 +21,14 @@ class CodeGenerator(code_generator.CodeGenerator):
         srcFile.write(code_generator.makeCodeLine(codeLine, indent) + suffix)
 
     def generatePythonCode(self, graph, graphName, startNode, moduleName, targetFolder):
+        graphHash = GraphModuleCache.getGraphHash(graph)
+        moduleInfo = self.loadUpToDateModuleInfo(graphHash, startNode, moduleName, targetFolder)
+        if moduleInfo != None:
+            # Unchanged graphs are neither regenerated nor reloaded:
+            srcFilePath = os.path.join(targetFolder, f'{moduleName}.py')
+            GraphModuleCache.registerLazyModule(self.actionManager, self.documentFilterManager, moduleName, srcFilePath, moduleInfo)
+            return srcFilePath
+
         srcFilePath = super().generatePythonCode(graph, graphName, startNode, moduleName, targetFolder)
 
         if isinstance(startNode, DocumentActionNode) or isinstance(startNode, ActionNode):
@@ -70,19 +77,14 @@ class CodeGenerator(code_generator.CodeGenerator):
                 runsOnMainThread = startNode.runsOnMainThread == True
                 self.writeCodeLine(srcFile, f"return {'True' if runsOnMainThread else 'False'}", code_generator.DEFAULT_INDENT*2)
 
-            pythonFileDir = os.path.dirname(srcFilePath)
-
-            if not pythonFileDir in sys.path:
-                sys.path.append(pythonFileDir)
-
-            execModule = importlib.import_module(moduleName)
-            importlib.reload(execModule)
+            execModule = GraphModuleCache.importModule(moduleName, srcFilePath)
             docAction = execModule.ActionVS()
 
             if self.actionManager.isActionIdRegistered(docAction.id):
                 self.actionManager.unregisterActionId(docAction.id)
 
             self.actionManager.registerAction(docAction)
+            GraphModuleCache.saveActionModuleInfo(srcFilePath, docAction, graphHash)
         elif isinstance(startNode, DocumentFilterNode):
             with open(srcFilePath, "a+") as srcFile:
                 srcFile.write("\n")
@@ -90,14 +92,21 @@ class CodeGenerator(code_generator.CodeGenerator):
                 srcFile.write(f"HAS_STRING_ARG = {startNode.hasStringArg}\n")
                 srcFile.write(f"UNIQUE_LABEL_NAME = {startNode.uniqueLabelName}\n")
 
-            pythonFileDir = os.path.dirname(srcFilePath)
-
-            if not pythonFileDir in sys.path:
-                sys.path.append(pythonFileDir)
-                
-            execModule = importlib.import_module(moduleName)
-            importlib.reload(execModule)
+            execModule = GraphModuleCache.importModule(moduleName, srcFilePath)
 
             self.documentFilterManager.addFilter(DocumentFilter(execModule.execute, execModule.UNIQUE_LABEL_NAME, hasStringArg=execModule.HAS_STRING_ARG))
+            GraphModuleCache.saveDocumentFilterModuleInfo(srcFilePath, execModule, graphHash)
+
+        return srcFilePath
+
+    def loadUpToDateModuleInfo(self, graphHash: str, startNode, moduleName: str, targetFolder: str) -> dict:
+        """Returns the module info if the code of the action or filter graph was generated from the same graph before, otherwise None.
+        """
+        if graphHash == None or not isinstance(startNode, (DocumentActionNode, ActionNode, DocumentFilterNode)):
+            return None
+
+        moduleInfo = GraphModuleCache.loadModuleInfo(os.path.join(targetFolder, f'{moduleName}.py'))
+        if moduleInfo == None or moduleInfo.get('graphHash') != graphHash:
+            return None
 
-        return srcFilePath
\ No newline at end of file
+        return moduleInfo
\ No newline at end of file
@@ -1,10 +1,10 @@
 from MetadataManagerCore.filtering.DocumentFilterManager import DocumentFilterManager
 from MetadataManagerCore.filtering.DocumentFilter import DocumentFilter
 from VisualScripting.VisualScripting import VisualScripting
-import sys
-import os
-import importlib
+from VisualScriptingExtensions import GraphModuleCache
 from MetadataManagerCore.actions.ActionManager import ActionManager
+from PySide2.QtCore import QThreadPool
+from qt_extensions import qt_util
 import logging
 
 class ExtendedVisualScripting(VisualScripting):
@@ -17,26 +17,35 @@ class ExtendedVisualScripting(VisualScripting):
 
     def registerNodeClasses(self):
         allGraphSettings = self.graphManager.retrieveAvailableGraphSettings()
+        lazyPythonFiles = []
 
         for graphSettings in allGraphSettings:
             moduleName = self.graphManager.getModuleNameFromGraphName(graphSettings.name)
             pythonFile = self.graphManager.getPythonCodePath(graphSettings)
-            pythonFileDir = os.path.dirname(pythonFile)
 
-            if not pythonFileDir in sys.path:
-                sys.path.append(pythonFileDir)
+            # Modules with up to date module info are only imported on their first execution:
+            moduleInfo = GraphModuleCache.loadModuleInfo(pythonFile)
+            if moduleInfo != None:
+                try:
+                    GraphModuleCache.registerLazyModule(self.actionManager, self.documentFilterManager, moduleName, pythonFile, moduleInfo)
+                    lazyPythonFiles.append(pythonFile)
+                except Exception as e:
+                    self.logger.error(f'Failed to register {moduleName}. Reason: {str(e)}')
+
+                continue
 
             try:
-                execModule = importlib.import_module(moduleName)
-                importlib.reload(execModule)
+                execModule = GraphModuleCache.importModule(moduleName, pythonFile)
             except Exception as e:
                 self.logger.error(f'Failed to import {moduleName}. Reason: {str(e)}')
+                continue
             
             # Try to register action:
             try:
                 docAction = execModule.ActionVS()
                 try:
                     self.actionManager.registerAction(docAction)
+                    GraphModuleCache.saveActionModuleInfo(pythonFile, docAction)
                     continue
                 except Exception as e:
                     self.logger.error(f"Failed to register action {docAction.id}. Reason: {str(e)}")
@@ -46,10 +55,15 @@ class ExtendedVisualScripting(VisualScripting):
             # Try to add document filter:
             try:
                 self.documentFilterManager.addFilter(DocumentFilter(execModule.execute, execModule.UNIQUE_LABEL_NAME, hasStringArg=execModule.HAS_STRING_ARG))
+                GraphModuleCache.saveDocumentFilterModuleInfo(pythonFile, execModule)
                 continue
             except:
                 pass
 
+        # Makes sure the first execution of the lazily imported modules doesn't have to compile them:
+        if len(lazyPythonFiles) > 0:
+            QThreadPool.globalInstance().start(qt_util.LambdaTask(GraphModuleCache.compileModules, lazyPythonFiles))
+
     def load(self, settings, dbManager):
         super().load(settings, dbManager)
 
@@ -0,0 +1,187 @@
+from MetadataManagerCore.actions.DocumentAction import DocumentAction
+from MetadataManagerCore.actions.Action import Action
+from MetadataManagerCore.filtering.DocumentFilter import DocumentFilter
+from typing import Iterable
+import compileall
+import importlib
+import hashlib
+import json
+import sys
+import os
+import logging
+
+logger = logging.getLogger(__name__)
+
+# The info files are stored in a subfolder of the generated modules to keep them apart from the graph files:
+MODULE_INFO_FOLDER_NAME = '.graph_modules'
+
+DOCUMENT_ACTION_KIND = 'documentAction'
+ACTION_KIND = 'action'
+DOCUMENT_FILTER_KIND = 'documentFilter'
+
+def getFileHash(filename: str) -> str:
+    with open(filename, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+def getGraphHash(graph) -> str:
+    """Hash of the serialized graph or None if the graph can't be serialized, in which case it is always regenerated.
+    """
+    try:
+        serializedGraph = json.dumps(graph.serialize_session(), sort_keys=True, default=str)
+    except Exception as e:
+        logger.debug(f'Failed to serialize the graph: {str(e)}')
+        return None
+
+    return hashlib.sha1(serializedGraph.encode('utf-8')).hexdigest()
+
+def getModuleInfoFilename(pythonFile: str) -> str:
+    moduleName = os.path.splitext(os.path.basename(pythonFile))[0]
+    return os.path.join(os.path.dirname(pythonFile), MODULE_INFO_FOLDER_NAME, moduleName + '.info')
+
+def loadModuleInfo(pythonFile: str) -> dict:
+    """Returns the info of the generated module or None if there is none or the module was modified after it was written.
+    """
+    infoFilename = getModuleInfoFilename(pythonFile)
+    if not os.path.exists(infoFilename) or not os.path.exists(pythonFile):
+        return None
+
+    try:
+        with open(infoFilename, 'r') as f:
+            moduleInfo = json.load(f)
+
+        if moduleInfo.get('moduleHash') != getFileHash(pythonFile):
+            return None
+    except Exception as e:
+        logger.warning(f'Failed to read {infoFilename}: {str(e)}')
+        return None
+
+    return moduleInfo
+
+def saveModuleInfo(pythonFile: str, moduleInfo: dict, graphHash: str = None):
+    infoFilename = getModuleInfoFilename(pythonFile)
+
+    try:
+        moduleInfo['moduleHash'] = getFileHash(pythonFile)
+        moduleInfo['graphHash'] = graphHash
+
+        os.makedirs(os.path.dirname(infoFilename), exist_ok=True)
+        tempFilename = infoFilename + '.tmp'
+        with open(tempFilename, 'w') as f:
+            json.dump(moduleInfo, f, indent=2)
+
+        os.replace(tempFilename, infoFilename)
+    except Exception as e:
+        # The module is imported on the next start instead:
+        logger.warning(f'Failed to write {infoFilename}: {str(e)}')
+
+def saveActionModuleInfo(pythonFile: str, action, graphHash: str = None):
+    saveModuleInfo(pythonFile, {
+        'kind': DOCUMENT_ACTION_KIND if isinstance(action, DocumentAction) else ACTION_KIND,
+        'id': action.id,
+        'displayName': action.displayName,
+        'filterTags': action.filterTags,
+        'category': action.category,
+        'runsOnMainThread': action.runsOnMainThread
+    }, graphHash)
+
+def saveDocumentFilterModuleInfo(pythonFile: str, execModule, graphHash: str = None):
+    saveModuleInfo(pythonFile, {
+        'kind': DOCUMENT_FILTER_KIND,
+        'uniqueLabelName': execModule.UNIQUE_LABEL_NAME,
+        'hasStringArg': execModule.HAS_STRING_ARG
+    }, graphHash)
+
+def importModule(moduleName: str, pythonFile: str):
+    """Imports the generated module. It is only reloaded if it was imported before, e.g. after a regeneration.
+    """
+    pythonFileDir = os.path.dirname(pythonFile)
+    if not pythonFileDir in sys.path:
+        sys.path.append(pythonFileDir)
+
+    execModule = sys.modules.get(moduleName)
+    if execModule != None:
+        return importlib.reload(execModule)
+
+    return importlib.import_module(moduleName)
+
+def compileModules(pythonFiles: Iterable[str]):
+    """Byte-compiles the given modules if their cached bytecode is missing or outdated.
+    """
+    for pythonFile in pythonFiles:
+        try:
+            compileall.compile_file(pythonFile, quiet=1)
+        except Exception as e:
+            logger.warning(f'Failed to compile {pythonFile}: {str(e)}')
+
+class LazyActionVSBase(object):
+    """Action of a generated module that is only imported on the first execution. The action properties are read from the module info.
+    """
+    def __init__(self, moduleName: str, pythonFile: str, moduleInfo: dict) -> None:
+        super().__init__()
+
+        self.moduleName = moduleName
+        self.pythonFile = pythonFile
+        self.moduleInfo = moduleInfo
+        self.actionClass = None
+
+    @property
+    def id(self):
+        return self.moduleInfo['id']
+
+    @property
+    def displayName(self):
+        return self.moduleInfo['displayName']
+
+    @property
+    def filterTags(self):
+        return self.moduleInfo['filterTags']
+
+    @property
+    def category(self):
+        return self.moduleInfo['category']
+
+    @property
+    def runsOnMainThread(self):
+        return self.moduleInfo['runsOnMainThread']
+
+    def getActionClass(self):
+        if self.actionClass == None:
+            self.actionClass = importModule(self.moduleName, self.pythonFile).ActionVS
+
+        return self.actionClass
+
+class LazyDocumentActionVS(LazyActionVSBase, DocumentAction):
+    def execute(self, document):
+        # The generated execute function is called with this action to keep the events of the registered action:
+        self.getActionClass().execute(self, document)
+
+class LazyActionVS(LazyActionVSBase, Action):
+    def execute(self):
+        self.getActionClass().execute(self)
+
+def createLazyAction(moduleName: str, pythonFile: str, moduleInfo: dict):
+    if moduleInfo['kind'] == DOCUMENT_ACTION_KIND:
+        return LazyDocumentActionVS(moduleName, pythonFile, moduleInfo)
+
+    return LazyActionVS(moduleName, pythonFile, moduleInfo)
+
+def createLazyDocumentFilter(moduleName: str, pythonFile: str, moduleInfo: dict) -> DocumentFilter:
+    executeFunction = None
+
+    def execute(*args, **kwargs):
+        nonlocal executeFunction
+        if executeFunction == None:
+            executeFunction = importModule(moduleName, pythonFile).execute
+
+        return executeFunction(*args, **kwargs)
+
+    return DocumentFilter(execute, moduleInfo['uniqueLabelName'], hasStringArg=moduleInfo['hasStringArg'])
+
+def registerLazyModule(actionManager, documentFilterManager, moduleName: str, pythonFile: str, moduleInfo: dict):
+    """Registers the action or document filter of the generated module without importing it.
+    Already registered actions are kept because they are either up to date or the module is already imported.
+    """
+    if moduleInfo['kind'] == DOCUMENT_FILTER_KIND:
+        documentFilterManager.addFilter(createLazyDocumentFilter(moduleName, pythonFile, moduleInfo))
+    elif not actionManager.isActionIdRegistered(moduleInfo['id']):
+        actionManager.registerAction(createLazyAction(moduleName, pythonFile, moduleInfo))
@@ -1,6 +1,5 @@
 from VisualScripting.node_exec.base_nodes import defNode, defInlineNode, InlineNode
 from MetadataManagerCore.environment.EnvironmentManager import EnvironmentManager
-from VisualScripting.NodeGraphQt.base import node
 
 ENVIRONMENT_MANAGER : EnvironmentManager = None
 IDENTIFIER = "Environment"
@@ -35,6 +34,8 @@ class EnvironmentSelectionNode(InlineNode):
             self.comboBoxNodeWidget.add_items(envNames)
 
             self.deleteProperty("environmentComboMenu")
+            # The node graph UI is only imported where nodes are edited:
+            from VisualScripting.NodeGraphQt.base import node
             self.create_property("environmentComboMenu", envNames[0] if len(envNames) > 0 else None, items=envNames, widget_type=node.NODE_PROP_QCOMBO)
 
             if curSelection != None:
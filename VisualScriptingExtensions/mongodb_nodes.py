@@ -1,4 +1,5 @@
 from VisualScripting.node_exec.base_nodes import defNode, defInlineNode
+from database import collection_keys
 
 DB_MANAGER = None
 MONGODB_IDENTIFIER = "MongoDB"
@@ -7,7 +8,7 @@ MONGODB_IDENTIFIER = "MongoDB"
 def insertOrModifyDocument(collectionName, sid, dataDict, checkForModifications):
     if DB_MANAGER != None:
         checkForModifications = checkForModifications == True or checkForModifications == "True"
-        DB_MANAGER.insertOrModifyDocument(collectionName, sid, dataDict, checkForModifications)
+        collection_keys.insertOrModifyDocument(DB_MANAGER, collectionName, sid, dataDict, checkForModifications)
     else:
         print("DB Manager is None.")
 
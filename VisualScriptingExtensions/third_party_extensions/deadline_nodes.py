@@ -10,6 +10,8 @@ import tempfile
 import json
 import uuid
 import getpass
+import threading
+import contextlib
 
 DEADLINE_SERVICE : DeadlineService = None
 DEADLINE_IDENTIFIER = "Deadline"
@@ -21,7 +23,61 @@ def removeFiles(filenames):
         except Exception as e:
             print(str(e))
 
+class JobFileBatch(object):
+    """Job files of a submission batch are written to a single directory per subfolder instead of a new directory per file.
+    Created directories are remembered so they are only created once per batch.
+    """
+    def __init__(self) -> None:
+        super().__init__()
+
+        self.batchId = uuid.uuid4().hex
+        self.createdDirectories = set()
+        self.lock = threading.Lock()
+
+    def ensureDirectory(self, directory: str):
+        with self.lock:
+            if directory in self.createdDirectories:
+                return
+
+        os.makedirs(directory, exist_ok=True)
+
+        with self.lock:
+            self.createdDirectories.add(directory)
+
+    def getDirectory(self, subfolder: str):
+        directory = os.path.join(DEADLINE_SERVICE.info.customJobInfoDirectory, subfolder, self.batchId)
+        self.ensureDirectory(directory)
+        return directory
+
+# The job file batch is owned by the submission run and only visible to the threads it is activated on:
+_jobFileBatchContext = threading.local()
+
+@contextlib.contextmanager
+def jobFileBatchContext(batch: JobFileBatch):
+    """Writes the job files of the current thread to the given batch while the context is active.
+    """
+    previousBatch = getattr(_jobFileBatchContext, 'batch', None)
+    _jobFileBatchContext.batch = batch
+    try:
+        yield batch
+    finally:
+        _jobFileBatchContext.batch = previousBatch
+
+def getCurrentJobFileBatch() -> JobFileBatch:
+    return getattr(_jobFileBatchContext, 'batch', None)
+
+def ensureDirectory(directory: str):
+    batch = getCurrentJobFileBatch()
+    if batch:
+        batch.ensureDirectory(directory)
+    else:
+        os.makedirs(directory, exist_ok=True)
+
 def getDeadlineFilename(subfolder: str, ext: str, basename: str=None):
+    batch = getCurrentJobFileBatch()
+    if batch and not basename:
+        return os.path.join(batch.getDirectory(subfolder), f'{uuid.uuid4().hex}.{ext}')
+
     directory = os.path.join(DEADLINE_SERVICE.info.customJobInfoDirectory, subfolder, uuid.uuid4().hex)
     os.makedirs(directory, exist_ok=True)
 
@@ -32,6 +88,13 @@ def getDeadlineFilename(subfolder: str, ext: str, basename: str=None):
 
     return filename
 
+def writeDeadlineFiles(files):
+    """Writes the given (filename, content, encoding) tuples. The content is rendered in memory beforehand so the files are written in one go.
+    """
+    for filename, content, encoding in files:
+        with open(filename, 'w+', encoding=encoding) as f:
+            f.write(content)
+
 @defNode("Submit Job Files", isExecutable=True, returnNames=["Job"], identifier=DEADLINE_IDENTIFIER)
 def submitJobFiles(jobInfoFilename, pluginInfoFilename, auxiliaryFilenames=None, quiet=True, returnJobIdOnly=True, removeAuxiliaryFilesAfterSubmission=False):
     if DEADLINE_SERVICE == None:
@@ -140,28 +203,23 @@ def submit_3dsMaxPipelineJob(pipelineMaxScriptFilename, pipelineInfoDict, jobInf
 @defNode("Submit Nuke Job", isExecutable=True, returnNames=["Job"], identifier=DEADLINE_IDENTIFIER)
 def submitNukeJob(jobInfoDict: dict, pluginInfoDict: dict, scriptFilename: str, scriptInfoDict: dict, jobDependencies=None):
     # Create a python script file in the deadline repository:
-    directory = os.path.join(DEADLINE_SERVICE.info.customJobInfoDirectory, 'nuke', uuid.uuid4().hex)
-    os.makedirs(directory, exist_ok=True)
-
-    bootstrapScriptFilename = os.path.join(directory,  f'{uuid.uuid4().hex}.py')
-    infoFilename = os.path.join(directory, f'{uuid.uuid4().hex}.json')
+    bootstrapScriptFilename = getDeadlineFilename('nuke', 'py')
+    infoFilename = getDeadlineFilename('nuke', 'json')
 
     scriptDirectory = os.path.dirname(scriptFilename)
     scriptModule = os.path.splitext(os.path.basename(scriptFilename))[0]
-
-    with open(bootstrapScriptFilename, 'w+') as f:
-        f.write('import sys, json\n\n')
-        f.write(f'sys.path.append("{scriptDirectory}")\n')
-        f.write(f'import codecs\n\n')
-        f.write(f'import {scriptModule}\n\n')
-
-        unixInfoFilename = infoFilename.replace("\\", "/")
-        f.write(f'with codecs.open("{unixInfoFilename}", "r", "utf-8") as f:\n')
-        f.write(f'    infoDict = json.load(f, encoding="utf-8")\n\n')
-        f.write(f'{scriptModule}.process(infoDict)')
-
-    with open(infoFilename, 'w+', encoding='utf-8') as f:
-        json.dump(scriptInfoDict, f, indent=4, sort_keys=True, ensure_ascii=False)
+    unixInfoFilename = infoFilename.replace("\\", "/")
+
+    bootstrapScript = ('import sys, json\n\n'
+                       f'sys.path.append("{scriptDirectory}")\n'
+                       f'import codecs\n\n'
+                       f'import {scriptModule}\n\n'
+                       f'with codecs.open("{unixInfoFilename}", "r", "utf-8") as f:\n'
+                       f'    infoDict = json.load(f, encoding="utf-8")\n\n'
+                       f'{scriptModule}.process(infoDict)')
+
+    writeDeadlineFiles([(bootstrapScriptFilename, bootstrapScript, None),
+                        (infoFilename, json.dumps(scriptInfoDict, indent=4, sort_keys=True, ensure_ascii=False), 'utf-8')])
 
     jobInfoDict["Plugin"] = getNukePluginName()
     pluginInfoDict["ScriptFilename"] = bootstrapScriptFilename
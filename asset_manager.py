@@ -1,10 +1,14 @@
 from os import path
 from datetime import datetime
-from PySide2 import QtWidgets, QtCore, QtUiTools, QtGui
-from PySide2.QtWidgets import QDialog
+from PySide2 import QtCore, QtGui
+from typing import TYPE_CHECKING
 from PySide2.QtCore import Qt
 from PySide2.QtGui import QPixmapCache
 
+# QtWidgets and QtUiTools are imported where they are needed because the asset manager is also used in console mode:
+if TYPE_CHECKING:
+    from PySide2.QtWidgets import QDialog
+
 BASE_PLUGIN_PATH = path.join(path.dirname(path.realpath(__file__)), "plugins")
 PRIVATE_PATH = path.join(path.dirname(path.realpath(__file__)), "private")
 BASE_PATH = path.join(path.dirname(path.realpath(__file__)), "assets")
@@ -59,12 +63,14 @@ def getImagePath(imageBasename: str):
     return path.join(BASE_PATH, 'images', imageBasename)
 
 def loadUIFileAbsolutePath(path: str):
+    from PySide2 import QtUiTools
+
     uiFile = QtCore.QFile(path)
     uiFile.open(QtCore.QFile.ReadOnly)
     loader = QtUiTools.QUiLoader()
     return loader.load(uiFile)
 
-def loadDialogAbsolutePath(path: str, fixedSize=True) -> QDialog:
+def loadDialogAbsolutePath(path: str, fixedSize=True) -> 'QDialog':
     dialog = loadUIFileAbsolutePath(path)
     dialog.setWindowFlags(Qt.Dialog | (Qt.MSWindowsFixedSizeDialogHint if fixedSize else 0))
     return dialog
@@ -72,7 +78,7 @@ def loadDialogAbsolutePath(path: str, fixedSize=True) -> QDialog:
 def loadUIFile(relUIPath):
     return loadUIFileAbsolutePath(getUIFilePath(relUIPath))
 
-def loadDialog(relUIPath, fixedSize=True) -> QDialog:
+def loadDialog(relUIPath, fixedSize=True) -> 'QDialog':
     return loadDialogAbsolutePath(getUIFilePath(relUIPath), fixedSize=fixedSize)
 
 def getPluginUIFilePath(pluginName: str, uiFileName: str):
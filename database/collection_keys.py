@@ -0,0 +1,181 @@
+"""
+Registry of the keys used by the documents of each collection (key -> number of documents with that key).
+It replaces full collection scans for header discovery. Writers keep it up to date incrementally with updateKeyCounts.
+A collection without a complete registry (no complete marker) is rebuilt on demand with rebuild.
+"""
+from MetadataManagerCore import Keys
+from pymongo import UpdateOne, ASCENDING
+from pymongo.database import Database
+from pymongo.collection import Collection
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Set
+import itertools
+import logging
+
+logger = logging.getLogger(__name__)
+
+COLLECTION_KEYS_COLLECTION_NAME = 'collection_keys'
+
+# Names of the databases whose registry index was already ensured by this process:
+_indexedDatabaseNames: Set[str] = set()
+
+def getRegistryCollection(db: Database) -> Collection:
+    registry = db[COLLECTION_KEYS_COLLECTION_NAME]
+    if not db.name in _indexedDatabaseNames:
+        registry.create_index([('collection', ASCENDING), ('key', ASCENDING)], unique=True)
+        _indexedDatabaseNames.add(db.name)
+
+    return registry
+
+def getKeys(db: Database, collectionName: str) -> List[str]:
+    """Returns the sorted keys of the given collection or None if the registry of the collection was not built yet.
+    """
+    registry = getRegistryCollection(db)
+    if registry.find_one({'collection': collectionName, 'key': None, 'complete': True}) == None:
+        return None
+
+    return sorted(entry['key'] for entry in registry.find({'collection': collectionName, 'key': {'$ne': None}, 'count': {'$gt': 0}}))
+
+def getKeyCounts(db: Database, collectionName: str) -> Dict[str, int]:
+    registry = getRegistryCollection(db)
+    return {entry['key']: entry['count'] for entry in registry.find({'collection': collectionName, 'key': {'$ne': None}})}
+
+def rebuild(db: Database, collectionName: str) -> List[str]:
+    """Counts the keys of all documents on the database side and replaces the registry of the collection.
+    """
+    pipeline = [
+        {'$project': {'keys': {'$map': {'input': {'$objectToArray': '$$ROOT'}, 'as': 'field', 'in': '$$field.k'}}}},
+        {'$unwind': '$keys'},
+        {'$group': {'_id': '$keys', 'count': {'$sum': 1}}}
+    ]
+    keyCounts = {entry['_id']: entry['count'] for entry in db[collectionName].aggregate(pipeline, allowDiskUse=True)}
+
+    registry = getRegistryCollection(db)
+    registry.delete_many({'collection': collectionName})
+    entries = [{'collection': collectionName, 'key': key, 'count': count} for key, count in keyCounts.items()]
+    entries.append({'collection': collectionName, 'key': None, 'complete': True})
+    registry.insert_many(entries)
+
+    logger.info(f'Rebuilt the key registry of {collectionName} with {len(keyCounts)} keys.')
+
+    return sorted(keyCounts.keys())
+
+def reset(db: Database, collectionName: str):
+    """Marks the registry of an empty (e.g. newly created) collection as complete without scanning it.
+    """
+    registry = getRegistryCollection(db)
+    registry.delete_many({'collection': collectionName})
+    registry.insert_one({'collection': collectionName, 'key': None, 'complete': True})
+
+def invalidate(db: Database, collectionName: str):
+    """Removes the registry of the collection, e.g. if the collection was dropped or replaced. It is rebuilt on the next request.
+    """
+    getRegistryCollection(db).delete_many({'collection': collectionName})
+
+def updateKeyCounts(db: Database, collectionName: str, keyCountDeltas: Dict[str, int]):
+    operations = [UpdateOne({'collection': collectionName, 'key': key}, {'$inc': {'count': delta}}, upsert=True)
+                  for key, delta in keyCountDeltas.items() if delta != 0]
+    if len(operations) == 0:
+        return
+
+    registry = getRegistryCollection(db)
+    registry.bulk_write(operations, ordered=False)
+    registry.delete_many({'collection': collectionName, 'key': {'$ne': None}, 'count': {'$lte': 0}})
+
+def getKeyDeltas(oldKeys: Set[str], newKeys: Set[str]) -> Counter:
+    deltas = Counter(newKeys - oldKeys)
+    deltas.subtract(oldKeys - newKeys)
+    return deltas
+
+def findDocumentKeys(collection: Collection, ids: Iterable[Any], idKey: str = '_id', chunkSize: int = 1000) -> Dict[Any, Set[str]]:
+    """Returns the keys of the documents with the given ids (values of idKey) without transferring the document values.
+    """
+    documentKeys = dict()
+    idIterator = iter(ids)
+    while True:
+        chunk = list(itertools.islice(idIterator, chunkSize))
+        if len(chunk) == 0:
+            break
+
+        pipeline = [
+            {'$match': {idKey: {'$in': chunk}}},
+            {'$project': {'_id': 0, 'id': f'${idKey}', 'keys': {'$map': {'input': {'$objectToArray': '$$ROOT'}, 'as': 'field', 'in': '$$field.k'}}}}
+        ]
+        for entry in collection.aggregate(pipeline):
+            documentKeys[entry.get('id')] = set(entry['keys'])
+
+    return documentKeys
+
+def getUpsertKeyDeltas(collection: Collection, idToSetKeys: Dict[Any, Set[str]], idKey: str = '_id', unsetKeys: Iterable[str] = ()) -> Counter:
+    """Key count deltas of upserting the documents with the given ids with $set (idToSetKeys) and $unset (unsetKeys).
+    Must be called before the write.
+    """
+    unsetKeys = set(unsetKeys)
+    oldDocumentKeys = findDocumentKeys(collection, idToSetKeys.keys(), idKey)
+    deltas = Counter()
+    for uid, setKeys in idToSetKeys.items():
+        oldKeys = oldDocumentKeys.get(uid)
+        if oldKeys == None:
+            # Inserted documents get an _id and the key of the upsert filter:
+            oldKeys = set()
+            newKeys = setKeys | {'_id', idKey}
+        else:
+            newKeys = oldKeys | setKeys
+
+        # Set keys take precedence over unset keys:
+        deltas.update(getKeyDeltas(oldKeys, newKeys - (unsetKeys - setKeys)))
+
+    return deltas
+
+def getRemovalKeyDeltas(collection: Collection, ids: Iterable[Any], idKey: str = '_id') -> Counter:
+    """Key count deltas of deleting the documents with the given ids. Must be called before the deletion.
+    """
+    deltas = Counter()
+    for keys in findDocumentKeys(collection, ids, idKey).values():
+        deltas.subtract(keys)
+
+    return deltas
+
+class DocumentKeyTracker(object):
+    """Keeps the key registry up to date for many writes to one collection with few round trips.
+    The keys of the written documents are read back in chunks and the deltas of a chunk are applied in one registry update.
+    Usage: call add(uid, oldKeys) after each write and flush() after the last one.
+    """
+    def __init__(self, db: Database, collectionName: str, idKey: str = Keys.systemIDKey, chunkSize: int = 1000) -> None:
+        super().__init__()
+
+        self.db = db
+        self.collectionName = collectionName
+        self.idKey = idKey
+        self.chunkSize = chunkSize
+        self.idToOldKeys: Dict[Any, Set[str]] = dict()
+
+    def add(self, uid, oldKeys: Set[str]):
+        """oldKeys are the keys of the document before the first write of this chunk (empty for inserted documents).
+        """
+        self.idToOldKeys.setdefault(uid, set(oldKeys))
+        if len(self.idToOldKeys) >= self.chunkSize:
+            self.flush()
+
+    def flush(self):
+        if len(self.idToOldKeys) == 0:
+            return
+
+        newDocumentKeys = findDocumentKeys(self.db[self.collectionName], self.idToOldKeys.keys(), self.idKey)
+        deltas = Counter()
+        for uid, oldKeys in self.idToOldKeys.items():
+            deltas.update(getKeyDeltas(oldKeys, newDocumentKeys.get(uid, set())))
+
+        self.idToOldKeys = dict()
+        updateKeyCounts(self.db, self.collectionName, deltas)
+
+def insertOrModifyDocument(dbManager, collectionName: str, sid: str, dataDict: dict, checkForModifications: bool):
+    """MongoDBManager.insertOrModifyDocument that keeps the key registry up to date.
+    Use a DocumentKeyTracker for many documents.
+    """
+    collection = dbManager.db[collectionName]
+    oldKeys = findDocumentKeys(collection, [sid], Keys.systemIDKey).get(sid, set())
+    dbManager.insertOrModifyDocument(collectionName, sid, dataDict, checkForModifications)
+    newKeys = findDocumentKeys(collection, [sid], Keys.systemIDKey).get(sid, set())
+
+    updateKeyCounts(dbManager.db, collectionName, getKeyDeltas(oldKeys, newKeys))
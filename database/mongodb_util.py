@@ -0,0 +1,89 @@
+from MetadataManagerCore.mongodb_manager import MongoDBManager
+from typing import Any, Callable, Iterable, Iterator, List
+import itertools
+import random
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+def findManyInCollections(dbManager: MongoDBManager, ids: Iterable[Any], collectionNames: List[str], chunkSize: int = 1000, includeMissing: bool = False) -> Iterator[dict]:
+    """Batched alternative to MongoDBManager.findOneInCollections for many ids.
+    Issues one $in query per collection and chunk instead of one query per id and collection.
+    Documents are yielded in the order of the given ids. If an id exists in multiple collections, the document of the first collection is used.
+    If includeMissing is True, None is yielded for ids that weren't found, so the results can be zipped with the ids.
+    """
+    idIterator = iter(ids)
+    while True:
+        chunk = list(itertools.islice(idIterator, chunkSize))
+        if len(chunk) == 0:
+            break
+
+        documents = dict()
+        remainingIds = list(dict.fromkeys(chunk))
+        for collectionName in collectionNames:
+            if len(remainingIds) == 0:
+                break
+
+            for document in dbManager.db[collectionName].find({'_id': {'$in': remainingIds}}):
+                documents[document['_id']] = document
+
+            remainingIds = [uid for uid in remainingIds if not uid in documents]
+
+        for uid in chunk:
+            document = documents.get(uid)
+            if document != None or includeMissing:
+                yield document
+
+# Bounds each connection attempt. pymongo waits up to serverSelectionTimeoutMS (30s by default) for a reachable server,
+# which also bounds the database operations of the connected manager, e.g. during a replica set failover.
+SERVER_SELECTION_TIMEOUT_IN_SECONDS = 10.0
+
+def withServerSelectionTimeout(host: str, timeoutInSeconds: float = SERVER_SELECTION_TIMEOUT_IN_SECONDS) -> str:
+    """Adds serverSelectionTimeoutMS to the options of a mongodb:// or mongodb+srv:// connection string that doesn't set it already.
+    Other hosts are returned unchanged.
+    """
+    if host == None or not host.startswith(('mongodb://', 'mongodb+srv://')) or 'serverselectiontimeoutms=' in host.lower():
+        return host
+
+    option = f'serverSelectionTimeoutMS={int(timeoutInSeconds * 1000)}'
+    if '?' in host:
+        return f'{host}&{option}' if not host.endswith(('?', '&')) else host + option
+
+    # The options follow the path, which is optional if there are no options:
+    hostWithoutScheme = host.split('://', 1)[1]
+    return f'{host}?{option}' if '/' in hostWithoutScheme else f'{host}/?{option}'
+
+def connectWithRetry(dbManager: MongoDBManager, timeout: float = None, initialDelay: float = 0.25, maxDelay: float = 10.0,
+                     waitFunction: Callable[[float], bool] = None) -> bool:
+    """Connects the database manager, retrying with exponential backoff and full jitter until the overall timeout (None: no timeout) expires.
+    waitFunction(seconds) is used to wait between attempts and aborts the retries if it returns True, e.g. AppInfo.waitForQuit.
+    Returns True if the connection was established.
+    A single connect() can block for the server selection timeout of the client (30s by default, see withServerSelectionTimeout),
+    so the overall timeout can be exceeded by up to one attempt and quitting is only noticed between attempts.
+    """
+    deadline = time.time() + timeout if timeout != None else None
+    attempt = 0
+    while True:
+        try:
+            dbManager.connect()
+            return True
+        except Exception as e:
+            logger.info(f'Failed to connect to the database: {str(e)}')
+
+        # Full jitter spreads the reconnects of many workers that lost the connection at the same time:
+        delay = random.uniform(0.0, min(maxDelay, initialDelay * 2 ** attempt))
+        attempt += 1
+
+        if deadline != None:
+            remainingTime = deadline - time.time()
+            if remainingTime <= 0.0:
+                return False
+
+            delay = min(delay, remainingTime)
+
+        if waitFunction:
+            if waitFunction(delay):
+                return False
+        else:
+            time.sleep(delay)
@@ -0,0 +1,145 @@
+from watchdog.events import FileSystemEventHandler
+from watchdog.observers import Observer
+from MetadataManagerCore.animation import anim_util
+from typing import Dict, List, Set, Tuple
+from collections import OrderedDict
+import threading
+import time
+import os
+import re
+import logging
+
+logger = logging.getLogger(__name__)
+
+class FileExistenceCache(FileSystemEventHandler):
+    """Memoizes directory listings per folder to answer file existence and frame sequence queries without hitting the file system repeatedly.
+    Cached listings are invalidated by watchdog events. Listings expire after ttlInSeconds because file system events are not 
+    reliable on all network shares. At most maxListings listings are kept, the least recently used ones are evicted first.
+    """
+    def __init__(self, ttlInSeconds: float = 30.0, maxWatchedFolders: int = 1000, maxListings: int = 10000) -> None:
+        super().__init__()
+
+        self.ttlInSeconds = ttlInSeconds
+        self.maxWatchedFolders = maxWatchedFolders
+        self.maxListings = maxListings
+        # Listings map the normcased names of a folder, which are used for matching, to the original names:
+        self.listings: Dict[str, Tuple[float, Dict[str, str]]] = OrderedDict()
+        self.watchedFolders: Set[str] = set()
+        self.lock = threading.Lock()
+        self.framePatternRegexCache: Dict[str, re.Pattern] = dict()
+
+        try:
+            self.observer = Observer()
+            self.observer.start()
+        except Exception as e:
+            self.observer = None
+            logger.error(f'Failed to start the file system observer. Falling back to ttl based invalidation. Reason: {str(e)}')
+
+    def shutdown(self):
+        if self.observer:
+            self.observer.stop()
+            self.observer.join()
+
+    @staticmethod
+    def normalizePath(path: str):
+        return os.path.normcase(os.path.abspath(path))
+
+    def getListing(self, folder: str) -> Dict[str, str]:
+        folder = self.normalizePath(folder)
+
+        with self.lock:
+            entry = self.listings.get(folder)
+            if entry:
+                self.listings.move_to_end(folder)
+
+        if entry and time.time() - entry[0] < self.ttlInSeconds:
+            return entry[1]
+
+        try:
+            listing = {os.path.normcase(name): name for name in os.listdir(folder)}
+        except OSError:
+            listing = dict()
+
+        with self.lock:
+            self.listings[folder] = (time.time(), listing)
+            self.listings.move_to_end(folder)
+            while len(self.listings) > self.maxListings:
+                self.listings.popitem(last=False)
+
+        self.watch(folder)
+
+        return listing
+
+    def watch(self, folder: str):
+        if not self.observer or not os.path.isdir(folder):
+            return
+
+        # Reserve the folder under the lock so concurrent lookups don't schedule it twice:
+        with self.lock:
+            if folder in self.watchedFolders or len(self.watchedFolders) >= self.maxWatchedFolders:
+                return
+
+            self.watchedFolders.add(folder)
+
+        try:
+            self.observer.schedule(self, folder, recursive=False)
+        except Exception as e:
+            logger.debug(f'Could not watch {folder}. Reason: {str(e)}')
+            with self.lock:
+                self.watchedFolders.discard(folder)
+
+    def invalidate(self, path: str):
+        path = self.normalizePath(path)
+        with self.lock:
+            self.listings.pop(path, None)
+            self.listings.pop(os.path.dirname(path), None)
+
+    def clear(self):
+        with self.lock:
+            self.listings.clear()
+
+    def exists(self, path: str) -> bool:
+        if not path:
+            return False
+
+        folder, basename = os.path.split(self.normalizePath(path))
+        if not basename:
+            return os.path.exists(path)
+
+        return basename in self.getListing(folder)
+
+    def getFramePatternRegex(self, basenamePattern: str) -> re.Pattern:
+        regex = self.framePatternRegexCache.get(basenamePattern)
+        if regex == None:
+            regexStr = ''.join(f'\\d{{{len(part)}}}' if part.startswith('#') else re.escape(part) for part in re.split('(#+)', basenamePattern) if part)
+            regex = re.compile(regexStr)
+            self.framePatternRegexCache[basenamePattern] = regex
+
+        return regex
+
+    def frames(self, hashtagPattern: str) -> List[str]:
+        """Returns the sorted existing frame filenames matching the given pattern, e.g. "C:/render_####.png".
+        """
+        if not hashtagPattern:
+            return []
+
+        folder, basenamePattern = os.path.split(hashtagPattern)
+        if '#' in folder:
+            return anim_util.extractExistingFrameFilenames(hashtagPattern)
+
+        if not '#' in basenamePattern:
+            return [hashtagPattern] if self.exists(hashtagPattern) else []
+
+        regex = self.getFramePatternRegex(os.path.normcase(basenamePattern))
+        listing = self.getListing(folder)
+        return [os.path.join(folder, listing[name]) for name in sorted(listing) if regex.fullmatch(name)]
+
+    def hasFrames(self, hashtagPattern: str) -> bool:
+        return len(self.frames(hashtagPattern)) > 0
+
+    def on_any_event(self, event):
+        self.invalidate(event.src_path)
+
+        destPath = getattr(event, 'dest_path', None)
+        if destPath:
+            self.invalidate(destPath)
@@ -0,0 +1,205 @@
+from PySide2.QtGui import QImage, QImageReader
+from PySide2.QtCore import Qt
+import threading
+import hashlib
+import shutil
+import uuid
+import time
+import os
+import logging
+
+logger = logging.getLogger(__name__)
+
+class ThumbnailCache(object):
+    """Content-addressed disk cache for downscaled preview images.
+    Thumbnails are keyed by (path, mtime, size, target size), so a modified source image simply maps to a new entry.
+    Thread-safe: entries are written to a temporary file first and then atomically moved into place.
+    The disk usage is bounded by maxSizeInBytes: the least recently used entries (by mtime, refreshed on access) are pruned
+    on startup and whenever a store exceeds the limit.
+    """
+    # Pruning removes entries until the cache is below this fraction of the limit, so it doesn't run on every store:
+    pruneTargetRatio = 0.8
+    # Cache hits refresh the mtime of an entry at most once per interval:
+    touchIntervalInSeconds = 3600
+    # Temporary files of interrupted writes are removed after this age:
+    tempFileMaxAgeInSeconds = 3600
+
+    def __init__(self, cacheDirectory: str, maxSizeInBytes: int = 512 * 1024 * 1024, pruneOnStartup=True) -> None:
+        super().__init__()
+
+        self.cacheDirectory = cacheDirectory
+        self.maxSizeInBytes = maxSizeInBytes
+        self.lock = threading.Lock()
+        # Unknown until the first prune walked the cache directory:
+        self.sizeInBytes = None
+        self.pruneInProgress = False
+
+        if pruneOnStartup:
+            self.pruneAsync()
+
+    def getCacheKey(self, path: str, targetSize: int) -> str:
+        stats = os.stat(path)
+        keyString = f'{os.path.normcase(os.path.abspath(path))}|{stats.st_mtime_ns}|{stats.st_size}|{targetSize}'
+        return hashlib.sha1(keyString.encode('utf-8')).hexdigest()
+
+    def getCacheFilename(self, key: str) -> str:
+        return os.path.join(self.cacheDirectory, key[:2], key + '.png')
+
+    def loadThumbnail(self, path: str, targetSize: int) -> QImage:
+        """Returns the image at path downscaled to fit into targetSize x targetSize pixels.
+        Decodes and caches the thumbnail if it is not cached yet. Can be called from any thread.
+        """
+        try:
+            cacheFilename = self.getCacheFilename(self.getCacheKey(path, targetSize))
+        except OSError:
+            return QImage()
+
+        try:
+            cacheStats = os.stat(cacheFilename)
+        except OSError:
+            cacheStats = None
+
+        if cacheStats:
+            image = QImage(cacheFilename)
+            if not image.isNull():
+                self.touch(cacheFilename, cacheStats)
+                return image
+
+        image, downscaled = self.decode(path, targetSize)
+
+        # Images that already fit are decoded quickly from the source, caching them would only waste disk space.
+        if downscaled:
+            self.store(image, cacheFilename)
+
+        return image
+
+    @staticmethod
+    def decode(path: str, targetSize: int):
+        """Decodes the image at path, downscaled to fit into targetSize x targetSize pixels.
+        Returns (image, downscaled).
+        """
+        reader = QImageReader(path)
+        reader.setAutoTransform(True)
+        size = reader.size()
+        if size.isValid() and max(size.width(), size.height()) > targetSize:
+            # Lets the image plugin decode at the reduced size directly if it supports it:
+            reader.setScaledSize(size.scaled(targetSize, targetSize, Qt.KeepAspectRatio))
+            return reader.read(), True
+
+        image = reader.read()
+        if image.isNull():
+            logger.error(f'Failed to decode {path}: {reader.errorString()}')
+            return image, False
+
+        if max(image.width(), image.height()) > targetSize:
+            return image.scaled(targetSize, targetSize, Qt.KeepAspectRatio, Qt.SmoothTransformation), True
+
+        return image, False
+
+    def store(self, image: QImage, cacheFilename: str):
+        if image.isNull():
+            return
+
+        try:
+            os.makedirs(os.path.dirname(cacheFilename), exist_ok=True)
+            tempFilename = f'{cacheFilename}.{uuid.uuid4().hex}.tmp'
+            if image.save(tempFilename, 'PNG'):
+                fileSize = os.path.getsize(tempFilename)
+                os.replace(tempFilename, cacheFilename)
+                self.onStored(fileSize)
+            elif os.path.isfile(tempFilename):
+                os.remove(tempFilename)
+        except Exception as e:
+            logger.error(f'Failed to write thumbnail {cacheFilename}: {str(e)}')
+
+    def touch(self, cacheFilename: str, cacheStats: os.stat_result):
+        now = time.time()
+        if now - cacheStats.st_mtime > self.touchIntervalInSeconds:
+            try:
+                os.utime(cacheFilename, (now, now))
+            except OSError:
+                pass
+
+    def onStored(self, fileSize: int):
+        with self.lock:
+            if self.sizeInBytes == None:
+                return
+
+            self.sizeInBytes += fileSize
+            exceedsLimit = self.sizeInBytes > self.maxSizeInBytes
+
+        if exceedsLimit:
+            self.pruneAsync()
+
+    def pruneAsync(self):
+        with self.lock:
+            if self.pruneInProgress:
+                return
+
+            self.pruneInProgress = True
+
+        threading.Thread(target=self.prune, name='ThumbnailCachePrune', daemon=True).start()
+
+    def prune(self):
+        """Removes the least recently used entries until the cache is below pruneTargetRatio * maxSizeInBytes.
+        Also removes temporary files of interrupted writes.
+        """
+        try:
+            entries = []
+            totalSize = 0
+            now = time.time()
+            for entry in self.scanFiles():
+                stats = entry.stat()
+                if entry.name.endswith('.tmp'):
+                    if now - stats.st_mtime > self.tempFileMaxAgeInSeconds:
+                        self.removeFile(entry.path)
+                    continue
+
+                entries.append((stats.st_mtime, stats.st_size, entry.path))
+                totalSize += stats.st_size
+
+            if totalSize > self.maxSizeInBytes:
+                targetSize = self.maxSizeInBytes * self.pruneTargetRatio
+                entries.sort()
+                for _, size, path in entries:
+                    if totalSize <= targetSize:
+                        break
+
+                    if self.removeFile(path):
+                        totalSize -= size
+
+            with self.lock:
+                self.sizeInBytes = totalSize
+        except Exception as e:
+            logger.error(f'Failed to prune the thumbnail cache {self.cacheDirectory}: {str(e)}')
+        finally:
+            with self.lock:
+                self.pruneInProgress = False
+
+    def scanFiles(self):
+        if not os.path.isdir(self.cacheDirectory):
+            return
+
+        with os.scandir(self.cacheDirectory) as subfolders:
+            for subfolder in subfolders:
+                if subfolder.is_dir():
+                    with os.scandir(subfolder.path) as entries:
+                        for entry in entries:
+                            if entry.is_file():
+                                yield entry
+
+    @staticmethod
+    def removeFile(path: str) -> bool:
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            return False
+
+    def clear(self):
+        try:
+            shutil.rmtree(self.cacheDirectory, ignore_errors=True)
+            with self.lock:
+                self.sizeInBytes = 0
+        except Exception as e:
+            logger.error(f'Failed to clear the thumbnail cache {self.cacheDirectory}: {str(e)}')
@@ -18,6 +18,12 @@ class AppRepositoryInfo(object):
     def latestVersionFilename(self):
         return os.path.join(self.directory, self.latestVersionBasename)
 
+    @property
+    def latestManifest(self) -> dict:
+        """Manifest of the latest version or None if the latest version is a full zip build.
+        """
+        return self.infoDict.get('manifest')
+
     @property
     def infoFilename(self):
         return os.path.join(self.directory, 'info.json')
@@ -31,4 +37,7 @@ class AppRepositoryInfo(object):
 
     def updateLatestVersion(self, latestVersionFilename: str):
         basename = os.path.basename(latestVersionFilename)
-        self.update({'latest': basename})
\ No newline at end of file
+        self.update({'latest': basename, 'manifest': None})
+
+    def updateLatestManifest(self, versionId: str, manifest: dict):
+        self.update({'latest': versionId, 'manifest': manifest})
\ No newline at end of file
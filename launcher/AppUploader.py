@@ -1,5 +1,6 @@
 from LauncherInfo import LauncherInfo
 from AppRepositoryInfo import AppRepositoryInfo
+from ContentRepository import ContentRepository
 import shutil
 import os
 from datetime import datetime
@@ -41,6 +42,20 @@ class AppUploader(object):
             
         shutil.copy(appFilename, uploadedVersionFilename)
         self.repositoryInfo.updateLatestVersion(uploadedVersionFilename)
+
+    def uploadAppFolder(self, appFolder: str) -> str:
+        """Uploads the files of the app folder to the content-addressed repository. Only chunks that aren't in the repository yet are copied.
+        Returns the version id.
+        """
+        repository = ContentRepository(self.repositoryInfo.directory)
+        manifest = repository.addFolder(appFolder)
+        versionId = repository.getVersionId(manifest)
+
+        if versionId != self.repositoryInfo.latestVersionBasename:
+            repository.saveManifest(versionId, manifest)
+            self.repositoryInfo.updateLatestManifest(versionId, manifest)
+
+        return versionId
         
 if __name__ == '__main__':
     launcherInfoDir = BASE_PATH
@@ -50,4 +65,8 @@ if __name__ == '__main__':
 
     launcherInfo = LauncherInfo(launcherInfoDir)
     appUploader = AppUploader(launcherInfo.appRepositoryDirectory)
-    appUploader.uploadApp(os.path.abspath(os.path.join(BASE_PATH, '..', 'dist', 'MetadataManager.zip')))
\ No newline at end of file
+    appFolder = os.path.abspath(os.path.join(BASE_PATH, '..', 'dist', 'MetadataManager'))
+    if os.path.isdir(appFolder):
+        appUploader.uploadAppFolder(appFolder)
+    else:
+        appUploader.uploadApp(os.path.abspath(os.path.join(BASE_PATH, '..', 'dist', 'MetadataManager.zip')))
\ No newline at end of file
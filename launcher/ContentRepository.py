@@ -0,0 +1,92 @@
+import hashlib
+import json
+import os
+import uuid
+
+# Files are stored in chunks, so a changed file only adds the chunks that changed to the repository:
+CHUNK_SIZE = 4 * 1024 * 1024
+
+class ContentRepository(object):
+    """Content-addressed app repository. File chunks are stored once as blobs named by their sha256 hash.
+    A version is described by a manifest with the sha256, size and chunk hashes of each file.
+    """
+    def __init__(self, directory: str) -> None:
+        super().__init__()
+
+        self.directory = directory
+
+    @property
+    def blobsDirectory(self):
+        return os.path.join(self.directory, 'blobs')
+
+    @property
+    def manifestsDirectory(self):
+        return os.path.join(self.directory, 'manifests')
+
+    def getBlobFilename(self, blobHash: str):
+        return os.path.join(self.blobsDirectory, blobHash[:2], blobHash)
+
+    def hasBlob(self, blobHash: str):
+        return os.path.exists(self.getBlobFilename(blobHash))
+
+    def readBlob(self, blobHash: str) -> bytes:
+        with open(self.getBlobFilename(blobHash), 'rb') as f:
+            return f.read()
+
+    def storeBlob(self, blobHash: str, data: bytes) -> bool:
+        """Stores the blob if it doesn't exist yet. Returns True if it was written.
+        """
+        blobFilename = self.getBlobFilename(blobHash)
+        if os.path.exists(blobFilename):
+            return False
+
+        os.makedirs(os.path.dirname(blobFilename), exist_ok=True)
+        # Blobs are written to a temporary file first so clients never read partially written blobs:
+        tempFilename = f'{blobFilename}.{uuid.uuid4().hex[:8]}.tmp'
+        with open(tempFilename, 'wb') as f:
+            f.write(data)
+
+        os.replace(tempFilename, blobFilename)
+        return True
+
+    def addFile(self, filename: str) -> dict:
+        fileHash = hashlib.sha256()
+        chunks = []
+        size = 0
+        with open(filename, 'rb') as f:
+            for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+                chunkHash = hashlib.sha256(chunk).hexdigest()
+                self.storeBlob(chunkHash, chunk)
+                chunks.append(chunkHash)
+                fileHash.update(chunk)
+                size += len(chunk)
+
+        return {'sha256': fileHash.hexdigest(), 'size': size, 'chunks': chunks}
+
+    def addFolder(self, folder: str) -> dict:
+        """Stores the chunks of all files of the folder and returns the manifest of the folder.
+        """
+        files = dict()
+        for root, _, filenames in os.walk(folder):
+            for filename in filenames:
+                absFilename = os.path.join(root, filename)
+                relFilename = os.path.relpath(absFilename, folder).replace('\\', '/')
+                files[relFilename] = self.addFile(absFilename)
+
+        return {'chunkSize': CHUNK_SIZE, 'files': files}
+
+    @staticmethod
+    def getVersionId(manifest: dict) -> str:
+        return hashlib.sha256(json.dumps(manifest, sort_keys=True).encode('utf-8')).hexdigest()[:32]
+
+    def getManifestFilename(self, versionId: str):
+        return os.path.join(self.manifestsDirectory, f'{versionId}.json')
+
+    def saveManifest(self, versionId: str, manifest: dict):
+        os.makedirs(self.manifestsDirectory, exist_ok=True)
+        with open(self.getManifestFilename(versionId), 'w') as f:
+            json.dump(manifest, f, sort_keys=True)
+
+    def loadManifest(self, versionId: str) -> dict:
+        with open(self.getManifestFilename(versionId)) as f:
+            return json.load(f)
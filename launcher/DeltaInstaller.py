@@ -0,0 +1,322 @@
+from ContentRepository import ContentRepository
+import zipfile
+import hashlib
+import shutil
+import stat
+import json
+import os
+import logging
+
+logger = logging.getLogger(__name__)
+
+# The manifest of the installed version is kept inside the app folder so it's swapped together with the files:
+INSTALLED_MANIFEST_BASENAME = '.launcher_manifest.json'
+
+# Copy-on-write clone of a whole file (Btrfs, XFS, ...):
+FICLONE = 0x40049409
+
+try:
+    import fcntl
+except ImportError:
+    # Windows:
+    fcntl = None
+
+def removeDirectory(directory: str):
+    """Removes the folder including read-only files, which can't be deleted on Windows.
+    """
+    def onError(function, path, excInfo):
+        os.chmod(path, stat.S_IWRITE)
+        function(path)
+
+    shutil.rmtree(directory, onerror=onError)
+
+def makeReadOnly(filename: str):
+    mode = os.stat(filename).st_mode
+    os.chmod(filename, mode & ~(stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH))
+
+def getFileStat(filename: str) -> list:
+    fileStat = os.stat(filename)
+    return [fileStat.st_size, fileStat.st_mtime_ns]
+
+class DeltaInstallStatistics(object):
+    def __init__(self) -> None:
+        super().__init__()
+
+        # Bytes read from the repository:
+        self.downloadedBytes = 0
+        # Bytes copied from the installed version (reused chunks and unchanged files that couldn't be cloned or linked):
+        self.copiedBytes = 0
+        self.reusedFileCount = 0
+        self.clonedFileCount = 0
+        self.linkedFileCount = 0
+        self.writtenFileCount = 0
+
+    def __str__(self) -> str:
+        return (f'{self.writtenFileCount} files written, {self.reusedFileCount} unchanged files reused '
+                f'({self.clonedFileCount} cloned, {self.linkedFileCount} linked), '
+                f'{self.downloadedBytes / 1024 / 1024:.1f} MB downloaded, {self.copiedBytes / 1024 / 1024:.1f} MB copied')
+
+class DeltaInstaller(object):
+    """Installs a version of a content repository into the app folder. Only changed files are downloaded into a staging folder.
+    The staging folder is then swapped with the app folder. The previously installed version is kept in the previous folder for rollbacks.
+
+    Unchanged files are reused without reading them: they are cloned (copy-on-write) if the file system supports it, else hard linked, else copied.
+    Installed files are read-only and their size and modification time are recorded in the installed manifest. A file whose recorded stat differs
+    may have been modified: it's copied and verified against its hash instead. A hard linked file modified in place also modifies the previous version,
+    so the files of the previous version are verified on rollback.
+    """
+    def __init__(self, installDirectory: str) -> None:
+        super().__init__()
+
+        self.installDirectory = os.path.normpath(installDirectory)
+
+    @property
+    def stagingDirectory(self):
+        return self.installDirectory + '.staging'
+
+    @property
+    def previousDirectory(self):
+        return self.installDirectory + '.previous'
+
+    def loadInstalledManifest(self) -> dict:
+        manifestFilename = os.path.join(self.installDirectory, INSTALLED_MANIFEST_BASENAME)
+        if not os.path.exists(manifestFilename):
+            return None
+
+        try:
+            with open(manifestFilename) as f:
+                return json.load(f)
+        except Exception as e:
+            logger.warning(f'Failed to read the installed manifest. All files are reinstalled. Reason: {str(e)}')
+            return None
+
+    def prepareStagingDirectory(self):
+        if os.path.exists(self.stagingDirectory):
+            removeDirectory(self.stagingDirectory)
+
+        os.makedirs(self.stagingDirectory)
+
+    def install(self, repository: ContentRepository, manifest: dict) -> DeltaInstallStatistics:
+        statistics = DeltaInstallStatistics()
+        installedManifest = self.loadInstalledManifest() or {}
+        installedFiles = installedManifest.get('files', dict())
+        installedFileStats = installedManifest.get('fileStats', dict())
+        canReuseChunks = installedManifest.get('chunkSize') == manifest['chunkSize']
+        fileStats = dict()
+
+        self.prepareStagingDirectory()
+
+        for relFilename, entry in manifest['files'].items():
+            targetFilename = os.path.join(self.stagingDirectory, relFilename)
+            os.makedirs(os.path.dirname(targetFilename), exist_ok=True)
+
+            installedFilename = os.path.join(self.installDirectory, relFilename)
+            installedEntry = installedFiles.get(relFilename) if os.path.exists(installedFilename) else None
+
+            if installedEntry and installedEntry['sha256'] == entry['sha256'] and os.path.getsize(installedFilename) == entry['size']:
+                if installedFileStats.get(relFilename) == getFileStat(installedFilename) and self.reuseFile(installedFilename, targetFilename, statistics):
+                    pass
+                elif not self.copyFile(installedFilename, targetFilename, entry['sha256'], statistics):
+                    logger.warning(f'The installed file {installedFilename} was modified. Rewriting {targetFilename} from the repository.')
+                    self.writeFile(repository, entry, manifest['chunkSize'], targetFilename, None, None, statistics)
+            else:
+                self.writeFile(repository, entry, manifest['chunkSize'], targetFilename, 
+                               installedFilename if canReuseChunks else None, installedEntry, statistics)
+
+            makeReadOnly(targetFilename)
+            fileStats[relFilename] = getFileStat(targetFilename)
+
+        self.writeManifest(self.stagingDirectory, manifest, fileStats)
+
+        self.swapStagingDirectory()
+
+        return statistics
+
+    def installZip(self, zipFilename: str):
+        """Installs a full zip build of the legacy repository format.
+        """
+        self.prepareStagingDirectory()
+
+        with zipfile.ZipFile(zipFilename, 'r') as zipRef:
+            zipRef.extractall(self.stagingDirectory)
+
+        self.swapStagingDirectory()
+
+    def writeManifest(self, directory: str, manifest: dict, fileStats: dict):
+        with open(os.path.join(directory, INSTALLED_MANIFEST_BASENAME), 'w') as f:
+            json.dump(dict(manifest, fileStats=fileStats), f, sort_keys=True)
+
+    def reuseFile(self, sourceFilename: str, targetFilename: str, statistics: DeltaInstallStatistics) -> bool:
+        """Clones or hard links the unchanged file without reading it. Returns False if neither is supported.
+        """
+        if self.cloneFile(sourceFilename, targetFilename):
+            statistics.clonedFileCount += 1
+        else:
+            try:
+                os.link(sourceFilename, targetFilename)
+            except OSError as e:
+                logger.debug(f'Failed to link {sourceFilename}: {str(e)}')
+                return False
+
+            statistics.linkedFileCount += 1
+
+        statistics.reusedFileCount += 1
+        return True
+
+    def cloneFile(self, sourceFilename: str, targetFilename: str) -> bool:
+        if fcntl == None:
+            return False
+
+        try:
+            with open(sourceFilename, 'rb') as sourceFile, open(targetFilename, 'wb') as targetFile:
+                fcntl.ioctl(targetFile.fileno(), FICLONE, sourceFile.fileno())
+        except OSError:
+            # Not supported by the file system:
+            if os.path.exists(targetFilename):
+                os.remove(targetFilename)
+
+            return False
+
+        shutil.copystat(sourceFilename, targetFilename)
+        return True
+
+    def copyFile(self, sourceFilename: str, targetFilename: str, sha256: str, statistics: DeltaInstallStatistics) -> bool:
+        """Copies the file and returns False if the copy doesn't match the hash, e.g. because the installed file was modified with the same size.
+        """
+        fileHash = hashlib.sha256()
+        copiedBytes = 0
+        with open(sourceFilename, 'rb') as sourceFile, open(targetFilename, 'wb') as targetFile:
+            for chunk in iter(lambda: sourceFile.read(1024 * 1024), b''):
+                fileHash.update(chunk)
+                targetFile.write(chunk)
+                copiedBytes += len(chunk)
+
+        statistics.copiedBytes += copiedBytes
+        if fileHash.hexdigest() != sha256:
+            return False
+
+        shutil.copystat(sourceFilename, targetFilename)
+        statistics.reusedFileCount += 1
+        return True
+
+    def writeFile(self, repository: ContentRepository, entry: dict, chunkSize: int, targetFilename: str, 
+                  installedFilename: str, installedEntry: dict, statistics: DeltaInstallStatistics):
+        installedChunks = installedEntry['chunks'] if installedEntry and installedFilename else []
+        fileHash = hashlib.sha256()
+
+        with open(targetFilename, 'wb') as targetFile:
+            installedFile = open(installedFilename, 'rb') if len(installedChunks) > 0 else None
+            try:
+                for i, chunkHash in enumerate(entry['chunks']):
+                    # Unchanged chunks at the same position are read from the installed file instead of the repository:
+                    if i < len(installedChunks) and installedChunks[i] == chunkHash:
+                        installedFile.seek(i * chunkSize)
+                        chunk = installedFile.read(chunkSize)
+                        statistics.copiedBytes += len(chunk)
+                    else:
+                        chunk = repository.readBlob(chunkHash)
+                        statistics.downloadedBytes += len(chunk)
+
+                    fileHash.update(chunk)
+                    targetFile.write(chunk)
+            finally:
+                if installedFile:
+                    installedFile.close()
+
+        if fileHash.hexdigest() != entry['sha256']:
+            if len(installedChunks) > 0:
+                logger.warning(f'The installed file {installedFilename} was modified. Rewriting {targetFilename} from the repository.')
+                self.writeFile(repository, entry, chunkSize, targetFilename, None, None, statistics)
+                return
+
+            raise RuntimeError(f'Hash mismatch of {targetFilename}. The repository is corrupted.')
+
+        statistics.writtenFileCount += 1
+
+    def swapStagingDirectory(self):
+        if os.path.exists(self.previousDirectory):
+            removeDirectory(self.previousDirectory)
+
+        if os.path.exists(self.installDirectory):
+            os.replace(self.installDirectory, self.previousDirectory)
+
+        try:
+            os.replace(self.stagingDirectory, self.installDirectory)
+        except Exception:
+            # Restore the installed version:
+            if os.path.exists(self.previousDirectory) and not os.path.exists(self.installDirectory):
+                os.replace(self.previousDirectory, self.installDirectory)
+
+            raise
+
+    def verifyPreviousVersion(self, repository: ContentRepository = None) -> bool:
+        """Verifies the files of the previous version whose stat changed since they were installed, e.g. hard linked files modified in the installed version.
+        Modified files are rewritten from the repository if it's given. Returns False if the previous version is corrupted.
+        """
+        manifestFilename = os.path.join(self.previousDirectory, INSTALLED_MANIFEST_BASENAME)
+        try:
+            with open(manifestFilename) as f:
+                manifest = json.load(f)
+        except Exception as e:
+            logger.warning(f'Failed to read the manifest of the previous version. It is not verified. Reason: {str(e)}')
+            return True
+
+        recordedFileStats = manifest.pop('fileStats', dict())
+        fileStats = dict(recordedFileStats)
+        for relFilename, entry in manifest['files'].items():
+            filename = os.path.join(self.previousDirectory, relFilename)
+            if os.path.exists(filename) and fileStats.get(relFilename) == getFileStat(filename):
+                continue
+
+            if os.path.exists(filename) and self.hashFile(filename) == entry['sha256']:
+                fileStats[relFilename] = getFileStat(filename)
+                continue
+
+            if repository == None:
+                logger.error(f'The file {filename} of the previous version was modified.')
+                return False
+
+            logger.warning(f'The file {filename} of the previous version was modified. Rewriting it from the repository.')
+            # Written next to the file and replaced, so a hard link to the installed version is broken up:
+            tempFilename = filename + '.tmp'
+            os.makedirs(os.path.dirname(filename), exist_ok=True)
+            self.writeFile(repository, entry, manifest['chunkSize'], tempFilename, None, None, DeltaInstallStatistics())
+            makeReadOnly(tempFilename)
+            if os.path.exists(filename):
+                os.chmod(filename, stat.S_IWRITE | stat.S_IREAD)
+
+            os.replace(tempFilename, filename)
+            fileStats[relFilename] = getFileStat(filename)
+
+        if fileStats != recordedFileStats:
+            self.writeManifest(self.previousDirectory, manifest, fileStats)
+
+        return True
+
+    def hashFile(self, filename: str) -> str:
+        fileHash = hashlib.sha256()
+        with open(filename, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                fileHash.update(chunk)
+
+        return fileHash.hexdigest()
+
+    def rollback(self, repository: ContentRepository = None) -> bool:
+        """Swaps the installed version with the previous version. Returns False if there is no previous version or it is corrupted.
+        Modified files of the previous version are rewritten from the repository if it's given.
+        """
+        if not os.path.exists(self.previousDirectory) or not os.path.exists(self.installDirectory):
+            return False
+
+        if not self.verifyPreviousVersion(repository):
+            return False
+
+        # The staging folder is used as intermediate folder, so the rolled back version becomes the previous version:
+        if os.path.exists(self.stagingDirectory):
+            removeDirectory(self.stagingDirectory)
+
+        os.replace(self.installDirectory, self.stagingDirectory)
+        os.replace(self.previousDirectory, self.installDirectory)
+        os.replace(self.stagingDirectory, self.previousDirectory)
+
+        return True
@@ -22,6 +22,10 @@ class LauncherInfo(object):
     def currentVersionFilename(self):
         return self.infoDict.get('current_version_filename')
 
+    @property
+    def previousVersionFilename(self):
+        return self.infoDict.get('previous_version_filename')
+
     @property
     def launcherInfoFilename(self):
         return os.path.join(self.directory, 'launcher.json')
@@ -1,9 +1,9 @@
 from LauncherInfo import LauncherInfo
 from AppRepositoryInfo import AppRepositoryInfo
+from ContentRepository import ContentRepository
+from DeltaInstaller import DeltaInstaller
 import os
 import logging
-import zipfile
-import shutil
 import subprocess
 import time
 import sys
@@ -25,23 +25,38 @@ class Launcher(object):
 
         self.logger = logging.getLogger(__name__)
 
-    def deleteLocalVersion(self, version: str):
-        self.logger.info(f'Deleting local version: {version}...')
-        shutil.rmtree(os.path.join(BASE_PATH, version))
-        
-    def update(self, currentVersionFilename: str, newVersionFilename: str):
+    def update(self, currentVersionFilename: str, repositoryInfo: AppRepositoryInfo):
+        newVersionFilename = repositoryInfo.latestVersionFilename
         self.logger.info(f'Updating to newest version: {newVersionFilename}...')
 
         launcherInfo = LauncherInfo(BASE_PATH)
+        installer = DeltaInstaller(os.path.join(BASE_PATH, launcherInfo.appFolderName))
+
+        # The new version is written into a staging folder and swapped with the installed version, which is kept for rollbacks:
+        tStart = time.time()
+        manifest = repositoryInfo.latestManifest
+        if manifest:
+            statistics = installer.install(ContentRepository(repositoryInfo.directory), manifest)
+            self.logger.info(f'Updated in {time.time() - tStart:.1f}s: {statistics}')
+        else:
+            installer.installZip(newVersionFilename)
+            self.logger.info(f'Updated in {time.time() - tStart:.1f}s.')
 
-        if currentVersionFilename:
-            self.deleteLocalVersion(launcherInfo.appFolderName)
-        
-        # Extract:
-        with zipfile.ZipFile(newVersionFilename, 'r') as zip_ref:
-            zip_ref.extractall(os.path.join(BASE_PATH, launcherInfo.appFolderName))
+        launcherInfo.update({'current_version_filename': newVersionFilename, 'previous_version_filename': currentVersionFilename})
+
+    def rollback(self):
+        launcherInfo = LauncherInfo(BASE_PATH)
+        installer = DeltaInstaller(os.path.join(BASE_PATH, launcherInfo.appFolderName))
+        # Modified files of the previous version are rewritten from the repository:
+        repositoryInfo = AppRepositoryInfo(launcherInfo.appRepositoryDirectory)
 
-        launcherInfo.updateCurrentVersionFilename(newVersionFilename)
+        if not installer.rollback(ContentRepository(repositoryInfo.directory)):
+            self.logger.error('There is no intact previous version to roll back to.')
+            return
+
+        self.logger.info(f'Rolled back to {launcherInfo.previousVersionFilename}.')
+        launcherInfo.update({'current_version_filename': launcherInfo.previousVersionFilename, 
+                             'previous_version_filename': launcherInfo.currentVersionFilename})
 
     def checkForUpdates(self):
         self.logger.info('Checking for updates...')
@@ -52,7 +67,7 @@ class Launcher(object):
         repositoryInfo = AppRepositoryInfo(launcherInfo.appRepositoryDirectory)
         curVersionFilename = launcherInfo.currentVersionFilename
         if curVersionFilename == None or curVersionFilename != repositoryInfo.latestVersionFilename or not os.path.exists(self.exeFilename):
-            self.update(curVersionFilename, repositoryInfo.latestVersionFilename)
+            self.update(curVersionFilename, repositoryInfo)
         else:
             self.logger.info('Already up to date.')
 
@@ -61,13 +76,18 @@ class Launcher(object):
         launcherInfo = LauncherInfo(BASE_PATH)
         return os.path.join(BASE_PATH, launcherInfo.appFolderName, launcherInfo.exeName)
         
-    def startApp(self):
-        subprocess.Popen([os.path.normpath(self.exeFilename), '-launcher', f'{os.path.join(BASE_PATH, sys.argv[0])}'] + sys.argv[1:])
+    def startApp(self, appArgs):
+        subprocess.Popen([os.path.normpath(self.exeFilename), '-launcher', f'{os.path.join(BASE_PATH, sys.argv[0])}'] + appArgs)
 
     def run(self):
         try:
-            self.checkForUpdates()
-            self.startApp()
+            # -rollback starts the previous version without checking for updates:
+            if '-rollback' in sys.argv[1:]:
+                self.rollback()
+            else:
+                self.checkForUpdates()
+
+            self.startApp([arg for arg in sys.argv[1:] if arg != '-rollback'])
             return True
         except Exception as e:
             self.logger.error(f'Failed with exception: {str(e)}')
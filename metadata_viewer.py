@@ -4,7 +4,7 @@ import argparse
 import sys
 import os
 import PySide2
-from Bootstrapper import Bootstrapper
+from startup_profiler import PROFILER, phase
 import logging
 import subprocess
 
@@ -27,12 +27,36 @@ def main():
     parser.add_argument('-task', metavar='Task Json File Path', type=str, default=None,
                         help=f"Path to a json file with task information.")
 
+    parser.add_argument('-taskQueue', metavar='Task Queue', type=str, default=None,
+                        help="Console worker mode: processes the tasks of the given queue directory (or RabbitMQ queue name) with a single initialization.")
+
+    parser.add_argument('-taskQueueBackend', type=str, default='directory', choices=['directory', 'rabbitmq'],
+                        help='The backend of the task queue.')
+
+    parser.add_argument('-idleTimeout', type=float, default=None,
+                        help='Console worker mode: quits if there are no tasks for the given number of seconds.')
+
     parser.add_argument('-launcher', help='Path to the launcher.', type=str, default=None)
 
     parser.add_argument('-loglevel', help='The level of the logger.', type=str, default=None)
 
+    parser.add_argument('--ready-timeout', type=float, default=None,
+                        help='Seconds to wait for the database connection and the initialization before giving up.')
+
+    parser.add_argument('--profile-startup', help='Prints the duration of each startup phase and import.', action='store_true')
+
     args = parser.parse_args()
-    bootstrapper = Bootstrapper(args.mode, args.task, args.launcher, loggerLevel=args.loglevel)
+    if args.profile_startup:
+        PROFILER.enable()
+
+    # Imported after enabling the profiler to include the imports of the application modules:
+    from Bootstrapper import Bootstrapper
+
+    with phase('Bootstrapper.__init__'):
+        bootstrapper = Bootstrapper(args.mode, args.task, args.launcher, loggerLevel=args.loglevel,
+                                    taskQueueName=args.taskQueue, taskQueueBackend=args.taskQueueBackend, idleTimeout=args.idleTimeout,
+                                    readyTimeout=args.ready_timeout)
+
     status = bootstrapper.run()
 
     if bootstrapper.restartRequested and args.launcher:
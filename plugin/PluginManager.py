@@ -3,12 +3,14 @@ from AppInfo import AppInfo
 from MetadataManagerCore.Event import Event
 from MetadataManagerCore.mongodb_manager import MongoDBManager
 from plugin.Plugin import Plugin
+from plugin.PluginManifestCache import PluginManifestCache
 from typing import Dict, List
 import importlib
 import os
 import sys
 import logging
 import typing
+import time
 
 logger = logging.getLogger(__name__)
 
@@ -43,9 +45,11 @@ class PluginInfo(object):
         return os.path.basename(self.pluginFolder)
 
 class PluginManager(object):
-    def __init__(self, defaultPluginsFolders: List[str], serviceRegistry: 'ServiceRegistry', appInfo: AppInfo) -> None:
+    def __init__(self, defaultPluginsFolders: List[str], serviceRegistry: 'ServiceRegistry', appInfo: AppInfo, manifestFilename: str = None) -> None:
         super().__init__()
 
+        self.manifestCache = PluginManifestCache(manifestFilename)
+
         self.pluginsFolders = set()
         self.defaultPluginsFolders = [folder.replace('\\', '/') for folder in defaultPluginsFolders]
         self.viewerRegistry: 'ViewerRegistry' = None
@@ -65,6 +69,8 @@ class PluginManager(object):
         for pluginsFolder in defaultPluginsFolders:
             self.addPluginsFolder(pluginsFolder)
 
+        self.manifestCache.save()
+
     def setPluginAutoactivateState(self, pluginName: str, autoactivate: bool):
         curAutoactivate = self.getPluginAutoactivateState(pluginName)
         if curAutoactivate != autoactivate:
@@ -92,20 +98,14 @@ class PluginManager(object):
         self.pluginsFolders.add(pluginsFolder)
 
         # Go through the subdirectories of the plugins folder to add the plugin info
-        for root,dirs,_ in os.walk(pluginsFolder):
-            for pluginFolder in dirs:
-                if pluginFolder == '__pycache__':
-                    continue
-
-                if pluginFolder in self.pluginInfoMap:
-                    logger.warning(f'The plugin {pluginFolder} was already added.')
-                    continue
-                
-                fullPluginFolderPath = os.path.join(root, pluginFolder)
-                self.pluginInfoMap[pluginFolder] = PluginInfo(fullPluginFolderPath)
-                self.onPluginAdded(pluginFolder)
-
-            break
+        for pluginFolder in self.manifestCache.listPluginFolders(pluginsFolder):
+            if pluginFolder in self.pluginInfoMap:
+                logger.warning(f'The plugin {pluginFolder} was already added.')
+                continue
+            
+            fullPluginFolderPath = os.path.join(pluginsFolder, pluginFolder)
+            self.pluginInfoMap[pluginFolder] = PluginInfo(fullPluginFolderPath)
+            self.onPluginAdded(pluginFolder)
 
         if not pluginsFolder in self.defaultPluginsFolders:
             self.saveDbState(self.serviceRegistry.dbManager)
@@ -114,22 +114,18 @@ class PluginManager(object):
 
     def refreshAvailablePlugins(self):
         pluginNames = set()
-        for pluginFolder in self.pluginsFolders:
-            for root,dirs,_ in os.walk(pluginFolder):
-                for pluginFolder in dirs:
-                    if pluginFolder == '__pycache__':
-                        continue
-
-                    pluginNames.add(pluginFolder)
+        for pluginsFolder in self.pluginsFolders:
+            for pluginFolder in self.manifestCache.listPluginFolders(pluginsFolder):
+                pluginNames.add(pluginFolder)
 
-                    if pluginFolder in self.pluginInfoMap:
-                        continue
-                    
-                    fullPluginFolderPath = os.path.join(root, pluginFolder)
-                    self.pluginInfoMap[pluginFolder] = PluginInfo(fullPluginFolderPath)
-                    self.onPluginAdded(pluginFolder)
+                if pluginFolder in self.pluginInfoMap:
+                    continue
+                
+                fullPluginFolderPath = os.path.join(pluginsFolder, pluginFolder)
+                self.pluginInfoMap[pluginFolder] = PluginInfo(fullPluginFolderPath)
+                self.onPluginAdded(pluginFolder)
 
-                break
+        self.manifestCache.save()
 
         deletedPluginNames = set(self.pluginInfoMap.keys()) - pluginNames
         for deletedPluginName in deletedPluginNames:
@@ -145,18 +141,12 @@ class PluginManager(object):
         sys.path.remove(pluginsFolder)
 
         # Go through the subdirectories of the plugins folder to remove the plugin info
-        for _,dirs,_ in os.walk(pluginsFolder):
-            for pluginFolder in dirs:
-                if pluginFolder == '__pycache__':
-                    continue
-                
-                if not pluginFolder in self.pluginInfoMap:
-                    continue
-
-                del self.pluginInfoMap[pluginFolder]
-                self.onPluginRemoved(pluginFolder)
+        for pluginFolder in self.manifestCache.listPluginFolders(pluginsFolder):
+            if not pluginFolder in self.pluginInfoMap:
+                continue
 
-            break
+            del self.pluginInfoMap[pluginFolder]
+            self.onPluginRemoved(pluginFolder)
 
         self.saveDbState(self.serviceRegistry.dbManager)
 
@@ -167,14 +157,52 @@ class PluginManager(object):
         return self.pluginInfoMap.get(name, PluginInfo(None)).pluginInstance
 
     def refreshPluginState(self):
+        requestedPluginNames = []
         for pluginName in self.availablePluginNames:
             active = self.pluginActiveStatus.get(pluginName, True)
             autoactivate = self.getPluginAutoactivateState(pluginName)
             if active or autoactivate:
-                try:
-                    self.setPluginActive(pluginName, active or autoactivate)
-                except Exception as e:
-                    logger.error(str(e))
+                requestedPluginNames.append(pluginName)
+
+        # Inactive plugins are not imported. Dependencies are loaded before their dependents:
+        tStart = time.time()
+        for pluginName in self.getLoadOrder(requestedPluginNames):
+            try:
+                self.setPluginActive(pluginName, True, saveState=False)
+            except Exception as e:
+                logger.error(str(e))
+
+        logger.info(f'Loaded plugins in {time.time() - tStart:.2f}s.')
+
+        self.save(self.settings, self.dbManager)
+        self.manifestCache.save()
+
+    def getLoadOrder(self, pluginNames: List[str]) -> List[str]:
+        """Returns the given plugins and their dependencies (known from the manifest) in dependency order.
+        Plugins with dependencies that can only be determined by importing them load those dependencies on import.
+        """
+        loadOrder = []
+        visitedPluginNames = set()
+
+        def visit(pluginName: str):
+            if pluginName in visitedPluginNames:
+                # Either loaded already or a circular dependency which is reported when the plugin is loaded.
+                return
+
+            visitedPluginNames.add(pluginName)
+            pluginInfo = self.pluginInfoMap.get(pluginName)
+            if not pluginInfo:
+                return
+
+            for dependency in self.manifestCache.getDependentPluginNames(pluginInfo.pluginFolder, pluginName) or []:
+                visit(dependency)
+
+            loadOrder.append(pluginName)
+
+        for pluginName in pluginNames:
+            visit(pluginName)
+
+        return loadOrder
 
     def setViewerRegistry(self, viewerRegistry: 'ViewerRegistry'):
         self.viewerRegistry = viewerRegistry
@@ -183,7 +211,7 @@ class PluginManager(object):
     def availablePluginNames(self):
         return [pluginName for pluginName in self.pluginInfoMap.keys()]
 
-    def setPluginActive(self, pluginName: str, active: bool, loadingPluginNames: List[str] = None):
+    def setPluginActive(self, pluginName: str, active: bool, loadingPluginNames: List[str] = None, saveState=True):
         pluginInfo = self.pluginInfoMap.get(pluginName)
 
         if not pluginInfo:
@@ -201,7 +229,8 @@ class PluginManager(object):
             pluginInfo.pluginActive = False
 
         # Save the state:
-        self.save(self.settings, self.dbManager)
+        if saveState:
+            self.save(self.settings, self.dbManager)
 
     def addPlugin(self, pluginInfo: PluginInfo, loadingPluginNames: List[str] = None):
         pluginName = pluginInfo.pluginName
@@ -220,8 +249,14 @@ class PluginManager(object):
             if not os.path.exists(pluginMainFile):
                 raise RuntimeError(f'The main plugin python file {pluginMainFile} does not exist.')
 
-            pluginModule = importlib.import_module(f'{pluginName}.{pluginName}')
-            importlib.reload(pluginModule)
+            tStart = time.time()
+
+            # Modules are only reloaded if the plugin was imported before (e.g. when it's activated again):
+            moduleName = f'{pluginName}.{pluginName}'
+            if moduleName in sys.modules:
+                pluginModule = importlib.reload(sys.modules[moduleName])
+            else:
+                pluginModule = importlib.import_module(moduleName)
 
             pluginClass = getattr(pluginModule, pluginName, None)
             if pluginClass == None:
@@ -231,7 +266,7 @@ class PluginManager(object):
             if pluginClass.dependentPluginNames() and len(pluginClass.dependentPluginNames()) > 0:
                 try:
                     for depPlugin in pluginClass.dependentPluginNames():
-                        self.setPluginActive(depPlugin, True, loadingPluginNames=loadingPluginNames)
+                        self.setPluginActive(depPlugin, True, loadingPluginNames=loadingPluginNames, saveState=False)
                 except Exception as e:
                     raise RuntimeError(f'Failed to load plugin {pluginName} because one of its dependencies failed to load: {str(e)}')
             
@@ -244,6 +279,8 @@ class PluginManager(object):
 
             pluginInstance.init()
             pluginInfo.pluginActive = True
+
+            logger.info(f'Loaded plugin {pluginName} in {time.time() - tStart:.2f}s.')
         except Exception as e:
             pluginLoadingError = f'Failed to import plugin {pluginName} because an exception occurred: {str(e)}'
             logger.error(pluginLoadingError)
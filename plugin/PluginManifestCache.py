@@ -0,0 +1,120 @@
+from typing import Dict, List
+import json
+import ast
+import os
+import logging
+
+logger = logging.getLogger(__name__)
+
+def parseDependentPluginNames(pluginMainFile: str, pluginName: str) -> List[str]:
+    """Extracts the names returned by dependentPluginNames() of the plugin class without importing the plugin.
+    Returns None if the dependencies are not a literal list of strings, in which case they are resolved when the plugin is imported.
+    """
+    with open(pluginMainFile, 'r', encoding='utf-8') as f:
+        tree = ast.parse(f.read(), filename=pluginMainFile)
+
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef) and node.name == pluginName:
+            for classNode in node.body:
+                if isinstance(classNode, ast.FunctionDef) and classNode.name == 'dependentPluginNames':
+                    returnNodes = [n for n in ast.walk(classNode) if isinstance(n, ast.Return)]
+                    if len(returnNodes) != 1:
+                        return None
+
+                    try:
+                        dependencies = ast.literal_eval(returnNodes[0].value)
+                    except ValueError:
+                        return None
+
+                    if isinstance(dependencies, (list, tuple)) and all(isinstance(d, str) for d in dependencies):
+                        return list(dependencies)
+
+                    return None
+
+            # The plugin class doesn't override dependentPluginNames:
+            return []
+
+    return None
+
+class PluginManifestCache(object):
+    """Persists the plugin folders of each plugins folder and the dependencies of each plugin, validated by modification times.
+    On warm starts plugin discovery only needs a stat of each plugins folder and plugin main file.
+    """
+    def __init__(self, filename: str = None) -> None:
+        super().__init__()
+
+        self.filename = filename
+        # plugins folder -> {'mtime': int, 'pluginFolders': [str]}
+        self.folders: Dict[str, dict] = dict()
+        # plugin main file -> {'mtime': int, 'dependencies': [str] or None}
+        self.plugins: Dict[str, dict] = dict()
+        self.dirty = False
+
+        self.load()
+
+    def load(self):
+        if not self.filename or not os.path.exists(self.filename):
+            return
+
+        try:
+            with open(self.filename, 'r') as f:
+                manifest = json.load(f)
+
+            self.folders = manifest.get('folders', dict())
+            self.plugins = manifest.get('plugins', dict())
+        except Exception as e:
+            logger.warning(f'Failed to read the plugin manifest {self.filename}. It will be rebuilt. Reason: {str(e)}')
+
+    def save(self):
+        if not self.filename or not self.dirty:
+            return
+
+        try:
+            os.makedirs(os.path.dirname(self.filename), exist_ok=True)
+            tempFilename = self.filename + '.tmp'
+            with open(tempFilename, 'w') as f:
+                json.dump({'folders': self.folders, 'plugins': self.plugins}, f, indent=2)
+
+            os.replace(tempFilename, self.filename)
+            self.dirty = False
+        except Exception as e:
+            logger.error(f'Failed to write the plugin manifest {self.filename}: {str(e)}')
+
+    def listPluginFolders(self, pluginsFolder: str) -> List[str]:
+        """Returns the names of the plugin folders in the given plugins folder.
+        """
+        # The modification time of a folder changes if entries are added, removed or renamed:
+        mtime = os.stat(pluginsFolder).st_mtime_ns
+        entry = self.folders.get(pluginsFolder)
+        if entry and entry['mtime'] == mtime:
+            return entry['pluginFolders']
+
+        pluginFolders = sorted(e.name for e in os.scandir(pluginsFolder) if e.is_dir() and e.name != '__pycache__')
+        self.folders[pluginsFolder] = {'mtime': mtime, 'pluginFolders': pluginFolders}
+        self.dirty = True
+
+        return pluginFolders
+
+    def getDependentPluginNames(self, pluginFolder: str, pluginName: str) -> List[str]:
+        """Returns the names of the plugins the given plugin depends on or None if they can only be determined by importing the plugin.
+        """
+        pluginMainFile = os.path.join(pluginFolder, pluginName + '.py').replace('\\', '/')
+        try:
+            mtime = os.stat(pluginMainFile).st_mtime_ns
+        except OSError:
+            return None
+
+        entry = self.plugins.get(pluginMainFile)
+        if entry and entry['mtime'] == mtime:
+            return entry['dependencies']
+
+        try:
+            dependencies = parseDependentPluginNames(pluginMainFile, pluginName)
+        except Exception as e:
+            logger.warning(f'Failed to parse the dependencies of plugin {pluginName}: {str(e)}')
+            dependencies = None
+
+        self.plugins[pluginMainFile] = {'mtime': mtime, 'dependencies': dependencies}
+        self.dirty = True
+
+        return dependencies
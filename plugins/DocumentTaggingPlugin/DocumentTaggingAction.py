@@ -2,6 +2,7 @@ from typing import List
 from MetadataManagerCore.actions.DocumentAction import DocumentAction
 from MetadataManagerCore import Keys
 from MetadataManagerCore.mongodb_manager import MongoDBManager
+from database import collection_keys
 import logging
 
 logger = logging.getLogger(__name__)
@@ -36,7 +37,7 @@ class DocumentTaggingAction(DocumentAction):
         collectionName = document.get(Keys.collection)
         sid = document.get(Keys.systemIDKey)
         if collectionName:
-            self.dbManager.insertOrModifyDocument(collectionName, sid, document, True)
+            collection_keys.insertOrModifyDocument(self.dbManager, collectionName, sid, document, True)
         else:
             logger.warning(f'The document {sid} does not have a collection key {Keys.collection}')
 
@@ -1,34 +1,74 @@
 from RenderingPipelinePlugin import PipelineKeys, RenderingPipelineUtil
 import os
+import functools
+from typing import Tuple
 from MetadataManagerCore import Keys
 
 INVALID_FILENAME_CHARS = '<>:"|?*'
 
+GERMAN_CHARACTER_REPLACEMENTS = (('ö', 'oe'), ('ü', 'ue'), ('ä', 'ae'), ('Ä', 'AE'), ('Ü', 'UE'), ('Ö', 'OE'), ('ß', 'ss'), ('ẞ', 'SS'))
+
+# Consecutive str.replace calls are faster than str.translate for short names. The replacements are skipped
+# if the name doesn't contain the characters, e.g. German characters in ASCII names.
+
 def replaceGermanCharacters(input: str):
-    return input.replace('ö', 'oe').replace('ü', 'ue').replace('ä', 'ae').replace('Ä', 'AE').replace('Ü', 'UE').replace('Ö', 'OE').replace('ß', 'ss').replace('ẞ', 'SS')
+    if input.isascii():
+        return input
 
-def extractNameFromNamingConvention(namingConvention: str, documentWithSettings: dict):
-    if not namingConvention:
-        # Apply default convention by using the sid
-        return documentWithSettings.get(Keys.systemIDKey, '')
+    for char, replacement in GERMAN_CHARACTER_REPLACEMENTS:
+        input = input.replace(char, replacement)
 
+    return input
+
+def removeInvalidFilenameCharacters(name: str):
+    for c in INVALID_FILENAME_CHARS:
+        if c in name:
+            name = name.replace(c, '')
+
+    return name
+
+@functools.lru_cache(maxsize=1024)
+def compileNamingConvention(namingConvention: str) -> Tuple[Tuple[str, bool], ...]:
+    """Parses the given naming convention, e.g. "[Folder]/[Name]_v01", into a tuple of (text, isKey) tokens.
+    """
+    tokens = []
     keyExtractionInProgress = False
     curKey = ''
-    name = ''
+    literal = ''
     for c in namingConvention:
         if c == '[':
             keyExtractionInProgress = True
         elif c == ']':
             keyExtractionInProgress = False
-            value = documentWithSettings.get(curKey, '')
-            if value == None:
-                value = ''
-            name += value
+            if literal:
+                tokens.append((literal, False))
+                literal = ''
+            tokens.append((curKey, True))
             curKey = ''
         elif keyExtractionInProgress:
             curKey += c
         else:
-            name += c
+            literal += c
+
+    if literal:
+        tokens.append((literal, False))
+
+    return tuple(tokens)
+
+def extractNameFromNamingConvention(namingConvention: str, documentWithSettings: dict):
+    if not namingConvention:
+        # Apply default convention by using the sid
+        return documentWithSettings.get(Keys.systemIDKey, '')
+
+    parts = []
+    for text, isKey in compileNamingConvention(namingConvention):
+        if isKey:
+            value = documentWithSettings.get(text, '')
+            parts.append(value if value != None else '')
+        else:
+            parts.append(text)
+
+    name = ''.join(parts)
     
     try:
         charsToReplace = documentWithSettings.get(PipelineKeys.CharactersToReplaceInNamingConvention)
@@ -42,10 +82,7 @@ def extractNameFromNamingConvention(namingConvention: str, documentWithSettings:
     if documentWithSettings.get(PipelineKeys.ReplaceGermanCharacters, ''):
         name = replaceGermanCharacters(name)
 
-    for c in INVALID_FILENAME_CHARS:
-        name = name.replace(c, '')
-
-    return name
+    return removeInvalidFilenameCharacters(name)
 
 class NamingConvention(object):
     def __init__(self) -> None:
@@ -8,8 +8,17 @@ from MetadataManagerCore.actions.DocumentAction import DocumentAction
 from typing import List
 import os
 import typing
+import threading
+import collections
+from database import collection_keys
 from RenderingPipelinePlugin.PipelineType import PipelineType
 from MetadataManagerCore.animation import anim_util
+from RenderingPipelinePlugin.submitters.submission_graph import submitInDependencyOrder
+from DocumentActionExecutionEngine import DocumentActionExecutionMode
+import VisualScriptingExtensions.third_party_extensions.deadline_nodes as deadline_nodes
+import logging
+
+logger = logging.getLogger(__name__)
 
 if typing.TYPE_CHECKING:
     from RenderingPipelinePlugin.RenderingPipeline import RenderingPipeline
@@ -17,6 +26,8 @@ if typing.TYPE_CHECKING:
 if os.name == 'nt':
     import VisualScripting.node_exec.windows_nodes as windows_nodes
 
+DEFAULT_SUBMISSION_THREAD_COUNT = 8
+
 class PipelineAction(Action):
     def __init__(self, pipeline: 'RenderingPipeline'):
         super().__init__()
@@ -50,18 +61,57 @@ class CopyForDeliveryDocumentAction(PipelineDocumentAction):
     def displayName(self):
         return "Copy for Delivery"
 
+    @property
+    def executionMode(self):
+        # Documents are copied independently, the copies are I/O bound:
+        return DocumentActionExecutionMode.Threaded
+
+    @property
+    def executionWidth(self) -> int:
+        return 4
+
     def execute(self, document: dict):
         documentWithSettings = self.pipeline.combineDocumentWithSettings(document, self.pipeline.environmentSettings)
         self.pipeline.copyForDelivery(documentWithSettings)
 
 class SubmissionAction(PipelineDocumentAction):
+    """Submits the documents concurrently on the thread pool of the document action execution engine.
+    The submitters of a single document run in dependency order. Failures are raised to the engine which reports them per document.
+    """
+    def __init__(self, pipeline: 'RenderingPipeline'):
+        super().__init__(pipeline)
+
+        # Job file batch of the running submissions, shared by overlapping runs:
+        self.jobFileBatch: deadline_nodes.JobFileBatch = None
+        self.runCount = 0
+        self.runLock = threading.Lock()
+
     @property
     def displayName(self):
         return 'Submit'
 
-    def execute(self, document: dict, basePriority: int, submitters: List[Submitter], initialStatus: str, resX: int, resY: int):
-        lastJobId = None
+    @property
+    def executionMode(self):
+        return DocumentActionExecutionMode.Threaded
+
+    @property
+    def executionWidth(self) -> int:
+        try:
+            threadCount = int(self.pipeline.environmentSettings.get(PipelineKeys.DeadlineSubmissionThreadCount) or DEFAULT_SUBMISSION_THREAD_COUNT)
+        except:
+            threadCount = DEFAULT_SUBMISSION_THREAD_COUNT
+
+        return max(1, threadCount)
+
+    def beginDocumentExecution(self):
+        # All job files of this run are written to a shared batch directory:
+        with self.runLock:
+            if self.runCount == 0:
+                self.jobFileBatch = deadline_nodes.JobFileBatch()
 
+            self.runCount += 1
+
+    def execute(self, document: dict, basePriority: int, submitters: List[Submitter], initialStatus: str, resX: int, resY: int):
         if resX != None and resY != None:
             document[PipelineKeys.ResolutionOverwriteX] = resX
             document[PipelineKeys.ResolutionOverwriteY] = resY
@@ -75,7 +125,15 @@ class SubmissionAction(PipelineDocumentAction):
         for submitter in submitters:
             if submitter.active:
                 submitter.initialStatus = initialStatus
-                lastJobId = submitter.submit(documentWithSettings, dependentJobIds=lastJobId)
+
+        with deadline_nodes.jobFileBatchContext(self.jobFileBatch):
+            submitInDependencyOrder(submitters, documentWithSettings)
+
+    def onDocumentExecutionFinished(self):
+        with self.runLock:
+            self.runCount = max(0, self.runCount - 1)
+            if self.runCount == 0:
+                self.jobFileBatch = None
 
     @property
     def runsOnMainThread(self):
@@ -91,11 +149,14 @@ class CollectionUpdateAction(PipelineAction):
         return 'Update Collection'
 
     def execute(self, productTablePath: str, productTableSheetName: str):
-        self.pipeline.readProductTable(productTablePath, productTableSheetName, self.pipeline.environmentSettings, onProgressUpdate=self.updateProgress)
+        syncResult = self.pipeline.readProductTable(productTablePath, productTableSheetName, self.pipeline.environmentSettings, onProgressUpdate=self.updateProgress)
         pipelineEnv = self.pipeline.environment
+        if syncResult:
+            pipelineEnv.settings[PipelineKeys.TableHeader] = syncResult.header
         pipelineEnv.settings[PipelineKeys.ProductTable] = productTablePath.replace('\\', '/')
         pipelineEnv.settings[PipelineKeys.ProductTableSheetName] = productTableSheetName
         self.pipeline.environmentManager.upsert(pipelineEnv.uniqueEnvironmentId)
+        self.pipeline.invalidateEnvironmentSettings()
 
         if self.pipeline.viewerRegistry.documentSearchFilterViewer:
             self.pipeline.viewerRegistry.documentSearchFilterViewer.viewItemsOverThreadPool(saveSearchHistoryEntry=False)
@@ -170,11 +231,16 @@ class RefreshPreviewFilenameAction(PipelineAction):
         ext = self.pipeline.getPreferredPreviewExtension(self.pipeline.environmentSettings)
         collection = self.pipeline.dbManager.db[self.pipeline.dbCollectionName]
 
+        keyCountDeltas = collections.Counter()
         for document in collection.find({}):
+            oldKeys = set(document.keys())
             documentWithSettings = self.pipeline.combineDocumentWithSettings(document, self.pipeline.environmentSettings)
             filename = self.pipeline.namingConvention.getPostFilename(documentWithSettings, ext=ext)
             document[Keys.preview] = filename
 
             collection.replace_one({'_id': document['_id']}, document)
+            keyCountDeltas.update(collection_keys.getKeyDeltas(oldKeys, set(document.keys())))
+
+        collection_keys.updateKeyCounts(self.pipeline.dbManager.db, self.pipeline.dbCollectionName, keyCountDeltas)
         
         qt_util.runInMainThread(lambda: self.pipeline.viewerRegistry.documentSearchFilterViewer.viewItems(saveSearchHistoryEntry=False))
\ No newline at end of file
@@ -42,6 +42,12 @@ DeliveryNaming = 'rp_delivery_naming'
 Perspective = 'rp_perspective'
 SceneExtension = 'rp_scene_extension'
 Mapping = 'rp_mapping'
+ContentHash = 'rp_content_hash'
+RemovedFromTable = 'rp_removed_from_table'
+# If True, rows that were removed from the product table are flagged with RemovedFromTable instead of deleted when syncing:
+FlagRemovedDocuments = 'rp_flag_removed_documents'
+# The header of the last read product table. Columns that are removed from the table are removed from the documents:
+TableHeader = 'rp_table_header'
 
 BaseSceneFilename = 'rp_base_scene_filename'
 InputSceneFilename = 'rp_input_scene_filename'
@@ -86,6 +92,7 @@ DeadlineDeliveryTimeout = 'rp_deadline_delivery_timeout'
 DeadlineRemovePadding = 'rp_deadline_remove_padding'
 DeadlineConcurrentTasks = 'rp_deadline_concurrent_tasks'
 DeadlineStateSet = 'rp_deadline_state_set'
+DeadlineSubmissionThreadCount = 'rp_deadline_submission_thread_count'
 
 # 3dsMax
 Max3dsVersion = 'rp_3dsmax_version'
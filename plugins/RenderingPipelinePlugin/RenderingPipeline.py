@@ -16,6 +16,7 @@ from RenderingPipelinePlugin.submitters.Submitter import Submitter, SubmitterReq
 import asset_manager
 from typing import Callable, Dict, List
 from table import table_util
+from database import collection_keys
 from MetadataManagerCore.environment.Environment import Environment
 from RenderingPipelinePlugin.NamingConvention import NamingConvention
 from RenderingPipelinePlugin.NamingConvention import extractNameFromNamingConvention
@@ -32,10 +33,31 @@ from RenderingPipelinePlugin.PipelineActions import RefreshPreviewFilenameAction
 from MetadataManagerCore.actions.Action import Action
 from qt_extensions.RegexPatternInputValidator import RegexPatternInputValidator
 import uuid
+import time
+from pymongo import UpdateOne, DeleteMany, UpdateMany
+import json
+import collections
 
 logger = logging.getLogger(__name__)
 
+class CollectionSyncResult(object):
+    def __init__(self) -> None:
+        super().__init__()
+
+        self.added = 0
+        self.changed = 0
+        self.removed = 0
+        self.unchanged = 0
+        # The header of the read table. Callers store it as PipelineKeys.TableHeader in the environment settings:
+        self.header: List[str] = []
+
+    def __str__(self) -> str:
+        return f'Added: {self.added}, Changed: {self.changed}, Removed: {self.removed}, Unchanged: {self.unchanged}'
+
 class RenderingPipeline(object):
+    # Bumped whenever environments are modified or loaded. Invalidates the evaluated settings caches of all pipelines.
+    environmentSettingsVersion = 0
+
     def __init__(self, name: str, serviceRegistry: ServiceRegistry, viewerRegistry: ViewerRegistry, appInfo: AppInfo) -> None:
         super().__init__()
         
@@ -55,6 +77,24 @@ class RenderingPipeline(object):
 
         self.submissionCheckBoxStates: typing.Dict[str, bool] = dict()
 
+        # (environmentSettingsVersion, environment, evaluated settings)
+        self.environmentSettingsCache: typing.Tuple[int, Environment, dict] = None
+        self.environmentSettingsCacheHits = 0
+        self.environmentSettingsCacheMisses = 0
+
+        # Number of documents that are written to the database with a single bulk write when processing documents.
+        self.documentWriteBatchSize = 1000
+
+    @property
+    def flagRemovedDocuments(self) -> bool:
+        """If True, documents that no longer appear in the product table are flagged instead of deleted when syncing the collection.
+        """
+        return self.shouldFlagRemovedDocuments(self.environmentSettings)
+
+    @staticmethod
+    def shouldFlagRemovedDocuments(environmentSettings: dict) -> bool:
+        return bool(environmentSettings.get(PipelineKeys.FlagRemovedDocuments, False)) if environmentSettings else False
+
     def activate(self):
         if not self.activationInitialized:
             self.registerAndLinkActions()
@@ -275,11 +315,34 @@ class RenderingPipeline(object):
 
     @property
     def environmentSettings(self) -> dict:
+        """The evaluated settings of the pipeline environment. They are cached until invalidateEnvironmentSettings() is called.
+        Environment manager state changes and edits in the environment and pipeline viewers invalidate the cache.
+        Code that modifies Environment.settings directly must call invalidateEnvironmentSettings() itself.
+        Note: The returned dictionary is shared and must not be modified.
+        """
         environment = self.environmentManager.getEnvironmentFromName(self.environmentName)
-        if environment:
-            return environment.getEvaluatedSettings()
+        if not environment:
+            return None
+
+        cache = self.environmentSettingsCache
+        if cache and cache[0] == RenderingPipeline.environmentSettingsVersion and cache[1] is environment:
+            self.environmentSettingsCacheHits += 1
+            return cache[2]
+
+        self.environmentSettingsCacheMisses += 1
+        version = RenderingPipeline.environmentSettingsVersion
+        settings = environment.getEvaluatedSettings()
+        self.environmentSettingsCache = (version, environment, settings)
         
-        return None
+        return settings
+
+    @property
+    def environmentSettingsCacheStatistics(self) -> dict:
+        return {'hits': self.environmentSettingsCacheHits, 'misses': self.environmentSettingsCacheMisses}
+
+    @staticmethod
+    def invalidateEnvironmentSettings():
+        RenderingPipeline.environmentSettingsVersion += 1
 
     def combineDocumentWithSettings(self, document: dict, settings: dict):
         docCopy = document.copy()
@@ -373,41 +436,71 @@ class RenderingPipeline(object):
         return perspectiveCodes
 
     def generateDocuments(self, table: Table, header: typing.List[str], rowIndices: typing.List[int], environmentSettings: dict = None,
-                    onProgressUpdate: Callable[[float, str],None] = None, logHandler: Callable[[str],None] = None):
-        docs = []
-        rowIdx = 1
-        rowCount = table.nrows
-
+                    onProgressUpdate: Callable[[float, str],None] = None, logHandler: Callable[[str],None] = None) -> typing.Iterator[dict]:
+        """Yields a document per table row. The rows are streamed, progress is reported by processDocuments.
+        """
         if onProgressUpdate:
             onProgressUpdate(0, 'Generating documents...')
             
         for row in table.getRowsWithoutHeader():
             # Convert values to string for consistency
             row = [str(v) if v != None else v for v in row]
-            documentDict = self.zipRowAndHeader(row, header, rowIndices)
-
-            docs.append(documentDict)
-
-            rowIdx += 1
-
-            if onProgressUpdate:
-                onProgressUpdate(float(rowIdx) / rowCount)
+            yield self.zipRowAndHeader(row, header, rowIndices)
 
+    def preprocessDocuments(self, docs: typing.Iterable[dict], environmentSettings: dict = None, 
+                            onProgressUpdate: Callable[[float, str],None] = None, logHandler: Callable[[str],None] = None) -> typing.Iterable[dict]:
+        """Override to modify the generated documents. Implementations should yield the documents instead of collecting them.
+        """
         return docs
 
-    def preprocessDocuments(self, docs: typing.List[dict], environmentSettings: dict = None, 
-                            onProgressUpdate: Callable[[float, str],None] = None, logHandler: Callable[[str],None] = None):
-        return docs
+    def computeContentHash(self, documentDict: dict) -> str:
+        content = {k: v for k, v in documentDict.items() if k != PipelineKeys.ContentHash}
+        return hashlib.sha1(json.dumps(content, sort_keys=True, default=str).encode('utf-8')).hexdigest()
 
-    def processDocuments(self, docs: typing.List[dict], collectionName: str, environmentSettings: dict = None,
-                    onProgressUpdate: Callable[[float, str],None] = None, logHandler: Callable[[str],None] = None):
+    def loadContentHashes(self, collection) -> typing.Tuple[Dict[str, str], typing.Set[str]]:
+        """Returns a sid -> content hash mapping of the documents in the given collection and the sids of flagged documents.
+        """
+        contentHashes = dict()
+        flaggedSids = set()
+        projection = {Keys.systemIDKey: True, PipelineKeys.ContentHash: True, PipelineKeys.RemovedFromTable: True}
+        for document in collection.find({}, projection):
+            sid = document.get(Keys.systemIDKey)
+            if sid != None:
+                contentHashes[sid] = document.get(PipelineKeys.ContentHash)
+                if document.get(PipelineKeys.RemovedFromTable):
+                    flaggedSids.add(sid)
+
+        return contentHashes, flaggedSids
+
+    def processDocuments(self, docs: typing.Iterable[dict], collectionName: str, environmentSettings: dict = None,
+                    onProgressUpdate: Callable[[float, str],None] = None, logHandler: Callable[[str],None] = None, 
+                    syncCollection=False, docCount: int = None, removedHeaderKeys: typing.Iterable[str] = ()) -> CollectionSyncResult:
+        """Writes the documents to the given collection. 
+        If syncCollection is True, only added and changed documents are written (detected by content hashes) and documents 
+        that are not part of docs anymore are deleted (or flagged if flagRemovedDocuments is True) - all with a single bulk write.
+        docs may be a generator. docCount is used for the progress, without it only the number of processed rows is reported.
+        removedHeaderKeys (columns that were removed from the table) are unset in the written documents.
+        """
+        flagRemovedDocuments = self.shouldFlagRemovedDocuments(environmentSettings)
+        # The removed flag is always unset because the option may have been disabled since the last sync:
+        unsetKeys = set(removedHeaderKeys) | {PipelineKeys.RemovedFromTable}
 
         # In case of rendering name duplicates, create mappings/links to the document with the first-assigned rendering.
         renderingToDocumentMap: Dict[str,dict] = dict()
 
         sidSet = set()
         rowIdx = 1
-        docCount = len(docs)
+        if docCount == None and hasattr(docs, '__len__'):
+            docCount = len(docs)
+
+        collection = self.dbManager.db[collectionName]
+        collection.create_index(Keys.systemIDKey)
+        writeOperations: List[UpdateOne] = []
+        # The keys of the written documents (sid -> keys) to update the key registry of the collection:
+        writtenDocumentKeys: Dict[str, typing.Set[str]] = dict()
+
+        syncResult = CollectionSyncResult()
+        existingContentHashes, flaggedSids = self.loadContentHashes(collection) if syncCollection else (dict(), set())
 
         for documentDict in docs:
             if any(rowSkipCondition(documentDict) for rowSkipCondition in self.rowSkipConditions):
@@ -452,12 +545,84 @@ class RenderingPipeline(object):
                         renderingToDocumentMap[renderingName] = documentDict
                         documentDict[PipelineKeys.Mapping] = None
 
-                    self.dbManager.insertOrModifyDocument(collectionName, sid, documentDict, checkForModifications=False)
+                    # The document dict is modified for the next perspective so a copy is written.
+                    documentCopy = documentDict.copy()
+                    documentCopy[PipelineKeys.ContentHash] = self.computeContentHash(documentCopy)
+
+                    if sid in existingContentHashes:
+                        if existingContentHashes[sid] == documentCopy[PipelineKeys.ContentHash] and not sid in flaggedSids:
+                            syncResult.unchanged += 1
+                            continue
+
+                        syncResult.changed += 1
+                    else:
+                        syncResult.added += 1
+
+                    update = {'$set': documentCopy}
+                    documentUnsetKeys = {key: '' for key in unsetKeys if not key in documentCopy}
+                    if len(documentUnsetKeys) > 0:
+                        update['$unset'] = documentUnsetKeys
+
+                    writeOperations.append(UpdateOne({Keys.systemIDKey: sid}, update, upsert=True))
+                    writtenDocumentKeys[sid] = set(documentCopy.keys())
 
             rowIdx += 1
 
-            if onProgressUpdate:
-                onProgressUpdate(float(rowIdx) / docCount)
+            # When syncing, all changes are written with a single bulk write at the end.
+            if not syncCollection and len(writeOperations) >= self.documentWriteBatchSize:
+                keyCountDeltas = self.getUpsertKeyCountDeltas(collection, writtenDocumentKeys, unsetKeys)
+                self.writeDocumentBatch(collection, writeOperations, self.getRowProgress(rowIdx, docCount), onProgressUpdate, keyCountDeltas)
+                writeOperations = []
+                writtenDocumentKeys = dict()
+            elif onProgressUpdate:
+                if docCount:
+                    onProgressUpdate(self.getRowProgress(rowIdx, docCount))
+                elif rowIdx % 1000 == 0:
+                    onProgressUpdate(0, f'Processed {rowIdx - 1} rows...')
+
+        keyCountDeltas = self.getUpsertKeyCountDeltas(collection, writtenDocumentKeys, unsetKeys)
+
+        if syncCollection:
+            # Already flagged documents are deleted if flagging was disabled in the meantime:
+            removedSids = [sid for sid in existingContentHashes.keys() if not sid in sidSet and not (flagRemovedDocuments and sid in flaggedSids)]
+            syncResult.removed = len(removedSids)
+
+            if len(removedSids) > 0:
+                if flagRemovedDocuments:
+                    writeOperations.append(UpdateMany({Keys.systemIDKey: {'$in': removedSids}}, {'$set': {PipelineKeys.RemovedFromTable: True}}))
+                    keyCountDeltas.update(collection_keys.getUpsertKeyDeltas(collection, {sid: {PipelineKeys.RemovedFromTable} for sid in removedSids}, Keys.systemIDKey))
+                else:
+                    writeOperations.append(DeleteMany({Keys.systemIDKey: {'$in': removedSids}}))
+                    keyCountDeltas.update(collection_keys.getRemovalKeyDeltas(collection, removedSids, Keys.systemIDKey))
+
+        self.writeDocumentBatch(collection, writeOperations, 1.0, onProgressUpdate, keyCountDeltas)
+
+        return syncResult
+
+    @staticmethod
+    def getRowProgress(rowIdx: int, docCount: int) -> float:
+        return min(float(rowIdx) / docCount, 1.0) if docCount else 0.0
+
+    def getUpsertKeyCountDeltas(self, collection, writtenDocumentKeys: Dict[str, typing.Set[str]], unsetKeys: typing.Set[str]):
+        if len(writtenDocumentKeys) == 0:
+            return collections.Counter()
+
+        return collection_keys.getUpsertKeyDeltas(collection, writtenDocumentKeys, Keys.systemIDKey, unsetKeys)
+
+    def writeDocumentBatch(self, collection, writeOperations: list, progress: float, onProgressUpdate: Callable[[float, str],None] = None, 
+                           keyCountDeltas: Dict[str, int] = None):
+        if len(writeOperations) == 0:
+            return
+
+        tStart = time.time()
+        collection.bulk_write(writeOperations, ordered=False)
+        if keyCountDeltas:
+            collection_keys.updateKeyCounts(self.dbManager.db, collection.name, keyCountDeltas)
+        elapsedTime = time.time() - tStart
+
+        logger.debug(f'Wrote {len(writeOperations)} documents to {collection.name} in {elapsedTime:.2f}s.')
+        if onProgressUpdate:
+            onProgressUpdate(progress, f'Wrote {len(writeOperations)} documents in {elapsedTime:.2f}s.')
 
     def readTable(self, productTablePath: str = None, excelSheetName: str = None):
         return table_util.readTable(productTablePath, excelSheetName=excelSheetName)
@@ -474,7 +639,8 @@ class RenderingPipeline(object):
         return missingKeys
 
     def readProductTable(self, productTablePath: str = None, productTableSheetname: str = None, environmentSettings: dict = None, 
-                         onProgressUpdate: Callable[[float, str],None] = None, replaceExistingCollection=False, logHandler: Callable[[str],None] = None):
+                         onProgressUpdate: Callable[[float, str],None] = None, replaceExistingCollection=False, logHandler: Callable[[str],None] = None,
+                         syncCollection=False) -> CollectionSyncResult:
         """Generates a database collection with rendering entries from the given table.
 
         Args:
@@ -482,9 +648,13 @@ class RenderingPipeline(object):
             productTableSheetname (str, optional): [description]. Defaults to None.
             environmentSettings (dict, optional): [description]. Defaults to None.
             onProgressUpdate (Callable[[float, str],None], optional): [description]. The first argument is the progress in [0,1], the second is the progress message (optional). Defaults to None.
+            syncCollection (bool, optional): Only writes changed rows and removes rows that are missing in the table. Ignored if replaceExistingCollection is True. Defaults to False.
 
         Raises:
             RuntimeError: [description]
+
+        Returns:
+            CollectionSyncResult: The number of added, changed, removed and unchanged documents.
         """
         table = self.readTable(productTablePath, excelSheetName=productTableSheetname)
 
@@ -517,15 +687,23 @@ class RenderingPipeline(object):
                 existingCollection = self.dbManager.db[collectionName]
                 if existingCollection.count() > 0:
                     self.dbManager.db[collectionName].rename(tempCollectionName)
+                    # The collection is rebuilt from scratch:
+                    collection_keys.reset(self.dbManager.db, collectionName)
                 else:
                     replaceExistingCollection = False
             except Exception as e:
                 raise RuntimeError(f'Failed to rename collection {collectionName} to temporary collection {tempCollectionName}. Maybe it already exists?')
 
         try:
+            # The documents are streamed from the table to the database. The row count (a single counting pass for streamed tables) is only used for the progress.
             docs = self.generateDocuments(table, header, rowIndices, environmentSettings, onProgressUpdate, logHandler)
             docs = self.preprocessDocuments(docs, environmentSettings, onProgressUpdate, logHandler)
-            self.processDocuments(docs, collectionName, environmentSettings, onProgressUpdate, logHandler)
+            previousHeader = (environmentSettings or {}).get(PipelineKeys.TableHeader) or []
+            removedHeaderKeys = [key for key in previousHeader if not key in header]
+            syncResult = self.processDocuments(docs, collectionName, environmentSettings, onProgressUpdate, logHandler, 
+                                               syncCollection=syncCollection and not replaceExistingCollection, docCount=max(table.nrows - 1, 0),
+                                               removedHeaderKeys=removedHeaderKeys)
+            syncResult.header = header
             self.postProcessHeader(header)
 
             if replaceExistingCollection:
@@ -534,6 +712,13 @@ class RenderingPipeline(object):
                 droppedTempCollection = True
 
             self.dbManager.addMissingHeaderInfos(self.dbCollectionName, header)
+
+            if syncCollection and not replaceExistingCollection:
+                logger.info(f'Synced collection {collectionName}: {syncResult}')
+                if logHandler:
+                    logHandler(f'Synced collection: {syncResult}')
+
+            return syncResult
         except Exception as e:
             logger.error(str(e))
             if logHandler:
@@ -543,6 +728,7 @@ class RenderingPipeline(object):
             if replaceExistingCollection and not droppedTempCollection:
                 self.dbManager.dropCollection(collectionName)
                 self.dbManager.db[tempCollectionName].rename(collectionName)
+                collection_keys.invalidate(self.dbManager.db, collectionName)
 
             raise e
 
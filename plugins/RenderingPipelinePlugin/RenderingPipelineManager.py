@@ -5,6 +5,7 @@ from typing import List
 from MetadataManagerCore import Keys
 from RenderingPipelinePlugin.RenderingPipeline import RenderingPipeline
 from MetadataManagerCore.Event import Event
+from database import collection_keys
 import logging
 from ServiceRegistry import ServiceRegistry
 
@@ -28,6 +29,8 @@ class RenderingPipelineManager(object):
 
         self.onPipelineClassRegistrationEvent = Event()
 
+        self.environmentManager.onStateChanged.subscribe(RenderingPipeline.invalidateEnvironmentSettings)
+
         self.registerClass(RenderingPipeline)
 
     def registerClass(self, pipelineClass):
@@ -139,6 +142,7 @@ class RenderingPipelineManager(object):
             # Collections may not exist:
             try:
                 self.serviceRegistry.dbManager.dropCollection(pipeline.dbCollectionName)
+                collection_keys.invalidate(self.dbManager.db, pipeline.dbCollectionName)
             except:
                 pass
 
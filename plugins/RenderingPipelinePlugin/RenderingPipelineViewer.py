@@ -21,6 +21,7 @@ from qt_extensions.LoadingButtonWrapper import LoadingButtonWrapper
 
 from RenderingPipelinePlugin.PipelineType import PipelineType
 from RenderingPipelinePlugin.RenderingPipelineManager import RenderingPipelineManager, RenderingPipelinesCollectionName
+from RenderingPipelinePlugin.PipelineActions import DEFAULT_SUBMISSION_THREAD_COUNT
 import asset_manager
 from qt_extensions import qt_util
 from qt_extensions.ProgressDialog import ProgressDialog
@@ -89,6 +90,11 @@ class RenderingPipelineViewer(object):
         self.dialog.productTableEdit.textChanged.connect(self.onProductTableChanged)
         self.dialog.productTableSheetNameComboBox.currentTextChanged.connect(self.onProductTableSheetNameChanged)
         self.dialog.copyToClipboardButton.clicked.connect(lambda: QtGui.QGuiApplication.clipboard().setText(self.dialog.nukeSourceCodeTemplateEdit.toPlainText()))
+        # Syncing is ignored when the existing table is replaced:
+        self.dialog.replaceExistingCollectionCheckBox.stateChanged.connect(lambda: self.dialog.syncExistingCollectionCheckBox.setEnabled(not self.dialog.replaceExistingCollectionCheckBox.isChecked()))
+        self.dialog.syncExistingCollectionCheckBox.setEnabled(not self.dialog.replaceExistingCollectionCheckBox.isChecked())
+        self.dialog.replaceExistingCollectionCheckBox.stateChanged.connect(lambda: self.dialog.flagRemovedDocumentsCheckBox.setEnabled(not self.dialog.replaceExistingCollectionCheckBox.isChecked()))
+        self.dialog.flagRemovedDocumentsCheckBox.setEnabled(not self.dialog.replaceExistingCollectionCheckBox.isChecked())
 
         self.dialog.statusLabel.setText('')
         self.dialog.statusLabel.setStyleSheet('color: red')
@@ -148,6 +154,7 @@ class RenderingPipelineViewer(object):
         self.environmentEntries.append(LineEditEnvironmentEntry(PipelineKeys.DeadlinePriority, self.dialog.deadlinePriorityEdit, valueType=int))
         self.environmentEntries.append(CheckBoxEnvironmentEntry(PipelineKeys.DeadlineRemovePadding, self.dialog.removeFilenamePaddingCheckBox, PipelineType.Max3ds, self.dialog.pipelineTypeComboBox))
         self.environmentEntries.append(LineEditEnvironmentEntry(PipelineKeys.DeadlineConcurrentTasks, self.dialog.deadlineConcurrentTasksEdit, valueType=int))
+        self.environmentEntries.append(LineEditEnvironmentEntry(PipelineKeys.DeadlineSubmissionThreadCount, self.dialog.deadlineSubmissionThreadCountEdit, valueType=int, fallbackValue=DEFAULT_SUBMISSION_THREAD_COUNT))
         self.environmentEntries.append(ComboBoxEnvironmentEntry(PipelineKeys.Max3dsVersion, self.dialog.versionOf3dsMaxComboBox, PipelineType.Max3ds, self.dialog.pipelineTypeComboBox))
         self.environmentEntries.append(ComboBoxEnvironmentEntry(PipelineKeys.BlenderVersion, self.dialog.blenderVersionComboBox, PipelineType.Blender, self.dialog.pipelineTypeComboBox))
         self.environmentEntries.append(ComboBoxEnvironmentEntry(PipelineKeys.UnrealEngineVersion, self.dialog.unrealEngineVersionComboBox, PipelineType.UnrealEngine, self.dialog.pipelineTypeComboBox))
@@ -227,6 +234,7 @@ class RenderingPipelineViewer(object):
         self.environmentViewer.setEnvironment(self.environment)
         self.environmentViewer.setKeyDisplayIgnoreFilter('^rp_.*')
         self.environmentViewer.allowSave = False
+        self.environmentViewer.onSettingsEdited.subscribe(RenderingPipeline.invalidateEnvironmentSettings)
 
         self.rowSkipConditions: List[RowSkipConditionUIElement] = []
         self.dialog.addRowSkipConditionButton.clicked.connect(self.onAddRowSkipConditionClick)
@@ -579,6 +587,7 @@ class RenderingPipelineViewer(object):
         self.environment.settings[PipelineKeys.RenderingExtension] = renderingExtension
         self.environment.settings[PipelineKeys.PostOutputExtensions] = postOutputExtensionsStr
         self.environment.settings[PipelineKeys.PerspectiveCodes] = perspectiveCodesStr
+        self.environment.settings[PipelineKeys.FlagRemovedDocuments] = self.dialog.flagRemovedDocumentsCheckBox.isChecked()
 
         self.environment.settings[PipelineKeys.SceneExtension] = self.getSceneExtensionFromPipelineType(pipelineType)
 
@@ -592,6 +601,9 @@ class RenderingPipelineViewer(object):
         except Exception as e:
             self.dialog.statusLabel.setText(str(e))
             return
+        finally:
+            # The settings were modified in place:
+            RenderingPipeline.invalidateEnvironmentSettings()
 
         if pipelineType == PipelineType.UnrealEngine.value:
             # Generate required python source code in project location
@@ -613,14 +625,21 @@ class RenderingPipelineViewer(object):
         if self.dialog.updateCollectionCheckBox.isChecked():
             try:
                 replaceExistingCollection = pipelineExists and self.dialog.replaceExistingCollectionCheckBox.isChecked()
+                syncCollection = pipelineExists and self.dialog.syncExistingCollectionCheckBox.isChecked()
                 progressDialog = ProgressDialog()
                 progressDialog.setTitle('')
                 progressDialog.open()
                 self.dialog.statusLabel.setText('')
                 self.dialog.logTextEdit.clear()
                 logHandler = lambda msg: self.dialog.logTextEdit.append(msg)
-                pipeline.readProductTable(productTablePath=productTable, productTableSheetname=sheetName, environmentSettings=self.environment.getEvaluatedSettings(), 
-                                        onProgressUpdate=progressDialog.updateProgress, replaceExistingCollection=replaceExistingCollection, logHandler=logHandler)
+                syncResult = pipeline.readProductTable(productTablePath=productTable, productTableSheetname=sheetName, environmentSettings=self.environment.getEvaluatedSettings(), 
+                                        onProgressUpdate=progressDialog.updateProgress, replaceExistingCollection=replaceExistingCollection, logHandler=logHandler,
+                                        syncCollection=syncCollection)
+                if syncResult:
+                    self.environment.settings[PipelineKeys.TableHeader] = syncResult.header
+
+                if syncCollection and syncResult:
+                    self.dialog.statusLabel.setText(f'Synced table. {syncResult}')
             except Exception as e:
                 self.dialog.statusLabel.setText(f'Failed reading the product table {productTable} with exception: {str(e)}')
                 return
@@ -629,6 +648,7 @@ class RenderingPipelineViewer(object):
 
         self.renderingPipelineManager.addNewPipelineInstance(pipeline, replaceExisting=True)
         self.environmentManager.upsert(self.environment)
+        RenderingPipeline.invalidateEnvironmentSettings()
 
         self.viewerRegistry.environmentManagerViewer.refreshEnvironmentsComboBox()
         self.viewerRegistry.collectionViewer.refreshCollections()
@@ -646,6 +666,8 @@ class RenderingPipelineViewer(object):
             self.dialog.updateCollectionCheckBox.setText('Update Table')
             self.dialog.deleteButton.setVisible(True)
             self.dialog.replaceExistingCollectionCheckBox.setVisible(True)
+            self.dialog.syncExistingCollectionCheckBox.setVisible(True)
+            self.dialog.flagRemovedDocumentsCheckBox.setVisible(True)
         else:
             prevEnv = self.environment
             self.environment = Environment(EnvironmentManager.getIdFromEnvironmentName(pipelineName))
@@ -657,6 +679,8 @@ class RenderingPipelineViewer(object):
             self.dialog.updateCollectionCheckBox.setText('Create Table')
             self.dialog.deleteButton.setVisible(False)
             self.dialog.replaceExistingCollectionCheckBox.setVisible(False)
+            self.dialog.syncExistingCollectionCheckBox.setVisible(False)
+            self.dialog.flagRemovedDocumentsCheckBox.setVisible(False)
 
     def refreshProductSheetNameComboBox(self):
         self.dialog.productTableSheetNameComboBox.clear()
@@ -711,6 +735,7 @@ class RenderingPipelineViewer(object):
             self.dialog.pipelineClassComboBox.setCurrentText(environmentSettings.get(PipelineKeys.PipelineClass, ''))
             self.dialog.productTableSheetNameComboBox.setCurrentText(environmentSettings.get(PipelineKeys.ProductTableSheetName, ''))
             self.dialog.replaceGermanCharactersCheckBox.setChecked(environmentSettings.get(PipelineKeys.ReplaceGermanCharacters, True))
+            self.dialog.flagRemovedDocumentsCheckBox.setChecked(environmentSettings.get(PipelineKeys.FlagRemovedDocuments, False))
             self.dialog.perspectiveCodesEdit.setText(environmentSettings.get(PipelineKeys.PerspectiveCodes, ''))
             self.dialog.renderingExtensionComboBox.setCurrentText(environmentSettings.get(PipelineKeys.RenderingExtension, ''))
             self.dialog.postOutputExtensionsEdit.setText(environmentSettings.get(PipelineKeys.PostOutputExtensions, ''))
@@ -6,6 +6,8 @@ from RenderingPipelinePlugin.CustomSubmissionTaskViewer import CustomSubmissionT
 from RenderingPipelinePlugin.MetadataManagerTaskView import MetadataManagerTaskView
 from RenderingPipelinePlugin.submitters.MetadataManagerTaskSubmitter import MetadataManagerTaskSubmitter
 from RenderingPipelinePlugin.submitters.SubmitterInfo import SubmitterInfo, getPipelineSubmitterInfos, getPostSubmitterInfos
+from RenderingPipelinePlugin.submitters.submission_graph import hasDependencyCycle
+from PySide2.QtCore import Qt
 
 from qt_extensions import qt_util
 
@@ -17,6 +19,7 @@ class TaskExecutionOrderView(object):
         self.mainDialog = mainDialog
         self.submitterInfos: typing.List[SubmitterInfo] = []
         self.curPipelineType: PipelineType = None
+        self.selectedTaskOrderExecutionButton = None
 
         self.customSubmissionTaskViewer.onSubmissionTaskViewDeleted.subscribe(self.onSubmissionTaskViewDeleted)
         self.customSubmissionTaskViewer.onSubmissionTaskViewAdded.subscribe(self.onSubmissionTaskViewAdded)
@@ -24,6 +27,9 @@ class TaskExecutionOrderView(object):
         self.updateSubmitters(PipelineType.Max3ds)
         self.mainDialog.taskExecutionOrderMoveUpButton.clicked.connect(self.onTaskExecutionOrderMoveUpClick)
         self.mainDialog.taskExecutionOrderMoveDownButton.clicked.connect(self.onTaskExecutionOrderMoveDownClick)
+        self.mainDialog.taskDependsOnPreviousCheckBox.clicked.connect(self.onDependsOnPreviousTaskClicked)
+        self.mainDialog.taskDependenciesListWidget.itemChanged.connect(self.onTaskDependencyItemChanged)
+        self.refreshTaskDependencies()
 
     def getSubmitterInfosAsDict(self) -> typing.List[dict]:
         return [i.toDict() for i in self.submitterInfos]
@@ -48,6 +54,7 @@ class TaskExecutionOrderView(object):
             newIdx = newIdx if newIdx == 0 and idx != 0 else newIdx + 1
             self.submitterInfos.insert(newIdx, submitterInfo)
             layout.insertItem(newIdx, item)
+            self.refreshTaskDependencies()
 
     def onTaskExecutionOrderMoveUpClick(self):
         if self.selectedTaskOrderExecutionButton:
@@ -67,6 +74,68 @@ class TaskExecutionOrderView(object):
 
             self.submitterInfos.insert(newIdx, submitterInfo)
             layout.insertItem(newIdx, item)
+            self.refreshTaskDependencies()
+
+    @property
+    def selectedSubmitterInfo(self) -> SubmitterInfo:
+        return self.selectedTaskOrderExecutionButton.submitterInfo if self.selectedTaskOrderExecutionButton else None
+
+    def refreshTaskDependencies(self):
+        submitterInfo = self.selectedSubmitterInfo
+        checkBox: QtWidgets.QCheckBox = self.mainDialog.taskDependsOnPreviousCheckBox
+        listWidget: QtWidgets.QListWidget = self.mainDialog.taskDependenciesListWidget
+
+        listWidget.blockSignals(True)
+        listWidget.clear()
+        self.mainDialog.taskDependenciesGroupBox.setEnabled(submitterInfo != None)
+
+        if submitterInfo:
+            idx = self.submitterInfos.index(submitterInfo)
+            dependsOnPrevious = submitterInfo.dependencies == None
+            if dependsOnPrevious:
+                dependencies = [self.submitterInfos[idx-1].name] if idx > 0 else []
+            else:
+                dependencies = submitterInfo.dependencies
+
+            checkBox.setChecked(dependsOnPrevious)
+            listWidget.setEnabled(not dependsOnPrevious)
+
+            for info in self.submitterInfos:
+                if info != submitterInfo:
+                    item = QtWidgets.QListWidgetItem(info.name)
+                    item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
+                    item.setCheckState(Qt.Checked if info.name in dependencies else Qt.Unchecked)
+                    listWidget.addItem(item)
+
+        listWidget.blockSignals(False)
+
+    def onDependsOnPreviousTaskClicked(self, checked: bool):
+        submitterInfo = self.selectedSubmitterInfo
+        if not submitterInfo:
+            return
+
+        if checked:
+            submitterInfo.dependencies = None
+        else:
+            # Start with the implicit dependency:
+            idx = self.submitterInfos.index(submitterInfo)
+            submitterInfo.dependencies = [self.submitterInfos[idx-1].name] if idx > 0 else []
+
+        self.refreshTaskDependencies()
+
+    def onTaskDependencyItemChanged(self, item: QtWidgets.QListWidgetItem):
+        submitterInfo = self.selectedSubmitterInfo
+        if not submitterInfo:
+            return
+
+        listWidget: QtWidgets.QListWidget = self.mainDialog.taskDependenciesListWidget
+        previousDependencies = submitterInfo.dependencies
+        submitterInfo.dependencies = [listWidget.item(i).text() for i in range(listWidget.count()) if listWidget.item(i).checkState() == Qt.Checked]
+
+        if hasDependencyCycle(self.submitterInfos):
+            submitterInfo.dependencies = previousDependencies
+            self.refreshTaskDependencies()
+            QtWidgets.QMessageBox.warning(self.mainDialog, "Cyclic Dependency", f"{item.text()} can't be a dependency of {submitterInfo.name} because it would create a cycle.")
     
     def updateTaskExecutionOrderLayout(self):
         layout: QtWidgets.QVBoxLayout = self.mainDialog.taskExecutionOrderLayout
@@ -79,6 +148,8 @@ class TaskExecutionOrderView(object):
             taskView = self.customSubmissionTaskViewer.getViewByName(submitterInfo.name)
             self.addTaskExecutionOrderEntry(submitterInfo, taskView)
 
+        self.refreshTaskDependencies()
+
     def addTaskExecutionOrderEntry(self, submitterInfo: SubmitterInfo, taskView: MetadataManagerTaskView=None):
         if not submitterInfo in self.submitterInfos:
             self.submitterInfos.append(submitterInfo)
@@ -104,15 +175,25 @@ class TaskExecutionOrderView(object):
             if btn != button:
                 btn.setChecked(False)
 
+        self.refreshTaskDependencies()
+
     def onSubmissionTaskViewAdded(self, taskView: MetadataManagerTaskView):
         self.addTaskExecutionOrderEntry(SubmitterInfo(taskView.name, MetadataManagerTaskSubmitter), taskView)
+        self.refreshTaskDependencies()
 
     def onSubmissionTaskViewNameChanged(self, taskView: MetadataManagerTaskView):
         for btn in self.taskExecutionOrderButtons:
             if btn.taskView == taskView:
+                prevName = btn.submitterInfo.name
                 btn.setText(taskView.name)
                 btn.submitterInfo.name = taskView.name
 
+                for info in self.submitterInfos:
+                    if info.dependencies:
+                        info.dependencies = [taskView.name if name == prevName else name for name in info.dependencies]
+
+        self.refreshTaskDependencies()
+
     def onSubmissionTaskViewDeleted(self, taskView: MetadataManagerTaskView):
         idx = None
         for i, info in enumerate(self.submitterInfos):
@@ -123,12 +204,21 @@ class TaskExecutionOrderView(object):
         if idx == None:
             return
 
-        self.submitterInfos.pop(idx)
+        deletedInfo = self.submitterInfos.pop(idx)
         layout: QtWidgets.QVBoxLayout = self.mainDialog.taskExecutionOrderLayout
         item = layout.takeAt(idx)
         self.taskExecutionOrderButtons.remove(item.widget())
         item.widget().deleteLater()
 
+        if self.selectedTaskOrderExecutionButton == item.widget():
+            self.selectedTaskOrderExecutionButton = None
+
+        for info in self.submitterInfos:
+            if info.dependencies:
+                info.dependencies = [name for name in info.dependencies if name != deletedInfo.name]
+
+        self.refreshTaskDependencies()
+
     def updateSubmitters(self, pipelineType: PipelineType):
         if not self.curPipelineType is None:
             for n in getPipelineSubmitterInfos(self.curPipelineType):
@@ -1,5 +1,4 @@
 from RenderingPipelinePlugin.filters.PipelineFilter import PipelineFilter
-import os
 
 import typing
 
@@ -16,4 +15,4 @@ class HasInputSceneFilter(PipelineFilter):
         documentWithSettings = self.pipeline.combineDocumentWithSettings(document, self.pipeline.environmentSettings)
         inputSceneFilename = self.pipeline.namingConvention.getInputSceneFilename(documentWithSettings)
         
-        return inputSceneFilename and os.path.exists(inputSceneFilename)
\ No newline at end of file
+        return inputSceneFilename and self.pipeline.serviceRegistry.fileExistenceCache.exists(inputSceneFilename)
\ No newline at end of file
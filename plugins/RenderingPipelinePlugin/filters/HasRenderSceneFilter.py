@@ -1,5 +1,4 @@
 from RenderingPipelinePlugin.filters.PipelineFilter import PipelineFilter
-import os
 
 import typing
 
@@ -14,4 +13,4 @@ class HasRenderSceneFilter(PipelineFilter):
         documentWithSettings = self.pipeline.combineDocumentWithSettings(document, self.pipeline.environmentSettings)
         renderSceneFilename = self.pipeline.namingConvention.getRenderSceneFilename(documentWithSettings)
         
-        return renderSceneFilename and os.path.exists(renderSceneFilename)
\ No newline at end of file
+        return renderSceneFilename and self.pipeline.serviceRegistry.fileExistenceCache.exists(renderSceneFilename)
\ No newline at end of file
@@ -1,5 +1,4 @@
 from RenderingPipelinePlugin.filters.PipelineFilter import PipelineFilter
-from MetadataManagerCore.animation import anim_util
 
 import typing
 
@@ -14,4 +13,4 @@ class HasRenderingFilter(PipelineFilter):
         documentWithSettings = self.pipeline.combineDocumentWithSettings(document, self.pipeline.environmentSettings)
         renderingFilename = self.pipeline.namingConvention.getRenderingFilename(documentWithSettings)
         
-        return renderingFilename and anim_util.hasExistingFrameFilenames(renderingFilename)
\ No newline at end of file
+        return renderingFilename and self.pipeline.serviceRegistry.fileExistenceCache.hasFrames(renderingFilename)
\ No newline at end of file
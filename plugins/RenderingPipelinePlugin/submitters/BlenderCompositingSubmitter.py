@@ -23,7 +23,7 @@ class BlenderCompositingSubmitter(RenderingPipelineSubmitter):
 
         # Make sure the output folder exists:
         outputDir = os.path.dirname(self.pipeline.namingConvention.getPostFilename(documentWithSettings))
-        os.makedirs(outputDir, exist_ok=True)
+        deadline_nodes.ensureDirectory(outputDir)
 
         for i, ext in enumerate(RenderingPipelineUtil.getPostOutputExtensions(documentWithSettings)):
             filename = self.pipeline.namingConvention.getPostFilename(documentWithSettings, ext=ext)
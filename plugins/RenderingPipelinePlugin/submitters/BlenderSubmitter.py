@@ -25,7 +25,7 @@ class BlenderInputSceneCreationSubmitter(RenderingPipelineSubmitter):
         jobInfoDict['OutputFilename0'] = os.path.basename(filename)
 
         # Make sure the output folder exists:
-        os.makedirs(jobInfoDict['OutputDirectory0'], exist_ok=True)
+        deadline_nodes.ensureDirectory(jobInfoDict['OutputDirectory0'])
 
         self.setTimeout(jobInfoDict, documentWithSettings, PipelineKeys.DeadlineInputSceneTimeout)
         self.setNodesBlackWhitelist(jobInfoDict, documentWithSettings, PipelineKeys.DeadlineInputSceneCreationInfo)
@@ -64,7 +64,7 @@ class BlenderRenderSceneCreationSubmitter(RenderingPipelineSubmitter):
         jobInfoDict['OutputFilename0'] = os.path.basename(filename)
 
         # Make sure the output folder exists:
-        os.makedirs(jobInfoDict['OutputDirectory0'], exist_ok=True)
+        deadline_nodes.ensureDirectory(jobInfoDict['OutputDirectory0'])
 
         frames = documentWithSettings.get(PipelineKeys.getKeyWithPerspective(PipelineKeys.Frames, documentWithSettings.get(PipelineKeys.Perspective, '')), '')
         pipelineInfoDict[PipelineKeys.Frames] = frames
@@ -107,7 +107,7 @@ class BlenderRenderingSubmitter(RenderingPipelineSubmitter):
         jobInfoDict['OutputFilename0'] = os.path.basename(filename)
 
         # Make sure the output folder exists:
-        os.makedirs(jobInfoDict['OutputDirectory0'], exist_ok=True)
+        deadline_nodes.ensureDirectory(jobInfoDict['OutputDirectory0'])
 
         self.setTimeout(jobInfoDict, documentWithSettings, PipelineKeys.DeadlineRenderingTimeout)
         self.setNodesBlackWhitelist(jobInfoDict, documentWithSettings, PipelineKeys.DeadlineRenderingInfo)
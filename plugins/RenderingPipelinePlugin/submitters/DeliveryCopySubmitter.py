@@ -18,7 +18,7 @@ class DeliveryCopySubmitter(RenderingPipelineSubmitter):
 
         # Make sure the output folder exists:
         outputDir = os.path.dirname(self.pipeline.namingConvention.getDeliveryFilename(documentWithSettings))
-        os.makedirs(outputDir, exist_ok=True)
+        deadline_nodes.ensureDirectory(outputDir)
 
         for i, ext in enumerate(RenderingPipelineUtil.getPostOutputExtensions(documentWithSettings)):
             filename = self.pipeline.namingConvention.getDeliveryFilename(documentWithSettings, ext=ext)
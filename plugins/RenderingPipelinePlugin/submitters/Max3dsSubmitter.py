@@ -26,7 +26,7 @@ class Max3dsInputSceneCreationSubmitter(RenderingPipelineSubmitter):
         jobInfoDict['OutputFilename0'] = os.path.basename(filename)
 
         # Make sure the output folder exists:
-        os.makedirs(jobInfoDict['OutputDirectory0'], exist_ok=True)
+        deadline_nodes.ensureDirectory(jobInfoDict['OutputDirectory0'])
 
         self.setTimeout(jobInfoDict, documentWithSettings, PipelineKeys.DeadlineInputSceneTimeout)
         self.setNodesBlackWhitelist(jobInfoDict, documentWithSettings, PipelineKeys.DeadlineInputSceneCreationInfo)
@@ -63,7 +63,7 @@ class Max3dsRenderSceneCreationSubmitter(RenderingPipelineSubmitter):
         jobInfoDict['ConcurrentTasks'] = concurrentTasks
 
         # Make sure the output folder exists:
-        os.makedirs(jobInfoDict['OutputDirectory0'], exist_ok=True)
+        deadline_nodes.ensureDirectory(jobInfoDict['OutputDirectory0'])
 
         self.setTimeout(jobInfoDict, documentWithSettings, PipelineKeys.DeadlineRenderSceneTimeout)
         self.setNodesBlackWhitelist(jobInfoDict, documentWithSettings, PipelineKeys.DeadlineRenderSceneCreationInfo)
@@ -78,33 +78,36 @@ class Max3dsRenderSceneCreationSubmitter(RenderingPipelineSubmitter):
 class Max3dsRenderingSubmitter(RenderingPipelineSubmitter):
     defaultActive = True
 
-    def prepareScript(self, documentWithSettings: dict, scriptPipelineKey: str, scriptPluginKey: str, pluginInfoDict: dict):
+    def prepareScript(self, documentWithSettings: dict, scriptPipelineKey: str, scriptPluginKey: str, pluginInfoDict: dict, files: list):
         scriptFilename = documentWithSettings.get(scriptPipelineKey)
         if scriptFilename and os.path.exists(scriptFilename) and os.path.isfile(scriptFilename):
             scriptFilename = scriptFilename.replace('\\', '/')
             bootstrapScriptFilename = deadline_nodes.getDeadlineFilename('3dsMax', 'ms')
-            pipelineInfoFilename = deadline_nodes.getDeadlineFilename('3dsMax', 'json')
-            
-            with open(pipelineInfoFilename, "w+", encoding='utf-8') as f:
-                json.dump(documentWithSettings, f, sort_keys=True, indent=4, ensure_ascii=False)
-
-            with open(bootstrapScriptFilename, "w+") as f:
-                f.write("(\n")
-                f.write("   global executePipelineRequest\n\n")
-                f.write("   python.Init()\n\n")
-                f.write("   processResult = true\n\n")
-                f.write("   try (\n")
-                f.write(f"      fileIn \"{scriptFilename}\"\n\n")
-                f.write(f"      infoFile = \"" + pipelineInfoFilename.replace('\\', '/') + "\"\n")
-                f.write(f"      executePipelineRequest infoFile\n")
-                f.write("   ) catch (\n")
-                f.write(f"      (dotNetClass \"System.Console\").Error.WriteLine (\"ERROR: \" + (getCurrentException()))\n")
-                f.write(f"      processResult = false\n")
-                f.write("   )\n")
-                f.write("\n")
-                f.write("   processResult\n")
-                f.write(")")
 
+            # All scripts of a job share the same pipeline info file:
+            if len(files) == 0:
+                pipelineInfoFilename = deadline_nodes.getDeadlineFilename('3dsMax', 'json')
+                files.append((pipelineInfoFilename, json.dumps(documentWithSettings, sort_keys=True, indent=4, ensure_ascii=False), 'utf-8'))
+            else:
+                pipelineInfoFilename = files[0][0]
+
+            script = ("(\n"
+                      "   global executePipelineRequest\n\n"
+                      "   python.Init()\n\n"
+                      "   processResult = true\n\n"
+                      "   try (\n"
+                      f"      fileIn \"{scriptFilename}\"\n\n"
+                      "      infoFile = \"" + pipelineInfoFilename.replace('\\', '/') + "\"\n"
+                      "      executePipelineRequest infoFile\n"
+                      "   ) catch (\n"
+                      "      (dotNetClass \"System.Console\").Error.WriteLine (\"ERROR: \" + (getCurrentException()))\n"
+                      "      processResult = false\n"
+                      "   )\n"
+                      "\n"
+                      "   processResult\n"
+                      ")")
+
+            files.append((bootstrapScriptFilename, script, None))
             pluginInfoDict[scriptPluginKey] = bootstrapScriptFilename
 
     def submit(self, documentWithSettings: dict, dependentJobIds: List[str]=None):
@@ -130,7 +133,7 @@ class Max3dsRenderingSubmitter(RenderingPipelineSubmitter):
         jobInfoDict['OutputFilename0'] = os.path.basename(filename)
         
         # Make sure the output folder exists:
-        os.makedirs(jobInfoDict['OutputDirectory0'], exist_ok=True)
+        deadline_nodes.ensureDirectory(jobInfoDict['OutputDirectory0'])
 
         self.setTimeout(jobInfoDict, documentWithSettings, PipelineKeys.DeadlineRenderingTimeout)
         self.setNodesBlackWhitelist(jobInfoDict, documentWithSettings, PipelineKeys.DeadlineRenderingInfo)
@@ -140,8 +143,10 @@ class Max3dsRenderingSubmitter(RenderingPipelineSubmitter):
         removePadding = documentWithSettings.get(PipelineKeys.DeadlineRemovePadding)
         pluginInfoDict['RemovePadding'] = 'True' if removePadding else 'False'
         
-        self.prepareScript(documentWithSettings, PipelineKeys.RenderPostLoadScript, 'PostLoadScript', pluginInfoDict)
-        self.prepareScript(documentWithSettings, PipelineKeys.PreFrameScript, 'PreFrameScript', pluginInfoDict)
+        files = []
+        self.prepareScript(documentWithSettings, PipelineKeys.RenderPostLoadScript, 'PostLoadScript', pluginInfoDict, files)
+        self.prepareScript(documentWithSettings, PipelineKeys.PreFrameScript, 'PreFrameScript', pluginInfoDict, files)
+        deadline_nodes.writeDeadlineFiles(files)
 
         return deadline_nodes.submitJob(jobInfoDict, pluginInfoDict)
 
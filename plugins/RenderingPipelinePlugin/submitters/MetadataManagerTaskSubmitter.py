@@ -24,12 +24,12 @@ class MetadataManagerTaskSubmitter(RenderingPipelineSubmitter):
 
         # Make sure the output folder exists:
         outputDir = os.path.dirname(self.pipeline.namingConvention.getDeliveryFilename(documentWithSettings))
-        os.makedirs(outputDir, exist_ok=True)
+        deadline_nodes.ensureDirectory(outputDir)
 
         for i, filename in enumerate(self.metadataManagerTaskSettings.outputFilenamesDict.values()):
             filename = extractNameFromNamingConvention(filename, documentWithSettings)
             outputDir = os.path.dirname(filename)
-            os.makedirs(outputDir, exist_ok=True)
+            deadline_nodes.ensureDirectory(outputDir)
 
             jobInfoDict[f'OutputDirectory{i}'] = outputDir
             jobInfoDict[f'OutputFilename{i}'] = os.path.basename(filename)
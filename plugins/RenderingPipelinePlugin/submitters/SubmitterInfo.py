@@ -20,19 +20,29 @@ class SubmitterInfo(object):
         self.taskView = None
         self.taskSettings: MetadataManagerSubmissionTaskSettings = None
 
+        # Names of the submitters this submitter depends on. If None, it depends on the previous submitter.
+        self.dependencies: typing.List[str] = None
+
     def __eq__(self, other: object) -> bool:
         return isinstance(other, SubmitterInfo) and self.name == other.name and self.taskView == other.taskView
 
     def toDict(self):
-        return {
+        d = {
             'name': self.name,
             'className': self.submitterClass.__name__
         }
 
+        if self.dependencies != None:
+            d['dependencies'] = self.dependencies
+
+        return d
+
     @staticmethod
     def fromDict(d: dict):
         submitterClass = submitter_mapping.ClassNameToClassMap.get(d.get('className'))
-        return SubmitterInfo(d.get('name'), submitterClass)
+        info = SubmitterInfo(d.get('name'), submitterClass)
+        info.dependencies = d.get('dependencies')
+        return info
 
 def getOrderedSubmitterInfos(envSettings: dict) -> typing.List[SubmitterInfo]:
     submitterInfoDicts = envSettings.get(PipelineKeys.OrderedSubmitterInfos)
@@ -41,7 +41,7 @@ class UnrealEngineInputSceneCreationSubmitter(RenderingPipelineSubmitter):
         jobInfoDict['OutputFilename0'] = os.path.basename(filename)
 
         # Make sure the output folder exists:
-        os.makedirs(jobInfoDict['OutputDirectory0'], exist_ok=True)
+        deadline_nodes.ensureDirectory(jobInfoDict['OutputDirectory0'])
 
         self.setTimeout(jobInfoDict, documentWithSettings, PipelineKeys.DeadlineInputSceneTimeout)
         self.setNodesBlackWhitelist(jobInfoDict, documentWithSettings, PipelineKeys.DeadlineInputSceneCreationInfo)
@@ -79,7 +79,7 @@ class UnrealEngineRenderSceneCreationSubmitter(RenderingPipelineSubmitter):
         jobInfoDict['OutputFilename0'] = os.path.basename(filename)
 
         # Make sure the output folder exists:
-        os.makedirs(jobInfoDict['OutputDirectory0'], exist_ok=True)
+        deadline_nodes.ensureDirectory(jobInfoDict['OutputDirectory0'])
 
         frames = documentWithSettings.get(PipelineKeys.getKeyWithPerspective(PipelineKeys.Frames, documentWithSettings.get(PipelineKeys.Perspective, '')), '')
         pipelineInfoDict[PipelineKeys.Frames] = frames
@@ -120,7 +120,7 @@ class UnrealEngineRenderingSubmitter(RenderingPipelineSubmitter):
         jobInfoDict['OutputFilename0'] = os.path.basename(filename)
 
         # Make sure the output folder exists:
-        os.makedirs(jobInfoDict['OutputDirectory0'], exist_ok=True)
+        deadline_nodes.ensureDirectory(jobInfoDict['OutputDirectory0'])
 
         self.setTimeout(jobInfoDict, documentWithSettings, PipelineKeys.DeadlineRenderingTimeout)
         self.setNodesBlackWhitelist(jobInfoDict, documentWithSettings, PipelineKeys.DeadlineRenderingInfo)
@@ -0,0 +1,115 @@
+import typing
+from typing import Dict, List
+from RenderingPipelinePlugin.submitters.Submitter import Submitter
+
+if typing.TYPE_CHECKING:
+    from RenderingPipelinePlugin.submitters.SubmitterInfo import SubmitterInfo
+
+def getSubmitterDependencies(submitters: List[Submitter]) -> Dict[Submitter, List[Submitter]]:
+    """Resolves the dependency graph of the active submitters.
+    Submitters without declared dependencies depend on the previous active submitter (linear chain).
+    Declared dependencies on inactive submitters are replaced by the dependencies of the inactive submitter.
+    """
+    nameToSubmitter = {submitter.info.name: submitter for submitter in submitters if submitter.info}
+    declaredDependencies: Dict[Submitter, List[Submitter]] = dict()
+
+    previousActiveSubmitter = None
+    for submitter in submitters:
+        dependencyNames = submitter.info.dependencies if submitter.info else None
+        if dependencyNames == None:
+            declaredDependencies[submitter] = [previousActiveSubmitter] if previousActiveSubmitter else []
+        else:
+            declaredDependencies[submitter] = [nameToSubmitter[name] for name in dependencyNames if name in nameToSubmitter and nameToSubmitter[name] != submitter]
+
+        if submitter.active:
+            previousActiveSubmitter = submitter
+
+    def resolve(submitter: Submitter, visited: typing.Set[Submitter]) -> List[Submitter]:
+        resolved = []
+        for dependency in declaredDependencies.get(submitter, []):
+            if dependency in visited:
+                continue
+
+            if dependency.active:
+                resolved.append(dependency)
+            else:
+                visited.add(dependency)
+                resolved.extend(resolve(dependency, visited))
+
+        return resolved
+
+    dependencies: Dict[Submitter, List[Submitter]] = dict()
+    for submitter in submitters:
+        if submitter.active:
+            # Remove duplicates while keeping the order:
+            dependencies[submitter] = list(dict.fromkeys(resolve(submitter, set([submitter]))))
+
+    return dependencies
+
+def sortTopologically(submitters: List[Submitter], dependencies: Dict[Submitter, List[Submitter]]) -> List[Submitter]:
+    """Returns the submitters in an order in which all dependencies are submitted first.
+    Independent submitters keep their relative order. Raises a RuntimeError if the graph has cycles.
+    """
+    remainingDependencyCounts = {submitter: len(dependencies.get(submitter, [])) for submitter in submitters}
+    dependents: Dict[Submitter, List[Submitter]] = {submitter: [] for submitter in submitters}
+    for submitter in submitters:
+        for dependency in dependencies.get(submitter, []):
+            dependents[dependency].append(submitter)
+
+    sortedSubmitters = []
+    ready = [submitter for submitter in submitters if remainingDependencyCounts[submitter] == 0]
+    while len(ready) > 0:
+        submitter = ready.pop(0)
+        sortedSubmitters.append(submitter)
+
+        for dependent in dependents[submitter]:
+            remainingDependencyCounts[dependent] -= 1
+            if remainingDependencyCounts[dependent] == 0:
+                ready.append(dependent)
+
+        ready.sort(key=submitters.index)
+
+    if len(sortedSubmitters) != len(submitters):
+        cyclicNames = [submitter.info.name if submitter.info else submitter.name for submitter in submitters if not submitter in sortedSubmitters]
+        raise RuntimeError(f'The submitter dependencies contain a cycle: {", ".join(cyclicNames)}')
+
+    return sortedSubmitters
+
+def submitInDependencyOrder(submitters: List[Submitter], documentWithSettings: dict) -> Dict[Submitter, List[str]]:
+    """Submits all active submitters for the given document. Each job depends on the jobs of its dependencies.
+    If a dependency didn't submit a job (e.g. because the document is mapped), its own job dependencies are used instead.
+    Returns the job ids of each submitter (including inherited ids if no job was submitted).
+    """
+    dependencies = getSubmitterDependencies(submitters)
+    activeSubmitters = [submitter for submitter in submitters if submitter.active]
+
+    jobIds: Dict[Submitter, List[str]] = dict()
+    for submitter in sortTopologically(activeSubmitters, dependencies):
+        dependentJobIds = list(dict.fromkeys(jobId for dependency in dependencies[submitter] for jobId in jobIds[dependency]))
+        jobId = submitter.submit(documentWithSettings, dependentJobIds=dependentJobIds if len(dependentJobIds) > 0 else None)
+        jobIds[submitter] = [jobId] if jobId else dependentJobIds
+
+    return jobIds
+
+def hasDependencyCycle(submitterInfos: List['SubmitterInfo']) -> bool:
+    nameToDependencies: Dict[str, List[str]] = dict()
+    for i, info in enumerate(submitterInfos):
+        if info.dependencies == None:
+            nameToDependencies[info.name] = [submitterInfos[i-1].name] if i > 0 else []
+        else:
+            nameToDependencies[info.name] = info.dependencies
+
+    # 0: unvisited, 1: on the current path, 2: done
+    states = {name: 0 for name in nameToDependencies.keys()}
+
+    def visit(name: str) -> bool:
+        states[name] = 1
+        for dependency in nameToDependencies.get(name, []):
+            state = states.get(dependency, 2)
+            if state == 1 or (state == 0 and visit(dependency)):
+                return True
+
+        states[name] = 2
+        return False
+
+    return any(states[name] == 0 and visit(name) for name in nameToDependencies.keys())
@@ -4,6 +4,7 @@ from PySide2 import QtCore, QtGui, QtWidgets
 ### by https://stackoverflow.com/users/984421/ekhumoro
 class PhotoViewer(QtWidgets.QGraphicsView):
     photoClicked = QtCore.Signal(QtCore.QPoint)
+    zoomedIn = QtCore.Signal()
 
     def __init__(self, parent):
         super(PhotoViewer, self).__init__(parent)
@@ -53,6 +54,22 @@ class PhotoViewer(QtWidgets.QGraphicsView):
         if resetZoom:
             self.fitInView()
 
+    def replacePhoto(self, pixmap):
+        """Replaces the shown photo with a version of different resolution (e.g. the full resolution of a thumbnail)
+        while keeping the displayed size, zoom and position.
+        """
+        oldPixmap = self._photo.pixmap()
+        if oldPixmap.isNull() or pixmap == None or pixmap.isNull():
+            self.setPhoto(pixmap, resetZoom=False)
+            return
+
+        factor = oldPixmap.width() / pixmap.width()
+        center = self.mapToScene(self.viewport().rect().center())
+        self._photo.setPixmap(pixmap)
+        self.setSceneRect(QtCore.QRectF(pixmap.rect()))
+        self.scale(factor, factor)
+        self.centerOn(center / factor)
+
     def wheelEvent(self, event):
         if self.hasPhoto():
             if event.angleDelta().y() > 0:
@@ -63,6 +80,8 @@ class PhotoViewer(QtWidgets.QGraphicsView):
                 self._zoom -= 1
             if self._zoom > 0:
                 self.scale(factor, factor)
+                if self._zoom == 1 and factor > 1.0:
+                    self.zoomedIn.emit()
             elif self._zoom == 0:
                 self.fitInView()
             else:
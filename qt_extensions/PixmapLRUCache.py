@@ -0,0 +1,58 @@
+from PySide2 import QtGui
+from collections import OrderedDict
+
+class PixmapLRUCache(object):
+    """Keeps the most recently used pixmaps in memory. The cache is bounded by the estimated pixel memory of the pixmaps
+    rather than by the number of entries because preview resolutions vary a lot.
+    Pixmaps are GUI thread objects, so the cache must only be used from the GUI thread.
+    """
+    def __init__(self, maxSizeInBytes: int) -> None:
+        super().__init__()
+
+        self.maxSizeInBytes = maxSizeInBytes
+        self.sizeInBytes = 0
+        self.entries: OrderedDict = OrderedDict()
+
+    @staticmethod
+    def getPixmapSizeInBytes(pixmap: QtGui.QPixmap) -> int:
+        if pixmap.isNull():
+            return 0
+
+        return pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
+
+    def __contains__(self, key) -> bool:
+        return key in self.entries
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, key) -> QtGui.QPixmap:
+        entry = self.entries.get(key)
+        if entry == None:
+            return None
+
+        self.entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key, pixmap: QtGui.QPixmap):
+        self.remove(key)
+
+        sizeInBytes = self.getPixmapSizeInBytes(pixmap)
+        if sizeInBytes > self.maxSizeInBytes:
+            return
+
+        self.entries[key] = (pixmap, sizeInBytes)
+        self.sizeInBytes += sizeInBytes
+
+        while self.sizeInBytes > self.maxSizeInBytes:
+            _, (_, evictedSizeInBytes) = self.entries.popitem(last=False)
+            self.sizeInBytes -= evictedSizeInBytes
+
+    def remove(self, key):
+        entry = self.entries.pop(key, None)
+        if entry != None:
+            self.sizeInBytes -= entry[1]
+
+    def clear(self):
+        self.entries.clear()
+        self.sizeInBytes = 0
@@ -13,7 +13,25 @@ class ProgressDialog(object):
 
         self.progressBar: QProgressBar = self.progressDialog.progressBar
         self.progressBar.setMaximum(0)
-        
+
+        self.cancelButton = self.progressDialog.cancelButton
+        self.cancelButton.setVisible(False)
+        self.cancelButton.clicked.connect(self.onCancelClicked)
+        self.cancelFunction = None
+
+    def setCancelFunction(self, cancelFunction):
+        """Shows a cancel button that calls the given function. Pass None to hide the button.
+        """
+        self.cancelFunction = cancelFunction
+        self.cancelButton.setEnabled(True)
+        self.cancelButton.setVisible(cancelFunction != None)
+
+    def onCancelClicked(self):
+        if self.cancelFunction:
+            self.cancelButton.setEnabled(False)
+            self.progressDialog.infoLabel.setText('Cancelling...')
+            self.cancelFunction()
+
     def setTitle(self, title: str):
         self.progressDialog.setWindowTitle(title)
 
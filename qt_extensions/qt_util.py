@@ -1,6 +1,10 @@
 from PySide2 import QtCore
 from PySide2.QtCore import QRunnable
-from PySide2.QtWidgets import QFileDialog, QLineEdit, QPushButton, QWidget
+from typing import TYPE_CHECKING
+
+# QtWidgets is imported where it is needed because qt_util is also used in console mode:
+if TYPE_CHECKING:
+    from PySide2.QtWidgets import QLineEdit, QPushButton
 
 # From https://stackoverflow.com/questions/10991991/pyside-easier-way-of-updating-gui-from-another-thread
 # by chfoo: https://stackoverflow.com/users/1524507/chfoo
@@ -46,7 +50,9 @@ def clearContainer(container):
         elif item.layout():
             clearContainer(item.layout())
 
-def connectFileSelection(parentWidget, lineEdit : QLineEdit, button: QPushButton, filter="Any File (*.*)"):
+def connectFileSelection(parentWidget, lineEdit : 'QLineEdit', button: 'QPushButton', filter="Any File (*.*)"):
+    from PySide2.QtWidgets import QFileDialog
+
     def onSelect():
         fileName,_ = QFileDialog.getOpenFileName(parentWidget, "Open", "", filter=filter)
         if fileName != None and fileName != "":
@@ -54,7 +60,9 @@ def connectFileSelection(parentWidget, lineEdit : QLineEdit, button: QPushButton
 
     button.clicked.connect(onSelect)
 
-def connectFolderSelection(parentWidget, lineEdit : QLineEdit, button: QPushButton, initialDir=""):
+def connectFolderSelection(parentWidget, lineEdit : 'QLineEdit', button: 'QPushButton', initialDir=""):
+    from PySide2.QtWidgets import QFileDialog
+
     def onSelect():
         dirName = QFileDialog.getExistingDirectory(parentWidget, "Open", initialDir)
         if dirName != None and dirName != "":
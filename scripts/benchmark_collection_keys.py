@@ -0,0 +1,103 @@
+"""
+Header discovery benchmark. Compares discovering the header keys of a collection by scanning every document, like
+MongoDBManager.findAllKeysInCollection, with reading the key registry (see database/collection_keys.py).
+Also reports the one-off registry rebuild (see scripts/rebuild_collection_keys.py) and the incremental registry updates of
+a batch of modified documents with a DocumentKeyTracker.
+
+Usage: python scripts/benchmark_collection_keys.py --host mongodb://localhost:27017 --documents 500000
+       python scripts/benchmark_collection_keys.py --fake --documents 20000
+Without a mongod, --fake uses the in-memory database of the tests.
+The synthetic collections are dropped afterwards.
+"""
+import os
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(REPO_DIR)
+
+from database import collection_keys
+from MetadataManagerCore import Keys
+import argparse
+import random
+import time
+
+COLLECTION_NAME = 'products'
+
+def seedCollection(collection, documentCount: int):
+    collection.drop()
+    rng = random.Random(0)
+    for start in range(0, documentCount, 10000):
+        documents = []
+        for i in range(start, min(documentCount, start + 10000)):
+            document = {Keys.systemIDKey: f'product_{i}', 'Name': f'Product {i}', 'Material': rng.choice(['Oak', 'Steel', 'Glass'])}
+            document.update({f'Attribute {k}': rng.randrange(100) for k in range(20)})
+            # Rare keys are only found by scanning all documents:
+            if i % 1000 == 0:
+                document[f'Rare {i // 1000 % 10}'] = True
+
+            documents.append(document)
+
+        collection.insert_many(documents)
+
+def findAllKeysByScanning(collection):
+    # Like MongoDBManager.findAllKeysInCollection:
+    keys = set()
+    for document in collection.find({}):
+        keys.update(document.keys())
+
+    return sorted(keys)
+
+def modifyDocuments(db, modifiedCount: int):
+    collection = db[COLLECTION_NAME]
+    keyTracker = collection_keys.DocumentKeyTracker(db, COLLECTION_NAME)
+    for i in range(modifiedCount):
+        sid = f'product_{i}'
+        oldKeys = set(collection.find_one({Keys.systemIDKey: sid}, {'_id': False}).keys()) | {'_id'}
+        collection.update_one({Keys.systemIDKey: sid}, {'$set': {'Modified': True}, '$unset': {'Attribute 0': ''}})
+        keyTracker.add(sid, oldKeys)
+
+    keyTracker.flush()
+
+def measure(function):
+    tStart = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - tStart
+
+def main():
+    parser = argparse.ArgumentParser(description="Header discovery benchmark.")
+    parser.add_argument('--host', type=str, default='mongodb://localhost:27017')
+    parser.add_argument('--db', type=str, default='collection_keys_benchmark')
+    parser.add_argument('--fake', action='store_true', help='Uses the in-memory database of the tests instead of a mongod.')
+    parser.add_argument('--documents', type=int, default=500000)
+    parser.add_argument('--modified', type=int, default=1000, help='Documents modified for the incremental registry update.')
+    args = parser.parse_args()
+
+    if args.fake:
+        sys.path.append(os.path.join(REPO_DIR, 'tests'))
+        from fake_mongo import FakeDatabase
+        db = FakeDatabase(args.db)
+        client = None
+    else:
+        from pymongo import MongoClient
+        client = MongoClient(args.host)
+        db = client[args.db]
+
+    try:
+        seedCollection(db[COLLECTION_NAME], args.documents)
+
+        scannedKeys, scanTime = measure(lambda: findAllKeysByScanning(db[COLLECTION_NAME]))
+        rebuiltKeys, rebuildTime = measure(lambda: collection_keys.rebuild(db, COLLECTION_NAME))
+        registryKeys, registryTime = measure(lambda: collection_keys.getKeys(db, COLLECTION_NAME))
+        assert scannedKeys == rebuiltKeys == registryKeys
+
+        _, modificationTime = measure(lambda: modifyDocuments(db, args.modified))
+        assert collection_keys.getKeys(db, COLLECTION_NAME) == findAllKeysByScanning(db[COLLECTION_NAME])
+
+        print(f'documents={args.documents} keys={len(registryKeys)} scan={scanTime:.3f}s registry={registryTime:.4f}s '
+              f'rebuild={rebuildTime:.3f}s (once) {args.modified} modified documents with registry updates={modificationTime:.3f}s')
+    finally:
+        if client:
+            client.drop_database(args.db)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+CSV table benchmark. Generates a product table with quoted multi-line cells and measures the time and peak Python memory of
+streaming its rows with the CSVTable against reading all rows into a list first, as the previous reader did.
+
+Usage: python scripts/benchmark_csv_table.py --rows 1000000
+"""
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from table.CSVTable import CSVTable
+import argparse
+import tempfile
+import tracemalloc
+import shutil
+import csv
+import time
+
+def createTable(filename: str, rowCount: int):
+    with open(filename, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f, delimiter=';')
+        writer.writerow(['Name', 'Description', 'Material', 'Price', 'Preview'])
+        for i in range(rowCount):
+            # Every tenth description has a separator and a line break in a quoted cell:
+            description = f'Product {i}; variant {i % 7}\nsecond line' if i % 10 == 0 else f'Product {i}'
+            writer.writerow([f'product_{i:07d}', description, 'Oak', f'{i % 1000},90', f'/previews/product_{i:07d}.png'])
+
+def measure(function):
+    tracemalloc.start()
+    tStart = time.perf_counter()
+    result = function()
+    elapsed = time.perf_counter() - tStart
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+def streamRows(filename: str) -> int:
+    return sum(1 for _ in CSVTable(filename, ';').getRowsWithoutHeader())
+
+def readAllRows(filename: str) -> int:
+    with open(filename, newline='', encoding='utf-8') as f:
+        rows = list(csv.reader(f, delimiter=';'))
+
+    return len(rows) - 1
+
+def main():
+    parser = argparse.ArgumentParser(description="CSV table streaming benchmark.")
+    parser.add_argument('--rows', type=int, default=1000000)
+    args = parser.parse_args()
+
+    rootDir = tempfile.mkdtemp(prefix='csv_table_benchmark_')
+    try:
+        filename = os.path.join(rootDir, 'products.csv')
+        createTable(filename, args.rows)
+        print(f'rows={args.rows} file-size={os.path.getsize(filename) / 1e6:.1f}MB')
+
+        for name, function in [('stream', streamRows), ('read-all', readAllRows), ('nrows', lambda filename: CSVTable(filename, ';').nrows - 1)]:
+            rowCount, elapsed, peak = measure(lambda: function(filename))
+            print(f'{name:8s} rows={rowCount} time={elapsed:.2f}s peak-memory={peak / 1e6:.1f}MB')
+    finally:
+        shutil.rmtree(rootDir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
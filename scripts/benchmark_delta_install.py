@@ -0,0 +1,93 @@
+"""
+Delta install benchmark. Generates two versions of an app build that differ in a few files, installs the first version and measures
+the bytes downloaded and copied and the wall time of updating to the second version and of rolling back.
+Unchanged files are reused with each method: cloned (needs a copy-on-write file system, e.g. Btrfs or XFS), hard linked or copied.
+
+Usage: python scripts/benchmark_delta_install.py --size-mb 500 --files 200 --changed-files 2
+"""
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'launcher'))
+
+from ContentRepository import ContentRepository
+import DeltaInstaller as delta_installer
+from DeltaInstaller import DeltaInstaller, removeDirectory
+import argparse
+import tempfile
+import time
+
+def writeVersion(folder: str, fileCount: int, fileSize: int, changedFileCount: int, version: int):
+    for i in range(fileCount):
+        filename = os.path.join(folder, f'lib_{i // 50}', f'module_{i}.bin')
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+        with open(filename, 'wb') as f:
+            # Deterministic content per file, the first files change between versions:
+            seed = (i, version if i < changedFileCount else 0)
+            f.write((repr(seed).encode() * (fileSize // len(repr(seed)) + 1))[:fileSize])
+
+def failingLink(source, target):
+    raise OSError('Hard links are disabled by the benchmark.')
+
+def runMethod(rootDir: str, repository: ContentRepository, manifests: list, method: str):
+    installer = DeltaInstaller(os.path.join(rootDir, f'app_{method}'))
+    originalLink = delta_installer.os.link
+    if method == 'copy':
+        delta_installer.os.link = failingLink
+
+    originalCloneFile = DeltaInstaller.cloneFile
+    if method != 'clone':
+        DeltaInstaller.cloneFile = lambda self, sourceFilename, targetFilename: False
+
+    try:
+        installer.install(repository, manifests[0])
+
+        tStart = time.perf_counter()
+        statistics = installer.install(repository, manifests[1])
+        updateDuration = time.perf_counter() - tStart
+
+        tStart = time.perf_counter()
+        rolledBack = installer.rollback(repository)
+        rollbackDuration = time.perf_counter() - tStart
+    finally:
+        delta_installer.os.link = originalLink
+        DeltaInstaller.cloneFile = originalCloneFile
+
+    for directory in [installer.installDirectory, installer.previousDirectory]:
+        if os.path.exists(directory):
+            removeDirectory(directory)
+
+    if method == 'clone' and statistics.clonedFileCount == 0:
+        print(f'{method:5s} not supported by the file system')
+        return
+
+    print(f'{method:5s} update={updateDuration:.2f}s downloaded={statistics.downloadedBytes / 1e6:.1f}MB copied={statistics.copiedBytes / 1e6:.1f}MB '
+          f'reused={statistics.reusedFileCount} rollback={rollbackDuration:.2f}s rolled-back={rolledBack}')
+
+def main():
+    parser = argparse.ArgumentParser(description="Delta install benchmark.")
+    parser.add_argument('--size-mb', type=int, default=500, help='Size of the build.')
+    parser.add_argument('--files', type=int, default=200)
+    parser.add_argument('--changed-files', type=int, default=2)
+    parser.add_argument('--dir', default=None, help='Folder on the file system to measure, e.g. for copy-on-write clones. A temporary folder by default.')
+    args = parser.parse_args()
+
+    rootDir = tempfile.mkdtemp(prefix='delta_install_benchmark_', dir=args.dir)
+    try:
+        fileSize = args.size_mb * 1000 * 1000 // args.files
+        repository = ContentRepository(os.path.join(rootDir, 'repository'))
+        manifests = []
+        for version in [1, 2]:
+            sourceFolder = os.path.join(rootDir, f'source_v{version}')
+            writeVersion(sourceFolder, args.files, fileSize, args.changed_files, version)
+            manifests.append(repository.addFolder(sourceFolder))
+            removeDirectory(sourceFolder)
+
+        print(f'build={args.size_mb}MB files={args.files} changed-files={args.changed_files}')
+        for method in ['clone', 'link', 'copy']:
+            runMethod(rootDir, repository, manifests, method)
+    finally:
+        removeDirectory(rootDir)
+
+if __name__ == "__main__":
+    main()
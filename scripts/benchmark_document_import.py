@@ -0,0 +1,129 @@
+"""
+Document import benchmark. Imports a synthetic product table with RenderingPipeline.processDocuments and compares the batched
+bulk writes with one write round trip per document, like the previous dbManager.insertOrModifyDocument(..., checkForModifications=False) loop.
+
+Usage: python scripts/benchmark_document_import.py --host mongodb://localhost:27017 --rows 10000,50000
+       python scripts/benchmark_document_import.py --fake --latency-ms 0.5 --rows 1000,5000
+Without a mongod, --fake uses the in-memory database of the tests and adds the given latency to each write round trip.
+The synthetic collections are dropped afterwards.
+"""
+import os
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(REPO_DIR)
+sys.path.append(os.path.join(REPO_DIR, 'plugins'))
+
+from RenderingPipelinePlugin.RenderingPipeline import RenderingPipeline
+from RenderingPipelinePlugin import PipelineKeys
+from unittest.mock import MagicMock
+from types import SimpleNamespace
+import argparse
+import time
+
+class RoundTripCountingCollection(object):
+    """Counts the write round trips. In per-document mode each operation of a bulk write is sent on its own.
+    """
+    def __init__(self, collection, perDocument: bool, latencyInSeconds: float) -> None:
+        super().__init__()
+
+        self.collection = collection
+        self.perDocument = perDocument
+        self.latencyInSeconds = latencyInSeconds
+        self.roundTrips = 0
+
+    def __getattr__(self, name):
+        return getattr(self.collection, name)
+
+    def writeOperations(self, operations, ordered: bool):
+        self.roundTrips += 1
+        if self.latencyInSeconds > 0.0:
+            time.sleep(self.latencyInSeconds)
+
+        self.collection.bulk_write(operations, ordered=ordered)
+
+    def bulk_write(self, operations, ordered=True):
+        if self.perDocument:
+            for operation in operations:
+                self.writeOperations([operation], ordered)
+        else:
+            self.writeOperations(operations, ordered)
+
+class RoundTripCountingDatabase(object):
+    def __init__(self, db, perDocument: bool, latencyInSeconds: float) -> None:
+        super().__init__()
+
+        self.db = db
+        self.perDocument = perDocument
+        self.latencyInSeconds = latencyInSeconds
+        self.collections = dict()
+
+    @property
+    def name(self):
+        return self.db.name
+
+    def __getitem__(self, collectionName: str):
+        collection = self.collections.get(collectionName)
+        if collection == None:
+            collection = RoundTripCountingCollection(self.db[collectionName], self.perDocument, self.latencyInSeconds)
+            self.collections[collectionName] = collection
+
+        return collection
+
+    @property
+    def roundTrips(self):
+        return sum(collection.roundTrips for collection in self.collections.values())
+
+def createPipeline(db) -> RenderingPipeline:
+    serviceRegistry = SimpleNamespace(environmentManager=MagicMock(), dbManager=SimpleNamespace(db=db))
+    return RenderingPipeline('Benchmark Pipeline', serviceRegistry, MagicMock(), MagicMock())
+
+def generateRows(rowCount: int):
+    for i in range(rowCount):
+        yield {'Name': f'product_{i:07d}', 'Description': f'Product {i}', 'Material': ['Oak', 'Steel', 'Glass'][i % 3], 'Price': f'{i % 1000},90'}
+
+def runImport(db, collectionName: str, rowCount: int, perDocument: bool, latencyInSeconds: float):
+    db[collectionName].drop()
+    countingDb = RoundTripCountingDatabase(db, perDocument, latencyInSeconds)
+    pipeline = createPipeline(countingDb)
+    settings = {PipelineKeys.SidNaming: '[Name]', PipelineKeys.PostOutputExtensions: 'png', PipelineKeys.PerspectiveCodes: ''}
+
+    tStart = time.perf_counter()
+    pipeline.processDocuments(generateRows(rowCount), collectionName, settings, docCount=rowCount)
+    elapsed = time.perf_counter() - tStart
+
+    assert db[collectionName].count_documents({}) == rowCount
+    return elapsed, countingDb.roundTrips
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-document vs. bulk write document import benchmark.")
+    parser.add_argument('--host', type=str, default='mongodb://localhost:27017')
+    parser.add_argument('--db', type=str, default='document_import_benchmark')
+    parser.add_argument('--fake', action='store_true', help='Uses the in-memory database of the tests instead of a mongod.')
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='Added to each write round trip, e.g. the round trip time to a remote mongod.')
+    parser.add_argument('--rows', type=str, default='10000,50000')
+    args = parser.parse_args()
+
+    if args.fake:
+        sys.path.append(os.path.join(REPO_DIR, 'tests'))
+        from fake_mongo import FakeDatabase
+        db = FakeDatabase(args.db)
+        client = None
+    else:
+        from pymongo import MongoClient
+        client = MongoClient(args.host)
+        db = client[args.db]
+
+    try:
+        for rowCount in [int(r) for r in args.rows.split(',')]:
+            perDocumentTime, perDocumentRoundTrips = runImport(db, f'rows_{rowCount}', rowCount, True, args.latency_ms / 1000.0)
+            bulkTime, bulkRoundTrips = runImport(db, f'rows_{rowCount}', rowCount, False, args.latency_ms / 1000.0)
+
+            print(f'rows={rowCount:6d} per-document={perDocumentTime:.2f}s ({rowCount / perDocumentTime:.0f} rows/s, {perDocumentRoundTrips} write round trips) '
+                  f'bulk={bulkTime:.2f}s ({rowCount / bulkTime:.0f} rows/s, {bulkRoundTrips} write round trips)')
+    finally:
+        if client:
+            client.drop_database(args.db)
+
+if __name__ == "__main__":
+    main()
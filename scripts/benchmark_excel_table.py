@@ -0,0 +1,95 @@
+"""
+xlsx table benchmark. Generates a product workbook and measures the time and peak Python memory of reading its rows and columns
+with the streaming XlsxTable against the previous implementation, which materialized all cells of the sheet on construction.
+
+Usage: python scripts/benchmark_excel_table.py --rows 100000
+"""
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from table.ExcelTable import ExcelTable
+import argparse
+import tempfile
+import tracemalloc
+import openpyxl
+import shutil
+import time
+import io
+
+class PreviousXlsxTable(object):
+    """The previous xlsx table: all cells are loaded on construction.
+    """
+    def __init__(self, sheet):
+        super().__init__()
+
+        self.sheet = sheet
+        self.rows = list(self.sheet.rows)
+
+    def getRowValues(self, rowIndex):
+        return [cell.value if cell else None for cell in self.rows[rowIndex]]
+
+    def getRowsWithoutHeader(self, headerIdx=0):
+        return [self.getRowValues(i) for i in range(headerIdx + 1, len(self.rows))]
+
+    def getColumnsWithoutHeader(self, headerIdx=0):
+        return [list(column) for column in zip(*self.getRowsWithoutHeader(headerIdx))]
+
+    @staticmethod
+    def read(workbookPath: str, sheetName: str):
+        with open(workbookPath, "rb") as f:
+            inMemFile = io.BytesIO(f.read())
+
+        wb = openpyxl.load_workbook(inMemFile, read_only=True, data_only=True)
+        return PreviousXlsxTable(wb[sheetName])
+
+def createWorkbook(filename: str, rowCount: int):
+    wb = openpyxl.Workbook(write_only=True)
+    sheet = wb.create_sheet('Products')
+    sheet.append(['Name', 'Description', 'Material', 'Price', 'Preview'])
+    for i in range(rowCount):
+        sheet.append([f'product_{i:07d}', f'Product {i}', 'Oak', (i % 1000) + 0.9, f'/previews/product_{i:07d}.png'])
+
+    wb.save(filename)
+
+def measure(function, measureMemory: bool):
+    # Tracing allocations slows openpyxl down several times, the time is measured in a separate run:
+    tStart = time.perf_counter()
+    result = function()
+    elapsed = time.perf_counter() - tStart
+    if not measureMemory:
+        return result, elapsed, 0
+
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+def main():
+    parser = argparse.ArgumentParser(description="xlsx table streaming benchmark.")
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--skip-memory', action='store_true', help='Only measures the time.')
+    args = parser.parse_args()
+
+    rootDir = tempfile.mkdtemp(prefix='excel_table_benchmark_')
+    try:
+        filename = os.path.join(rootDir, 'products.xlsx')
+        createWorkbook(filename, args.rows)
+        print(f'rows={args.rows} file-size={os.path.getsize(filename) / 1e6:.1f}MB')
+
+        measurements = [('previous rows', lambda: sum(1 for _ in PreviousXlsxTable.read(filename, 'Products').getRowsWithoutHeader())),
+                        ('stream rows', lambda: sum(1 for _ in ExcelTable.read(filename, 'Products').getRowsWithoutHeader())),
+                        ('previous columns', lambda: len(PreviousXlsxTable.read(filename, 'Products').getColumnsWithoutHeader()[0])),
+                        ('stream columns', lambda: len(ExcelTable.read(filename, 'Products').getColumnsWithoutHeader()[0])),
+                        ('header', lambda: len(ExcelTable.read(filename, 'Products').getHeader())),
+                        ('sheet names', lambda: len(ExcelTable.getSheetNames(filename)))]
+        for name, function in measurements:
+            result, elapsed, peak = measure(function, not args.skip_memory)
+            print(f'{name:16s} result={result} time={elapsed:.2f}s peak-memory={peak / 1e6:.1f}MB')
+    finally:
+        shutil.rmtree(rootDir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
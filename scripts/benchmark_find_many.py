@@ -0,0 +1,119 @@
+"""
+Batched document lookup benchmark. Compares looking up the documents of a selection one id and collection at a time,
+like MongoDBManager.findOneInCollections, with findManyInCollections, which issues one $in query per collection and chunk.
+The selection mixes ids of all collections, so the per-id lookup also queries the collections that don't contain the id.
+
+Usage: python scripts/benchmark_find_many.py --host mongodb://localhost:27017 --selection 100,1000,10000
+       python scripts/benchmark_find_many.py --fake --latency-ms 0.5 --documents 1000 --selection 100,1000
+Without a mongod, --fake uses an in-memory mongomock database and adds the given latency to each query.
+mongomock scans the whole collection for each query, so keep the collections small.
+The synthetic collections are dropped afterwards.
+"""
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.mongodb_util import findManyInCollections
+from types import SimpleNamespace
+import argparse
+import random
+import time
+
+COLLECTION_NAMES = ['shots', 'assets', 'sequences']
+
+class QueryCountingCollection(object):
+    def __init__(self, collection, latencyInSeconds: float) -> None:
+        super().__init__()
+
+        self.collection = collection
+        self.latencyInSeconds = latencyInSeconds
+        self.queryCount = 0
+
+    def __getattr__(self, name):
+        return getattr(self.collection, name)
+
+    def countQuery(self):
+        self.queryCount += 1
+        if self.latencyInSeconds > 0.0:
+            time.sleep(self.latencyInSeconds)
+
+    def find(self, *args, **kwargs):
+        self.countQuery()
+        return self.collection.find(*args, **kwargs)
+
+    def find_one(self, *args, **kwargs):
+        self.countQuery()
+        return self.collection.find_one(*args, **kwargs)
+
+class QueryCountingDatabase(object):
+    def __init__(self, db, latencyInSeconds: float) -> None:
+        super().__init__()
+
+        self.collections = {name: QueryCountingCollection(db[name], latencyInSeconds) for name in COLLECTION_NAMES}
+
+    def __getitem__(self, collectionName: str):
+        return self.collections[collectionName]
+
+    @property
+    def queryCount(self):
+        return sum(collection.queryCount for collection in self.collections.values())
+
+def findOneInCollections(db, uid, collectionNames):
+    # Matches MongoDBManager.findOneInCollections:
+    for collectionName in collectionNames:
+        document = db[collectionName].find_one({'_id': uid})
+        if document != None:
+            return document
+
+    return None
+
+def seedCollections(db, documentCount: int):
+    for collectionName in COLLECTION_NAMES:
+        db[collectionName].drop()
+        db[collectionName].insert_many([{'_id': f'{collectionName}_{i}', 'name': f'{collectionName} {i}', 'preview': f'/previews/{collectionName}_{i}.png'}
+                                        for i in range(documentCount)])
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-id vs. batched document lookup benchmark.")
+    parser.add_argument('--host', type=str, default='mongodb://localhost:27017')
+    parser.add_argument('--db', type=str, default='find_many_benchmark')
+    parser.add_argument('--fake', action='store_true', help='Uses an in-memory mongomock database instead of a mongod.')
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='Added to each query, e.g. the round trip time to a remote mongod.')
+    parser.add_argument('--documents', type=int, default=20000, help='Documents per collection.')
+    parser.add_argument('--selection', type=str, default='100,1000,10000')
+    args = parser.parse_args()
+
+    if args.fake:
+        import mongomock
+        client = mongomock.MongoClient()
+    else:
+        from pymongo import MongoClient
+        client = MongoClient(args.host)
+
+    try:
+        seedCollections(client[args.db], args.documents)
+        rng = random.Random(0)
+
+        for selectionSize in [int(s) for s in args.selection.split(',')]:
+            ids = [f'{rng.choice(COLLECTION_NAMES)}_{rng.randrange(args.documents)}' for _ in range(selectionSize)]
+
+            db = QueryCountingDatabase(client[args.db], args.latency_ms / 1000.0)
+            tStart = time.perf_counter()
+            perIdDocuments = [findOneInCollections(db, uid, COLLECTION_NAMES) for uid in ids]
+            perIdTime = time.perf_counter() - tStart
+            perIdQueryCount = db.queryCount
+
+            db = QueryCountingDatabase(client[args.db], args.latency_ms / 1000.0)
+            tStart = time.perf_counter()
+            batchedDocuments = list(findManyInCollections(SimpleNamespace(db=db), ids, COLLECTION_NAMES, includeMissing=True))
+            batchedTime = time.perf_counter() - tStart
+
+            assert batchedDocuments == perIdDocuments
+            print(f'selection={selectionSize:6d} per-id={perIdTime:.3f}s ({perIdQueryCount} queries) '
+                  f'batched={batchedTime:.3f}s ({db.queryCount} queries)')
+    finally:
+        client.drop_database(args.db)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Naming convention benchmark. Measures the per-document cost of NamingConvention.addFilenameInfo, which resolves about 10 naming conventions
+per document, with the compiled and cached templates against the previous implementation that parsed each template on every call.
+Both implementations are checked to produce the same filenames.
+
+Usage: python scripts/benchmark_naming_convention.py --documents 100000
+"""
+import os
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(REPO_DIR)
+sys.path.append(os.path.join(REPO_DIR, 'plugins'))
+
+from RenderingPipelinePlugin import PipelineKeys
+from RenderingPipelinePlugin import NamingConvention as naming_convention
+from RenderingPipelinePlugin.NamingConvention import NamingConvention, INVALID_FILENAME_CHARS, replaceGermanCharacters
+from MetadataManagerCore import Keys
+import argparse
+import time
+
+def previousExtractNameFromNamingConvention(namingConvention: str, documentWithSettings: dict):
+    """The previous implementation: the template is parsed character by character on every call.
+    """
+    if not namingConvention:
+        return documentWithSettings.get(Keys.systemIDKey, '')
+
+    keyExtractionInProgress = False
+    curKey = ''
+    name = ''
+    for c in namingConvention:
+        if c == '[':
+            keyExtractionInProgress = True
+        elif c == ']':
+            keyExtractionInProgress = False
+            value = documentWithSettings.get(curKey, '')
+            if value == None:
+                value = ''
+            name += value
+            curKey = ''
+        elif keyExtractionInProgress:
+            curKey += c
+        else:
+            name += c
+
+    try:
+        charsToReplace = documentWithSettings.get(PipelineKeys.CharactersToReplaceInNamingConvention)
+        if isinstance(charsToReplace, list):
+            for targetNaming, charToReplace, replacementChar in charsToReplace:
+                if targetNaming == 'All' or documentWithSettings.get(targetNaming) == namingConvention:
+                    name = name.replace(charToReplace, replacementChar)
+    except:
+        pass
+
+    if documentWithSettings.get(PipelineKeys.ReplaceGermanCharacters, ''):
+        name = name.replace('ö', 'oe').replace('ü', 'ue').replace('ä', 'ae').replace('Ä', 'AE').replace('Ü', 'UE').replace('Ö', 'OE').replace('ß', 'ss').replace('ẞ', 'SS')
+
+    for c in INVALID_FILENAME_CHARS:
+        name = name.replace(c, '')
+
+    return name
+
+SETTINGS = {
+    PipelineKeys.BaseScenesFolder: '/projects/furniture/base', PipelineKeys.InputScenesFolder: '/projects/furniture/input',
+    PipelineKeys.CreatedInputScenesFolder: '/projects/furniture/created', PipelineKeys.RenderScenesFolder: '/projects/furniture/render',
+    PipelineKeys.EnvironmentScenesFolder: '/projects/furniture/environment', PipelineKeys.NukeScenesFolder: '/projects/furniture/nuke',
+    PipelineKeys.BlenderCompositingScenesFolder: '/projects/furniture/blender', PipelineKeys.RenderingsFolder: '/projects/furniture/renderings',
+    PipelineKeys.PostFolder: '/projects/furniture/post', PipelineKeys.DeliveryFolder: '/projects/furniture/delivery',
+    PipelineKeys.BaseSceneNaming: '[Category]/[Name]_base', PipelineKeys.InputSceneNaming: '[Category]/[Name]_[Material]_input',
+    PipelineKeys.CreatedInputSceneNaming: '[Category]/[Name]_[Material]_created', PipelineKeys.RenderSceneNaming: '[Category]/[Name]_[Material]_[rp_perspective]',
+    PipelineKeys.EnvironmentSceneNaming: 'environments/[Environment]', PipelineKeys.NukeSceneNaming: '[Category]/[Name]_comp',
+    PipelineKeys.BlenderCompositingSceneNaming: '[Category]/[Name]_comp',
+    PipelineKeys.getKeyWithPerspective(PipelineKeys.RenderingNaming, 'default'): '[Category]/[Name]_[Material]_[rp_perspective]',
+    PipelineKeys.getKeyWithPerspective(PipelineKeys.PostNaming, 'default'): '[Category]/[Name]_[Material]_[rp_perspective]_post',
+    PipelineKeys.getKeyWithPerspective(PipelineKeys.DeliveryNaming, 'default'): '[Name] [Material] ([rp_perspective])',
+    PipelineKeys.SceneExtension: 'max', PipelineKeys.RenderingExtension: 'exr', PipelineKeys.ReplaceGermanCharacters: True,
+    PipelineKeys.CharactersToReplaceInNamingConvention: [['All', ' ', '_'], ['All', ',', '-']]
+}
+
+def generateDocuments(documentCount: int):
+    for i in range(documentCount):
+        document = dict(SETTINGS)
+        document.update({Keys.systemIDKey: f'product_{i}', 'Name': f'Stuhl Größe {i}', 'Category': ['Stühle', 'Tische', 'Lampen'][i % 3],
+                         'Material': ['Eiche, geölt', 'Stahl', 'Glas'][i % 3], 'Environment': 'studio', PipelineKeys.Perspective: f'p{i % 4}'})
+        yield document
+
+def runNaming(documentCount: int, extractFunction):
+    naming_convention.extractNameFromNamingConvention = extractFunction
+    namingConvention = NamingConvention()
+    documents = list(generateDocuments(documentCount))
+
+    tStart = time.perf_counter()
+    for document in documents:
+        namingConvention.addFilenameInfo(document)
+
+    return time.perf_counter() - tStart, documents
+
+def main():
+    parser = argparse.ArgumentParser(description="Naming convention benchmark.")
+    parser.add_argument('--documents', type=int, default=100000)
+    args = parser.parse_args()
+
+    currentExtractFunction = naming_convention.extractNameFromNamingConvention
+    try:
+        previousTime, previousDocuments = runNaming(args.documents, previousExtractNameFromNamingConvention)
+        currentTime, currentDocuments = runNaming(args.documents, currentExtractFunction)
+    finally:
+        naming_convention.extractNameFromNamingConvention = currentExtractFunction
+
+    assert previousDocuments == currentDocuments
+    print(f'documents={args.documents} previous={previousTime:.2f}s ({previousTime / args.documents * 1e6:.1f} us/document) '
+          f'compiled={currentTime:.2f}s ({currentTime / args.documents * 1e6:.1f} us/document) speedup={previousTime / currentTime:.1f}x')
+
+if __name__ == "__main__":
+    main()
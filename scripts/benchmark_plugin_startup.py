@@ -0,0 +1,178 @@
+"""
+Plugin startup benchmark. Generates synthetic plugins (some with dependencies, some inactive) in a temporary plugins folder and
+measures plugin discovery (PluginManager construction) and loading (PluginManager.load) on a cold start (no plugin manifest,
+no byte-compiled plugin modules) and on warm starts. Each start runs in a fresh interpreter.
+--compare-revision also measures the PluginManager of the given git revision, e.g. the one before the plugin manifest cache.
+
+Usage: python scripts/benchmark_plugin_startup.py --plugins 50 --inactive 10 --compare-revision 65af0ef^
+"""
+import os
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(REPO_DIR)
+
+import importlib.util
+import subprocess
+import statistics
+import argparse
+import tempfile
+import shutil
+import json
+import time
+
+FUNCTIONS_PER_PLUGIN = 200
+
+class Settings(object):
+    def __init__(self, values: dict) -> None:
+        super().__init__()
+
+        self.values = values
+
+    def value(self, key: str):
+        return self.values.get(key)
+
+    def setValue(self, key: str, value):
+        self.values[key] = value
+
+class StateCollection(object):
+    """Counts the plugin state writes, each is a database round trip.
+    """
+    def __init__(self, state: dict) -> None:
+        super().__init__()
+
+        self.state = state
+        self.writeCount = 0
+
+    def find_one(self, filter):
+        return self.state
+
+    def update_one(self, filter, update, upsert=False):
+        self.writeCount += 1
+
+def createPlugins(pluginsFolder: str, pluginCount: int):
+    os.makedirs(pluginsFolder)
+    open(os.path.join(pluginsFolder, '__init__.py'), 'w').close()
+    for i in range(pluginCount):
+        pluginName = f'SyntheticPlugin{i:03d}'
+        pluginFolder = os.path.join(pluginsFolder, pluginName)
+        os.makedirs(pluginFolder)
+        open(os.path.join(pluginFolder, '__init__.py'), 'w').close()
+
+        with open(os.path.join(pluginFolder, 'lib.py'), 'w') as f:
+            for k in range(FUNCTIONS_PER_PLUGIN):
+                f.write(f'def function{k}(value):\n    return [value * {k} for _ in range(3)]\n\n')
+
+        # Every fifth plugin depends on the previous plugin:
+        dependencies = [f'SyntheticPlugin{i - 1:03d}'] if i % 5 == 4 else []
+        with open(os.path.join(pluginFolder, f'{pluginName}.py'), 'w') as f:
+            f.write(f'from plugin.Plugin import Plugin\nfrom {pluginName} import lib\n\n'
+                    f'class {pluginName}(Plugin):\n'
+                    f'    def init(self):\n        lib.function0(1)\n\n'
+                    f'    @staticmethod\n    def dependentPluginNames():\n        return {dependencies!r}\n')
+
+def loadPluginManagerClass(pluginManagerFilename: str):
+    if pluginManagerFilename == None:
+        from plugin.PluginManager import PluginManager
+        return PluginManager
+
+    spec = importlib.util.spec_from_file_location('PreviousPluginManager', pluginManagerFilename)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.PluginManager
+
+def runStartup(pluginsFolder: str, manifestFilename: str, pluginManagerFilename: str, inactivePluginNames: list):
+    """Runs in the child interpreter and prints the measurements as json.
+    """
+    from types import SimpleNamespace
+    PluginManager = loadPluginManagerClass(pluginManagerFilename)
+    stateCollection = StateCollection({'plugins_folders': [], 'plugin_autoactivate_status': {name: False for name in inactivePluginNames}})
+    serviceRegistry = SimpleNamespace(dbManager=SimpleNamespace(stateCollection=stateCollection))
+    settings = Settings({'plugin_manager': {'plugin_active_status': {name: False for name in inactivePluginNames}}})
+
+    tStart = time.perf_counter()
+    try:
+        pluginManager = PluginManager([pluginsFolder], serviceRegistry, None, manifestFilename=manifestFilename)
+    except TypeError:
+        # Without the plugin manifest cache:
+        pluginManager = PluginManager([pluginsFolder], serviceRegistry, None)
+    discoveryTime = time.perf_counter() - tStart
+
+    tStart = time.perf_counter()
+    pluginManager.load(settings, serviceRegistry.dbManager)
+    loadTime = time.perf_counter() - tStart
+
+    importedPluginNames = [name for name in pluginManager.availablePluginNames if f'{name}.{name}' in sys.modules]
+    activePluginNames = [name for name, info in pluginManager.pluginInfoMap.items() if info.pluginActive]
+    print(json.dumps({'discovery': discoveryTime, 'load': loadTime, 'imported': len(importedPluginNames), 'active': len(activePluginNames),
+                      'stateWrites': stateCollection.writeCount}))
+
+def startChild(pluginsFolder: str, manifestFilename: str, pluginManagerFilename: str, inactivePluginNames: list) -> dict:
+    arguments = [sys.executable, os.path.abspath(__file__), '--child', pluginsFolder, '--manifest', manifestFilename,
+                 '--inactive-names', ','.join(inactivePluginNames)]
+    if pluginManagerFilename:
+        arguments += ['--plugin-manager', pluginManagerFilename]
+
+    # Warm starts use the byte-compiled plugin modules of the previous start, like an installed application:
+    environment = dict(os.environ)
+    environment.pop('PYTHONDONTWRITEBYTECODE', None)
+    process = subprocess.run(arguments, capture_output=True, text=True, check=True, env=environment)
+    return json.loads(process.stdout.strip().splitlines()[-1])
+
+def removeByteCode(pluginsFolder: str):
+    for root, dirs, _ in os.walk(pluginsFolder):
+        for directory in dirs:
+            if directory == '__pycache__':
+                shutil.rmtree(os.path.join(root, directory))
+
+def measure(name: str, pluginsFolder: str, manifestFilename: str, pluginManagerFilename: str, inactivePluginNames: list, warmStartCount: int):
+    removeByteCode(pluginsFolder)
+    if os.path.exists(manifestFilename):
+        os.remove(manifestFilename)
+
+    cold = startChild(pluginsFolder, manifestFilename, pluginManagerFilename, inactivePluginNames)
+    warm = [startChild(pluginsFolder, manifestFilename, pluginManagerFilename, inactivePluginNames) for _ in range(warmStartCount)]
+
+    for label, result in [('cold', cold), ('warm', {key: statistics.median(r[key] for r in warm) for key in cold.keys()})]:
+        print(f'{name:8s} {label} discovery={result["discovery"] * 1000:.1f}ms load={result["load"] * 1000:.1f}ms '
+              f'imported={result["imported"]:.0f} active={result["active"]:.0f} state-writes={result["stateWrites"]:.0f}')
+
+def main():
+    parser = argparse.ArgumentParser(description="Plugin startup benchmark.")
+    parser.add_argument('--plugins', type=int, default=50)
+    parser.add_argument('--inactive', type=int, default=10, help='Number of deactivated plugins.')
+    parser.add_argument('--warm-starts', type=int, default=5)
+    parser.add_argument('--compare-revision', type=str, default=None, help='Also measures plugin/PluginManager.py of this git revision.')
+    parser.add_argument('--child', type=str, default=None, help=argparse.SUPPRESS)
+    parser.add_argument('--manifest', type=str, default=None, help=argparse.SUPPRESS)
+    parser.add_argument('--plugin-manager', type=str, default=None, help=argparse.SUPPRESS)
+    parser.add_argument('--inactive-names', type=str, default='', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        runStartup(args.child, args.manifest, args.plugin_manager, [name for name in args.inactive_names.split(',') if name])
+        return
+
+    rootDir = tempfile.mkdtemp(prefix='plugin_startup_')
+    try:
+        pluginsFolder = os.path.join(rootDir, 'plugins')
+        createPlugins(pluginsFolder, args.plugins)
+        # The inactive plugins are not dependencies of active plugins:
+        inactivePluginNames = [f'SyntheticPlugin{i:03d}' for i in range(args.plugins - args.inactive, args.plugins) if i % 5 != 3]
+        manifestFilename = os.path.join(rootDir, 'plugin_manifest.json')
+        print(f'plugins={args.plugins} inactive={len(inactivePluginNames)} warm-starts={args.warm_starts}')
+
+        measure('current', pluginsFolder, manifestFilename, None, inactivePluginNames, args.warm_starts)
+
+        if args.compare_revision:
+            previousFilename = os.path.join(rootDir, 'PreviousPluginManager.py')
+            source = subprocess.run(['git', 'show', f'{args.compare_revision}:plugin/PluginManager.py'], cwd=REPO_DIR, capture_output=True, text=True, check=True).stdout
+            with open(previousFilename, 'w') as f:
+                f.write(source)
+
+            measure(args.compare_revision, pluginsFolder, manifestFilename, previousFilename, inactivePluginNames, args.warm_starts)
+    finally:
+        shutil.rmtree(rootDir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
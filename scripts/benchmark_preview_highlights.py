@@ -0,0 +1,109 @@
+"""
+Preview highlight benchmark. Checks the preview existence of synthetic documents like the document table does:
+serially and on the preview existence thread pool, with a cold and a warm file existence cache.
+Also measures how long shutting down the pool takes while checks are still queued.
+A directory listing latency can be simulated to approximate network shares.
+
+Usage: python scripts/benchmark_preview_highlights.py --documents 5000 --folders 500 --latency 0.005
+"""
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from file_cache import FileExistenceCache as file_existence_cache
+from file_cache.FileExistenceCache import FileExistenceCache
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import tempfile
+import shutil
+import time
+
+# Matches the preview existence executor of the document search filter viewer:
+WORKER_COUNT = 8
+
+def createPreviews(rootDir: str, documentCount: int, folderCount: int):
+    """Creates previews for every second document. Half of the previews are frame sequences.
+    """
+    previews = []
+    for i in range(documentCount):
+        folder = os.path.join(rootDir, f'folder_{i % folderCount:05d}')
+        os.makedirs(folder, exist_ok=True)
+        if i % 4 < 2:
+            preview = os.path.join(folder, f'preview_{i:06d}.png')
+            if i % 2 == 0:
+                open(preview, 'w').close()
+        else:
+            preview = os.path.join(folder, f'anim_{i:06d}_####.png')
+            if i % 2 == 0:
+                open(os.path.join(folder, f'anim_{i:06d}_0001.png'), 'w').close()
+
+        previews.append(preview)
+
+    return previews
+
+def hasPreview(cache: FileExistenceCache, preview: str) -> bool:
+    if '#' in preview:
+        return cache.hasFrames(preview)
+
+    return cache.exists(preview)
+
+def simulateListingLatency(latencyInSeconds: float):
+    listdir = os.listdir
+
+    def slowListdir(path):
+        time.sleep(latencyInSeconds)
+        return listdir(path)
+
+    file_existence_cache.os.listdir = slowListdir
+
+def timeChecks(previews, check) -> float:
+    tStart = time.perf_counter()
+    results = list(check(previews))
+    elapsed = time.perf_counter() - tStart
+    assert sum(results) == (len(previews) + 1) // 2
+    return elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description="Preview highlight benchmark.")
+    parser.add_argument('--documents', type=int, default=5000)
+    parser.add_argument('--folders', type=int, default=500)
+    parser.add_argument('--latency', type=float, default=0.005, help='Simulated latency of a directory listing in seconds.')
+    args = parser.parse_args()
+
+    rootDir = tempfile.mkdtemp(prefix='preview_highlight_benchmark_')
+    try:
+        previews = createPreviews(rootDir, args.documents, args.folders)
+        if args.latency > 0.0:
+            simulateListingLatency(args.latency)
+
+        for name, workerCount in [('serial', 1), ('pool', WORKER_COUNT)]:
+            cache = FileExistenceCache()
+            executor = ThreadPoolExecutor(max_workers=workerCount, thread_name_prefix='PreviewExistence')
+            check = lambda previews: executor.map(lambda preview: hasPreview(cache, preview), previews)
+            coldTime = timeChecks(previews, check)
+            warmTime = timeChecks(previews, check)
+            executor.shutdown()
+            cache.shutdown()
+
+            print(f'{name:6s} workers={workerCount} cold={coldTime:.2f}s ({len(previews) / coldTime:.0f}/s) warm={warmTime:.3f}s ({len(previews) / warmTime:.0f}/s)')
+
+        # Quitting while a batch of cold checks is queued:
+        cache = FileExistenceCache()
+        executor = ThreadPoolExecutor(max_workers=WORKER_COUNT, thread_name_prefix='PreviewExistence')
+        isShuttingDown = False
+        futures = [executor.submit(lambda preview: not isShuttingDown and hasPreview(cache, preview), preview) for preview in previews]
+        time.sleep(0.05)
+        tStart = time.perf_counter()
+        isShuttingDown = True
+        executor.shutdown(wait=False)
+        shutdownTime = time.perf_counter() - tStart
+        executor.shutdown(wait=True)
+        drainTime = time.perf_counter() - tStart
+        cache.shutdown()
+        print(f'shutdown with {len(futures)} queued checks: returned after {shutdownTime * 1000:.1f}ms, workers drained after {drainTime * 1000:.1f}ms')
+    finally:
+        shutil.rmtree(rootDir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
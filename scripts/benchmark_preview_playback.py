@@ -0,0 +1,157 @@
+"""
+Deterministic preview playback harness. Plays a generated frame sequence in the PreviewViewer tick by tick and reports dropped frames,
+i.e. animation ticks on which the next frame was not decoded yet and the current frame was held.
+Decoding is simulated deterministically: a fixed number of queued decode tasks runs per tick instead of the decode thread pool.
+Also counts file stats on the GUI thread, which stall playback on network shares.
+
+Passes: cold (nothing decoded), warm (second loop), after switching to another shot and back (shared pixmap cache).
+
+Usage: python scripts/benchmark_preview_playback.py --frames 500 --decodes-per-tick 2
+"""
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PySide2 import QtWidgets, QtGui
+from viewers.PreviewViewer import PreviewViewer
+import viewers.PreviewViewer as preview_viewer
+from file_cache.FileExistenceCache import FileExistenceCache
+from file_cache.ThumbnailCache import ThumbnailCache
+import argparse
+import tempfile
+import shutil
+
+class DeterministicDecodePool(object):
+    """Replaces the decode thread pool. Queued tasks run on the calling thread when runTasks is called, highest priority first.
+    """
+    def __init__(self) -> None:
+        super().__init__()
+
+        self.tasks = []
+        self.isRunningTask = False
+
+    def start(self, task, priority=0):
+        self.tasks.append((priority, task))
+        # Stable: tasks of the same priority keep their order.
+        self.tasks.sort(key=lambda entry: -entry[0])
+
+    def clear(self):
+        self.tasks = []
+
+    def runTasks(self, count: int):
+        for _ in range(min(count, len(self.tasks))):
+            _, task = self.tasks.pop(0)
+            self.isRunningTask = True
+            try:
+                task.run()
+            finally:
+                self.isRunningTask = False
+
+class GUIThreadStatCounter(object):
+    """Replaces the os module of the preview viewer to count the file stats that are not made by decode tasks.
+    """
+    def __init__(self, decodePool: DeterministicDecodePool) -> None:
+        super().__init__()
+
+        self.decodePool = decodePool
+        self.count = 0
+
+    def __getattr__(self, name):
+        return getattr(os, name)
+
+    def stat(self, path, *args, **kwargs):
+        if not self.decodePool.isRunningTask:
+            self.count += 1
+
+        return os.stat(path, *args, **kwargs)
+
+    def install(self):
+        preview_viewer.os = self
+
+    def uninstall(self):
+        preview_viewer.os = os
+
+def createSequence(folder: str, name: str, frameCount: int, frameSize: int) -> str:
+    os.makedirs(folder, exist_ok=True)
+    for i in range(frameCount):
+        image = QtGui.QImage(frameSize, frameSize, QtGui.QImage.Format_RGB32)
+        image.fill(QtGui.QColor.fromHsv((i * 7) % 360, 200, 200))
+        image.save(os.path.join(folder, f'{name}.{i:04d}.png'))
+
+    return os.path.join(folder, f'{name}.####.png')
+
+def play(app, viewer: PreviewViewer, decodePool: DeterministicDecodePool, frameCount: int, decodesPerTick: int) -> int:
+    """Plays one loop of the shown sequence and returns the number of dropped frames.
+    """
+    droppedFrameCount = 0
+    shownFrameCount = 0
+    while shownFrameCount < frameCount:
+        frameIdx = viewer.curFrameIdx
+        viewer.onUpdateAnimation()
+        if viewer.curFrameIdx == frameIdx:
+            droppedFrameCount += 1
+        else:
+            shownFrameCount += 1
+
+        decodePool.runTasks(decodesPerTick)
+        # Delivers the decoded thumbnails to the viewer:
+        app.processEvents()
+
+    return droppedFrameCount
+
+def createViewer(rootDir: str):
+    decodePool = DeterministicDecodePool()
+    # The main window owns the dock widget, it must outlive the harness:
+    mainWindow = QtWidgets.QMainWindow()
+    viewer = PreviewViewer(mainWindow, FileExistenceCache(), ThumbnailCache(os.path.join(rootDir, 'thumbnails'), pruneOnStartup=False))
+    viewer.mainWindow = mainWindow
+    viewer.decodeThreadPool = decodePool
+    # The harness drives the animation instead of the timer:
+    viewer.isPlaying = False
+    return viewer, decodePool
+
+def runHarness(app, rootDir: str, frameCount: int, decodesPerTick: int, frameSize: int = 128):
+    shotPattern = createSequence(os.path.join(rootDir, 'shot'), 'shot', frameCount, frameSize)
+    otherShotPattern = createSequence(os.path.join(rootDir, 'other_shot'), 'other_shot', 10, frameSize)
+
+    viewer, decodePool = createViewer(rootDir)
+    statCounter = GUIThreadStatCounter(decodePool)
+    statCounter.install()
+    try:
+        viewer.showPreview(shotPattern)
+        results = {'cold': play(app, viewer, decodePool, frameCount, decodesPerTick),
+                   'warm': play(app, viewer, decodePool, frameCount, decodesPerTick)}
+
+        viewer.showPreview(otherShotPattern)
+        decodePool.runTasks(len(decodePool.tasks))
+        app.processEvents()
+
+        viewer.showPreview(shotPattern)
+        results['reselected'] = play(app, viewer, decodePool, frameCount, decodesPerTick)
+        results['gui-thread-stats'] = statCounter.count
+    finally:
+        statCounter.uninstall()
+        viewer.fileExistenceCache.shutdown()
+
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Deterministic preview playback harness.")
+    parser.add_argument('--frames', type=int, default=500)
+    parser.add_argument('--decodes-per-tick', type=int, default=2, help='Decoded frames per animation tick, e.g. decode threads x (tick duration / decode duration).')
+    parser.add_argument('--frame-size', type=int, default=128)
+    args = parser.parse_args()
+
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    rootDir = tempfile.mkdtemp(prefix='preview_playback_')
+    try:
+        results = runHarness(app, rootDir, args.frames, args.decodes_per_tick, args.frame_size)
+    finally:
+        shutil.rmtree(rootDir, ignore_errors=True)
+
+    print(f'frames={args.frames} decodes-per-tick={args.decodes_per_tick} dropped frames: cold={results["cold"]} warm={results["warm"]} '
+          f'reselected={results["reselected"]} gui-thread-stats={results["gui-thread-stats"]}')
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+"""
+Submission throughput benchmark. Drives the SubmissionAction of a rendering pipeline over synthetic documents
+with the 3ds Max, Blender and Nuke submitters against the local mock Deadline web service.
+Reports the submitted jobs per second and the time spent on temporary job file I/O.
+
+Usage: python scripts/benchmark_submission.py --documents 5000 --latency 0.02 --threads 1,8,16
+Requires the MetadataManagerCore package (Deadline service) like the application itself.
+"""
+import os
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(REPO_DIR)
+sys.path.append(os.path.join(REPO_DIR, 'plugins'))
+
+from MetadataManagerCore.third_party_integrations.deadline.deadline_service import DeadlineService, DeadlineServiceInfo
+from MetadataManagerCore import Keys
+import VisualScriptingExtensions.third_party_extensions.deadline_nodes as deadline_nodes
+from RenderingPipelinePlugin.RenderingPipeline import RenderingPipeline
+from RenderingPipelinePlugin.PipelineActions import SubmissionAction
+from RenderingPipelinePlugin.submitters.Max3dsSubmitter import Max3dsInputSceneCreationSubmitter, Max3dsRenderSceneCreationSubmitter, Max3dsRenderingSubmitter
+from RenderingPipelinePlugin.submitters.BlenderSubmitter import BlenderRenderingSubmitter
+from RenderingPipelinePlugin.submitters.NukeSubmitter import NukeSubmitter
+from RenderingPipelinePlugin import PipelineKeys
+from DocumentActionExecutionEngine import DocumentActionExecutionEngine
+from ApplicationMode import ApplicationMode
+from mock_deadline_webservice import MockDeadlineWebService
+from types import SimpleNamespace
+import argparse
+import tempfile
+import threading
+import shutil
+import logging
+import time
+
+class BenchmarkDeadlineServiceInfo(DeadlineServiceInfo):
+    """Writes the job files to the temporary benchmark directory.
+    """
+    jobInfoDirectory = None
+
+    @property
+    def customJobInfoDirectory(self):
+        return self.jobInfoDirectory
+
+    @customJobInfoDirectory.setter
+    def customJobInfoDirectory(self, value):
+        pass
+
+class BenchmarkEnvironment(object):
+    def __init__(self, settings: dict) -> None:
+        super().__init__()
+
+        self.settings = settings
+
+    def getEvaluatedSettings(self):
+        return dict(self.settings)
+
+class FileIOTimer(object):
+    """Accumulates the time spent in the job file functions of the deadline nodes over all submission threads.
+    """
+    def __init__(self) -> None:
+        super().__init__()
+
+        self.lock = threading.Lock()
+        self.seconds = 0.0
+        self.originalFunctions = dict()
+
+    def wrap(self, functionName: str):
+        function = getattr(deadline_nodes, functionName)
+        self.originalFunctions[functionName] = function
+
+        def timedFunction(*args, **kwargs):
+            tStart = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - tStart
+                with self.lock:
+                    self.seconds += elapsed
+
+        setattr(deadline_nodes, functionName, timedFunction)
+
+    def install(self):
+        for functionName in ['getDeadlineFilename', 'ensureDirectory', 'writeDeadlineFiles']:
+            self.wrap(functionName)
+
+    def uninstall(self):
+        for functionName, function in self.originalFunctions.items():
+            setattr(deadline_nodes, functionName, function)
+
+def createSettings(rootDir: str, threadCount: int) -> dict:
+    scriptFilename = os.path.join(rootDir, 'scripts', 'script.py')
+    os.makedirs(os.path.dirname(scriptFilename), exist_ok=True)
+    with open(scriptFilename, 'w') as f:
+        f.write('# benchmark\n')
+
+    return {
+        PipelineKeys.DeadlineSubmissionThreadCount: threadCount,
+        PipelineKeys.SidNaming: '[Name]',
+        PipelineKeys.RenderingNaming: '[Name]',
+        PipelineKeys.PostNaming: '[Name]',
+        PipelineKeys.InputSceneNaming: '[Name]',
+        PipelineKeys.CreatedInputSceneNaming: '[Name]',
+        PipelineKeys.RenderSceneNaming: '[Name]',
+        PipelineKeys.NukeSceneNaming: '[Name]',
+        PipelineKeys.BaseFolder: rootDir,
+        PipelineKeys.RenderingsFolder: os.path.join(rootDir, 'renderings'),
+        PipelineKeys.PostFolder: os.path.join(rootDir, 'post'),
+        PipelineKeys.CreatedInputScenesFolder: os.path.join(rootDir, 'input_scenes'),
+        PipelineKeys.RenderScenesFolder: os.path.join(rootDir, 'render_scenes'),
+        PipelineKeys.NukeScenesFolder: os.path.join(rootDir, 'nuke'),
+        PipelineKeys.InputSceneCreationScript: scriptFilename,
+        PipelineKeys.RenderSceneCreationScript: scriptFilename,
+        PipelineKeys.RenderingScript: scriptFilename,
+        PipelineKeys.NukeScript: scriptFilename,
+        PipelineKeys.PostOutputExtensions: 'png',
+        PipelineKeys.RenderingExtension: 'exr',
+        PipelineKeys.PerspectiveCodes: '',
+        PipelineKeys.Frames: '0',
+        PipelineKeys.DeadlinePriority: 50
+    }
+
+def createPipeline(settings: dict) -> RenderingPipeline:
+    environmentManager = SimpleNamespace(getEnvironmentFromName=lambda name: environment, getIdFromEnvironmentName=lambda name: name)
+    environment = BenchmarkEnvironment(settings)
+    serviceRegistry = SimpleNamespace(environmentManager=environmentManager, dbManager=None)
+    appInfo = SimpleNamespace(mode=ApplicationMode.Console)
+    return RenderingPipeline('Benchmark', serviceRegistry, None, appInfo)
+
+def createSubmitters(pipeline: RenderingPipeline):
+    submitters = [Max3dsInputSceneCreationSubmitter(pipeline), Max3dsRenderSceneCreationSubmitter(pipeline), Max3dsRenderingSubmitter(pipeline),
+                  BlenderRenderingSubmitter(pipeline), NukeSubmitter(pipeline)]
+    for submitter in submitters:
+        submitter.active = True
+
+    return submitters
+
+def yieldDocuments(documentCount: int):
+    for i in range(documentCount):
+        name = f'shot_{i:06d}'
+        yield {'_id': name, Keys.systemIDKey: name, 'Name': name}
+
+def runBenchmark(documentCount: int, threadCount: int, mockService: MockDeadlineWebService, rootDir: str):
+    jobInfoDirectory = os.path.join(rootDir, f'job_infos_{threadCount}')
+    BenchmarkDeadlineServiceInfo.jobInfoDirectory = jobInfoDirectory
+
+    pipeline = createPipeline(createSettings(rootDir, threadCount))
+    action = SubmissionAction(pipeline)
+    submitters = createSubmitters(pipeline)
+    actionArgs = (None, submitters, 'Suspended', None, None)
+
+    jobCountBefore = mockService.submittedJobCount
+    ioTimer = FileIOTimer()
+    ioTimer.install()
+    try:
+        tStart = time.perf_counter()
+        result = DocumentActionExecutionEngine().execute(action, yieldDocuments(documentCount), actionArgs)
+        elapsed = time.perf_counter() - tStart
+    finally:
+        ioTimer.uninstall()
+
+    jobCount = mockService.submittedJobCount - jobCountBefore
+    fileCount = sum(len(files) for _, _, files in os.walk(jobInfoDirectory))
+    directoryCount = sum(len(dirs) for _, dirs, _ in os.walk(jobInfoDirectory))
+
+    print(f'threads={threadCount:3d} documents={result.processedCount} errors={len(result.errors)} jobs={jobCount} '
+          f'time={elapsed:.2f}s jobs/s={jobCount / elapsed if elapsed > 0 else 0.0:.1f} '
+          f'temp-file-io={ioTimer.seconds:.2f}s (summed over threads) files={fileCount} dirs={directoryCount}')
+
+def main():
+    parser = argparse.ArgumentParser(description="Submission throughput benchmark against the mock Deadline web service.")
+    parser.add_argument('--documents', type=int, default=5000)
+    parser.add_argument('--latency', type=float, default=0.02, help='Simulated latency of the web service per request in seconds.')
+    parser.add_argument('--threads', type=str, default='1,8', help='Comma separated submission thread counts to compare.')
+    parser.add_argument('--keep', action='store_true', help='Keeps the temporary job files.')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    mockService = MockDeadlineWebService(port=0, latencyInSeconds=args.latency)
+    mockService.start()
+
+    info = BenchmarkDeadlineServiceInfo()
+    info.webserviceHost = mockService.host
+    info.webservicePort = mockService.port
+    deadlineService = DeadlineService(None)
+    deadlineService.updateInfo(info)
+    deadline_nodes.DEADLINE_SERVICE = deadlineService
+
+    rootDir = tempfile.mkdtemp(prefix='submission_benchmark_')
+    try:
+        for threadCount in [int(t) for t in args.threads.split(',')]:
+            runBenchmark(args.documents, threadCount, mockService, rootDir)
+    finally:
+        mockService.stop()
+        if not args.keep:
+            shutil.rmtree(rootDir, ignore_errors=True)
+        else:
+            print(f'Job files: {rootDir}')
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Table sort benchmark. Compares sorting a document table in memory, like TableModel.sortInMemory (all rows are fetched and sorted in Python),
+with the sort pushed down to the database (only the first visible batch is fetched) at different collection sizes.
+The one-off build time of the on-demand sort index is reported separately.
+
+Usage: python scripts/benchmark_table_sort.py --host mongodb://localhost:27017 --rows 10000,100000,500000
+Requires a mongod. The synthetic collections are dropped afterwards.
+"""
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from viewers.DocumentSearchFilterViewer import DocumentSearchFilterViewer, TableEntryQuery
+from unittest.mock import MagicMock
+from types import SimpleNamespace
+from pymongo import MongoClient
+import itertools
+import operator
+import argparse
+import logging
+import random
+import time
+
+BATCH_SIZE = 2000
+DISPLAYED_KEYS = ['name', 'size', 'status', 'preview']
+
+def seedCollection(collection, rowCount: int):
+    collection.drop()
+    rng = random.Random(0)
+    for start in range(0, rowCount, 10000):
+        collection.insert_many([{'name': f'asset_{rng.randrange(rowCount):08d}', 'size': rng.randrange(1 << 20),
+                                 'status': rng.choice(['new', 'rendering', 'done']), 'preview': f'/previews/{i}.png'}
+                                for i in range(start, min(rowCount, start + 10000))])
+
+def createQuery(db, collectionName: str) -> TableEntryQuery:
+    documentFilterManager = MagicMock()
+    documentFilterManager.getFilters.return_value = []
+    # Without custom filters the filter manager is a plain find:
+    documentFilterManager.yieldFilteredDocuments = lambda collectionName, itemsFilter, distinctionText, filters: db[collectionName].find(itemsFilter)
+    viewer = SimpleNamespace(logger=logging.getLogger(__name__), dbManager=SimpleNamespace(db=db), documentFilterManager=documentFilterManager,
+                             extractTableEntry=lambda displayedKeys, item: DocumentSearchFilterViewer.extractTableEntry(None, displayedKeys, item))
+    return TableEntryQuery(viewer, [collectionName], {}, '', DISPLAYED_KEYS)
+
+def sortInMemory(query: TableEntryQuery, key: str):
+    # Matches TableModel.sortInBackground:
+    entries = list(query.yieldTableEntries())
+    entries.sort(key=operator.itemgetter(DISPLAYED_KEYS.index(key) + 1))
+    return entries
+
+def sortInDatabase(query: TableEntryQuery, key: str):
+    return list(itertools.islice(query.yieldSortedTableEntries(key, False), BATCH_SIZE))
+
+def main():
+    parser = argparse.ArgumentParser(description="In-memory vs. database table sort benchmark.")
+    parser.add_argument('--host', type=str, default='mongodb://localhost:27017')
+    parser.add_argument('--db', type=str, default='table_sort_benchmark')
+    parser.add_argument('--rows', type=str, default='10000,100000,500000')
+    parser.add_argument('--key', type=str, default='name', choices=DISPLAYED_KEYS)
+    args = parser.parse_args()
+
+    client = MongoClient(args.host)
+    db = client[args.db]
+    try:
+        for rowCount in [int(r) for r in args.rows.split(',')]:
+            collectionName = f'rows_{rowCount}'
+            seedCollection(db[collectionName], rowCount)
+            query = createQuery(db, collectionName)
+
+            tStart = time.perf_counter()
+            entries = sortInMemory(query, args.key)
+            inMemoryTime = time.perf_counter() - tStart
+            inMemoryRowCount = len(entries)
+            del entries
+
+            tStart = time.perf_counter()
+            query.ensureSortIndex(args.key)
+            indexTime = time.perf_counter() - tStart
+
+            tStart = time.perf_counter()
+            entries = sortInDatabase(query, args.key)
+            databaseTime = time.perf_counter() - tStart
+
+            print(f'rows={rowCount:7d} in-memory={inMemoryTime:.3f}s ({inMemoryRowCount} rows loaded) '
+                  f'database={databaseTime:.3f}s ({len(entries)} rows loaded) index-build={indexTime:.3f}s (once per key)')
+    finally:
+        client.drop_database(args.db)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Task queue benchmark. Processes no-op tasks once with one console process per task, like the Deadline jobs of the
+Metadata Manager submitter did, and once with a single console worker that processes a directory task queue.
+Reports the tasks per second of both and the per task overhead that the worker saves.
+--mode latency instead starts a worker with --ready-timeout repeatedly and reports the distribution of the latency from the
+process start to the completion of its first task, which includes the database connection and the initialization.
+
+Usage: python scripts/benchmark_task_queue.py --tasks 500 --action-id <id of a registered document action>
+       python scripts/benchmark_task_queue.py --mode latency --starts 50 --ready-timeout 60 --action-id <id of a registered document action>
+Requires the full application environment (MetadataManagerCore and a reachable database) like the console mode itself.
+"""
+import os
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(REPO_DIR)
+
+from task_queue.DirectoryTaskQueue import DirectoryTaskQueue
+import subprocess
+import argparse
+import tempfile
+import math
+import shutil
+import time
+
+def createNoOpTaskDict(actionId: str) -> dict:
+    # Matches createMetadataManagerActionTaskDict of the deadline nodes. The filter matches no documents so the action never runs:
+    return {"taskType": "DocumentAction", "actionId": actionId, "collections": [],
+            "documentFilter": '{"_id": null}', "distinctionFilter": "", "customDocumentFilters": None}
+
+def getConsoleCommand(*args) -> list:
+    return [sys.executable, os.path.join(REPO_DIR, 'metadata_viewer.py'), '-mode', 'Console', '-loglevel', 'WARNING', *args]
+
+def runProcessPerTask(taskFilenames: list) -> float:
+    tStart = time.perf_counter()
+    for taskFilename in taskFilenames:
+        subprocess.run(getConsoleCommand('-task', taskFilename), cwd=REPO_DIR, check=True, stdout=subprocess.DEVNULL)
+
+    return time.perf_counter() - tStart
+
+def runWorker(queueDirectory: str, idleTimeout: float) -> float:
+    tStart = time.perf_counter()
+    subprocess.run(getConsoleCommand('-taskQueue', queueDirectory, '-idleTimeout', str(idleTimeout)), cwd=REPO_DIR, check=True, stdout=subprocess.DEVNULL)
+
+    # The worker quits after idling:
+    return time.perf_counter() - tStart - idleTimeout
+
+def measureFirstTaskLatency(queueDirectory: str, taskDict: dict, readyTimeout: float) -> float:
+    """Starts a worker for a queue with a single task and returns the seconds until the task is done or None if it failed.
+    """
+    queue = DirectoryTaskQueue(queueDirectory)
+    queue.put(taskDict, name='first_task')
+
+    tStart = time.perf_counter()
+    process = subprocess.Popen(getConsoleCommand('-taskQueue', queue.directory, '-idleTimeout', '0.1', '--ready-timeout', str(readyTimeout)),
+                               cwd=REPO_DIR, stdout=subprocess.DEVNULL)
+    latency = None
+    try:
+        while latency == None and process.poll() == None:
+            if len(os.listdir(queue.doneDirectory)) > 0:
+                latency = time.perf_counter() - tStart
+            else:
+                time.sleep(0.005)
+
+        # The task may be completed right before the worker quits:
+        if latency == None and len(os.listdir(queue.doneDirectory)) > 0:
+            latency = time.perf_counter() - tStart
+    finally:
+        process.wait()
+
+    return latency
+
+def getPercentile(sortedValues: list, percent: float) -> float:
+    # Nearest rank:
+    return sortedValues[min(len(sortedValues) - 1, max(0, math.ceil(percent / 100.0 * len(sortedValues)) - 1))]
+
+def runLatencyBenchmark(rootDir: str, taskDict: dict, startCount: int, readyTimeout: float):
+    latencies = []
+    failedCount = 0
+    for i in range(startCount):
+        latency = measureFirstTaskLatency(os.path.join(rootDir, f'start_{i:04d}'), taskDict, readyTimeout)
+        if latency == None:
+            failedCount += 1
+        else:
+            latencies.append(latency)
+
+    print(f'starts={startCount} ready-timeout={readyTimeout}s failed={failedCount}')
+    if len(latencies) > 0:
+        latencies.sort()
+        print(f'startup to first task: p50={getPercentile(latencies, 50):.2f}s p95={getPercentile(latencies, 95):.2f}s '
+              f'min={latencies[0]:.2f}s max={latencies[-1]:.2f}s')
+
+def main():
+    parser = argparse.ArgumentParser(description="Task queue benchmark: one process per task vs. one worker.")
+    parser.add_argument('--tasks', type=int, default=500)
+    parser.add_argument('--action-id', type=str, required=True, help='Id of a document action that is registered in the application.')
+    parser.add_argument('--idle-timeout', type=float, default=2.0)
+    parser.add_argument('--mode', type=str, default='throughput', choices=['throughput', 'latency'])
+    parser.add_argument('--starts', type=int, default=50, help='Latency mode: number of worker starts.')
+    parser.add_argument('--ready-timeout', type=float, default=60.0, help='Latency mode: passed to each worker.')
+    args = parser.parse_args()
+
+    rootDir = tempfile.mkdtemp(prefix='task_queue_benchmark_')
+    try:
+        taskDict = createNoOpTaskDict(args.action_id)
+        if args.mode == 'latency':
+            runLatencyBenchmark(rootDir, taskDict, args.starts, args.ready_timeout)
+            return
+
+        queue = DirectoryTaskQueue(os.path.join(rootDir, 'process_per_task'))
+        for i in range(args.tasks):
+            queue.put(taskDict, name=f'task_{i:05d}')
+
+        taskFilenames = [os.path.join(queue.pendingDirectory, f) for f in queue.getPendingTaskFilenames()]
+        processPerTaskTime = runProcessPerTask(taskFilenames)
+
+        queue = DirectoryTaskQueue(os.path.join(rootDir, 'worker'))
+        for i in range(args.tasks):
+            queue.put(taskDict, name=f'task_{i:05d}')
+
+        workerTime = runWorker(queue.directory, args.idle_timeout)
+        doneCount = len(os.listdir(queue.doneDirectory))
+        failedCount = len(os.listdir(queue.failedDirectory))
+
+        print(f'process per task: {processPerTaskTime:.2f}s ({args.tasks / processPerTaskTime:.1f} tasks/s)')
+        print(f'worker:           {workerTime:.2f}s ({args.tasks / workerTime:.1f} tasks/s) done={doneCount} failed={failedCount}')
+        print(f'saved per task:   {(processPerTaskTime - workerTime) / args.tasks * 1000:.1f}ms')
+    finally:
+        shutil.rmtree(rootDir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Thumbnail cache benchmark. Measures cold loads (decode + store), warm loads (cache hits) and pruning of the disk cache
+for synthetic preview images.
+
+Usage: python scripts/benchmark_thumbnail_cache.py --images 200 --image-size 2048 --thumbnail-size 256 --max-size-mb 2
+"""
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PySide2.QtGui import QImage, QColor, QPainter
+from file_cache.ThumbnailCache import ThumbnailCache
+import argparse
+import random
+import tempfile
+import shutil
+import time
+
+def createImages(directory: str, imageCount: int, imageSize: int):
+    rng = random.Random(0)
+    filenames = []
+    for i in range(imageCount):
+        image = QImage(imageSize, imageSize, QImage.Format_RGB32)
+        image.fill(QColor.fromHsv((i * 37) % 360, 200, 200))
+        # Detail keeps the thumbnails from compressing unrealistically well:
+        painter = QPainter(image)
+        blockSize = max(1, imageSize // 64)
+        for _ in range(4096):
+            painter.fillRect(rng.randrange(imageSize), rng.randrange(imageSize), blockSize, blockSize, QColor(rng.randrange(0xffffff)))
+        painter.end()
+
+        filename = os.path.join(directory, f'image_{i:05d}.jpg')
+        image.save(filename)
+        filenames.append(filename)
+
+    return filenames
+
+def getDirectorySize(directory: str) -> int:
+    return sum(os.path.getsize(os.path.join(root, f)) for root, _, files in os.walk(directory) for f in files)
+
+def timeLoads(cache: ThumbnailCache, filenames, thumbnailSize: int) -> float:
+    tStart = time.perf_counter()
+    for filename in filenames:
+        cache.loadThumbnail(filename, thumbnailSize)
+
+    return time.perf_counter() - tStart
+
+def main():
+    parser = argparse.ArgumentParser(description="Thumbnail cache benchmark.")
+    parser.add_argument('--images', type=int, default=200)
+    parser.add_argument('--image-size', type=int, default=2048)
+    parser.add_argument('--thumbnail-size', type=int, default=256)
+    parser.add_argument('--max-size-mb', type=float, default=2.0, help='Disk limit of the cache, should be smaller than all thumbnails to measure pruning.')
+    args = parser.parse_args()
+
+    rootDir = tempfile.mkdtemp(prefix='thumbnail_benchmark_')
+    try:
+        filenames = createImages(rootDir, args.images, args.image_size)
+        cacheDirectory = os.path.join(rootDir, 'cache')
+
+        cache = ThumbnailCache(cacheDirectory, maxSizeInBytes=1 << 40, pruneOnStartup=False)
+        coldTime = timeLoads(cache, filenames, args.thumbnail_size)
+        warmTime = timeLoads(cache, filenames, args.thumbnail_size)
+        uncappedSize = getDirectorySize(cacheDirectory)
+
+        print(f'images={args.images} cold={coldTime:.2f}s ({args.images / coldTime:.1f}/s) warm={warmTime:.2f}s ({args.images / warmTime:.1f}/s) '
+              f'cache-size={uncappedSize / 1e6:.2f}MB')
+
+        # Startup of a cache that exceeds the limit:
+        cache = ThumbnailCache(cacheDirectory, maxSizeInBytes=int(args.max_size_mb * 1e6), pruneOnStartup=False)
+        tStart = time.perf_counter()
+        cache.prune()
+        pruneTime = time.perf_counter() - tStart
+        print(f'prune: {pruneTime * 1000:.1f}ms {uncappedSize / 1e6:.2f}MB -> {getDirectorySize(cacheDirectory) / 1e6:.2f}MB (limit {args.max_size_mb:.2f}MB)')
+
+        # Steady state: stores beyond the limit trigger background pruning.
+        shutil.rmtree(cacheDirectory)
+        cache = ThumbnailCache(cacheDirectory, maxSizeInBytes=int(args.max_size_mb * 1e6), pruneOnStartup=False)
+        cache.prune()
+        cappedTime = timeLoads(cache, filenames, args.thumbnail_size)
+        while cache.pruneInProgress:
+            time.sleep(0.01)
+
+        print(f'capped cold={cappedTime:.2f}s ({args.images / cappedTime:.1f}/s) cache-size={getDirectorySize(cacheDirectory) / 1e6:.2f}MB')
+    finally:
+        shutil.rmtree(rootDir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
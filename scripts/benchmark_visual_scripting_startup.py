@@ -0,0 +1,181 @@
+"""
+Visual scripting startup benchmark. Generates synthetic modules like the ones the CodeGenerator writes for action and document filter graphs
+and measures ExtendedVisualScripting.registerNodeClasses on a cold start (no module info, no byte-compiled modules) and on warm starts.
+Each start runs in a fresh interpreter.
+--compare-revision also measures the ExtendedVisualScripting of the given git revision, e.g. the one before the lazily registered modules.
+
+Usage: python scripts/benchmark_visual_scripting_startup.py --graphs 300 --compare-revision 07cf0bd^
+"""
+import os
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(REPO_DIR)
+
+from types import SimpleNamespace
+import importlib.util
+import subprocess
+import statistics
+import argparse
+import tempfile
+import shutil
+import json
+import time
+
+NODES_PER_GRAPH = 100
+
+class ActionManager(object):
+    def __init__(self) -> None:
+        super().__init__()
+
+        self.actions = dict()
+
+    def isActionIdRegistered(self, actionId: str) -> bool:
+        return actionId in self.actions
+
+    def registerAction(self, action):
+        self.actions[action.id] = action
+
+class DocumentFilterManager(object):
+    def __init__(self) -> None:
+        super().__init__()
+
+        self.filters = []
+
+    def addFilter(self, documentFilter):
+        self.filters.append(documentFilter)
+
+class GraphManager(object):
+    def __init__(self, graphsFolder: str) -> None:
+        super().__init__()
+
+        self.graphsFolder = graphsFolder
+
+    def retrieveAvailableGraphSettings(self):
+        return [SimpleNamespace(name=os.path.splitext(filename)[0]) for filename in sorted(os.listdir(self.graphsFolder)) if filename.endswith('.py')]
+
+    def getModuleNameFromGraphName(self, graphName: str) -> str:
+        return graphName
+
+    def getPythonCodePath(self, graphSettings) -> str:
+        return os.path.join(self.graphsFolder, f'{graphSettings.name}.py')
+
+def createGeneratedModules(graphsFolder: str, graphCount: int):
+    """Every fourth graph is a document filter graph, the others are document action graphs.
+    """
+    os.makedirs(graphsFolder)
+    for i in range(graphCount):
+        moduleName = f'synthetic_graph_{i:04d}'
+        with open(os.path.join(graphsFolder, f'{moduleName}.py'), 'w') as f:
+            f.write('def execute(document, *args):\n    values = dict()\n')
+            for k in range(NODES_PER_GRAPH):
+                f.write(f"    values['node{k}'] = str(document.get('Name', '')) + '_{k}'\n")
+
+            f.write('    return values\n\n')
+
+            if i % 4 == 3:
+                f.write(f"HAS_STRING_ARG = False\nUNIQUE_LABEL_NAME = '{moduleName}'\n")
+            else:
+                f.write('import MetadataManagerCore.actions.DocumentAction\n\n'
+                        'class ActionVS(MetadataManagerCore.actions.DocumentAction.DocumentAction):\n'
+                        '    def execute(self, document):\n        execute(document)\n\n'
+                        f"    @property\n    def id(self):\n        return '{moduleName}'\n"
+                        f"    @property\n    def displayName(self):\n        return 'Synthetic Graph {i}'\n"
+                        "    @property\n    def filterTags(self):\n        return ['Synthetic']\n"
+                        "    @property\n    def category(self):\n        return 'Default'\n"
+                        "    @property\n    def runsOnMainThread(self):\n        return False\n")
+
+def loadExtendedVisualScriptingClass(extendedVisualScriptingFilename: str):
+    if extendedVisualScriptingFilename == None:
+        from VisualScriptingExtensions.ExtendedVisualScripting import ExtendedVisualScripting
+        return ExtendedVisualScripting
+
+    spec = importlib.util.spec_from_file_location('PreviousExtendedVisualScripting', extendedVisualScriptingFilename)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.ExtendedVisualScripting
+
+def runStartup(graphsFolder: str, extendedVisualScriptingFilename: str):
+    """Runs in the child interpreter and prints the measurements as json.
+    """
+    from PySide2.QtCore import QThreadPool
+    import logging
+    ExtendedVisualScripting = loadExtendedVisualScriptingClass(extendedVisualScriptingFilename)
+
+    # The graph serialization folders and the node graph of VisualScripting are not needed to register the generated modules:
+    visualScripting = ExtendedVisualScripting.__new__(ExtendedVisualScripting)
+    visualScripting.logger = logging.getLogger(__name__)
+    visualScripting.actionManager = ActionManager()
+    visualScripting.documentFilterManager = DocumentFilterManager()
+    visualScripting.graphManager = GraphManager(graphsFolder)
+
+    tStart = time.perf_counter()
+    visualScripting.registerNodeClasses()
+    registrationTime = time.perf_counter() - tStart
+
+    importedModuleNames = [name for name in sys.modules if name.startswith('synthetic_graph_')]
+    print(json.dumps({'registration': registrationTime, 'imported': len(importedModuleNames), 'actions': len(visualScripting.actionManager.actions),
+                      'filters': len(visualScripting.documentFilterManager.filters)}))
+
+    # Waits for the background byte-compilation:
+    QThreadPool.globalInstance().waitForDone()
+
+def startChild(graphsFolder: str, extendedVisualScriptingFilename: str) -> dict:
+    arguments = [sys.executable, os.path.abspath(__file__), '--child', graphsFolder]
+    if extendedVisualScriptingFilename:
+        arguments += ['--extended-visual-scripting', extendedVisualScriptingFilename]
+
+    # Warm starts use the byte-compiled modules of the previous start, like an installed application:
+    environment = dict(os.environ)
+    environment.pop('PYTHONDONTWRITEBYTECODE', None)
+    process = subprocess.run(arguments, capture_output=True, text=True, check=True, env=environment)
+    return json.loads(process.stdout.strip().splitlines()[-1])
+
+def removeCaches(graphsFolder: str):
+    for directory in ['__pycache__', '.graph_modules']:
+        shutil.rmtree(os.path.join(graphsFolder, directory), ignore_errors=True)
+
+def measure(name: str, graphsFolder: str, extendedVisualScriptingFilename: str, warmStartCount: int):
+    removeCaches(graphsFolder)
+
+    cold = startChild(graphsFolder, extendedVisualScriptingFilename)
+    warm = [startChild(graphsFolder, extendedVisualScriptingFilename) for _ in range(warmStartCount)]
+
+    for label, result in [('cold', cold), ('warm', {key: statistics.median(r[key] for r in warm) for key in cold.keys()})]:
+        print(f'{name:8s} {label} registration={result["registration"] * 1000:.1f}ms imported={result["imported"]:.0f} '
+              f'actions={result["actions"]:.0f} filters={result["filters"]:.0f}')
+
+def main():
+    parser = argparse.ArgumentParser(description="Visual scripting startup benchmark.")
+    parser.add_argument('--graphs', type=int, default=300)
+    parser.add_argument('--warm-starts', type=int, default=5)
+    parser.add_argument('--compare-revision', type=str, default=None, help='Also measures VisualScriptingExtensions/ExtendedVisualScripting.py of this git revision.')
+    parser.add_argument('--child', type=str, default=None, help=argparse.SUPPRESS)
+    parser.add_argument('--extended-visual-scripting', type=str, default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        runStartup(args.child, args.extended_visual_scripting)
+        return
+
+    rootDir = tempfile.mkdtemp(prefix='visual_scripting_startup_')
+    try:
+        graphsFolder = os.path.join(rootDir, 'graphs')
+        createGeneratedModules(graphsFolder, args.graphs)
+        print(f'graphs={args.graphs} warm-starts={args.warm_starts}')
+
+        measure('current', graphsFolder, None, args.warm_starts)
+
+        if args.compare_revision:
+            previousFilename = os.path.join(rootDir, 'PreviousExtendedVisualScripting.py')
+            source = subprocess.run(['git', 'show', f'{args.compare_revision}:VisualScriptingExtensions/ExtendedVisualScripting.py'], cwd=REPO_DIR,
+                                    capture_output=True, text=True, check=True).stdout
+            with open(previousFilename, 'w') as f:
+                f.write(source)
+
+            measure(args.compare_revision, graphsFolder, previousFilename, args.warm_starts)
+    finally:
+        shutil.rmtree(rootDir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""
+Local stand-in for the Deadline web service. Implements the endpoints used by the DeadlineService:
+job submission (POST /api/jobs), job queries (GET /api/jobs) and pool names (GET /api/pools).
+Submitted job and plugin infos are recorded and synthetic job ids are returned after a configurable latency.
+
+Usage: python scripts/mock_deadline_webservice.py --port 8082 --latency 0.05 --record submissions.jsonl
+Point the Deadline service info of the Metadata Manager to localhost and the chosen port.
+"""
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+import argparse
+import threading
+import logging
+import json
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_NAMES = ['none', 'input_scenes', 'render_scenes', 'renderings', 'nuke', 'blender', 'delivery']
+
+class MockDeadlineWebService(object):
+    def __init__(self, host='localhost', port=8082, latencyInSeconds=0.0, poolNames=None, recordFilename=None):
+        super().__init__()
+
+        self.host = host
+        self.port = port
+        self.latencyInSeconds = latencyInSeconds
+        self.poolNames = poolNames if poolNames != None else DEFAULT_POOL_NAMES
+        self.recordFilename = recordFilename
+
+        self.jobs = dict()
+        self.jobsLock = threading.Lock()
+        self.server: ThreadingHTTPServer = None
+        self.serverThread: threading.Thread = None
+
+    @property
+    def submittedJobCount(self):
+        with self.jobsLock:
+            return len(self.jobs)
+
+    def submitJob(self, jobInfo: dict, pluginInfo: dict, auxFiles: list) -> dict:
+        # Deadline job ids are 24 hex characters long:
+        jobId = uuid.uuid4().hex[:24]
+        job = {
+            '_id': jobId,
+            'Props': {
+                'Name': jobInfo.get('Name', ''),
+                'Plug': jobInfo.get('Plugin', ''),
+                'Pool': jobInfo.get('Pool', 'none'),
+                'PluginInfo': pluginInfo
+            },
+            'JobInfo': jobInfo,
+            'AuxFiles': auxFiles,
+            'SubmissionTime': time.time()
+        }
+
+        with self.jobsLock:
+            self.jobs[jobId] = job
+
+            if self.recordFilename:
+                with open(self.recordFilename, 'a') as f:
+                    f.write(json.dumps(job) + '\n')
+
+        return job
+
+    def getJobs(self, jobIds: list = None) -> list:
+        with self.jobsLock:
+            if jobIds:
+                return [self.jobs[jobId] for jobId in jobIds if jobId in self.jobs]
+
+            return list(self.jobs.values())
+
+    def start(self):
+        service = self
+
+        class RequestHandler(MockDeadlineRequestHandler):
+            mockService = service
+
+        self.server = ThreadingHTTPServer((self.host, self.port), RequestHandler)
+        # Allows binding to port 0 to get a free port:
+        self.port = self.server.server_address[1]
+        self.serverThread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.serverThread.start()
+
+        logger.info(f'Mock Deadline web service running on {self.host}:{self.port}')
+
+    def stop(self):
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+class MockDeadlineRequestHandler(BaseHTTPRequestHandler):
+    mockService: MockDeadlineWebService = None
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+    def sendJson(self, data, status=200):
+        body = json.dumps(data).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def simulateLatency(self):
+        if self.mockService.latencyInSeconds > 0:
+            time.sleep(self.mockService.latencyInSeconds)
+
+    def do_GET(self):
+        self.simulateLatency()
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+
+        if url.path.rstrip('/') == '':
+            body = b'Running'
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        elif url.path == '/api/pools':
+            self.sendJson(self.mockService.poolNames)
+        elif url.path == '/api/jobs':
+            jobIds = [jobId for ids in query.get('JobID', []) for jobId in ids.split(',')]
+            jobs = self.mockService.getJobs(jobIds)
+            if query.get('IdOnly', ['false'])[0].lower() == 'true':
+                self.sendJson([job['_id'] for job in jobs])
+            else:
+                self.sendJson(jobs)
+        else:
+            self.sendJson({'Error': f'Unknown endpoint {url.path}'}, status=404)
+
+    def do_POST(self):
+        self.simulateLatency()
+        url = urlparse(self.path)
+
+        if url.path != '/api/jobs':
+            self.sendJson({'Error': f'Unknown endpoint {url.path}'}, status=404)
+            return
+
+        try:
+            contentLength = int(self.headers.get('Content-Length', 0))
+            data = json.loads(self.rfile.read(contentLength).decode('utf-8'))
+        except Exception as e:
+            self.sendJson({'Error': f'Invalid request body: {e}'}, status=400)
+            return
+
+        job = self.mockService.submitJob(data.get('JobInfo', {}), data.get('PluginInfo', {}), data.get('AuxFiles', []))
+        self.sendJson({'_id': job['_id']} if data.get('IdOnly') else job)
+
+def main():
+    parser = argparse.ArgumentParser(description="Local mock of the Deadline web service.")
+    parser.add_argument('--host', type=str, default='localhost')
+    parser.add_argument('--port', type=int, default=8082)
+    parser.add_argument('--latency', type=float, default=0.0, help='Simulated latency per request in seconds.')
+    parser.add_argument('--pools', type=str, default=None, help='Comma separated pool names.')
+    parser.add_argument('--record', type=str, default=None, help='Appends submitted jobs as json lines to the given file.')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    poolNames = [p.strip() for p in args.pools.split(',')] if args.pools else None
+    service = MockDeadlineWebService(args.host, args.port, args.latency, poolNames, args.record)
+    service.start()
+
+    try:
+        while True:
+            time.sleep(1.0)
+    except KeyboardInterrupt:
+        logger.info(f'Stopping. Submitted jobs: {service.submittedJobCount}')
+        service.stop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""
+Rebuilds the key registry (see database/collection_keys.py) of existing collections.
+Only needed once for collections that were written before the registry existed or by external tools.
+The registry of a collection is otherwise rebuilt on demand when the collection is opened in the collection viewer.
+
+Usage: python scripts/rebuild_collection_keys.py --host mongodb://localhost:27017 --db metadata_manager [--collections a,b]
+"""
+from pymongo import MongoClient
+import argparse
+import logging
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from database import collection_keys
+
+logger = logging.getLogger(__name__)
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuilds the key registry of existing collections.")
+    parser.add_argument('--host', type=str, default='mongodb://localhost:27017')
+    parser.add_argument('--db', type=str, required=True, help='Database name.')
+    parser.add_argument('--collections', type=str, default=None, help='Comma separated collection names. Defaults to all collections.')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    db = MongoClient(args.host)[args.db]
+    if args.collections:
+        collectionNames = [c.strip() for c in args.collections.split(',')]
+    else:
+        collectionNames = [c for c in db.list_collection_names() if c != collection_keys.COLLECTION_KEYS_COLLECTION_NAME and not c.startswith('system.')]
+
+    for collectionName in collectionNames:
+        try:
+            collection_keys.rebuild(db, collectionName)
+        except Exception as e:
+            logger.error(f'Failed to rebuild the key registry of {collectionName}: {str(e)}')
+
+if __name__ == "__main__":
+    main()
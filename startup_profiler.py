@@ -0,0 +1,111 @@
+from contextlib import contextmanager
+from typing import List
+import builtins
+import threading
+import time
+import sys
+
+class ProfileNode(object):
+    def __init__(self, name: str, isImport: bool = False) -> None:
+        super().__init__()
+
+        self.name = name
+        self.isImport = isImport
+        self.durationInSeconds = 0.0
+        self.children: List['ProfileNode'] = []
+
+class StartupProfiler(object):
+    """Records a timing tree of the startup phases and the imports of not yet loaded modules.
+    Disabled by default, the phases have no overhead then. Enabled with the --profile-startup switch.
+    """
+    def __init__(self) -> None:
+        super().__init__()
+
+        self.enabled = False
+        self.root = ProfileNode('startup')
+        self.lock = threading.Lock()
+        self.threadState = threading.local()
+        self.originalImport = None
+        self.startTime = 0.0
+        # Imports and phases below this duration are omitted from the report:
+        self.minReportedDurationInSeconds = 0.001
+
+    def enable(self, profileImports=True):
+        self.enabled = True
+        self.startTime = time.perf_counter()
+
+        if profileImports and builtins.__import__ != self.profiledImport:
+            self.originalImport = builtins.__import__
+            builtins.__import__ = self.profiledImport
+
+    def disable(self):
+        self.enabled = False
+        self.root.durationInSeconds = time.perf_counter() - self.startTime
+
+        # The saved import is kept, other threads may still be inside profiledImport:
+        if builtins.__import__ == self.profiledImport:
+            builtins.__import__ = self.originalImport
+
+    @property
+    def stack(self) -> List[ProfileNode]:
+        stack = getattr(self.threadState, 'stack', None)
+        if stack == None:
+            stack = []
+            self.threadState.stack = stack
+
+        return stack
+
+    @contextmanager
+    def phase(self, name: str, isImport: bool = False):
+        if not self.enabled:
+            yield
+            return
+
+        node = ProfileNode(name, isImport)
+        stack = self.stack
+        parent = stack[-1] if len(stack) > 0 else None
+        stack.append(node)
+        tStart = time.perf_counter()
+        try:
+            yield
+        finally:
+            node.durationInSeconds = time.perf_counter() - tStart
+            stack.pop()
+
+            if parent != None:
+                parent.children.append(node)
+            else:
+                with self.lock:
+                    self.root.children.append(node)
+
+    def profiledImport(self, name, globals=None, locals=None, fromlist=(), level=0):
+        originalImport = self.originalImport
+
+        # Already loaded modules are not profiled:
+        if not self.enabled or (level == 0 and name in sys.modules):
+            return originalImport(name, globals, locals, fromlist, level)
+
+        with self.phase(name, isImport=True):
+            return originalImport(name, globals, locals, fromlist, level)
+
+    def report(self) -> str:
+        lines = []
+
+        def addLines(node: ProfileNode, depth: int):
+            for child in node.children:
+                if child.durationInSeconds < self.minReportedDurationInSeconds:
+                    continue
+
+                label = f'import {child.name}' if child.isImport else child.name
+                lines.append(f'{"  " * depth}{child.durationInSeconds * 1000.0:9.1f} ms  {label}')
+                addLines(child, depth + 1)
+
+        lines.append(f'Startup profile ({self.root.durationInSeconds:.2f}s total):')
+        addLines(self.root, 0)
+
+        return '\n'.join(lines)
+
+PROFILER = StartupProfiler()
+
+def phase(name: str):
+    return PROFILER.phase(name)
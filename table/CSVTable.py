@@ -1,32 +1,95 @@
 from table.Table import Table
+from itertools import islice
+import csv
 
 class CSVTable(Table):
+    """Streams rows from a csv file instead of keeping the whole table in memory.
+    If no separator is given, the delimiter is sniffed from the beginning of the file.
+    """
+    sniffSampleSize = 64 * 1024
+
     def __init__(self, path, separator, encodingOverride=None):
-        self.rows = []
-        with open(path) as f:
-            for row in f:
-                self.rows.append(row.rstrip('\n').split(sep=separator))
+        super().__init__()
+
+        self.path = path
+        self.separator = separator
+        self.encoding = encodingOverride
+        self.dialect = self.sniffDialect()
+
+        self.header = None
+        self.nrows_computed = None
+        # Sequential getRowValues calls continue reading with the same csv reader instead of rescanning the file:
+        self.rowIterator = None
+        self.nextRowIndex = 0
+
+    def open(self):
+        return open(self.path, newline='', encoding=self.encoding)
+
+    def sniffDialect(self):
+        with self.open() as f:
+            sample = f.read(self.sniffSampleSize)
+
+        try:
+            if self.separator:
+                return csv.Sniffer().sniff(sample, delimiters=self.separator)
+            else:
+                return csv.Sniffer().sniff(sample)
+        except csv.Error:
+            # Sniffing fails for single column tables or if the sample ends in the middle of a quoted cell.
+            dialect = csv.excel
+            if self.separator:
+                class SeparatorDialect(csv.excel):
+                    delimiter = self.separator
+
+                dialect = SeparatorDialect
+
+            return dialect
+
+    def yieldRows(self):
+        with self.open() as f:
+            for row in csv.reader(f, self.dialect):
+                yield row
 
     def getRowValues(self, rowIndex):
-        return self.rows[rowIndex]
+        if rowIndex == 0 and self.header != None:
+            return self.header
+
+        # Restart reading only for rows before the current position:
+        if self.rowIterator == None or rowIndex < self.nextRowIndex:
+            self.rowIterator = self.yieldRows()
+            self.nextRowIndex = 0
+
+        row = next(islice(self.rowIterator, rowIndex - self.nextRowIndex, None), None)
+        if row == None:
+            self.rowIterator = None
+            raise IndexError(f'Row index {rowIndex} is out of range.')
+
+        self.nextRowIndex = rowIndex + 1
+        if rowIndex == 0:
+            self.header = row
+
+        return row
 
     def getColumnValues(self, colIndex):
-        return [self.rows[i][colIndex] for i in range(0,self.nrows)]
+        return [row[colIndex] if colIndex < len(row) else None for row in self.yieldRows()]
 
     def getCellValue(self, rowIndex, colIndex):
-        return self.rows[rowIndex][colIndex]
+        return self.getRowValues(rowIndex)[colIndex]
 
     @property
     def ncols(self):
-        return len(self.rows[0]) if len(self.rows) > 0 else 0
-    
+        try:
+            return len(self.getRowValues(0))
+        except IndexError:
+            return 0
+
     @property
     def nrows(self):
-        return len(self.rows)
+        # A single counting pass, the result is kept for the lifetime of the table:
+        if self.nrows_computed == None:
+            self.nrows_computed = sum(1 for _ in self.yieldRows())
 
-    def getRowsWithoutHeader(self, headerIdx=0):
-        for rowIdx in range(headerIdx+1, self.nrows):
-            yield self.getRowValues(rowIdx)
+        return self.nrows_computed
 
-    def getRowAsDict(self, headerValues, rowValues):
-        return dict(zip(headerValues, rowValues))
\ No newline at end of file
+    def getRowsWithoutHeader(self, headerIdx=0):
+        return islice(self.yieldRows(), headerIdx+1, None)
@@ -1,4 +1,17 @@
 from table.Table import Table
+from xml.etree import ElementTree
+import posixpath
+import zipfile
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Transitional and strict (ISO 29500) namespaces of the workbook part:
+SPREADSHEETML_NAMESPACES = ['http://schemas.openxmlformats.org/spreadsheetml/2006/main', 'http://purl.oclc.org/ooxml/spreadsheetml/main']
+PACKAGE_RELATIONSHIPS_NAMESPACE = 'http://schemas.openxmlformats.org/package/2006/relationships'
+OFFICE_DOCUMENT_RELATIONSHIP_TYPES = ['http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument',
+                                      'http://purl.oclc.org/ooxml/officeDocument/relationships/officeDocument']
+DEFAULT_WORKBOOK_PART = 'xl/workbook.xml'
 
 imported = False
 try:
@@ -41,11 +54,52 @@ class ExcelTable(Table):
         if workbookPath.lower().endswith('.xls'):
             return XlsTable(xlrd.open_workbook(filename=workbookPath,encoding_override=encodingOverride).sheet_by_name(sheetName))
         else:
+            # A read-only workbook keeps its archive open while rows are streamed.
+            # Reading the compressed file into memory avoids locking the table on disk.
             with open(workbookPath, "rb") as f:
                 inMemFile = io.BytesIO(f.read())
 
             wb = openpyxl.load_workbook(inMemFile, read_only=True, data_only=True)
-            return XlsxTable(wb.get_sheet_by_name(sheetName))
+            return XlsxTable(wb[sheetName])
+
+    @staticmethod
+    def getSheetNames(workbookPath: str):
+        if workbookPath.lower().endswith('.xls'):
+            wb = xlrd.open_workbook(filename=workbookPath, on_demand=True)
+            sheetNames = wb.sheet_names()
+            wb.release_resources()
+            return sheetNames
+        else:
+            # Only the workbook part is parsed, cell data and shared strings are never touched.
+            try:
+                with zipfile.ZipFile(workbookPath) as archive:
+                    root = ElementTree.fromstring(archive.read(ExcelTable.getWorkbookPartName(archive)))
+
+                sheetNames = [sheet.get('name') for namespace in SPREADSHEETML_NAMESPACES for sheet in root.iter(f'{{{namespace}}}sheet')]
+                if len(sheetNames) > 0:
+                    return sheetNames
+            except Exception as e:
+                logger.debug(f'Failed to parse the workbook part of {workbookPath}: {str(e)}')
+
+            wb = openpyxl.load_workbook(workbookPath, read_only=True)
+            sheetNames = wb.sheetnames
+            wb.close()
+            return sheetNames
+
+    @staticmethod
+    def getWorkbookPartName(archive: zipfile.ZipFile) -> str:
+        """Resolves the workbook part through the package relationships. It is not necessarily stored at xl/workbook.xml.
+        """
+        try:
+            root = ElementTree.fromstring(archive.read('_rels/.rels'))
+        except KeyError:
+            return DEFAULT_WORKBOOK_PART
+
+        for relationship in root.iter(f'{{{PACKAGE_RELATIONSHIPS_NAMESPACE}}}Relationship'):
+            if relationship.get('Type') in OFFICE_DOCUMENT_RELATIONSHIP_TYPES:
+                return posixpath.normpath(relationship.get('Target').lstrip('/'))
+
+        return DEFAULT_WORKBOOK_PART
 
 class XlsTable(ExcelTable):
     def getRowValues(self, rowIndex):
@@ -66,42 +120,65 @@ class XlsTable(ExcelTable):
         return self.sheet.nrows if self.sheet != None else 0
 
 class XlsxTable(ExcelTable):
+    """Expects a read-only worksheet. Rows are streamed with iter_rows instead of being materialized as cell objects.
+    """
     def __init__(self, sheet):
         super().__init__(sheet)
 
-        self.rows = list(self.sheet.rows)
+        self.header = None
         self.nrows_computed = None
         self.ncols_computed = None
 
-        if self.nrows == None:
-            self.nrows_computed = len(self.rows)
-        
-        if self.ncols == None:
-            self.ncols_computed = len(self.rows[0])
+    def yieldRows(self, minRow=None, maxRow=None, minCol=None, maxCol=None):
+        if self.sheet == None:
+            return
+
+        for row in self.sheet.iter_rows(min_row=minRow, max_row=maxRow, min_col=minCol, max_col=maxCol, values_only=True):
+            yield list(row)
 
     def getRowValues(self, rowIndex):
-        return [cell.value if cell else None for cell in self.rows[rowIndex]] if self.sheet != None else []
+        if rowIndex == 0 and self.header != None:
+            return self.header
+
+        row = next(self.yieldRows(minRow=rowIndex+1, maxRow=rowIndex+1), [])
+        if rowIndex == 0:
+            self.header = row
+
+        return row
 
     def getColumnValues(self, colIndex):
-        return [cell.value if cell else None for col in self.sheet.iter_cols(min_col=colIndex+1, max_col=colIndex+1) for cell in col] if self.sheet != None else []
+        return [row[0] if len(row) > 0 else None for row in self.yieldRows(minCol=colIndex+1, maxCol=colIndex+1)]
 
     def getCellValue(self, rowIndex, colIndex):
-        cell = self.sheet.cell(rowIndex, colIndex) if self.sheet != None else None
-        if cell:
-            return cell.value
-        
-        return None
+        row = self.getRowValues(rowIndex)
+        return row[colIndex] if colIndex < len(row) else None
 
     @property
     def ncols(self):
-        if self.ncols_computed:
-            return self.ncols_computed
-        else:
-            return self.sheet.max_column if self.sheet != None else 0
+        if self.sheet == None:
+            return 0
+
+        if self.sheet.max_column != None:
+            return self.sheet.max_column
+
+        if self.ncols_computed == None:
+            self.ncols_computed = len(self.getRowValues(0))
+
+        return self.ncols_computed
 
     @property
     def nrows(self):
-        if self.nrows_computed:
-            return self.nrows_computed
-        else:
-            return self.sheet.max_row if self.sheet != None else 0
\ No newline at end of file
+        if self.sheet == None:
+            return 0
+
+        if self.sheet.max_row != None:
+            return self.sheet.max_row
+
+        # The dimensions are unknown if the sheet doesn't store them:
+        if self.nrows_computed == None:
+            self.nrows_computed = sum(1 for _ in self.yieldRows())
+
+        return self.nrows_computed
+
+    def getRowsWithoutHeader(self, headerIdx=0):
+        return self.yieldRows(minRow=headerIdx+2)
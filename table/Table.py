@@ -27,11 +27,21 @@ class Table(ABC):
         ...
 
     def getColumnsWithoutHeader(self, headerIdx=0):
-        return [self.getColumnValues(i)[headerIdx+1:] for i in range(0, self.ncols)]
+        # Collect all columns in a single pass over the rows:
+        columns = [[] for _ in range(0, self.ncols)]
+        for row in self.getRowsWithoutHeader(headerIdx):
+            for i, column in enumerate(columns):
+                column.append(row[i] if i < len(row) else None)
+
+        return columns
 
     def getHeader(self,rowIndex=0):
         return self.getRowValues(rowIndex)
 
+    def yieldRows(self):
+        for rowIdx in range(0, self.nrows):
+            yield self.getRowValues(rowIdx)
+
     def getRowsWithoutHeader(self, headerIdx=0):
         for rowIdx in range(headerIdx+1, self.nrows):
             yield self.getRowValues(rowIdx)
@@ -23,15 +23,8 @@ def readTable(tablePath: str, csvSeparator=';', excelSheetName=None, encodingOve
         raise RuntimeError(f'Unsupported file format {os.path.splitext(tablePath)[1]}')
 
 def getSheetNames(tablePath: str):
-    if tablePath.lower().endswith('.xls'):
-        wb = xlrd.open_workbook(filename=tablePath)
-        return wb.sheet_names()
-    elif tablePath.lower().endswith('.xlsx'):
-        wb = openpyxl.load_workbook(tablePath, read_only=True, data_only=True)
-        sheetnames = wb.sheetnames
-        wb.close()
-        
-        return sheetnames
+    if tablePath.lower().endswith('.xls') or tablePath.lower().endswith('.xlsx'):
+        return ExcelTable.getSheetNames(tablePath)
 
     return None
 
@@ -0,0 +1,108 @@
+from task_queue.TaskQueue import TaskQueue, TaskQueueEntry
+import json
+import time
+import uuid
+import os
+import logging
+
+logger = logging.getLogger(__name__)
+
+class DirectoryTaskQueue(TaskQueue):
+    """Task queue in a local or shared directory. Producers put task json files into the pending folder.
+    Workers claim a task by moving it into the processing folder. The move is atomic so multiple workers can share a queue.
+    Completed tasks are moved into the done or failed folder and the log of each task is written to the logs folder.
+    The mtime of a task in the processing folder is its lease: workers renew it while processing. Tasks whose lease expired,
+    e.g. because their worker crashed, are moved back to the pending folder when a worker starts.
+    """
+    pollIntervalInSeconds = 0.25
+    leaseDurationInSeconds = 300.0
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        self.pendingDirectory = os.path.join(directory, 'pending')
+        self.processingDirectory = os.path.join(directory, 'processing')
+        self.doneDirectory = os.path.join(directory, 'done')
+        self.failedDirectory = os.path.join(directory, 'failed')
+
+        for d in [self.pendingDirectory, self.processingDirectory, self.doneDirectory, self.failedDirectory]:
+            os.makedirs(d, exist_ok=True)
+
+        super().__init__(os.path.join(directory, 'logs'))
+
+        self.requeueExpiredTasks()
+
+    def __str__(self) -> str:
+        return self.directory
+
+    def put(self, taskDict: dict, name: str = None) -> str:
+        """Adds the task to the queue. The name defaults to a unique name that keeps the tasks in submission order.
+        """
+        if name == None:
+            name = f'{time.strftime("%Y%m%d-%H%M%S")}-{time.time_ns() % 1000000000:09d}_{uuid.uuid4().hex[:8]}'
+
+        # Written next to the pending folder first so workers never see partially written tasks:
+        tempFilename = os.path.join(self.directory, f'{name}.json.tmp')
+        with open(tempFilename, 'w') as f:
+            json.dump(taskDict, f)
+
+        os.replace(tempFilename, os.path.join(self.pendingDirectory, f'{name}.json'))
+
+        return name
+
+    def requeueExpiredTasks(self) -> int:
+        requeuedCount = 0
+        now = time.time()
+        for entry in os.scandir(self.processingDirectory):
+            try:
+                if not entry.is_file() or now - entry.stat().st_mtime < self.leaseDurationInSeconds:
+                    continue
+
+                os.replace(entry.path, os.path.join(self.pendingDirectory, entry.name))
+                requeuedCount += 1
+                logger.warning(f'Requeued the task {entry.name} because its lease expired.')
+            except OSError:
+                # Completed or requeued by another worker in the meantime:
+                continue
+
+        return requeuedCount
+
+    def getPendingTaskFilenames(self):
+        entries = [e for e in os.scandir(self.pendingDirectory) if e.is_file() and e.name.endswith('.json')]
+        return [e.name for e in sorted(entries, key=lambda e: (e.stat().st_mtime, e.name))]
+
+    def get(self, timeout: float) -> TaskQueueEntry:
+        tStart = time.time()
+        while True:
+            for filename in self.getPendingTaskFilenames():
+                processingFilename = os.path.join(self.processingDirectory, filename)
+                try:
+                    os.replace(os.path.join(self.pendingDirectory, filename), processingFilename)
+                except OSError:
+                    # Claimed by another worker:
+                    continue
+
+                # Starts the lease:
+                self.renewLease(processingFilename)
+                return TaskQueueEntry(os.path.splitext(filename)[0], processingFilename)
+
+            if time.time() - tStart >= timeout:
+                return None
+
+            time.sleep(self.pollIntervalInSeconds)
+
+    @staticmethod
+    def renewLease(processingFilename: str):
+        try:
+            os.utime(processingFilename)
+        except OSError as e:
+            logger.warning(f'Failed to renew the lease of {processingFilename}: {str(e)}')
+
+    def keepAlive(self, entry: TaskQueueEntry):
+        self.renewLease(entry.taskFilePath)
+
+    def complete(self, entry: TaskQueueEntry, succeeded: bool):
+        targetDirectory = self.doneDirectory if succeeded else self.failedDirectory
+        try:
+            os.replace(entry.taskFilePath, os.path.join(targetDirectory, os.path.basename(entry.taskFilePath)))
+        except OSError as e:
+            logger.error(f'Failed to move the task {entry.name} to {targetDirectory}: {str(e)}')
@@ -0,0 +1,77 @@
+from task_queue.TaskQueue import TaskQueue, TaskQueueEntry
+import tempfile
+import uuid
+import os
+import logging
+
+logger = logging.getLogger(__name__)
+
+class RabbitMQTaskQueue(TaskQueue):
+    """Task queue backed by a durable RabbitMQ queue. Each message body is a task json.
+    Messages are acknowledged after the task is processed, so tasks of a crashed worker are redelivered.
+    Failed tasks are rejected without requeueing; configure a dead letter exchange on the queue to keep them.
+    The connection is not thread-safe: get, keepAlive and complete must be called from the same thread. Tasks are processed on another
+    thread while keepAlive services the heartbeats of the connection.
+    """
+    def __init__(self, host: str, queueName: str, username: str = None, password: str = None, workDirectory: str = None) -> None:
+        # Optional backend: pika is only required if a RabbitMQ task queue is used.
+        import pika
+
+        self.amqpErrorClass = pika.exceptions.AMQPError
+        self.queueName = queueName
+        self.workDirectory = workDirectory or os.path.join(tempfile.gettempdir(), 'metadata_manager_tasks', queueName)
+        os.makedirs(self.workDirectory, exist_ok=True)
+
+        super().__init__(os.path.join(self.workDirectory, 'logs'))
+
+        credentials = pika.PlainCredentials(username, password) if username else pika.ConnectionParameters.DEFAULT_CREDENTIALS
+        self.connection = pika.BlockingConnection(pika.ConnectionParameters(host=host, credentials=credentials))
+        self.channel = self.connection.channel()
+        self.channel.queue_declare(queue=queueName, durable=True)
+        # One unacknowledged task per worker:
+        self.channel.basic_qos(prefetch_count=1)
+        self.messages = self.channel.consume(queueName, inactivity_timeout=1.0)
+
+    def __str__(self) -> str:
+        return f'RabbitMQ queue {self.queueName}'
+
+    def get(self, timeout: float) -> TaskQueueEntry:
+        # The consumer returns after its inactivity timeout of one second without a message, regardless of the given timeout:
+        method, _, body = next(self.messages)
+        if method == None:
+            return None
+
+        name = f'{self.queueName}_{method.delivery_tag}_{uuid.uuid4().hex[:8]}'
+        taskFilePath = os.path.join(self.workDirectory, f'{name}.json')
+        with open(taskFilePath, 'wb') as f:
+            f.write(body)
+
+        return TaskQueueEntry(name, taskFilePath, tag=method.delivery_tag)
+
+    def keepAlive(self, entry: TaskQueueEntry):
+        try:
+            self.connection.process_data_events(time_limit=0)
+        except self.amqpErrorClass as e:
+            logger.error(f'Lost the connection of {self} while processing {entry.name}: {str(e)}')
+
+    def complete(self, entry: TaskQueueEntry, succeeded: bool):
+        try:
+            if succeeded:
+                self.channel.basic_ack(entry.tag)
+            else:
+                self.channel.basic_nack(entry.tag, requeue=False)
+        except self.amqpErrorClass as e:
+            # The unacknowledged message is redelivered by the broker:
+            logger.error(f'Failed to acknowledge the task {entry.name} of {self}, it will be redelivered: {str(e)}')
+
+        try:
+            os.remove(entry.taskFilePath)
+        except OSError as e:
+            logger.warning(f'Failed to remove {entry.taskFilePath}: {str(e)}')
+
+    def close(self):
+        try:
+            self.channel.cancel()
+            self.connection.close()
+        except Exception as e:
+            logger.warning(f'Failed to close the connection of {self}: {str(e)}')
@@ -0,0 +1,39 @@
+import os
+
+class TaskQueueEntry(object):
+    def __init__(self, name: str, taskFilePath: str, tag=None) -> None:
+        super().__init__()
+
+        self.name = name
+        # Task json file that is passed to the task processor:
+        self.taskFilePath = taskFilePath
+        # Backend specific data, e.g. the delivery tag of a message:
+        self.tag = tag
+
+class TaskQueue(object):
+    """Source of the tasks of a console worker. Entries are claimed with get and must be completed with complete.
+    """
+    def __init__(self, logDirectory: str) -> None:
+        super().__init__()
+
+        self.logDirectory = logDirectory
+        os.makedirs(self.logDirectory, exist_ok=True)
+
+    def get(self, timeout: float) -> TaskQueueEntry:
+        """Claims the next task. Returns None if there was no task within the given timeout.
+        """
+        raise NotImplementedError()
+
+    def complete(self, entry: TaskQueueEntry, succeeded: bool):
+        raise NotImplementedError()
+
+    def keepAlive(self, entry: TaskQueueEntry):
+        """Called periodically on the thread of get and complete while the entry is processed, e.g. to renew its claim.
+        """
+        pass
+
+    def getLogFilename(self, entry: TaskQueueEntry) -> str:
+        return os.path.join(self.logDirectory, f'{entry.name}.log')
+
+    def close(self):
+        pass
@@ -0,0 +1,124 @@
+import importlib.abc
+import importlib.machinery
+import importlib.util
+import types
+import sys
+import os
+from unittest.mock import MagicMock
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+for path in [REPO_DIR, os.path.join(REPO_DIR, 'plugins')]:
+    if not path in sys.path:
+        sys.path.insert(0, path)
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+# Packages that are not available on PyPI, only on Windows or part of the VisualScripting submodule. They are replaced by fake modules:
+FAKE_PACKAGES = ['MetadataManagerCore', 'VisualScripting', 'NodeGraphQt', 'photoshop', 'core', 'node_exec', 'qt_util', 'msilib']
+
+class FakeEvent(object):
+    def __init__(self):
+        self.handlers = []
+
+    def subscribe(self, handler):
+        self.handlers.append(handler)
+
+    def unsubscribe(self, handler):
+        self.handlers.remove(handler)
+
+    def clear(self):
+        self.handlers = []
+
+    def __call__(self, *args, **kwargs):
+        for handler in list(self.handlers):
+            handler(*args, **kwargs)
+
+class FakeClassMeta(type):
+    def __getattr__(cls, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+
+        value = MagicMock(name=f'{cls.__name__}.{name}')
+        setattr(cls, name, value)
+        return value
+
+def createFakeClass(name: str):
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __getattr__(self, attrName):
+        if attrName.startswith('__'):
+            raise AttributeError(attrName)
+
+        value = MagicMock(name=f'{name}.{attrName}')
+        object.__setattr__(self, attrName, value)
+        return value
+
+    return FakeClassMeta(name, (object,), {'__init__': __init__, '__getattr__': __getattr__})
+
+class FakeModule(types.ModuleType):
+    """Module whose capitalized attributes are subclassable fake classes and all other attributes are mocks.
+    """
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+
+        if name == 'Event':
+            value = FakeEvent
+        elif name[:1].isupper():
+            value = createFakeClass(name)
+        else:
+            value = MagicMock(name=f'{self.__name__}.{name}')
+
+        setattr(self, name, value)
+        return value
+
+class FakeModuleFinder(importlib.abc.MetaPathFinder, importlib.abc.Loader):
+    def __init__(self, packages):
+        self.packages = packages
+
+    def find_spec(self, fullname, path, target=None):
+        if fullname.split('.')[0] in self.packages:
+            return importlib.machinery.ModuleSpec(fullname, self, is_package=True)
+
+        return None
+
+    def create_module(self, spec):
+        module = FakeModule(spec.name)
+        module.__path__ = []
+        return module
+
+    def exec_module(self, module):
+        pass
+
+# Constants of fake modules that are used as values, e.g. as document keys:
+FAKE_MODULE_ATTRIBUTES = {
+    'MetadataManagerCore.Keys': {
+        'systemIDKey': 's_id',
+        'collection': 'collection',
+        'preview': 'preview',
+        'notDefinedValue': '',
+        'TAGS': 'tags',
+        'OLD_VERSIONS_COLLECTION_SUFFIX': '_old_versions',
+        'hiddenCollections': set(),
+        'systemKeys': ['s_id', '_id']
+    }
+}
+
+def installFakeModuleFinder():
+    missingPackages = [p for p in FAKE_PACKAGES if importlib.util.find_spec(p) == None]
+    if len(missingPackages) > 0 and not any(isinstance(f, FakeModuleFinder) for f in sys.meta_path):
+        sys.meta_path.append(FakeModuleFinder(missingPackages))
+
+    for moduleName, attributes in FAKE_MODULE_ATTRIBUTES.items():
+        module = importlib.import_module(moduleName)
+        if isinstance(module, FakeModule):
+            for name, value in attributes.items():
+                setattr(module, name, value)
+
+            # Makes "from package import module" return the module instead of a fake class:
+            packageName, _, attributeName = moduleName.rpartition('.')
+            setattr(sys.modules[packageName], attributeName, module)
+
+installFakeModuleFinder()
@@ -0,0 +1,59 @@
+from pymongo import UpdateOne, UpdateMany, DeleteMany, DeleteOne, InsertOne, ReplaceOne
+import pytest
+
+mongomock = pytest.importorskip('mongomock')
+
+class FakeDatabase(object):
+    """In-memory database. The collections count the round trips of bulk writes and aggregations and record the filters of finds.
+    mongomock's bulk_write is not compatible with recent pymongo versions, it is emulated with single operations.
+    """
+    def __init__(self, name='test'):
+        self.mockDatabase = mongomock.MongoClient()[name]
+        self.collections = dict()
+
+    @property
+    def name(self):
+        return self.mockDatabase.name
+
+    def __getitem__(self, collectionName: str) -> 'FakeCollection':
+        collection = self.collections.get(collectionName)
+        if collection == None:
+            collection = FakeCollection(self.mockDatabase[collectionName])
+            self.collections[collectionName] = collection
+
+        return collection
+
+class FakeCollection(object):
+    def __init__(self, mockCollection):
+        self.mockCollection = mockCollection
+        self.roundTrips = 0
+        self.findFilters = []
+
+    def __getattr__(self, name):
+        return getattr(self.mockCollection, name)
+
+    def find(self, filter=None, *args, **kwargs):
+        self.findFilters.append(filter)
+        return self.mockCollection.find(filter, *args, **kwargs)
+
+    def aggregate(self, pipeline, **kwargs):
+        self.roundTrips += 1
+        return self.mockCollection.aggregate(pipeline)
+
+    def bulk_write(self, operations, ordered=True):
+        self.roundTrips += 1
+        for op in operations:
+            if isinstance(op, UpdateOne):
+                self.mockCollection.update_one(op._filter, op._doc, upsert=op._upsert)
+            elif isinstance(op, UpdateMany):
+                self.mockCollection.update_many(op._filter, op._doc, upsert=op._upsert)
+            elif isinstance(op, ReplaceOne):
+                self.mockCollection.replace_one(op._filter, op._doc, upsert=op._upsert)
+            elif isinstance(op, DeleteMany):
+                self.mockCollection.delete_many(op._filter)
+            elif isinstance(op, DeleteOne):
+                self.mockCollection.delete_one(op._filter)
+            elif isinstance(op, InsertOne):
+                self.mockCollection.insert_one(op._doc)
+            else:
+                raise NotImplementedError(type(op))
@@ -0,0 +1,98 @@
+import pytest
+
+from fake_mongo import FakeDatabase
+from database import collection_keys
+from MetadataManagerCore import Keys
+
+COLLECTION_NAME = 'Products'
+
+class FakeDBManager(object):
+    """Writes like MongoDBManager.insertOrModifyDocument: sets the given values and a modification key.
+    """
+    def __init__(self, db: FakeDatabase):
+        self.db = db
+        self.writeCount = 0
+
+    def insertOrModifyDocument(self, collectionName: str, sid: str, dataDict: dict, checkForModifications: bool):
+        self.writeCount += 1
+        values = {key: value for key, value in dataDict.items() if key != '_id'}
+        values['version'] = self.writeCount
+        self.db[collectionName].update_one({Keys.systemIDKey: sid}, {'$set': values}, upsert=True)
+
+@pytest.fixture
+def db():
+    db = FakeDatabase()
+    collection_keys.reset(db, COLLECTION_NAME)
+    return db
+
+def getRebuiltKeyCounts(db: FakeDatabase):
+    collection_keys.rebuild(db, COLLECTION_NAME)
+    return collection_keys.getKeyCounts(db, COLLECTION_NAME)
+
+def upsert(db: FakeDatabase, sid: str, setValues: dict, unsetKeys=()):
+    collection = db[COLLECTION_NAME]
+    deltas = collection_keys.getUpsertKeyDeltas(collection, {sid: set(setValues.keys())}, Keys.systemIDKey, unsetKeys)
+    update = {'$set': setValues}
+    # MongoDB rejects updates that set and unset the same key, writers only unset keys that are not set:
+    unsetKeys = [key for key in unsetKeys if not key in setValues]
+    if unsetKeys:
+        update['$unset'] = {key: '' for key in unsetKeys}
+    collection.update_one({Keys.systemIDKey: sid}, update, upsert=True)
+    collection_keys.updateKeyCounts(db, COLLECTION_NAME, deltas)
+
+def test_insert_modify_remove_replace_deltas_match_rebuild(db):
+    collection = db[COLLECTION_NAME]
+
+    # Insert:
+    upsert(db, 'a', {'Name': 'a', 'Color': 'red'})
+    upsert(db, 'b', {'Name': 'b', 'Size': 3})
+    # Modify (new key, unset key, set key that is also unset):
+    upsert(db, 'a', {'Size': 1}, unsetKeys=['Color'])
+    upsert(db, 'b', {'Color': 'blue'}, unsetKeys=['Color', 'Size'])
+    # Replace:
+    oldDocument = collection.find_one({Keys.systemIDKey: 'a'})
+    newDocument = {'_id': oldDocument['_id'], Keys.systemIDKey: 'a', 'Weight': 2}
+    collection.replace_one({'_id': oldDocument['_id']}, newDocument)
+    collection_keys.updateKeyCounts(db, COLLECTION_NAME, collection_keys.getKeyDeltas(set(oldDocument.keys()), set(newDocument.keys())))
+    # Remove:
+    upsert(db, 'c', {'Name': 'c'})
+    deltas = collection_keys.getRemovalKeyDeltas(collection, ['c'], Keys.systemIDKey)
+    collection.delete_many({Keys.systemIDKey: 'c'})
+    collection_keys.updateKeyCounts(db, COLLECTION_NAME, deltas)
+
+    keyCounts = collection_keys.getKeyCounts(db, COLLECTION_NAME)
+
+    assert keyCounts == getRebuiltKeyCounts(db)
+    assert keyCounts == {'_id': 2, Keys.systemIDKey: 2, 'Name': 1, 'Color': 1, 'Weight': 1}
+
+def test_key_tracker_matches_rebuild_with_fewer_round_trips(db):
+    dbManager = FakeDBManager(db)
+    for i in range(10):
+        dbManager.insertOrModifyDocument(COLLECTION_NAME, str(i), {'Name': str(i)}, False)
+    collection_keys.rebuild(db, COLLECTION_NAME)
+
+    collection = db[COLLECTION_NAME]
+    registry = db[collection_keys.COLLECTION_KEYS_COLLECTION_NAME]
+    roundTrips = collection.roundTrips + registry.roundTrips
+
+    keyTracker = collection_keys.DocumentKeyTracker(db, COLLECTION_NAME, chunkSize=4)
+    for document in list(collection.find({})):
+        oldKeys = set(document.keys())
+        document['Extra'] = 1
+        dbManager.insertOrModifyDocument(COLLECTION_NAME, document[Keys.systemIDKey], document, False)
+        keyTracker.add(document[Keys.systemIDKey], oldKeys)
+    keyTracker.flush()
+
+    # One read back and one registry update per chunk of 4 documents:
+    assert collection.roundTrips + registry.roundTrips - roundTrips == 6
+    keyCounts = collection_keys.getKeyCounts(db, COLLECTION_NAME)
+    assert keyCounts['Extra'] == 10
+    assert keyCounts == getRebuiltKeyCounts(db)
+
+def test_insert_or_modify_document_keeps_the_registry_consistent(db):
+    dbManager = FakeDBManager(db)
+
+    collection_keys.insertOrModifyDocument(dbManager, COLLECTION_NAME, 'a', {'Name': 'a'}, False)
+    collection_keys.insertOrModifyDocument(dbManager, COLLECTION_NAME, 'a', {'Color': 'red'}, False)
+
+    assert collection_keys.getKeyCounts(db, COLLECTION_NAME) == getRebuiltKeyCounts(db)
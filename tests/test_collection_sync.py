@@ -0,0 +1,82 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+import pytest
+
+pytest.importorskip('PySide2')
+
+from fake_mongo import FakeDatabase
+from RenderingPipelinePlugin.RenderingPipeline import RenderingPipeline
+from RenderingPipelinePlugin import PipelineKeys
+from database import collection_keys
+from MetadataManagerCore import Keys
+
+COLLECTION_NAME = 'TestPipeline'
+
+def createPipeline(db: FakeDatabase):
+    serviceRegistry = SimpleNamespace(environmentManager=MagicMock(), dbManager=SimpleNamespace(db=db))
+    return RenderingPipeline('Test Pipeline', serviceRegistry, MagicMock(), MagicMock())
+
+def createSettings(**settings):
+    defaults = {
+        PipelineKeys.SidNaming: '[Name]',
+        PipelineKeys.PostOutputExtensions: 'png',
+        PipelineKeys.PerspectiveCodes: ''
+    }
+    defaults.update(settings)
+    return defaults
+
+def sync(pipeline: RenderingPipeline, rows, settings: dict, removedHeaderKeys=()):
+    docs = (dict(row) for row in rows)
+    return pipeline.processDocuments(docs, COLLECTION_NAME, settings, syncCollection=True, removedHeaderKeys=removedHeaderKeys)
+
+def findDocuments(db: FakeDatabase):
+    return {d['Name']: d for d in db[COLLECTION_NAME].find({})}
+
+@pytest.fixture
+def db():
+    return FakeDatabase()
+
+def test_removed_rows_are_deleted(db):
+    pipeline = createPipeline(db)
+    settings = createSettings()
+    sync(pipeline, [{'Name': 'a'}, {'Name': 'b'}], settings)
+
+    result = sync(pipeline, [{'Name': 'a'}], settings)
+
+    assert result.removed == 1 and result.unchanged == 1
+    assert list(findDocuments(db).keys()) == ['a']
+
+def test_removed_rows_are_flagged_and_unflagged(db):
+    pipeline = createPipeline(db)
+    settings = createSettings(**{PipelineKeys.FlagRemovedDocuments: True})
+    sync(pipeline, [{'Name': 'a'}, {'Name': 'b'}], settings)
+
+    sync(pipeline, [{'Name': 'a'}], settings)
+    assert findDocuments(db)['b'][PipelineKeys.RemovedFromTable] == True
+
+    # The flag is removed even if flagging was disabled in the meantime:
+    result = sync(pipeline, [{'Name': 'a'}, {'Name': 'b'}], createSettings())
+    assert result.changed == 1
+    assert not PipelineKeys.RemovedFromTable in findDocuments(db)['b']
+
+def test_flagged_rows_are_deleted_after_flagging_is_disabled(db):
+    pipeline = createPipeline(db)
+    sync(pipeline, [{'Name': 'a'}, {'Name': 'b'}], createSettings(**{PipelineKeys.FlagRemovedDocuments: True}))
+    sync(pipeline, [{'Name': 'a'}], createSettings(**{PipelineKeys.FlagRemovedDocuments: True}))
+
+    result = sync(pipeline, [{'Name': 'a'}], createSettings())
+
+    assert result.removed == 1
+    assert list(findDocuments(db).keys()) == ['a']
+
+def test_removed_columns_are_unset(db):
+    pipeline = createPipeline(db)
+    settings = createSettings()
+    collection_keys.reset(db, COLLECTION_NAME)
+    sync(pipeline, [{'Name': 'a', 'Color': 'red'}], settings)
+
+    result = sync(pipeline, [{'Name': 'a'}], settings, removedHeaderKeys=['Color'])
+
+    assert result.changed == 1
+    assert not 'Color' in findDocuments(db)['a']
+    assert collection_keys.getKeys(db, COLLECTION_NAME) == collection_keys.rebuild(db, COLLECTION_NAME)
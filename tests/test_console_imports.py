@@ -0,0 +1,57 @@
+import subprocess
+import textwrap
+import sys
+import os
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Runs in a fresh interpreter because the other tests already imported the GUI modules.
+CONSOLE_STARTUP_SCRIPT = textwrap.dedent('''
+    import builtins
+    import sys
+    sys.path.insert(0, {testsDir!r})
+    import conftest
+
+    GUI_MODULE_NAMES = ['PySide2.QtWidgets', 'NodeGraphQt', 'VisualScripting.NodeGraphQt', 'VisualScriptingExtensions.third_party_extensions.photoshop_nodes']
+
+    def isGuiModule(name: str) -> bool:
+        return any(name == guiName or name.startswith(guiName + '.') for guiName in GUI_MODULE_NAMES)
+
+    importedGuiModules = []
+    originalImport = builtins.__import__
+
+    def recordingImport(name, globals=None, locals=None, fromlist=(), level=0):
+        fullNames = [name] + [f'{{name}}.{{attribute}}' for attribute in (fromlist or ())]
+        importedGuiModules.extend(n for n in fullNames if level == 0 and isGuiModule(n))
+        return originalImport(name, globals, locals, fromlist, level)
+
+    builtins.__import__ = recordingImport
+
+    from types import SimpleNamespace
+    from unittest.mock import MagicMock
+    from ApplicationMode import ApplicationMode
+    from Bootstrapper import Bootstrapper
+    from ServiceRegistry import ServiceRegistry
+    from ConsoleApp import ConsoleApp
+    from task_queue.DirectoryTaskQueue import DirectoryTaskQueue
+    from plugins.RenderingPipelinePlugin import PipelineActions
+
+    bootstrapper = Bootstrapper.__new__(Bootstrapper)
+    bootstrapper.mode = ApplicationMode.Console
+    bootstrapper.appInfo = SimpleNamespace(company='Test', appName='ConsoleImportTest', mode=ApplicationMode.Console)
+    bootstrapper.serviceRegistry = ServiceRegistry()
+    bootstrapper.dbManager = MagicMock()
+    bootstrapper.hostProcessController = MagicMock()
+    bootstrapper.initServices()
+
+    assert importedGuiModules == [] and not any(isGuiModule(name) for name in sys.modules), importedGuiModules
+    print('OK')
+''')
+
+def test_console_startup_does_not_import_gui_modules(tmp_path):
+    script = CONSOLE_STARTUP_SCRIPT.format(testsDir=TESTS_DIR)
+    env = dict(os.environ, HOME=str(tmp_path), XDG_DATA_HOME=str(tmp_path))
+    process = subprocess.run([sys.executable, '-c', script], cwd=str(tmp_path), env=env, capture_output=True, text=True, timeout=120)
+
+    assert process.returncode == 0, process.stderr
+    assert process.stdout.strip().endswith('OK')
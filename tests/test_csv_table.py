@@ -0,0 +1,70 @@
+from table.CSVTable import CSVTable
+from table import table_util
+import os
+import pytest
+
+@pytest.fixture
+def table(tmp_path):
+    path = tmp_path / 'table.csv'
+    path.write_text('a,b,c\n1,2\n3,4,5\n6,7,8\n')
+    return CSVTable(str(path), ',')
+
+def test_rows_are_read_sequentially(table: CSVTable):
+    assert table.getHeader() == ['a', 'b', 'c']
+    assert table.getRowValues(1) == ['1', '2']
+    assert table.getRowValues(3) == ['6', '7', '8']
+    # Reading an earlier row restarts the reader:
+    assert table.getRowValues(2) == ['3', '4', '5']
+    assert table.getCellValue(2, 2) == '5'
+
+    with pytest.raises(IndexError):
+        table.getRowValues(4)
+
+def test_row_count_and_columns(table: CSVTable):
+    assert table.nrows == 4
+    assert table.ncols == 3
+    # Missing cells are padded with None like in the other tables:
+    assert table.getColumnsWithoutHeader() == [['1', '3', '6'], ['2', '4', '7'], [None, '5', '8']]
+    assert table.getColumnValues(2) == ['c', None, '5', '8']
+
+def test_rows_without_header_are_streamed(table: CSVTable):
+    assert list(table.getRowsWithoutHeader()) == [['1', '2'], ['3', '4', '5'], ['6', '7', '8']]
+
+def test_empty_table(tmp_path):
+    path = tmp_path / 'empty.csv'
+    path.write_text('')
+    table = CSVTable(str(path), ',')
+
+    assert table.nrows == 0
+    assert table.ncols == 0
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+@pytest.mark.parametrize('separator', [';', None])
+def test_quoted_multi_line_cells(separator):
+    # The delimiter is sniffed if no separator is given:
+    table = CSVTable(os.path.join(FIXTURES_DIR, 'products_quoted.csv'), separator)
+
+    assert table.getHeader() == ['Name', 'Description', 'Price']
+    assert list(table.getRowsWithoutHeader()) == [
+        ['Chair; oak', 'Solid oak chair\r\nwith "classic" back', '129,90'],
+        ['Table', 'Extendable;\r\n\r\nseats 8', '499'],
+        ['Lamp', '"Arc" floor lamp', '']
+    ]
+    assert table.nrows == 4
+    assert table.getCellValue(2, 1) == 'Extendable;\r\n\r\nseats 8'
+
+def test_encoding_override():
+    path = os.path.join(FIXTURES_DIR, 'products_cp1252.csv')
+    table = CSVTable(path, ',', encodingOverride='cp1252')
+
+    assert table.getColumnsWithoutHeader() == [['Sessel', 'Café-Tisch'], ['Leder', 'Eiche'], ['Größe: 90 × 80 cm – „Classic“', 'Preis 49 €']]
+
+    # The file is not valid utf-8:
+    with pytest.raises(UnicodeDecodeError):
+        CSVTable(path, ',', encodingOverride='utf-8')
+
+def test_read_table_passes_the_encoding_override():
+    table = table_util.readTable(os.path.join(FIXTURES_DIR, 'products_cp1252.csv'), csvSeparator=',', encodingOverride='cp1252')
+
+    assert table.getRowValues(2)[0] == 'Café-Tisch'
@@ -0,0 +1,155 @@
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'launcher'))
+
+import ContentRepository as content_repository
+from ContentRepository import ContentRepository
+import DeltaInstaller as delta_installer
+from DeltaInstaller import DeltaInstaller, INSTALLED_MANIFEST_BASENAME
+import shutil
+import stat
+import pytest
+
+V1_FILES = {'app.py': b'print("v1")', 'lib/data.bin': b'0123456789abcdef', 'removed.txt': b'removed in v2'}
+V2_FILES = {'app.py': b'print("v2")', 'lib/data.bin': b'0123456789abcdef', 'added.txt': b'added in v2'}
+
+def writeFolder(folder: str, files: dict):
+    for relFilename, data in files.items():
+        filename = os.path.join(folder, relFilename)
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+        with open(filename, 'wb') as f:
+            f.write(data)
+
+def readFolder(folder: str) -> dict:
+    files = dict()
+    for root, _, filenames in os.walk(folder):
+        for filename in filenames:
+            absFilename = os.path.join(root, filename)
+            relFilename = os.path.relpath(absFilename, folder).replace('\\', '/')
+            if relFilename != INSTALLED_MANIFEST_BASENAME:
+                with open(absFilename, 'rb') as f:
+                    files[relFilename] = f.read()
+
+    return files
+
+def modifyInPlace(filename: str):
+    os.chmod(filename, stat.S_IWRITE | stat.S_IREAD)
+    with open(filename, 'r+b') as f:
+        f.write(b'XXXX')
+
+    # Modified later than installed, also on file systems with coarse timestamps:
+    fileStat = os.stat(filename)
+    os.utime(filename, ns=(fileStat.st_atime_ns, fileStat.st_mtime_ns + 2 * 10**9))
+
+def fakeCloneFile(self, sourceFilename, targetFilename):
+    shutil.copy2(sourceFilename, targetFilename)
+    return True
+
+@pytest.fixture(params=['clone', 'link', 'copy'])
+def reuseMode(request, monkeypatch):
+    if request.param == 'clone':
+        monkeypatch.setattr(DeltaInstaller, 'cloneFile', fakeCloneFile)
+    else:
+        monkeypatch.setattr(DeltaInstaller, 'cloneFile', lambda self, sourceFilename, targetFilename: False)
+
+    if request.param == 'copy':
+        def failingLink(source, target):
+            raise OSError('Hard links are not supported.')
+
+        monkeypatch.setattr(delta_installer.os, 'link', failingLink)
+
+    return request.param
+
+@pytest.fixture
+def versions(tmp_path, monkeypatch):
+    # Small chunks so files consist of multiple chunks:
+    monkeypatch.setattr(content_repository, 'CHUNK_SIZE', 4)
+    repository = ContentRepository(str(tmp_path / 'repository'))
+    manifests = []
+    for i, files in enumerate([V1_FILES, V2_FILES]):
+        sourceFolder = str(tmp_path / f'source_v{i + 1}')
+        writeFolder(sourceFolder, files)
+        manifests.append(repository.addFolder(sourceFolder))
+
+    return repository, manifests
+
+def test_install_and_rollback(tmp_path, versions):
+    repository, (manifestV1, manifestV2) = versions
+    installer = DeltaInstaller(str(tmp_path / 'app'))
+
+    assert not installer.rollback()
+
+    installer.install(repository, manifestV1)
+    statistics = installer.install(repository, manifestV2)
+
+    assert readFolder(installer.installDirectory) == V2_FILES
+    assert readFolder(installer.previousDirectory) == V1_FILES
+    assert statistics.reusedFileCount == 1 and statistics.writtenFileCount == 2
+
+    assert installer.rollback()
+    assert readFolder(installer.installDirectory) == V1_FILES
+    assert readFolder(installer.previousDirectory) == V2_FILES
+
+    assert installer.rollback()
+    assert readFolder(installer.installDirectory) == V2_FILES
+    assert readFolder(installer.previousDirectory) == V1_FILES
+
+def test_unchanged_files_are_reused(tmp_path, versions, reuseMode):
+    repository, (manifestV1, manifestV2) = versions
+    installer = DeltaInstaller(str(tmp_path / 'app'))
+    installer.install(repository, manifestV1)
+    statistics = installer.install(repository, manifestV2)
+
+    installedFilename = os.path.join(installer.installDirectory, 'lib', 'data.bin')
+    previousFilename = os.path.join(installer.previousDirectory, 'lib', 'data.bin')
+    assert statistics.reusedFileCount == 1
+    assert statistics.clonedFileCount == (1 if reuseMode == 'clone' else 0)
+    assert statistics.linkedFileCount == (1 if reuseMode == 'link' else 0)
+    # Unchanged files are only read if they can't be cloned or linked, the two leading chunks of app.py are always copied:
+    assert statistics.copiedBytes == (8 + 16 if reuseMode == 'copy' else 8)
+    assert os.path.samefile(installedFilename, previousFilename) == (reuseMode == 'link')
+    assert all(os.stat(os.path.join(installer.installDirectory, relFilename)).st_mode & stat.S_IWUSR == 0 for relFilename in V2_FILES)
+
+def test_modified_files_of_the_previous_version_are_detected_on_rollback(tmp_path, versions, reuseMode):
+    repository, (manifestV1, manifestV2) = versions
+    installer = DeltaInstaller(str(tmp_path / 'app'))
+    installer.install(repository, manifestV1)
+    installer.install(repository, manifestV2)
+
+    # A hard linked file also modifies the previous version:
+    modifyInPlace(os.path.join(installer.installDirectory, 'lib', 'data.bin'))
+
+    if reuseMode == 'link':
+        assert not installer.rollback()
+        assert readFolder(installer.previousDirectory)['lib/data.bin'] != V1_FILES['lib/data.bin']
+
+    assert installer.rollback(repository)
+    assert readFolder(installer.installDirectory) == V1_FILES
+
+    # The modified version is now the previous version:
+    assert not installer.rollback()
+    assert installer.rollback(repository)
+    assert readFolder(installer.installDirectory) == V2_FILES
+
+def test_rollback_rewrites_a_deleted_file_of_the_previous_version(tmp_path, versions):
+    repository, (manifestV1, manifestV2) = versions
+    installer = DeltaInstaller(str(tmp_path / 'app'))
+    installer.install(repository, manifestV1)
+    installer.install(repository, manifestV2)
+    os.remove(os.path.join(installer.previousDirectory, 'removed.txt'))
+
+    assert not installer.rollback()
+    assert installer.rollback(repository)
+    assert readFolder(installer.installDirectory) == V1_FILES
+
+def test_modified_file_with_the_same_size_is_reinstalled(tmp_path, versions):
+    repository, (manifestV1, manifestV2) = versions
+    installer = DeltaInstaller(str(tmp_path / 'app'))
+    installer.install(repository, manifestV2)
+    modifyInPlace(os.path.join(installer.installDirectory, 'lib', 'data.bin'))
+
+    statistics = installer.install(repository, manifestV2)
+
+    assert readFolder(installer.installDirectory) == V2_FILES
+    assert statistics.reusedFileCount == 2 and statistics.writtenFileCount == 1
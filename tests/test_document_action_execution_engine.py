@@ -0,0 +1,49 @@
+import threading
+import pytest
+
+from DocumentActionExecutionEngine import DocumentActionExecutionEngine, DocumentActionExecutionMode
+
+class RecordingAction(object):
+    displayName = 'Recording'
+
+    def __init__(self, executionMode=DocumentActionExecutionMode.Serial, failingIds=(), onExecute=None):
+        self.executionMode = executionMode
+        self.executionWidth = 4
+        self.failingIds = set(failingIds)
+        self.onExecute = onExecute
+        self.executedIds = []
+        self.lock = threading.Lock()
+
+    def execute(self, document: dict, suffix: str):
+        if self.onExecute:
+            self.onExecute(document)
+
+        if document['_id'] in self.failingIds:
+            raise ValueError(f'Invalid document {document["_id"]}')
+
+        with self.lock:
+            self.executedIds.append(document['_id'] + suffix)
+
+def yieldDocuments(count: int):
+    for i in range(count):
+        yield {'_id': str(i)}
+
+@pytest.mark.parametrize('executionMode', [DocumentActionExecutionMode.Serial, DocumentActionExecutionMode.Threaded])
+def test_execution_continues_past_errors(executionMode):
+    action = RecordingAction(executionMode, failingIds=['1', '3'])
+
+    result = DocumentActionExecutionEngine().execute(action, yieldDocuments(6), ('!',))
+
+    assert sorted(action.executedIds) == ['0!', '2!', '4!', '5!']
+    assert result.processedCount == 6
+    assert sorted(error.documentId for error in result.errors) == ['1', '3']
+
+def test_serial_execution_is_cancelable():
+    engine = DocumentActionExecutionEngine()
+    action = RecordingAction(onExecute=lambda document: engine.cancel() if document['_id'] == '2' else None)
+
+    result = engine.execute(action, yieldDocuments(10), ('',))
+
+    # The current document is finished, no new documents are started:
+    assert action.executedIds == ['0', '1', '2']
+    assert result.cancelled
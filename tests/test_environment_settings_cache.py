@@ -0,0 +1,64 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+import pytest
+
+pytest.importorskip('PySide2')
+
+from RenderingPipelinePlugin.RenderingPipeline import RenderingPipeline
+from viewers.EnvironmentViewer import EnvironmentViewer
+from conftest import FakeEvent
+
+class FakeEnvironment(object):
+    def __init__(self, settings: dict):
+        self.settings = settings
+
+    def getEvaluatedSettings(self):
+        return dict(self.settings)
+
+def createPipeline(environment: FakeEnvironment):
+    environmentManager = MagicMock()
+    environmentManager.getEnvironmentFromName.return_value = environment
+    serviceRegistry = SimpleNamespace(environmentManager=environmentManager, dbManager=MagicMock())
+    return RenderingPipeline('Test Pipeline', serviceRegistry, MagicMock(), MagicMock())
+
+def createEnvironmentViewer(environment: FakeEnvironment):
+    viewer = SimpleNamespace(environment=environment, settingsTable=MagicMock(entries=[]), widget=MagicMock(),
+                             onSettingsEdited=FakeEvent(), validateCurrentEnvironment=lambda: True)
+    viewer.saveEnvironment = MagicMock()
+    return viewer
+
+def test_cached_settings_are_reused():
+    pipeline = createPipeline(FakeEnvironment({'key': 'a'}))
+
+    assert pipeline.environmentSettings is pipeline.environmentSettings
+    assert pipeline.environmentSettingsCacheStatistics == {'hits': 1, 'misses': 1}
+
+def test_invalidate_after_settings_edit():
+    environment = FakeEnvironment({'key': 'a'})
+    pipeline = createPipeline(environment)
+    assert pipeline.environmentSettings['key'] == 'a'
+
+    environment.settings['key'] = 'b'
+    RenderingPipeline.invalidateEnvironmentSettings()
+
+    assert pipeline.environmentSettings['key'] == 'b'
+
+def test_unsaved_environment_viewer_edit_invalidates_settings():
+    environment = FakeEnvironment({'key': 'a'})
+    pipeline = createPipeline(environment)
+    assert pipeline.environmentSettings['key'] == 'a'
+
+    viewer = createEnvironmentViewer(environment)
+    viewer.onSettingsEdited.subscribe(RenderingPipeline.invalidateEnvironmentSettings)
+    assert EnvironmentViewer.addEntry(viewer, 'key', 'b', save=False)
+
+    viewer.saveEnvironment.assert_not_called()
+    assert pipeline.environmentSettings['key'] == 'b'
+
+def test_replaced_environment_is_not_served_from_cache():
+    pipeline = createPipeline(FakeEnvironment({'key': 'a'}))
+    assert pipeline.environmentSettings['key'] == 'a'
+
+    pipeline.environmentManager.getEnvironmentFromName.return_value = FakeEnvironment({'key': 'b'})
+
+    assert pipeline.environmentSettings['key'] == 'b'
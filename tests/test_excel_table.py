@@ -0,0 +1,118 @@
+from table.ExcelTable import ExcelTable, XlsxTable
+import zipfile
+import pytest
+
+openpyxl = pytest.importorskip('openpyxl')
+
+ROWS = [['Name', 'Price', 'Material'],
+        ['chair', 49.9, 'Oak'],
+        ['table', 199, None],
+        ['lamp', 25.5, 'Steel']]
+
+def writeWorkbook(path, sheetNames, rows=None):
+    wb = openpyxl.Workbook()
+    wb.active.title = sheetNames[0]
+    for sheetName in sheetNames[1:]:
+        wb.create_sheet(sheetName)
+
+    for row in rows or []:
+        wb.active.append(row)
+
+    wb.save(path)
+
+@pytest.fixture
+def productsPath(tmp_path):
+    path = str(tmp_path / 'products.xlsx')
+    writeWorkbook(path, ['Products', 'Other'], ROWS)
+    return path
+
+def rewriteArchive(path, rename: dict = None, replace: dict = None):
+    with zipfile.ZipFile(path) as archive:
+        parts = {name: archive.read(name) for name in archive.namelist()}
+
+    for oldName, newName in (rename or {}).items():
+        parts[newName] = parts.pop(oldName)
+
+    for name, (old, new) in (replace or {}).items():
+        parts[name] = parts[name].replace(old, new)
+
+    with zipfile.ZipFile(path, 'w') as archive:
+        for name, data in parts.items():
+            archive.writestr(name, data)
+
+def test_sheet_names(tmp_path):
+    path = str(tmp_path / 'table.xlsx')
+    writeWorkbook(path, ['Products', 'Other'])
+
+    assert ExcelTable.getSheetNames(path) == ['Products', 'Other']
+
+def test_workbook_part_is_resolved_through_relationships(tmp_path):
+    path = str(tmp_path / 'table.xlsx')
+    writeWorkbook(path, ['Products', 'Other'])
+    rewriteArchive(path, rename={'xl/workbook.xml': 'xl/main.xml'}, replace={'_rels/.rels': (b'xl/workbook.xml', b'xl/main.xml')})
+
+    assert ExcelTable.getSheetNames(path) == ['Products', 'Other']
+
+def test_strict_namespace(tmp_path):
+    path = str(tmp_path / 'table.xlsx')
+    writeWorkbook(path, ['Products'])
+    rewriteArchive(path, replace={'xl/workbook.xml': (b'http://schemas.openxmlformats.org/spreadsheetml/2006/main', b'http://purl.oclc.org/ooxml/spreadsheetml/main')})
+
+    assert ExcelTable.getSheetNames(path) == ['Products']
+
+def test_strict_relationships_and_absolute_workbook_target(tmp_path):
+    path = str(tmp_path / 'table.xlsx')
+    writeWorkbook(path, ['Products', 'Other'])
+    rewriteArchive(path, rename={'xl/workbook.xml': 'xl/main.xml'},
+                   replace={'_rels/.rels': (b'http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument', b'http://purl.oclc.org/ooxml/officeDocument/relationships/officeDocument')})
+    rewriteArchive(path, replace={'_rels/.rels': (b'Target="xl/workbook.xml"', b'Target="/xl/main.xml"')})
+
+    with zipfile.ZipFile(path) as archive:
+        assert ExcelTable.getWorkbookPartName(archive) == 'xl/main.xml'
+
+    assert ExcelTable.getSheetNames(path) == ['Products', 'Other']
+
+def test_rows_and_columns_are_streamed(productsPath):
+    table = ExcelTable.read(productsPath, 'Products')
+
+    assert isinstance(table, XlsxTable)
+    assert table.nrows == 4 and table.ncols == 3
+    assert table.getHeader() == ROWS[0]
+    assert list(table.getRowsWithoutHeader()) == ROWS[1:]
+    assert table.getColumnsWithoutHeader() == [['chair', 'table', 'lamp'], [49.9, 199, 25.5], ['Oak', None, 'Steel']]
+    assert table.getColumnValues(1) == ['Price', 49.9, 199, 25.5]
+    assert table.getRowValues(2) == ROWS[2]
+    assert table.getCellValue(3, 2) == 'Steel'
+    assert table.getCellValue(2, 2) == None
+    assert table.getCellValue(1, 5) == None
+    assert table.getRowValues(10) == []
+
+def test_rows_below_a_custom_header(productsPath):
+    table = ExcelTable.read(productsPath, 'Products')
+
+    assert list(table.getRowsWithoutHeader(headerIdx=1)) == ROWS[2:]
+
+def test_header_is_cached(productsPath):
+    table = ExcelTable.read(productsPath, 'Products')
+    assert table.getHeader() == ROWS[0]
+
+    # The header row is not streamed again:
+    table.yieldRows = None
+    assert table.getHeader() == ROWS[0]
+    assert table.getCellValue(0, 1) == 'Price'
+
+def test_dimensions_are_counted_if_the_sheet_does_not_store_them(productsPath):
+    rewriteArchive(productsPath, replace={'xl/worksheets/sheet1.xml': (b'<dimension ref="A1:C4" />', b'')})
+    table = ExcelTable.read(productsPath, 'Products')
+
+    assert table.sheet.max_row == None
+    assert table.nrows == 4 and table.ncols == 3
+    assert table.nrows_computed == 4 and table.ncols_computed == 3
+    assert table.getColumnsWithoutHeader() == [['chair', 'table', 'lamp'], [49.9, 199, 25.5], ['Oak', None, 'Steel']]
+
+def test_missing_sheet():
+    table = XlsxTable(None)
+
+    assert table.nrows == 0 and table.ncols == 0
+    assert list(table.getRowsWithoutHeader()) == []
+    assert table.getRowValues(0) == []
@@ -0,0 +1,97 @@
+from types import SimpleNamespace
+import time
+import os
+import pytest
+
+from file_cache.FileExistenceCache import FileExistenceCache
+
+def touch(path: str):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    open(path, 'w').close()
+
+@pytest.fixture
+def cache():
+    cache = FileExistenceCache(ttlInSeconds=3600.0)
+    yield cache
+    cache.shutdown()
+
+@pytest.fixture
+def ttlCache():
+    # Without file system events, e.g. on network shares:
+    cache = FileExistenceCache(ttlInSeconds=0.2)
+    cache.shutdown()
+    cache.observer = None
+    return cache
+
+def test_exists(cache, tmp_path):
+    touch(str(tmp_path / 'a.png'))
+
+    assert cache.exists(str(tmp_path / 'a.png'))
+    assert not cache.exists(str(tmp_path / 'b.png'))
+    assert not cache.exists(str(tmp_path / 'missing' / 'a.png'))
+    assert not cache.exists('')
+    assert cache.exists(str(tmp_path) + os.sep)
+
+def test_frames(cache, tmp_path):
+    for frame in [3, 1, 2]:
+        touch(str(tmp_path / f'render_{frame:04d}.png'))
+    touch(str(tmp_path / 'render_01.png'))
+    touch(str(tmp_path / 'render_0001.exr'))
+
+    assert cache.frames(str(tmp_path / 'render_####.png')) == [str(tmp_path / f'render_{frame:04d}.png') for frame in [1, 2, 3]]
+    assert cache.hasFrames(str(tmp_path / 'render_##.png'))
+    assert not cache.hasFrames(str(tmp_path / 'other_####.png'))
+    assert cache.frames(str(tmp_path / 'render_0002.png')) == [str(tmp_path / 'render_0002.png')]
+    assert cache.frames('') == []
+
+def test_frames_keep_the_original_names_on_case_insensitive_file_systems(cache, tmp_path, monkeypatch):
+    # Like on Windows:
+    monkeypatch.setattr(os.path, 'normcase', lambda path: path.lower())
+    touch(str(tmp_path / 'Shot_0001.PNG'))
+
+    assert cache.exists(str(tmp_path / 'SHOT_0001.png'))
+    assert cache.frames(str(tmp_path / 'shot_####.png')) == [str(tmp_path / 'Shot_0001.PNG')]
+
+def test_listings_expire_after_the_ttl(ttlCache, tmp_path):
+    assert not ttlCache.exists(str(tmp_path / 'a.png'))
+    touch(str(tmp_path / 'a.png'))
+
+    # Served from the cached listing:
+    assert not ttlCache.exists(str(tmp_path / 'a.png'))
+    time.sleep(0.3)
+    assert ttlCache.exists(str(tmp_path / 'a.png'))
+
+def test_file_system_events_invalidate_listings(cache, tmp_path):
+    assert not cache.exists(str(tmp_path / 'a.png'))
+    touch(str(tmp_path / 'a.png'))
+
+    tStart = time.time()
+    while not cache.exists(str(tmp_path / 'a.png')) and time.time() - tStart < 5.0:
+        time.sleep(0.05)
+
+    assert cache.exists(str(tmp_path / 'a.png'))
+
+def test_moved_files_invalidate_both_folders(ttlCache, tmp_path):
+    ttlCache.ttlInSeconds = 3600.0
+    touch(str(tmp_path / 'src' / 'a.png'))
+    os.makedirs(str(tmp_path / 'dst'))
+    assert ttlCache.exists(str(tmp_path / 'src' / 'a.png')) and not ttlCache.exists(str(tmp_path / 'dst' / 'a.png'))
+
+    os.replace(str(tmp_path / 'src' / 'a.png'), str(tmp_path / 'dst' / 'a.png'))
+    ttlCache.on_any_event(SimpleNamespace(src_path=str(tmp_path / 'src' / 'a.png'), dest_path=str(tmp_path / 'dst' / 'a.png')))
+
+    assert not ttlCache.exists(str(tmp_path / 'src' / 'a.png')) and ttlCache.exists(str(tmp_path / 'dst' / 'a.png'))
+
+def test_least_recently_used_listings_are_evicted(ttlCache, tmp_path):
+    ttlCache.ttlInSeconds = 3600.0
+    ttlCache.maxListings = 2
+    folders = [str(tmp_path / name) for name in 'abc']
+    for folder in folders:
+        os.makedirs(folder)
+
+    ttlCache.getListing(folders[0])
+    ttlCache.getListing(folders[1])
+    ttlCache.getListing(folders[0])
+    ttlCache.getListing(folders[2])
+
+    assert list(ttlCache.listings.keys()) == [FileExistenceCache.normalizePath(folders[0]), FileExistenceCache.normalizePath(folders[2])]
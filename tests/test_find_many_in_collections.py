@@ -0,0 +1,73 @@
+from types import SimpleNamespace
+import pytest
+
+from fake_mongo import FakeDatabase
+from database.mongodb_util import findManyInCollections
+
+@pytest.fixture
+def dbManager():
+    db = FakeDatabase()
+    db['shots'].insert_many([{'_id': f'shot_{i}', 'collection': 'shots'} for i in range(10)])
+    db['assets'].insert_many([{'_id': f'asset_{i}', 'collection': 'assets'} for i in range(10)])
+    # Also in the first collection:
+    db['assets'].insert_one({'_id': 'shot_3', 'collection': 'assets'})
+    return SimpleNamespace(db=db)
+
+def getIds(documents):
+    return [document['_id'] if document != None else None for document in documents]
+
+def test_documents_are_yielded_in_the_selection_order(dbManager):
+    ids = ['asset_4', 'shot_2', 'asset_0', 'shot_9', 'shot_0']
+
+    assert getIds(findManyInCollections(dbManager, ids, ['shots', 'assets'])) == ids
+
+def test_first_collection_wins(dbManager):
+    documents = list(findManyInCollections(dbManager, ['shot_3'], ['shots', 'assets']))
+    assert [document['collection'] for document in documents] == ['shots']
+
+    documents = list(findManyInCollections(dbManager, ['shot_3'], ['assets', 'shots']))
+    assert [document['collection'] for document in documents] == ['assets']
+
+def test_missing_ids(dbManager):
+    ids = ['shot_1', 'unknown', 'asset_1']
+
+    assert getIds(findManyInCollections(dbManager, ids, ['shots', 'assets'])) == ['shot_1', 'asset_1']
+    assert getIds(findManyInCollections(dbManager, ids, ['shots', 'assets'], includeMissing=True)) == ['shot_1', None, 'asset_1']
+
+def test_duplicate_ids(dbManager):
+    ids = ['shot_1', 'asset_1', 'shot_1', 'unknown', 'unknown']
+
+    assert getIds(findManyInCollections(dbManager, ids, ['shots', 'assets'], includeMissing=True)) == ['shot_1', 'asset_1', 'shot_1', None, None]
+    # Each id is only queried once:
+    assert dbManager.db['shots'].findFilters == [{'_id': {'$in': ['shot_1', 'asset_1', 'unknown']}}]
+    assert dbManager.db['assets'].findFilters == [{'_id': {'$in': ['asset_1', 'unknown']}}]
+
+@pytest.mark.parametrize('chunkSize', [1, 3, 4, 20])
+def test_chunk_boundaries(dbManager, chunkSize):
+    ids = [f'asset_{i}' if i % 2 == 0 else f'shot_{i}' for i in range(8)] + ['unknown', 'shot_0']
+
+    documents = findManyInCollections(dbManager, ids, ['shots', 'assets'], chunkSize=chunkSize, includeMissing=True)
+
+    assert getIds(documents) == [uid if uid != 'unknown' else None for uid in ids]
+    chunkCount = (len(ids) + chunkSize - 1) // chunkSize
+    assert len(dbManager.db['shots'].findFilters) == chunkCount
+    assert all(len(f['_id']['$in']) <= chunkSize for f in dbManager.db['shots'].findFilters)
+
+def test_later_collections_are_skipped_once_all_ids_are_found(dbManager):
+    assert getIds(findManyInCollections(dbManager, ['shot_1', 'shot_2'], ['shots', 'assets'])) == ['shot_1', 'shot_2']
+    assert dbManager.db['assets'].findFilters == []
+
+def test_ids_are_consumed_lazily(dbManager):
+    def yieldIds():
+        yield 'shot_1'
+        yield 'shot_2'
+        raise AssertionError('Only the first chunk is read.')
+
+    documents = findManyInCollections(dbManager, yieldIds(), ['shots'], chunkSize=2)
+
+    assert next(documents)['_id'] == 'shot_1'
+    assert next(documents)['_id'] == 'shot_2'
+
+def test_no_ids(dbManager):
+    assert list(findManyInCollections(dbManager, [], ['shots', 'assets'])) == []
+    assert dbManager.db['shots'].findFilters == []
@@ -0,0 +1,126 @@
+import threading
+import socket
+import time
+import pytest
+from pymongo.uri_parser import parse_uri
+
+from database import mongodb_util
+
+class FailingDBManager(object):
+    def __init__(self, failureCount: int = None) -> None:
+        self.failureCount = failureCount
+        self.attemptCount = 0
+
+    def connect(self):
+        self.attemptCount += 1
+        if self.failureCount == None or self.attemptCount <= self.failureCount:
+            raise ConnectionError('Connection refused.')
+
+class TCPDBManager(object):
+    """Connects like a client that can't reach the server until it listens.
+    """
+    def __init__(self, port: int) -> None:
+        self.port = port
+        self.attemptCount = 0
+
+    def connect(self):
+        self.attemptCount += 1
+        socket.create_connection(('127.0.0.1', self.port), timeout=0.5).close()
+
+def test_backoff_is_bounded(monkeypatch):
+    # The upper bound of the full jitter:
+    monkeypatch.setattr(mongodb_util.random, 'uniform', lambda a, b: b)
+    delays = []
+    dbManager = FailingDBManager(failureCount=8)
+
+    connected = mongodb_util.connectWithRetry(dbManager, initialDelay=0.25, maxDelay=10.0, waitFunction=lambda delay: delays.append(delay))
+
+    assert connected
+    assert delays == [0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 10.0, 10.0]
+
+def test_jitter_stays_within_the_backoff():
+    delays = []
+
+    mongodb_util.connectWithRetry(FailingDBManager(failureCount=20), initialDelay=0.25, maxDelay=10.0, waitFunction=lambda delay: delays.append(delay))
+
+    for attempt, delay in enumerate(delays):
+        assert 0.0 <= delay <= min(10.0, 0.25 * 2 ** attempt)
+
+def test_retries_stop_at_the_deadline():
+    dbManager = FailingDBManager()
+    delays = []
+
+    def wait(delay):
+        delays.append(delay)
+        time.sleep(delay)
+
+    tStart = time.time()
+    connected = mongodb_util.connectWithRetry(dbManager, timeout=0.5, initialDelay=0.1, maxDelay=0.2, waitFunction=wait)
+    elapsed = time.time() - tStart
+
+    assert not connected
+    assert 0.5 <= elapsed < 1.0
+    assert dbManager.attemptCount == len(delays) + 1
+    # Waits never go past the deadline:
+    assert sum(delays) <= 0.5 + 0.01
+
+def test_quit_aborts_the_retries():
+    dbManager = FailingDBManager()
+    waitCount = [0]
+
+    def waitForQuit(delay):
+        waitCount[0] += 1
+        return waitCount[0] == 2
+
+    assert not mongodb_util.connectWithRetry(dbManager, waitFunction=waitForQuit)
+    assert dbManager.attemptCount == 2
+
+def getFreePort() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+def test_connects_once_the_server_listens():
+    port = getFreePort()
+    listening = threading.Event()
+    stop = threading.Event()
+
+    def listenDelayed():
+        time.sleep(0.5)
+        with socket.socket() as server:
+            server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            server.bind(('127.0.0.1', port))
+            server.listen()
+            listening.set()
+            stop.wait(5.0)
+
+    listener = threading.Thread(target=listenDelayed, daemon=True)
+    listener.start()
+    dbManager = TCPDBManager(port)
+    try:
+        tStart = time.time()
+        connected = mongodb_util.connectWithRetry(dbManager, timeout=5.0, initialDelay=0.05, maxDelay=0.2)
+        elapsed = time.time() - tStart
+    finally:
+        stop.set()
+        listener.join()
+
+    assert connected
+    assert listening.is_set()
+    assert dbManager.attemptCount > 1
+    assert 0.5 <= elapsed < 2.0
+
+@pytest.mark.parametrize('host, expectedHost', [
+    ('mongodb://localhost:27017', 'mongodb://localhost:27017/?serverSelectionTimeoutMS=10000'),
+    ('mongodb://localhost:27017/admin', 'mongodb://localhost:27017/admin?serverSelectionTimeoutMS=10000'),
+    ('mongodb://a:1,b:2/?replicaSet=rs', 'mongodb://a:1,b:2/?replicaSet=rs&serverSelectionTimeoutMS=10000'),
+    ('mongodb://localhost/?serverSelectionTimeoutMS=2000', 'mongodb://localhost/?serverSelectionTimeoutMS=2000'),
+    ('localhost', 'localhost'),
+    (None, None)
+])
+def test_server_selection_timeout_is_added_to_connection_strings(host, expectedHost):
+    boundedHost = mongodb_util.withServerSelectionTimeout(host)
+
+    assert boundedHost == expectedHost
+    if boundedHost and boundedHost.startswith('mongodb://'):
+        assert parse_uri(boundedHost)['options']['serverSelectionTimeoutMS'] > 0
@@ -0,0 +1,26 @@
+import pytest
+
+from RenderingPipelinePlugin import PipelineKeys
+from RenderingPipelinePlugin.NamingConvention import extractNameFromNamingConvention, replaceGermanCharacters
+from MetadataManagerCore import Keys
+
+@pytest.mark.parametrize('namingConvention, document, expectedName', [
+    ('[Category]/[Name]_v01', {'Category': 'chairs', 'Name': 'chair'}, 'chairs/chair_v01'),
+    ('[Name]_[Missing]_[Empty]', {'Name': 'chair', 'Empty': None}, 'chair__'),
+    ('', {Keys.systemIDKey: 'sid'}, 'sid'),
+    ('[Name]?*', {'Name': 'a<b>c:"d"|e'}, 'abcde'),
+    ('[Name]', {'Name': 'Größe Öl', PipelineKeys.ReplaceGermanCharacters: True}, 'Groesse OEl'),
+    ('[Name]', {'Name': 'Größe', PipelineKeys.ReplaceGermanCharacters: False}, 'Größe'),
+    # Consecutive replacements, a replacement can be replaced again:
+    ('[Name]', {'Name': 'a b,c', PipelineKeys.CharactersToReplaceInNamingConvention: [['All', ' ', ','], ['All', ',', '-']]}, 'a-b-c'),
+    ('[Name]', {'Name': 'a b', 'rp_post_naming': '[Name]', PipelineKeys.CharactersToReplaceInNamingConvention: [['rp_post_naming', ' ', '_'], ['rp_other_naming', 'a', 'b']]}, 'a_b'),
+    ('[Name]', {'Name': 'a b', PipelineKeys.CharactersToReplaceInNamingConvention: [['All', ' ', ':']]}, 'ab'),
+])
+def test_extract_name(namingConvention, document, expectedName):
+    assert extractNameFromNamingConvention(namingConvention, document) == expectedName
+    # The compiled template is reused:
+    assert extractNameFromNamingConvention(namingConvention, document) == expectedName
+
+def test_replace_german_characters():
+    assert replaceGermanCharacters('Äpfel Über Öfen ẞ') == 'AEpfel UEber OEfen SS'
+    assert replaceGermanCharacters('ascii') == 'ascii'
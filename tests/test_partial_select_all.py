@@ -0,0 +1,45 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+import pytest
+
+pytest.importorskip('PySide2')
+
+from TableModel import TableModel
+from MainWindowManager import MainWindowManager
+from viewers.DocumentSearchFilterViewer import DocumentSearchFilterViewer
+import viewers.DocumentSearchFilterViewer as document_search_filter_viewer
+
+def createTableModel(rowCount: int, hasMoreRows: bool) -> TableModel:
+    model = TableModel(None, [], ['Name'], ['Name'])
+    model.setEntrySource(iter([]) if hasMoreRows else None, [[f'id_{i}', f'name_{i}'] for i in range(rowCount)])
+    return model
+
+def createMainWindowManager(model: TableModel, selectedRowCount: int):
+    selectionModel = MagicMock()
+    selectionModel.selectedRows.return_value = [model.index(i, 0) for i in range(selectedRowCount)]
+    tableView = SimpleNamespace(selectionModel=lambda: selectionModel)
+    return SimpleNamespace(tableModel=model, window=SimpleNamespace(tableView=tableView))
+
+@pytest.mark.parametrize('rowCount, hasMoreRows, selectedRowCount, expected', [
+    (3, True, 3, True),
+    (3, True, 2, False),
+    (3, False, 3, False),
+    (0, True, 0, False)
+])
+def test_is_partial_select_all(rowCount, hasMoreRows, selectedRowCount, expected):
+    model = createTableModel(rowCount, hasMoreRows)
+    manager = createMainWindowManager(model, selectedRowCount)
+
+    assert MainWindowManager.isPartialSelectAll.fget(manager) == expected
+
+def test_fetch_failure_is_reported(monkeypatch):
+    messageBox = MagicMock()
+    monkeypatch.setattr(document_search_filter_viewer.QtWidgets, 'QMessageBox', messageBox)
+    itemCountLabel = MagicMock()
+    viewer = SimpleNamespace(documentTableModel=createTableModel(3, True), currentDocumentCount=10,
+                             mainWindow=SimpleNamespace(itemCountLabel=itemCountLabel, window=None))
+
+    DocumentSearchFilterViewer.onTableFetchFailed(viewer, 'Cursor not found.')
+
+    itemCountLabel.setText.assert_called_once_with('Item Count: 10 (3 loaded)')
+    assert messageBox.warning.call_count == 1
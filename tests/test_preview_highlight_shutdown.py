@@ -0,0 +1,28 @@
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+import threading
+import pytest
+
+pytest.importorskip('PySide2')
+
+from viewers.DocumentSearchFilterViewer import DocumentSearchFilterViewer
+
+def test_shutdown_stops_the_preview_existence_checks():
+    release = threading.Event()
+    fileExistenceCache = MagicMock()
+    fileExistenceCache.exists.side_effect = lambda path: release.wait(5.0)
+    viewer = SimpleNamespace(isShuttingDown=False, previewHighlightGeneration=0, fileExistenceCache=fileExistenceCache,
+                             previewExistenceExecutor=ThreadPoolExecutor(max_workers=1))
+    hasPreview = lambda preview: DocumentSearchFilterViewer.hasPreview(viewer, preview)
+    futures = [viewer.previewExistenceExecutor.submit(hasPreview, f'/previews/{i}.png') for i in range(10)]
+
+    DocumentSearchFilterViewer.shutdown(viewer)
+    release.set()
+
+    # The running check finishes, the queued checks are skipped:
+    assert sum(future.result(timeout=5.0) for future in futures) <= 1
+    assert fileExistenceCache.exists.call_count <= 1
+    assert viewer.previewHighlightGeneration == 1
+    with pytest.raises(RuntimeError):
+        viewer.previewExistenceExecutor.submit(hasPreview, '/previews/new.png')
@@ -0,0 +1,55 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+import os
+import pytest
+
+pytest.importorskip('PySide2')
+
+from PySide2 import QtGui, QtWidgets
+from viewers.PreviewViewer import PreviewViewer
+from qt_extensions.PixmapLRUCache import PixmapLRUCache
+
+@pytest.fixture(scope='module')
+def app():
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+def createViewer():
+    return SimpleNamespace(pixmapCache=PixmapLRUCache(1 << 20), pendingPaths=set(), pathKeys=dict(), validatedPaths=set(), failedKeys=set(),
+                           displayedPath=None, resetZoomOnLoad=True, preview=MagicMock())
+
+def createImage(color='red'):
+    image = QtGui.QImage(8, 8, QtGui.QImage.Format_RGB32)
+    image.fill(QtGui.QColor(color))
+    return image
+
+def test_modified_file_gets_a_new_key(tmp_path):
+    path = str(tmp_path / 'preview.png')
+    createImage().save(path)
+    key = PreviewViewer.getPixmapKey(path)
+
+    createImage('blue').save(path, 'PNG', 0)
+    os.utime(path, ns=(key[1] + 10**9, key[1] + 10**9))
+
+    assert PreviewViewer.getPixmapKey(path) != key
+    assert PreviewViewer.getPixmapKey(str(tmp_path / 'missing.png')) == None
+
+def test_null_pixmaps_are_not_cached(app):
+    viewer = createViewer()
+    key = ('a.png', 1, 2)
+    viewer.pendingPaths.add('a.png')
+
+    PreviewViewer.onThumbnailLoaded(viewer, 'a.png', key, QtGui.QImage())
+
+    assert not key in viewer.pixmapCache
+    assert key in viewer.failedKeys and len(viewer.pendingPaths) == 0
+    assert PreviewViewer.isFrameReady(viewer, 'a.png')
+
+def test_decoded_pixmaps_are_cached_by_key(app):
+    viewer = createViewer()
+    viewer.displayedPath = 'a.png'
+    key = ('a.png', 1, 2)
+
+    PreviewViewer.onThumbnailLoaded(viewer, 'a.png', key, createImage())
+
+    assert key in viewer.pixmapCache and not ('a.png', 3, 2) in viewer.pixmapCache
+    viewer.preview.setPhoto.assert_called_once()
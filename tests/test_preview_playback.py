@@ -0,0 +1,26 @@
+import os
+import sys
+import pytest
+
+pytest.importorskip('PySide2')
+
+from PySide2 import QtWidgets
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+
+import benchmark_preview_playback
+
+@pytest.fixture(scope='module')
+def app():
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+@pytest.mark.parametrize('decodesPerTick', [1, 2])
+def test_playback_drops_no_frames_once_decoded(app, tmp_path, decodesPerTick):
+    results = benchmark_preview_playback.runHarness(app, str(tmp_path), 60, decodesPerTick)
+
+    # The first frames are decoded while the prefetch queue fills up:
+    assert results['cold'] <= 2
+    assert results['warm'] == 0
+    # The pixmap cache is shared across selection changes:
+    assert results['reselected'] == 0
+    assert results['gui-thread-stats'] == 0
@@ -0,0 +1,67 @@
+import threading
+import builtins
+import sys
+
+from startup_profiler import StartupProfiler
+
+def test_imports_are_profiled():
+    profiler = StartupProfiler()
+    sys.modules.pop('colorsys', None)
+    profiler.enable()
+    try:
+        import colorsys
+    finally:
+        profiler.disable()
+
+    assert builtins.__import__ != profiler.profiledImport
+    assert 'colorsys' in [child.name for child in profiler.root.children]
+
+def test_disable_while_other_threads_import():
+    profiler = StartupProfiler()
+    originalImport = builtins.__import__
+    importStarted = threading.Event()
+    profilerDisabled = threading.Event()
+
+    def blockingImport(*args, **kwargs):
+        importStarted.set()
+        profilerDisabled.wait(5.0)
+        return originalImport(*args, **kwargs)
+
+    builtins.__import__ = blockingImport
+    try:
+        profiler.enable()
+        errors = []
+
+        def importModule():
+            try:
+                profiler.profiledImport('json')
+                # Entered after disable, e.g. with a reference to the profiled import taken before:
+                profiler.profiledImport('os')
+            except Exception as e:
+                errors.append(e)
+
+        thread = threading.Thread(target=importModule)
+        thread.start()
+        importStarted.wait(5.0)
+        profiler.disable()
+        profilerDisabled.set()
+        thread.join(5.0)
+
+        assert errors == []
+        assert builtins.__import__ == blockingImport
+    finally:
+        builtins.__import__ = originalImport
+
+def test_enable_after_disable():
+    profiler = StartupProfiler()
+    originalImport = builtins.__import__
+    profiler.enable()
+    profiler.disable()
+    profiler.enable()
+    try:
+        assert builtins.__import__ == profiler.profiledImport
+        assert profiler.originalImport == originalImport
+    finally:
+        profiler.disable()
+
+    assert builtins.__import__ == originalImport
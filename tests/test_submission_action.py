@@ -0,0 +1,67 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+import threading
+
+from RenderingPipelinePlugin.PipelineActions import SubmissionAction
+from RenderingPipelinePlugin import PipelineKeys
+from DocumentActionExecutionEngine import DocumentActionExecutionEngine, DocumentActionExecutionMode
+import VisualScriptingExtensions.third_party_extensions.deadline_nodes as deadline_nodes
+
+class RecordingSubmitter(object):
+    def __init__(self, failingNames=()):
+        self.info = SimpleNamespace(name='Recording', dependencies=[])
+        self.active = True
+        self.failingNames = set(failingNames)
+        self.submittedNames = []
+        self.jobFileBatches = set()
+        self.lock = threading.Lock()
+
+    def submit(self, documentWithSettings: dict, dependentJobIds=None):
+        if documentWithSettings['Name'] in self.failingNames:
+            raise RuntimeError('Web service unavailable')
+
+        with self.lock:
+            self.submittedNames.append(documentWithSettings['Name'])
+            self.jobFileBatches.add(deadline_nodes.getCurrentJobFileBatch())
+
+        return 'job_' + documentWithSettings['Name']
+
+def createAction(threadCount=4):
+    settings = {PipelineKeys.DeadlineSubmissionThreadCount: threadCount}
+    pipeline = SimpleNamespace(name='Test', environmentSettings=settings, namingConvention=MagicMock(),
+                               combineDocumentWithSettings=lambda document, settings: dict(document))
+    return SubmissionAction(pipeline)
+
+def test_submission_runs_threaded_with_the_pipeline_thread_count():
+    action = createAction(threadCount=3)
+
+    assert action.executionMode == DocumentActionExecutionMode.Threaded
+    assert action.executionWidth == 3
+
+def test_submission_failures_are_returned_by_the_run():
+    action = createAction()
+    submitter = RecordingSubmitter(failingNames=['b'])
+    documents = [{'_id': name, 'Name': name} for name in 'abcd']
+
+    result = DocumentActionExecutionEngine().execute(action, iter(documents), (None, [submitter], 'Active', None, None))
+
+    # All submissions finished before execute returned:
+    assert sorted(submitter.submittedNames) == ['a', 'c', 'd']
+    assert result.processedCount == 4
+    assert [error.documentId for error in result.errors] == ['b']
+
+def test_job_file_batch_is_owned_by_the_run():
+    action = createAction()
+    submitter = RecordingSubmitter()
+    documents = [{'_id': name, 'Name': name} for name in 'abcdefgh']
+
+    DocumentActionExecutionEngine().execute(action, iter(documents), (None, [submitter], 'Active', None, None))
+    secondSubmitter = RecordingSubmitter()
+    DocumentActionExecutionEngine().execute(action, iter(documents), (None, [secondSubmitter], 'Active', None, None))
+
+    # All submissions of a run share one batch, the next run gets a new one:
+    assert len(submitter.jobFileBatches) == 1 and not None in submitter.jobFileBatches
+    assert len(secondSubmitter.jobFileBatches) == 1 and submitter.jobFileBatches != secondSubmitter.jobFileBatches
+    # The batch is not visible outside of the submissions:
+    assert deadline_nodes.getCurrentJobFileBatch() == None
+    assert action.jobFileBatch == None
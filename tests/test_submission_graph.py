@@ -0,0 +1,72 @@
+from types import SimpleNamespace
+import pytest
+
+from RenderingPipelinePlugin.submitters.submission_graph import getSubmitterDependencies, submitInDependencyOrder, hasDependencyCycle
+
+class FakeSubmitter(object):
+    def __init__(self, name: str, dependencies=None, active=True, submitsJob=True, log=None):
+        self.name = name
+        self.info = SimpleNamespace(name=name, dependencies=dependencies)
+        self.active = active
+        self.submitsJob = submitsJob
+        self.log = log if log != None else []
+
+    def submit(self, documentWithSettings: dict, dependentJobIds=None):
+        self.log.append((self.name, dependentJobIds))
+        return f'job_{self.name}' if self.submitsJob else None
+
+def test_linear_chain_by_default():
+    log = []
+    a, b, c = FakeSubmitter('a', log=log), FakeSubmitter('b', log=log), FakeSubmitter('c', log=log)
+
+    submitInDependencyOrder([a, b, c], {})
+
+    assert log == [('a', None), ('b', ['job_a']), ('c', ['job_b'])]
+
+def test_diamond():
+    log = []
+    top = FakeSubmitter('top', dependencies=[], log=log)
+    left = FakeSubmitter('left', dependencies=['top'], log=log)
+    right = FakeSubmitter('right', dependencies=['top'], log=log)
+    bottom = FakeSubmitter('bottom', dependencies=['left', 'right'], log=log)
+
+    # The declaration order doesn't matter:
+    jobIds = submitInDependencyOrder([bottom, right, left, top], {})
+
+    # Independent submitters keep their declaration order:
+    assert log == [('top', None), ('right', ['job_top']), ('left', ['job_top']), ('bottom', ['job_left', 'job_right'])]
+    assert jobIds[bottom] == ['job_bottom']
+
+def test_inactive_middle_submitter_is_bridged():
+    log = []
+    a = FakeSubmitter('a', log=log)
+    b = FakeSubmitter('b', active=False, log=log)
+    c = FakeSubmitter('c', dependencies=['b'], log=log)
+
+    dependencies = getSubmitterDependencies([a, b, c])
+    submitInDependencyOrder([a, b, c], {})
+
+    assert dependencies == {a: [], c: [a]}
+    assert log == [('a', None), ('c', ['job_a'])]
+
+def test_cycle_raises():
+    a = FakeSubmitter('a', dependencies=['b'])
+    b = FakeSubmitter('b', dependencies=['a'])
+
+    assert hasDependencyCycle([a.info, b.info])
+    with pytest.raises(RuntimeError):
+        submitInDependencyOrder([a, b], {})
+
+def test_no_cycle_in_default_chain():
+    assert not hasDependencyCycle([SimpleNamespace(name='a', dependencies=None), SimpleNamespace(name='b', dependencies=None)])
+
+def test_submitter_without_job_passes_on_its_dependencies():
+    log = []
+    a = FakeSubmitter('a', log=log)
+    mapped = FakeSubmitter('mapped', submitsJob=False, log=log)
+    c = FakeSubmitter('c', log=log)
+
+    jobIds = submitInDependencyOrder([a, mapped, c], {})
+
+    assert log == [('a', None), ('mapped', ['job_a']), ('c', ['job_a'])]
+    assert jobIds[mapped] == ['job_a']
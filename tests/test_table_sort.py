@@ -0,0 +1,69 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+import logging
+import itertools
+import pymongo
+import pytest
+
+pytest.importorskip('PySide2')
+
+from fake_mongo import FakeDatabase
+from viewers.DocumentSearchFilterViewer import DocumentSearchFilterViewer, TableEntryQuery, hasSortIndex
+
+def createQuery(db, collectionNames, createSortIndices=True) -> TableEntryQuery:
+    documentFilterManager = MagicMock()
+    documentFilterManager.getFilters.return_value = []
+    viewer = SimpleNamespace(logger=logging.getLogger(__name__), dbManager=SimpleNamespace(db=db), documentFilterManager=documentFilterManager,
+                             extractTableEntry=lambda displayedKeys, item: DocumentSearchFilterViewer.extractTableEntry(None, displayedKeys, item))
+    query = TableEntryQuery(viewer, collectionNames, {}, '', ['name', 'size'])
+    query.createSortIndices = createSortIndices
+    return query
+
+@pytest.fixture
+def db():
+    db = FakeDatabase()
+    db['a'].insert_many([{'_id': i, 'name': f'n{(i * 7) % 10}', 'size': i} for i in range(0, 10, 2)])
+    db['b'].insert_many([{'_id': i, 'name': f'n{(i * 7) % 10}', 'size': i} for i in range(1, 10, 2)])
+    return db
+
+def test_sort_index_is_created_on_demand(db):
+    query = createQuery(db, ['a', 'b'])
+
+    assert not hasSortIndex(db['a'], 'name')
+    assert query.ensureSortIndex('name')
+    assert hasSortIndex(db['a'], 'name') and hasSortIndex(db['b'], 'name')
+
+def test_sort_index_creation_can_be_disabled(db):
+    query = createQuery(db, ['a'], createSortIndices=False)
+
+    assert not query.ensureSortIndex('name')
+    assert not hasSortIndex(db['a'], 'name')
+
+def test_only_matching_indices_are_used_for_sorting(db):
+    db['a'].create_index([('name', pymongo.ASCENDING)])
+    db['a'].create_index([('size', pymongo.ASCENDING), ('_id', pymongo.DESCENDING)])
+
+    assert not hasSortIndex(db['a'], 'name')
+    assert not hasSortIndex(db['a'], 'size')
+    assert hasSortIndex(db['a'], '_id')
+
+    db['a'].create_index([('size', pymongo.DESCENDING), ('_id', pymongo.DESCENDING)])
+    assert hasSortIndex(db['a'], 'size')
+
+@pytest.mark.parametrize('descending', [False, True])
+def test_sorted_entries_of_multiple_collections_are_merged(db, descending):
+    query = createQuery(db, ['a', 'b'])
+    query.ensureSortIndex('name')
+
+    entries = list(query.yieldSortedTableEntries('name', descending))
+
+    expected = sorted(([i, f'n{(i * 7) % 10}', i] for i in range(10)), key=lambda e: e[1], reverse=descending)
+    assert [e[1] for e in entries] == [e[1] for e in expected]
+    assert sorted(entries) == sorted(expected)
+
+def test_sorted_entries_are_fetched_lazily(db):
+    query = createQuery(db, ['a'])
+
+    firstEntries = list(itertools.islice(query.yieldSortedTableEntries('size', False), 2))
+
+    assert firstEntries == [[0, 'n0', 0], [2, 'n4', 2]]
@@ -0,0 +1,156 @@
+from types import SimpleNamespace
+import threading
+import logging
+import os
+import time
+import pika.exceptions
+import pytest
+
+from task_queue.TaskQueue import TaskQueueEntry
+from task_queue.DirectoryTaskQueue import DirectoryTaskQueue
+from task_queue.RabbitMQTaskQueue import RabbitMQTaskQueue
+from ConsoleApp import ConsoleApp
+
+def setAge(filename: str, ageInSeconds: float):
+    t = time.time() - ageInSeconds
+    os.utime(filename, (t, t))
+
+def test_expired_tasks_are_requeued_on_startup(tmp_path):
+    queue = DirectoryTaskQueue(str(tmp_path))
+    queue.put({'taskType': 'A'}, name='crashed')
+    queue.put({'taskType': 'B'}, name='running')
+    crashedEntry = queue.get(timeout=0.0)
+    runningEntry = queue.get(timeout=0.0)
+    setAge(crashedEntry.taskFilePath, DirectoryTaskQueue.leaseDurationInSeconds + 1.0)
+    setAge(runningEntry.taskFilePath, DirectoryTaskQueue.leaseDurationInSeconds - 60.0)
+
+    # A worker that starts after the crash:
+    secondQueue = DirectoryTaskQueue(str(tmp_path))
+
+    assert secondQueue.getPendingTaskFilenames() == ['crashed.json']
+    assert os.listdir(secondQueue.processingDirectory) == ['running.json']
+    assert secondQueue.get(timeout=0.0).name == 'crashed'
+
+def test_keep_alive_renews_the_lease(tmp_path):
+    queue = DirectoryTaskQueue(str(tmp_path))
+    queue.put({'taskType': 'A'}, name='long')
+    entry = queue.get(timeout=0.0)
+    setAge(entry.taskFilePath, DirectoryTaskQueue.leaseDurationInSeconds + 1.0)
+
+    queue.keepAlive(entry)
+
+    assert DirectoryTaskQueue(str(tmp_path)).requeueExpiredTasks() == 0
+    assert os.listdir(queue.processingDirectory) == ['long.json']
+
+def test_complete_moves_the_task(tmp_path):
+    queue = DirectoryTaskQueue(str(tmp_path))
+    queue.put({}, name='good')
+    queue.put({}, name='bad')
+
+    queue.complete(queue.get(timeout=0.0), True)
+    queue.complete(queue.get(timeout=0.0), False)
+
+    assert os.listdir(queue.doneDirectory) == ['good.json']
+    assert os.listdir(queue.failedDirectory) == ['bad.json']
+    assert os.listdir(queue.processingDirectory) == []
+
+class ClosedChannel(object):
+    def basic_ack(self, tag):
+        raise pika.exceptions.ChannelWrongStateError('Channel is closed.')
+
+    def basic_nack(self, tag, requeue=True):
+        raise pika.exceptions.StreamLostError('Stream connection lost.')
+
+class LostConnection(object):
+    def process_data_events(self, time_limit=0):
+        raise pika.exceptions.StreamLostError('Stream connection lost.')
+
+def createRabbitMQTaskQueue(tmp_path) -> RabbitMQTaskQueue:
+    # Without a broker:
+    queue = RabbitMQTaskQueue.__new__(RabbitMQTaskQueue)
+    queue.amqpErrorClass = pika.exceptions.AMQPError
+    queue.queueName = 'tasks'
+    queue.workDirectory = str(tmp_path)
+    queue.channel = ClosedChannel()
+    queue.connection = LostConnection()
+    return queue
+
+@pytest.mark.parametrize('succeeded', [True, False])
+def test_rabbitmq_channel_errors_are_logged(tmp_path, caplog, succeeded):
+    queue = createRabbitMQTaskQueue(tmp_path)
+    taskFilePath = os.path.join(str(tmp_path), 'task.json')
+    open(taskFilePath, 'w').close()
+    entry = TaskQueueEntry('task', taskFilePath, tag=1)
+
+    queue.keepAlive(entry)
+    queue.complete(entry, succeeded)
+
+    assert len([r for r in caplog.records if r.levelno == logging.ERROR]) == 2
+    assert not os.path.exists(taskFilePath)
+
+class FakeTaskQueue(object):
+    def __init__(self) -> None:
+        self.keepAliveCount = 0
+        self.logFilename = os.devnull
+
+    def getLogFilename(self, entry: TaskQueueEntry):
+        return self.logFilename
+
+    def keepAlive(self, entry: TaskQueueEntry):
+        self.keepAliveCount += 1
+
+def createConsoleApp(processTaskFromJsonFile) -> ConsoleApp:
+    serviceRegistry = SimpleNamespace(taskProcessor=SimpleNamespace(processTaskFromJsonFile=processTaskFromJsonFile))
+    return ConsoleApp(SimpleNamespace(applicationQuitting=False), serviceRegistry, taskQueue=FakeTaskQueue())
+
+def raiseError(taskFilePath):
+    raise RuntimeError('Unknown action.')
+
+def logError(taskFilePath):
+    logging.getLogger('TaskProcessor').error('Unknown action.')
+
+@pytest.mark.parametrize('processTaskFromJsonFile, expectedResult', [
+    (lambda taskFilePath: None, True),
+    (lambda taskFilePath: True, True),
+    (lambda taskFilePath: False, False),
+    (raiseError, False),
+    (logError, False)
+])
+def test_task_failures_are_detected(processTaskFromJsonFile, expectedResult):
+    app = createConsoleApp(processTaskFromJsonFile)
+
+    assert app.processQueuedTaskInThread(TaskQueueEntry('task', 'task.json')) == expectedResult
+
+def test_errors_of_other_threads_dont_fail_the_task():
+    def processWhileAnotherThreadLogsAnError(taskFilePath):
+        otherThread = threading.Thread(target=lambda: logging.getLogger('Other').error('Unrelated.'))
+        otherThread.start()
+        otherThread.join()
+
+    app = createConsoleApp(processWhileAnotherThreadLogsAnError)
+
+    assert app.processQueuedTaskInThread(TaskQueueEntry('task', 'task.json'))
+
+def test_task_log_only_contains_the_task_thread(tmp_path):
+    def processWhileAnotherThreadLogs(taskFilePath):
+        logging.getLogger('TaskProcessor').warning('Task message.')
+        otherThread = threading.Thread(target=lambda: logging.getLogger('Other').warning('Unrelated message.'))
+        otherThread.start()
+        otherThread.join()
+
+    app = createConsoleApp(processWhileAnotherThreadLogs)
+    app.taskQueue.logFilename = str(tmp_path / 'task.log')
+
+    assert app.processQueuedTaskInThread(TaskQueueEntry('task', 'task.json'))
+    with open(app.taskQueue.logFilename) as f:
+        log = f.read()
+
+    assert 'Task message.' in log
+    assert 'Unrelated message.' not in log
+
+def test_queue_is_kept_alive_while_processing():
+    app = createConsoleApp(lambda taskFilePath: time.sleep(0.35))
+    app.keepAliveIntervalInSeconds = 0.1
+
+    assert app.processQueuedTaskInThread(TaskQueueEntry('task', 'task.json'))
+    assert app.taskQueue.keepAliveCount >= 2
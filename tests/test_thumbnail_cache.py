@@ -0,0 +1,52 @@
+import os
+import time
+import pytest
+
+pytest.importorskip('PySide2')
+
+from PySide2.QtGui import QImage, QColor
+from file_cache.ThumbnailCache import ThumbnailCache
+
+def createImage(path: str, color, size=512):
+    image = QImage(size, size, QImage.Format_RGB32)
+    image.fill(QColor(color))
+    image.save(path)
+    return path
+
+def getCachedFilenames(cache: ThumbnailCache):
+    return sorted(entry.path for entry in cache.scanFiles())
+
+def test_thumbnails_are_cached(tmp_path):
+    cache = ThumbnailCache(str(tmp_path / 'cache'), pruneOnStartup=False)
+    source = createImage(str(tmp_path / 'source.png'), 'red')
+
+    thumbnail = cache.loadThumbnail(source, 64)
+
+    assert thumbnail.width() == 64
+    assert len(getCachedFilenames(cache)) == 1
+    assert cache.loadThumbnail(source, 64).width() == 64
+
+def test_prune_removes_least_recently_used_entries(tmp_path):
+    cache = ThumbnailCache(str(tmp_path / 'cache'), pruneOnStartup=False)
+    sources = [createImage(str(tmp_path / f'source_{i}.png'), color) for i, color in enumerate(['red', 'green', 'blue', 'white'])]
+    for source in sources:
+        cache.loadThumbnail(source, 64)
+
+    cachedFilenames = {source: cache.getCacheFilename(cache.getCacheKey(source, 64)) for source in sources}
+    # Ages the entries, the first one is the oldest but a cache hit marks it as recently used:
+    now = time.time()
+    for i, source in enumerate(sources):
+        age = cache.touchIntervalInSeconds * (len(sources) - i)
+        os.utime(cachedFilenames[source], (now - age, now - age))
+    cache.loadThumbnail(sources[0], 64)
+
+    entrySize = max(os.path.getsize(f) for f in cachedFilenames.values())
+    cache.maxSizeInBytes = int(entrySize * 2.5 / cache.pruneTargetRatio)
+    staleTempFilename = os.path.join(os.path.dirname(cachedFilenames[sources[0]]), 'stale.png.tmp')
+    open(staleTempFilename, 'w').close()
+    os.utime(staleTempFilename, (now - 2 * cache.tempFileMaxAgeInSeconds, now - 2 * cache.tempFileMaxAgeInSeconds))
+
+    cache.prune()
+
+    assert getCachedFilenames(cache) == sorted([cachedFilenames[sources[0]], cachedFilenames[sources[3]]])
+    assert cache.sizeInBytes <= cache.maxSizeInBytes * cache.pruneTargetRatio
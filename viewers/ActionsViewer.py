@@ -16,6 +16,8 @@ from MetadataManagerCore.actions.ActionManager import ActionManager
 from PySide2.QtCore import QThreadPool
 from VisualScripting.VisualScriptingViewer import VisualScriptingViewer
 from MetadataManagerCore.mongodb_manager import MongoDBManager
+from database.mongodb_util import findManyInCollections
+from DocumentActionExecutionEngine import DocumentActionExecutionEngine, DocumentActionExecutionResult, getExecutionMode
 import logging
 
 logger = logging.getLogger(__name__)
@@ -178,6 +180,14 @@ class ActionsViewer(DockWidget):
     def documentActionConfirmationForSelectedItems(self, action: DocumentAction):
         count = len([i for i in self.mainWindowManager.selectedDocumentIds])
         if count > 0:
+            if self.mainWindowManager.isPartialSelectAll:
+                # Always ask because the user most likely expects all filtered documents to be selected:
+                totalCount = self.mainWindowManager.documentSearchFilterViewer.currentDocumentCount
+                ret = QtWidgets.QMessageBox.question(self.parentWindow, f"Action Execution Confirmation", 
+                    f"Only the {count} loaded rows of {totalCount} filtered documents are selected. Execute \"{action.displayName}\" for the {count} <b>loaded</b> documents?<br><br>"
+                    "Use \"Filtered Items\" to execute the action for all filtered documents.")
+                return ret == QtWidgets.QMessageBox.Yes
+
             if not action.askForConfirmation:
                 return True
                 
@@ -212,34 +222,70 @@ class ActionsViewer(DockWidget):
     def executeActionOnAllFilteredDocuments(self, action: DocumentAction, *actionArgs):
         documentSearchFilterViewer : DocumentSearchFilterViewer = self.mainWindowManager.documentSearchFilterViewer
         snapshot = documentSearchFilterViewer.getFilteredDocumentsSnapshot()
-        documentCount = snapshot.documentCount
-        i = 0
-
-        for document in snapshot.yieldDocuments():
-            logger.info(f'Execution action {action.displayName} on document {document.get("_id")}')
-            action.execute(document, *actionArgs)
 
-            self.updateProgressAsync(action, float(i+1) / documentCount, action.currentProgressMessage)
-            i += 1
-
-        self.clearProgressAsync()
+        self.executeActionOnDocuments(action, snapshot.yieldDocuments(), snapshot.documentCount, actionArgs)
 
     def executeActionOnAllSelectedDocuments(self, action: DocumentAction, *actionArgs):
         collectionNames = self.mainWindowManager.collectionViewer.getSelectedCollectionNames()
         selectedDocumentIds = [i for i in self.mainWindowManager.selectedDocumentIds]
-        selectedDocumentCount = len(selectedDocumentIds)
 
-        for i, uid in enumerate(selectedDocumentIds):
-            document = self.dbManager.findOneInCollections(uid, collectionNames)
-            if document != None:
-                logger.info(f'Execution action {action.displayName} on document {uid}')
-                action.execute(document, *actionArgs)
+        def yieldSelectedDocuments():
+            documents = findManyInCollections(self.dbManager, selectedDocumentIds, collectionNames, includeMissing=True)
+            for uid, document in zip(selectedDocumentIds, documents):
+                if document != None:
+                    yield document
+                else:
+                    logger.warning(f'Could not find document with id {uid}')
+
+        self.executeActionOnDocuments(action, yieldSelectedDocuments(), len(selectedDocumentIds), actionArgs)
+
+    def executeActionOnDocuments(self, action: DocumentAction, documents, documentCount: int, actionArgs):
+        engine = DocumentActionExecutionEngine()
+        logger.info(f'Executing action {action.displayName} on {documentCount} documents ({getExecutionMode(action).name})')
+
+        # Executions off the main thread are cancelable from a progress dialog, serial ones stop after the current document:
+        isCancelable = not action.runsOnMainThread
+        if isCancelable:
+            qt_util.runInMainThread(self.openDocumentActionProgressDialog, action, engine)
+
+        def onProgress(result: DocumentActionExecutionResult):
+            progress = float(result.processedCount) / documentCount if documentCount > 0 else 1.0
+            if isCancelable:
+                progressMessage = 'Cancelling...' if engine.isCancelled else f'{result.processedCount}/{documentCount} documents ({result.throughput:.1f}/s)'
+                qt_util.runInMainThread(self.progressDialog.updateProgress, progress, progressMessage)
             else:
-                logger.warning(f'Could not find document with id {uid}')
+                self.updateProgressAsync(action, progress, action.currentProgressMessage)
+
+        result = engine.execute(action, documents, actionArgs, onProgress)
+        logger.info(f'{action.displayName}: {result}')
+
+        if isCancelable:
+            qt_util.runInMainThread(self.closeDocumentActionProgressDialog)
+
+        qt_util.runInMainThread(self.statusBar.showMessage, f'{action.displayName}: {result}')
+
+        if len(result.errors) > 0:
+            qt_util.runInMainThread(self.showDocumentActionErrors, action, result)
+
+    def openDocumentActionProgressDialog(self, action: DocumentAction, engine: DocumentActionExecutionEngine):
+        self.progressDialog.setTitle(action.displayName)
+        self.progressDialog.setCancelFunction(engine.cancel)
+        self.progressDialog.open()
+
+    def closeDocumentActionProgressDialog(self):
+        self.progressDialog.setCancelFunction(None)
+        self.progressDialog.close()
 
-            self.updateProgressAsync(action, float(i+1) / selectedDocumentCount, action.currentProgressMessage)
+    def showDocumentActionErrors(self, action: DocumentAction, result: DocumentActionExecutionResult):
+        maxListedErrorCount = 100
+        details = '\n'.join(str(error) for error in result.errors[:maxListedErrorCount])
+        if len(result.errors) > maxListedErrorCount:
+            details += f'\n... and {len(result.errors) - maxListedErrorCount} more (see log).'
 
-        self.clearProgressAsync()
+        messageBox = QtWidgets.QMessageBox(QtWidgets.QMessageBox.Warning, f'{action.displayName} Errors', 
+                                           f'{len(result.errors)} of {result.processedCount} documents failed.', parent=self.parentWindow)
+        messageBox.setDetailedText(details)
+        messageBox.exec_()
 
     def clearProgressAsync(self):
         qt_util.runInMainThread(self.statusBar.showMessage, '')
@@ -8,6 +8,7 @@ import os
 from qt_extensions.DockWidget import DockWidget
 import asset_manager
 from MetadataManagerCore.Event import Event
+from database import collection_keys
 from PySide2.QtCore import Qt
 
 class CollectionViewer(DockWidget):
@@ -56,7 +57,10 @@ class CollectionViewer(DockWidget):
         if not currentCollection:
             return
 
-        keys = self.dbManager.findAllKeysInCollection(currentCollection)
+        keys = collection_keys.getKeys(self.dbManager.db, currentCollection)
+        if keys == None:
+            # One-off scan for collections without a key registry:
+            keys = collection_keys.rebuild(self.dbManager.db, currentCollection)
         self.collectionTableWidget.clear()
         self.collectionHeaderKeyInfos.clear()
 
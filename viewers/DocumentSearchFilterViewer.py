@@ -1,4 +1,3 @@
-from MetadataManagerCore.animation import anim_util
 import PySide2
 from PySide2.QtGui import QColor, QMovie
 import asset_manager
@@ -21,6 +20,10 @@ import re
 from MetadataManagerCore.util import timeit
 from MetadataManagerCore.filtering.DocumentFilter import DocumentFilter
 from MetadataManagerCore.filtering.DocumentFilterManager import DocumentFilterManager
+from file_cache.FileExistenceCache import FileExistenceCache
+from concurrent.futures import ThreadPoolExecutor
+import pymongo
+import heapq
 
 class FilteredDocumentsSnapshot(object):
     def __init__(self, documentSearchFilterViewer) -> None:
@@ -52,6 +55,124 @@ class FilteredDocumentsSnapshot(object):
             for d in self.documentFilterManager.yieldFilteredDocuments(collectionName, self.itemsFilter, distinctionText=distinctionText, filters=customFilters):
                 yield d
 
+def databaseSortKey(value):
+    # Approximates the MongoDB comparison order for mixed value types: null < numbers < strings < other types.
+    if value == None:
+        return (0, 0)
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        return (1, value)
+    elif isinstance(value, str):
+        return (2, value)
+    
+    return (3, str(value))
+
+class TableEntryQuery(object):
+    """Captures the search state of a table view request so entries can be (re-)fetched lazily, optionally sorted by the database.
+    """
+    # Creates the missing (key, _id) index of a sorted column on the first sort. Without an index tables are sorted in memory.
+    createSortIndices = True
+
+    def __init__(self, documentSearchFilterViewer, collectionNames: List[str], itemsFilter: dict, distinctionText: str, displayedKeys: List[str]) -> None:
+        super().__init__()
+
+        self.logger = documentSearchFilterViewer.logger
+        self.dbManager: MongoDBManager = documentSearchFilterViewer.dbManager
+        self.documentFilterManager: DocumentFilterManager = documentSearchFilterViewer.documentFilterManager
+        self.extractTableEntry = documentSearchFilterViewer.extractTableEntry
+        self.collectionNames = collectionNames
+        self.itemsFilter = itemsFilter
+        self.distinctionText = distinctionText
+        self.displayedKeys = displayedKeys
+
+    def yieldFilteredDocuments(self):
+        for collectionName in self.collectionNames:
+            for d in self.documentFilterManager.yieldFilteredDocuments(collectionName, self.itemsFilter, distinctionText=self.distinctionText, 
+                                                                       filters=self.documentFilterManager.getFilters([collectionName])):
+                yield d
+
+    def yieldTableEntries(self):
+        for d in self.yieldFilteredDocuments():
+            yield self.extractTableEntry(self.displayedKeys, d)
+
+    def countFilteredDocuments(self, shouldStop) -> int:
+        """Returns the number of filtered documents or None if shouldStop() returned True while counting.
+        Without python side filters the documents are counted by the database.
+        """
+        if self.canSortInDatabase():
+            return sum(self.dbManager.db[collectionName].count_documents(self.itemsFilter) for collectionName in self.collectionNames)
+
+        count = 0
+        for _ in self.yieldFilteredDocuments():
+            if shouldStop():
+                return None
+
+            count += 1
+
+        return count
+
+    def canSortInDatabase(self):
+        if len(self.distinctionText) > 0:
+            return False
+
+        # Custom filters are evaluated in Python and can't be combined with a database sort.
+        for docFilter in self.documentFilterManager.getFilters(self.collectionNames):
+            if docFilter.active or docFilter.negate:
+                return False
+
+        return True
+
+    def ensureSortIndex(self, key: str) -> bool:
+        """Returns True if every queried collection has an index for sorting by the given key. Missing indices are created if createSortIndices is set.
+        Blocks until the indices are built, so it must not be called on the main thread. 
+        Without an index the database would sort in memory which fails for large collections.
+        """
+        for collectionName in self.collectionNames:
+            collection = self.dbManager.db[collectionName]
+            if hasSortIndex(collection, key):
+                continue
+
+            if not self.createSortIndices:
+                return False
+
+            self.logger.info(f'Creating the sort index of {key} in {collectionName}...')
+            collection.create_index([(key, pymongo.ASCENDING), ('_id', pymongo.ASCENDING)])
+
+        return True
+
+    def yieldSortedTableEntries(self, key: str, descending: bool):
+        direction = pymongo.DESCENDING if descending else pymongo.ASCENDING
+        sort = [(key, direction)] if key == '_id' else [(key, direction), ('_id', direction)]
+        cursors = []
+        for collectionName in self.collectionNames:
+            collection = self.dbManager.db[collectionName]
+            cursors.append(collection.find(self.itemsFilter, sort=sort))
+
+        if len(cursors) == 1:
+            documents = cursors[0]
+        else:
+            documents = heapq.merge(*cursors, key=lambda d: databaseSortKey(d.get(key)), reverse=descending)
+
+        for d in documents:
+            yield self.extractTableEntry(self.displayedKeys, d)
+
+def hasSortIndex(collection, key: str):
+    """True if the collection has an index that supports sorting by (key, _id) in both directions.
+    """
+    if key == '_id':
+        return True
+
+    for indexInfo in collection.index_information().values():
+        indexKeys = indexInfo.get('key')
+        if not indexKeys or len(indexKeys) < 2 or indexKeys[0][0] != key or indexKeys[1][0] != '_id':
+            continue
+
+        # Both directions of the sort are supported if the key and _id are indexed in the same direction:
+        directions = (indexKeys[0][1], indexKeys[1][1])
+        if directions in [(1, 1), (-1, -1)]:
+            return True
+
+    return False
+
 class DocumentFilterView(object):
     def __init__(self, documentFilter : DocumentFilter):
         self.documentFilter = documentFilter
@@ -102,13 +223,24 @@ class DocumentFilterView(object):
 
 class DocumentSearchFilterViewer(QtCore.QObject):
     def __init__(self, appInfo : AppInfo, mainWindow, dbManager : MongoDBManager, documentFilterManager : DocumentFilterManager, 
-                 documentTableModel : TableModel, collectionViewer : CollectionViewer):
+                 documentTableModel : TableModel, collectionViewer : CollectionViewer, fileExistenceCache : FileExistenceCache):
         super().__init__()
 
         self.logger = logging.getLogger(__name__)
         self.widget = asset_manager.loadUIFile('documentSearchFilter.ui')
         self.highlightDocumentsWithPreview = True
-        self.previewHighlightCache: Dict[int,bool] = dict()
+        self.previewHighlightCache: Dict[Any,bool] = dict()
+        # Rows whose highlight state is not known yet. They are resolved in batches for the painted rows:
+        self.previewHighlightPendingRows: Dict[Any,int] = dict()
+        self.previewHighlightRequestedUids = set()
+        self.previewHighlightBatchScheduled = False
+        self.previewHighlightGeneration = 0
+        self.previewHighlightBatchSize = 500
+        self.previewExistenceExecutor = ThreadPoolExecutor(max_workers=8, thread_name_prefix='PreviewExistence')
+        self.isShuttingDown = False
+        self.viewItemsRequestId = 0
+        self.tableEntryQuery: TableEntryQuery = None
+        self.currentDocumentCount = 0
 
         self.appInfo = appInfo
         self.mainWindow = mainWindow
@@ -116,6 +248,7 @@ class DocumentSearchFilterViewer(QtCore.QObject):
         self.documentFilterManager = documentFilterManager
         self.documentTableModel = documentTableModel
         self.collectionViewer = collectionViewer
+        self.fileExistenceCache = fileExistenceCache
         self.documentFilterViews : List[DocumentFilterView] = []
         self.searchFilterQueue = []
         self.savedFilters = []
@@ -146,7 +279,8 @@ class DocumentSearchFilterViewer(QtCore.QObject):
 
         self.setupSavedFiltersUI()
 
-        self.documentTableModel.onSort.subscribe(lambda: self.previewHighlightCache.clear())
+        self.documentTableModel.sortFunction = self.sortInDatabase
+        self.documentTableModel.onFetchFailed.subscribe(self.onTableFetchFailed)
         self.updateHighlightDocumentsWithPreviewColorFunction()
         self.mainWindow.highlightDocumentsWithPreviewCheckBox.stateChanged.connect(self.onHighlightDocumentsWithPreviewCheckBoxChanged)
 
@@ -392,62 +526,205 @@ class DocumentSearchFilterViewer(QtCore.QObject):
         if len(self.documentTableModel.displayedKeys) == 0:
             return
 
-        self.previewHighlightCache = dict()
+        qt_util.runInMainThread(self.resetPreviewHighlights)
+        self.viewItemsRequestId += 1
+        requestId = self.viewItemsRequestId
 
         qt_util.runInMainThread(self.setLoading, True)
 
-        headerInfos = self.dbManager.extractCollectionHeaderInfo(self.collectionViewer.getSelectedCollectionNames())
+        collectionNames = self.collectionViewer.getSelectedCollectionNames()
+
+        headerInfos = self.dbManager.extractCollectionHeaderInfo(collectionNames)
         displayedHeaderInfos = [i for i in headerInfos if i.displayed]
-        self.documentTableModel.displayedKeys = [i.key for i in displayedHeaderInfos]
+        displayedKeys = [i.key for i in displayedHeaderInfos]
+        self.documentTableModel.displayedKeys = displayedKeys
         self.documentTableModel.header = [i.displayName for i in displayedHeaderInfos]
 
-        qt_util.runInMainThread(self.documentTableModel.clear)
+        self.tableEntryQuery = TableEntryQuery(self, collectionNames, self.getItemsFilter(), self.widget.distinctEdit.text(), displayedKeys)
+
         qt_util.runInMainThread(lambda: self.mainWindow.itemCountLabel.setText("Item Count: Computing..."))
 
-        entries = []
+        self.viewEntries(self.tableEntryQuery.yieldTableEntries())
+
+        qt_util.runInMainThread(self.setLoading, False)
+        if saveSearchHistoryEntry:
+            qt_util.runInMainThread(self.addCurrentSearchHistoryEntry)
+
+        # Count the filtered documents without keeping them in memory. 
+        # Stop counting if the application is quitting or a new search was started.
         i = 0
         try:
-            for collectionName in self.collectionViewer.yieldSelectedCollectionNames():
-                for item in self.getFilteredDocumentsOfCollection(collectionName):
-                    if self.appInfo.applicationQuitting:
-                        return
-
-                    i += 1
-                    tableEntry = self.extractTableEntry(self.documentTableModel.displayedKeys, item)
-                    entries.append(tableEntry)
+            i = self.tableEntryQuery.countFilteredDocuments(lambda: self.appInfo.applicationQuitting or requestId != self.viewItemsRequestId)
+            if i == None:
+                return
         except Exception as e:
-            self.logger.error(f'Failed to retrieve filtered items. Reason: {str(e)}')
-        
-        qt_util.runInMainThread(self.documentTableModel.addEntries, entries)
+            self.logger.error(f'Failed to count filtered items. Reason: {str(e)}')
 
         self.currentDocumentCount = i
         qt_util.runInMainThread(lambda:self.mainWindow.itemCountLabel.setText("Item Count: " + str(i)))
 
-        qt_util.runInMainThread(self.setLoading, False)
-        if saveSearchHistoryEntry:
-            qt_util.runInMainThread(self.addCurrentSearchHistoryEntry)
+    def onTableFetchFailed(self, errorMessage: str):
+        loadedCount = self.documentTableModel.rowCount(QtCore.QModelIndex())
+        self.mainWindow.itemCountLabel.setText(f"Item Count: {self.currentDocumentCount} ({loadedCount} loaded)")
+        QtWidgets.QMessageBox.warning(self.mainWindow.window, "Incomplete Table", 
+                                      f"Failed to fetch more rows after {loadedCount} rows. Please search again.\n\nReason: {errorMessage}")
+
+    def viewEntries(self, entrySource):
+        """Retrieves the first batch of entries and passes the remaining entry source to the table model 
+        which pulls further entries in batches as the user scrolls. 
+        This way the (potentially slow) initial query doesn't block the main thread.
+        """
+        initialEntries = []
+        try:
+            for tableEntry in entrySource:
+                initialEntries.append(tableEntry)
+                if len(initialEntries) >= self.documentTableModel.fetchBatchSize:
+                    break
+            else:
+                entrySource = None
+        except Exception as e:
+            self.logger.error(f'Failed to retrieve filtered items. Reason: {str(e)}')
+            entrySource = None
+        
+        qt_util.runInMainThread(self.documentTableModel.setEntrySource, entrySource, initialEntries)
+
+    def sortInDatabase(self, key: str, order: QtCore.Qt.SortOrder):
+        if not self.tableEntryQuery or not key in self.tableEntryQuery.displayedKeys or not self.tableEntryQuery.canSortInDatabase():
+            return False
+
+        QThreadPool.globalInstance().start(qt_util.LambdaTask(self.viewSortedEntries, self.tableEntryQuery, key, order, self.viewItemsRequestId))
+        return True
+
+    def viewSortedEntries(self, tableEntryQuery: TableEntryQuery, key: str, order: QtCore.Qt.SortOrder, requestId: int):
+        """Retrieves the first batch of the entries sorted by the database. Missing sort indices are built first, the current entries are kept meanwhile.
+        Falls back to the in-memory sort of the table model if there is no suitable index or the query fails.
+        """
+        initialEntries = []
+        entrySource = None
+        try:
+            if tableEntryQuery.ensureSortIndex(key):
+                entrySource = tableEntryQuery.yieldSortedTableEntries(key, order == QtCore.Qt.DescendingOrder)
+                for tableEntry in entrySource:
+                    initialEntries.append(tableEntry)
+                    if len(initialEntries) >= self.documentTableModel.fetchBatchSize:
+                        break
+                else:
+                    entrySource = None
+            else:
+                self.logger.info(f'No index for {key}. Sorting in memory.')
+                initialEntries = None
+        except Exception as e:
+            self.logger.error(f'Failed to sort by {key} in the database. Sorting in memory instead. Reason: {str(e)}')
+            initialEntries = None
+
+        qt_util.runInMainThread(self.applySortedEntries, requestId, tableEntryQuery.displayedKeys.index(key), order, entrySource, initialEntries)
+
+    def applySortedEntries(self, requestId: int, col: int, order: QtCore.Qt.SortOrder, entrySource, initialEntries):
+        # Drop the result if a new search was started in the meantime:
+        if requestId != self.viewItemsRequestId:
+            return
+
+        if initialEntries == None:
+            self.documentTableModel.sortInMemory(col, order)
+        else:
+            self.documentTableModel.setEntrySource(entrySource, initialEntries)
 
     def previewHighlightCellColorFunction(self, rowIdx: int, colIdx: int, data):
-        v = self.previewHighlightCache.get(rowIdx)
+        # The cache is keyed by document id so it stays valid when the table is sorted.
+        uid = self.documentTableModel.getUID(rowIdx)
+        v = self.previewHighlightCache.get(uid)
 
         if v != None:
             return QColor.fromRgb(10,52,22) if v else None
 
-        uid = self.documentTableModel.getUID(rowIdx)
-        doc = self.dbManager.findOneInCollections(uid, self.collectionViewer.getSelectedCollectionNames())
-        
-        if doc:
-            preview = doc.get(Keys.preview)
-            if preview and '#' in preview:
-                hasPreview = len(anim_util.extractExistingFrameFilenames(preview)) > 0
-            else:
-                hasPreview = preview and os.path.exists(preview)
-            self.previewHighlightCache[rowIdx] = hasPreview
-            if hasPreview:
-                return QColor.fromRgb(10,52,22)
+        if not uid in self.previewHighlightRequestedUids:
+            self.previewHighlightPendingRows[uid] = rowIdx
+            # All rows of a paint event are collected before the batch is requested:
+            if not self.previewHighlightBatchScheduled:
+                self.previewHighlightBatchScheduled = True
+                QtCore.QTimer.singleShot(0, self.requestPreviewHighlights)
 
         return None
 
+    def resetPreviewHighlights(self):
+        self.previewHighlightCache = dict()
+        self.previewHighlightPendingRows = dict()
+        self.previewHighlightRequestedUids = set()
+        self.previewHighlightGeneration += 1
+
+    def requestPreviewHighlights(self):
+        self.previewHighlightBatchScheduled = False
+        pendingRows = list(self.previewHighlightPendingRows.items())
+        self.previewHighlightPendingRows = dict()
+
+        collectionNames = self.collectionViewer.getSelectedCollectionNames()
+        for i in range(0, len(pendingRows), self.previewHighlightBatchSize):
+            batchRows = dict(pendingRows[i:i+self.previewHighlightBatchSize])
+            self.previewHighlightRequestedUids.update(batchRows.keys())
+            QThreadPool.globalInstance().start(qt_util.LambdaTask(self.computePreviewHighlights, batchRows, collectionNames, self.previewHighlightGeneration))
+
+    def hasPreview(self, preview) -> bool:
+        # Queued existence checks are skipped quickly after shutdown:
+        if self.isShuttingDown or not preview or not isinstance(preview, str):
+            return False
+
+        if '#' in preview:
+            return self.fileExistenceCache.hasFrames(preview)
+        
+        return self.fileExistenceCache.exists(preview)
+
+    def computePreviewHighlights(self, uidToRow: Dict[Any,int], collectionNames: List[str], generation: int):
+        if self.isShuttingDown:
+            return
+
+        uidToPreview = dict()
+        try:
+            remainingUids = list(uidToRow.keys())
+            for collectionName in collectionNames:
+                if len(remainingUids) == 0:
+                    break
+
+                for doc in self.dbManager.db[collectionName].find({'_id': {'$in': remainingUids}}, {Keys.preview: 1}):
+                    uidToPreview[doc['_id']] = doc.get(Keys.preview)
+
+                remainingUids = [uid for uid in remainingUids if not uid in uidToPreview]
+
+            uids = list(uidToPreview.keys())
+            hasPreviewResults = self.previewExistenceExecutor.map(self.hasPreview, [uidToPreview[uid] for uid in uids])
+            # Documents that no longer exist are not highlighted:
+            highlights = {uid: False for uid in uidToRow.keys()}
+            highlights.update(zip(uids, hasPreviewResults))
+        except Exception as e:
+            if self.isShuttingDown:
+                return
+
+            self.logger.error(f'Failed to compute the preview highlights. Reason: {str(e)}')
+            highlights = dict()
+
+        qt_util.runInMainThread(self.onPreviewHighlightsComputed, uidToRow, highlights, generation)
+
+    def onPreviewHighlightsComputed(self, uidToRow: Dict[Any,int], highlights: Dict[Any,bool], generation: int):
+        if generation != self.previewHighlightGeneration:
+            return
+
+        self.previewHighlightRequestedUids.difference_update(uidToRow.keys())
+        self.previewHighlightCache.update(highlights)
+
+        rowCount = self.documentTableModel.rowCount(QtCore.QModelIndex())
+        rows = [row for uid, row in uidToRow.items() if uid in highlights and highlights[uid] and row < rowCount]
+        if len(rows) > 0:
+            model = self.documentTableModel
+            topLeft = model.index(min(rows), 0)
+            bottomRight = model.index(max(rows), model.columnCount(QtCore.QModelIndex()) - 1)
+            model.dataChanged.emit(topLeft, bottomRight, [QtCore.Qt.BackgroundRole])
+
+    def shutdown(self):
+        """Stops the preview existence checks. Running checks are not waited for so a slow network share doesn't block quitting.
+        """
+        self.isShuttingDown = True
+        self.previewHighlightGeneration += 1
+        self.previewExistenceExecutor.shutdown(wait=False)
+
     def saveState(self, settings: QtCore.QSettings):
         settings.setValue("searchFilterQueue", self.searchFilterQueue)
         settings.setValue("savedSearchFilters", self.savedFilters)
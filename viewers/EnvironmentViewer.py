@@ -57,6 +57,8 @@ class EnvironmentViewer(object):
         self.onValueTypeComboBoxSelectionChanged()
 
         self.onNewEnvironmentAdded = Event()
+        # Called whenever the settings of the environment are modified, even if they are not saved (see allowSave and addEntry):
+        self.onSettingsEdited = Event()
         self.ignoreFilter = None
         self.allowSave = True
 
@@ -101,6 +103,7 @@ class EnvironmentViewer(object):
                 ret = QMessageBox.question(self.widget, "Delete Entry", "Are you sure you want to delete the settings entry?")
                 if ret == QMessageBox.Yes:
                     del self.environment.settings[key]
+                    self.onSettingsEdited()
 
                     for i in range(0, len(self.settingsTable.entries)):
                         existingTableKey = self.settingsTable.entries[i][0]
@@ -219,6 +222,7 @@ class EnvironmentViewer(object):
 
             self.widget.deleteEntryButton.setEnabled(True)
             self.environment.settings[key] = value
+            self.onSettingsEdited()
             if save:
                 self.saveEnvironment()
             return True
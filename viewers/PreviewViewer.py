@@ -1,5 +1,4 @@
 import typing
-from MetadataManagerCore.animation import anim_util
 from MetadataManagerCore.mongodb_manager import MongoDBManager
 from PySide2 import QtWidgets, QtCore, QtUiTools, QtGui
 from MetadataManagerCore import Keys
@@ -7,33 +6,53 @@ from qt_extensions.DockWidget import DockWidget
 import os
 import asset_manager
 from qt_extensions.PhotoViewer import PhotoViewer
-from PySide2.QtCore import QRunnable
-import time
+from qt_extensions.PixmapLRUCache import PixmapLRUCache
+from file_cache.FileExistenceCache import FileExistenceCache
+from file_cache.ThumbnailCache import ThumbnailCache
+from qt_extensions import qt_util
 
 def clearContainer(container):
     for i in reversed(range(container.count())): 
         container.itemAt(i).widget().setParent(None)
 
 class PreviewViewer(DockWidget):
-    def __init__(self, parentWindow):
+    # Maximum width/height of the decoded preview images. The full resolution is only loaded when zooming in.
+    thumbnailSize = 1024
+    # Memory budget of the decoded previews. The cache is kept across selection changes.
+    pixmapCacheSizeInBytes = 512 * 1024 * 1024
+    # Number of animation frames that are decoded ahead of the playhead:
+    prefetchFrameCount = 16
+
+    def __init__(self, parentWindow, fileExistenceCache: FileExistenceCache, thumbnailCache: ThumbnailCache):
         super().__init__("Preview", parentWindow, asset_manager.getUIFilePath("previewViewer.ui"))
 
+        self.fileExistenceCache = fileExistenceCache
+        self.thumbnailCache = thumbnailCache
         self.preview = PhotoViewer(self.widget)
+        self.preview.zoomedIn.connect(self.onPreviewZoomedIn)
         self.previewFilenames: typing.List[str] = []
         self.curPreviewFilenameIdx = 0
         self.shownImageFilename: str = None
+        # The path of the image that is currently loaded or displayed (the missing image placeholder for invalid paths):
+        self.displayedPath: str = None
+        self.isFullResolutionDisplayed = False
+        self.resetZoomOnLoad = True
         self.preview.toggleDragMode()
         self.isPlaying = True
-        self.autoLoadBigFiles = True
         self.playIcon = QtGui.QIcon(':/icons/play_icon.png')
         self.pauseIcon = QtGui.QIcon(':/icons/pause_icon.png')
         self.widget.previewFrame.layout().addWidget(self.preview)
 
-        self.loadBigFileButton = QtWidgets.QPushButton('Load')
-        self.loadBigFileButton.setVisible(False)
-        self.loadBigFileButton.setSizePolicy(QtWidgets.QSizePolicy.Policy.Minimum, QtWidgets.QSizePolicy.Policy.Fixed)
-        self.loadBigFileButton.clicked.connect(lambda: self.displayPreview(self.shownImageFilename, force=True))
-        self.widget.previewFrame.layout().addWidget(self.loadBigFileButton)
+        # Images are decoded off the GUI thread. Two threads keep animations fluent without competing with other background work:
+        self.decodeThreadPool = QtCore.QThreadPool()
+        self.decodeThreadPool.setMaxThreadCount(2)
+        self.pendingPaths: typing.Set[str] = set()
+        # Pixmap keys of the paths, resolved by the decode threads so the GUI thread never stats files. None if a file is not accessible.
+        self.pathKeys: typing.Dict[str, tuple] = dict()
+        # Paths whose key was resolved since the last selection change. Cached pixmaps of other paths are shown but revalidated.
+        self.validatedPaths: typing.Set[str] = set()
+        # Keys of images that failed to decode, so animations don't retry them every frame. Cleared on selection changes.
+        self.failedKeys: typing.Set[tuple] = set()
 
         self.widget.playToggleButton.clicked.connect(self.onTogglePlay)
         self.widget.nextFrameButton.clicked.connect(self.onNextFrame)
@@ -42,7 +61,7 @@ class PreviewViewer(DockWidget):
 
         self.curFrameIdx = 0
         self.frames = []
-        self.pixmapCacheDict = dict()
+        self.pixmapCache = PixmapLRUCache(self.pixmapCacheSizeInBytes)
 
         self.widget.animationSpeedSlider.valueChanged.connect(self.onAnimationSpeedSliderChanged)
 
@@ -60,14 +79,14 @@ class PreviewViewer(DockWidget):
             prevIdx = self.curPreviewFilenameIdx
             self.curPreviewFilenameIdx = (self.curPreviewFilenameIdx + 1) % len(self.previewFilenames)
             if prevIdx != self.curPreviewFilenameIdx:
-                self.showPreview(self.previewFilenames[self.curPreviewFilenameIdx], autoLoadBigFiles=self.autoLoadBigFiles)
+                self.showPreview(self.previewFilenames[self.curPreviewFilenameIdx])
 
     def onPrevPreviewClick(self):
         if self.previewFilenames and len(self.previewFilenames) > 0:
             prevIdx = self.curPreviewFilenameIdx
             self.curPreviewFilenameIdx = (self.curPreviewFilenameIdx - 1 + len(self.previewFilenames)) % len(self.previewFilenames)
             if prevIdx != self.curPreviewFilenameIdx:
-                self.showPreview(self.previewFilenames[self.curPreviewFilenameIdx], autoLoadBigFiles=self.autoLoadBigFiles)
+                self.showPreview(self.previewFilenames[self.curPreviewFilenameIdx])
 
     def onAnimationSpeedSliderChanged(self, value):
         self.animationTimer.setInterval(self.widget.animationSpeedSlider.maximum() - value + 1)
@@ -87,51 +106,130 @@ class PreviewViewer(DockWidget):
     def onPreviousFrame(self):
         self.showPreviousFrame()
 
-    def displayPreview(self, path: str, resetZoom=True, force=False):
+    def displayPreview(self, path: str, resetZoom=True):
         self.shownImageFilename = path
         validPath = True
-        if not os.path.exists(path):
+        if not self.fileExistenceCache.exists(path):
             path = asset_manager.getImagePath('missing_rendering.jpg')
             validPath = False
 
-        self.loadBigFileButton.setVisible(False)
-        self.preview.setVisible(True)
+        self.displayedPath = path
+        self.isFullResolutionDisplayed = False
 
-        if path in self.pixmapCacheDict:
-            self.preview.setPhoto(self.pixmapCacheDict[path], resetZoom=resetZoom)
-            return True
+        key = self.pathKeys.get(path)
+        if key in self.pixmapCache:
+            self.preview.setPhoto(self.pixmapCache.get(key), resetZoom=resetZoom)
+            # Revalidates the key in case the image was re-rendered:
+            self.requestThumbnail(path, priority=1)
+        elif path in self.validatedPaths and (key == None or key in self.failedKeys):
+            self.preview.setPhoto(None, resetZoom=resetZoom)
+        else:
+            # The preview is updated as soon as the thumbnail is decoded:
+            self.resetZoomOnLoad = resetZoom
+            self.requestThumbnail(path, priority=1)
+
+        self.prefetchFrames()
+
+        return validPath
 
-        if not force and not self.autoLoadBigFiles:
+    @staticmethod
+    def getPixmapKey(path: str) -> tuple:
+        """Pixmaps are keyed by (path, mtime, size) so a re-rendered image is decoded again. Returns None if the file is not accessible.
+        Stats the file, so it's only called on the decode threads.
+        """
+        try:
             stats = os.stat(path)
-            fileSize = float(stats.st_size)
-            fileSizeInMb = fileSize / 1024.0 / 1024.0
+        except (OSError, ValueError):
+            return None
 
-            if fileSizeInMb > 2.5:
-                self.loadBigFileButton.setVisible(True)
-                self.loadBigFileButton.setText(f'Load ({int(round(fileSizeInMb*10))/10.0} MB)')
-                self.preview.setVisible(False)
-                return False
+        return (path, stats.st_mtime_ns, stats.st_size)
 
-        scene = QtWidgets.QGraphicsScene()
-        pixmap = QtGui.QPixmap(path)
-        scene.addPixmap(pixmap)
-        self.preview.setPhoto(pixmap, resetZoom=resetZoom)
-        self.pixmapCacheDict[path] = pixmap
+    def isFrameReady(self, path: str) -> bool:
+        key = self.pathKeys.get(path)
+        return key in self.pixmapCache or (path in self.validatedPaths and (key == None or key in self.failedKeys))
 
-        return validPath
+    def requestThumbnail(self, path: str, priority=0):
+        if path in self.pendingPaths:
+            return
 
-    def showPreview(self, path: str, autoLoadBigFiles=True):
-        self.autoLoadBigFiles = autoLoadBigFiles
-        self.pixmapCacheDict = dict()
+        key = self.pathKeys.get(path)
+        if path in self.validatedPaths and (key == None or key in self.pixmapCache or key in self.failedKeys):
+            return
+
+        # A cached pixmap of a path that wasn't validated since the selection changed is only decoded again if the key changed:
+        cachedKey = key if key in self.pixmapCache else None
+        self.pendingPaths.add(path)
+        self.decodeThreadPool.start(qt_util.LambdaTask(self.loadThumbnail, path, cachedKey), priority)
+
+    def prefetchFrames(self):
+        frameCount = len(self.frames)
+        for i in range(1, min(self.prefetchFrameCount, frameCount - 1) + 1):
+            self.requestThumbnail(self.frames[(self.curFrameIdx + i) % frameCount])
+
+    def loadThumbnail(self, path: str, cachedKey: tuple):
+        key = self.getPixmapKey(path)
+        image = self.thumbnailCache.loadThumbnail(path, self.thumbnailSize) if key != None and key != cachedKey else None
+        qt_util.runInMainThread(self.onThumbnailLoaded, path, key, image)
+
+    def onThumbnailLoaded(self, path: str, key: tuple, image: QtGui.QImage):
+        self.pendingPaths.discard(path)
+        self.validatedPaths.add(path)
+        self.pathKeys[path] = key
+
+        if key == None:
+            pixmap = None
+        elif image is None:
+            # The cached pixmap is still valid and was already displayed. Decode again if it was evicted in the meantime:
+            if not key in self.pixmapCache:
+                self.requestThumbnail(path, priority=1)
+            return
+        else:
+            # QPixmaps must be created on the GUI thread. Null pixmaps are not cached, failed keys are remembered instead.
+            pixmap = QtGui.QPixmap.fromImage(image)
+            if pixmap.isNull():
+                self.failedKeys.add(key)
+            else:
+                self.pixmapCache.put(key, pixmap)
+
+        if path == self.displayedPath:
+            self.preview.setPhoto(pixmap, resetZoom=self.resetZoomOnLoad)
+            self.resetZoomOnLoad = False
+
+    def onPreviewZoomedIn(self):
+        if self.isFullResolutionDisplayed or self.displayedPath == None:
+            return
 
+        self.isFullResolutionDisplayed = True
+        self.decodeThreadPool.start(qt_util.LambdaTask(self.loadFullResolution, self.displayedPath), 2)
+
+    def loadFullResolution(self, path: str):
+        reader = QtGui.QImageReader(path)
+        reader.setAutoTransform(True)
+        qt_util.runInMainThread(self.onFullResolutionLoaded, path, reader.read())
+
+    def onFullResolutionLoaded(self, path: str, image: QtGui.QImage):
+        if path == self.displayedPath and self.isFullResolutionDisplayed and not image.isNull():
+            self.preview.replacePhoto(QtGui.QPixmap.fromImage(image))
+
+    def showPreview(self, path: str):
         self.animationTimer.stop()
+        self.frames = []
+
+        # Decoded pixmaps stay cached but queued decodes of the previous selection are no longer needed:
+        self.decodeThreadPool.clear()
+        self.pendingPaths.clear()
+        self.validatedPaths.clear()
+        self.failedKeys.clear()
+        # Keys of evicted pixmaps are not needed anymore:
+        self.pathKeys = {path: key for path, key in self.pathKeys.items() if key in self.pixmapCache}
+
         if path == None:
             self.displayPreview('')
             return
 
         if '#' in path:
             self.curFrameIdx = 0
-            self.frames = anim_util.extractExistingFrameFilenames(path)
+            self.frames = self.fileExistenceCache.frames(path)
 
             if len(self.frames) > 0:
                 if self.displayPreview(self.frames[self.curFrameIdx]) and self.isPlaying:
@@ -140,7 +238,15 @@ class PreviewViewer(DockWidget):
             self.displayPreview(path)
 
     def onUpdateAnimation(self):
-        self.showNextFrame()
+        if len(self.frames) == 0:
+            return
+
+        # Hold the current frame until the next one is decoded instead of skipping frames:
+        nextFramePath = self.frames[(self.curFrameIdx + 1) % len(self.frames)]
+        if self.isFrameReady(nextFramePath):
+            self.showNextFrame()
+        else:
+            self.requestThumbnail(nextFramePath, priority=1)
 
     def showNextFrame(self):
         if self.curFrameIdx < len(self.frames):
@@ -155,19 +261,19 @@ class PreviewViewer(DockWidget):
     def clearPreview(self):
         self.animationTimer.stop()
         self.frames = []
+        self.displayedPath = None
         self.preview.setPhoto(None)
 
     def selectBackgroundColor(self):
         self.backgroundColor = QtWidgets.QColorDialog.getColor()
         self.preview.setBackgroundBrush(self.backgroundColor)
 
-    def showMultiplePreviews(self, previewFilenames: typing.List[str], autoLoadBigFiles=True):
-        self.autoLoadBigFiles = autoLoadBigFiles
+    def showMultiplePreviews(self, previewFilenames: typing.List[str]):
         self.previewFilenames = previewFilenames
         self.curPreviewFilenameIdx = 0
 
         if not previewFilenames or len(self.previewFilenames) == 0:
-            self.showPreview(None, autoLoadBigFiles=self.autoLoadBigFiles)
+            self.showPreview(None)
             self.widget.nextPreviewButton.hide()
             self.widget.prevPreviewButton.hide()
             return
@@ -179,4 +285,4 @@ class PreviewViewer(DockWidget):
             self.widget.nextPreviewButton.hide()
             self.widget.prevPreviewButton.hide()
 
-        self.showPreview(previewFilenames[self.curPreviewFilenameIdx], autoLoadBigFiles=self.autoLoadBigFiles)
\ No newline at end of file
+        self.showPreview(previewFilenames[self.curPreviewFilenameIdx])
\ No newline at end of file
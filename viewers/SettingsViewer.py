@@ -4,6 +4,7 @@ import asset_manager
 from ServiceRegistry import ServiceRegistry
 from MetadataManagerCore import Keys
 from qt_extensions.ProgressDialog import ProgressDialog
+from database import collection_keys
 
 class SettingsViewer(DockWidget):
     def __init__(self, parentWindow, serviceRegistry: ServiceRegistry):
@@ -34,16 +35,23 @@ class SettingsViewer(DockWidget):
         docIdx = 0
         for collectionName in dbManager.getVisibleCollectionNames():
             collection = dbManager.db[collectionName]
-
-            for doc in collection.find({}):
-                sid = doc.get(Keys.systemIDKey)
-                if sid:
-                    dbManager.insertOrModifyDocument(collectionName, sid, doc, False)
-
-                docIdx += 1
-
-                # Progress:
-                progress = float(docIdx) / totalCount
-                progressDialog.updateProgress(progress)
+            # The key registry is updated once per chunk of documents instead of once per document:
+            keyTracker = collection_keys.DocumentKeyTracker(dbManager.db, collectionName)
+
+            try:
+                for doc in collection.find({}):
+                    sid = doc.get(Keys.systemIDKey)
+                    if sid:
+                        oldKeys = set(doc.keys())
+                        dbManager.insertOrModifyDocument(collectionName, sid, doc, False)
+                        keyTracker.add(sid, oldKeys)
+
+                    docIdx += 1
+
+                    # Progress:
+                    progress = float(docIdx) / totalCount
+                    progressDialog.updateProgress(progress)
+            finally:
+                keyTracker.flush()
 
         progressDialog.close()
\ No newline at end of file